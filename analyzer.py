@@ -4,6 +4,7 @@ from datetime import datetime
 from web3 import Web3
 from functools import wraps
 from config import GOPLUS_API_URL
+from goplus_batcher import get_goplus_batcher
 from safe_math import safe_div, safe_div_percentage
 
 # Import new security analysis modules
@@ -201,14 +202,12 @@ class TokenAnalyzer:
             # If no owner() function, assume not renounced
             return False
     
-    @retry_with_backoff(max_retries=2, base_delay=1)
     def _get_security_data(self, token_address):
-        """Fetch security data from GoPlus API"""
+        """Fetch security data from GoPlus API (batched; retries/backoff via the shared HTTP client)"""
         try:
-            url = f"{GOPLUS_API_URL}?contract_addresses={token_address}"
-            response = requests.get(url, timeout=10)  # Increased timeout
-            response.raise_for_status()  # Raise exception for bad status codes
-            data = response.json()
+            data = get_goplus_batcher().lookup_sync(GOPLUS_API_URL, token_address)
+            if data is None:
+                raise RuntimeError("HTTP error")  # bad status code
             
             if 'result' in data and token_address.lower() in data['result']:
                 token_data = data['result'][token_address.lower()]
@@ -0,0 +1,475 @@
+"""
+API Cache - Shared stale-while-revalidate cache for security and market APIs
+
+One process-wide cache for third-party API results (GoPlus, RugCheck,
+TokenSniffer, Moralis, Birdeye). Each source owns a namespace (CacheSource)
+with its own policy:
+
+- ttl:          age below which an entry is fresh
+- stale_ttl:    extra window in which the last value is returned instantly
+                while one background refresh runs (stale-while-revalidate);
+                a failed refresh keeps the stale value (stale-if-error)
+- negative_ttl: how long failed/empty results are cached, so a bad token or
+                a down API is not re-queried on every scan
+- persist:      write positive entries to a SQLite tier (data/api_cache.db),
+                so restarts come up with warm security data
+
+Concurrent misses for the same key share one fetch (async callers share a
+future, blocking callers wait on a per-key lock). Hit ratios are reported
+per source via get_stats().
+
+Usage:
+    cache = get_api_cache().source('goplus')
+    result = await cache.get_or_fetch(key, lambda: fetch_audit(token))
+    result = cache.get_or_fetch_sync(key, lambda: fetch_report(token))
+"""
+import asyncio
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _is_none(value: Any) -> bool:
+    return value is None
+
+
+@dataclass
+class CacheSourceConfig:
+    """Per-source cache policy (seconds)."""
+    ttl: float
+    stale_ttl: float = 0.0
+    negative_ttl: float = 60.0
+    persist: bool = False
+    max_entries: int = 10000
+    is_negative: Callable[[Any], bool] = _is_none   # value -> cache it as a failure?
+
+
+def _has_api_error(result: Dict) -> bool:
+    return bool(result.get('api_error'))
+
+
+def _has_error(result: Dict) -> bool:
+    return result.get('error') is not None
+
+
+# Security verdicts can flip within minutes (mint re-enabled, LP pulled, honeypot
+# switched on), so a stale one is only served briefly while it is refreshed
+SECURITY_STALE_TTL = 300
+
+# TTLs carried over from the per-module caches they replace
+DEFAULT_SOURCES = {
+    # security_audit results
+    'rugcheck': CacheSourceConfig(ttl=1800, stale_ttl=SECURITY_STALE_TTL, negative_ttl=60,
+                                  persist=True, is_negative=_has_api_error),
+    'goplus': CacheSourceConfig(ttl=1800, stale_ttl=SECURITY_STALE_TTL, negative_ttl=60,
+                                persist=True, is_negative=_has_api_error),
+    # TokenSnifferAnalyzer raw reports (None = API error)
+    'rugcheck.report': CacheSourceConfig(ttl=1800, stale_ttl=SECURITY_STALE_TTL, negative_ttl=60, persist=True),
+    'goplus.report': CacheSourceConfig(ttl=1800, stale_ttl=SECURITY_STALE_TTL, negative_ttl=60, persist=True,
+                                       is_negative=lambda report: report is None or report.get('code') != 1),
+    'tokensniffer': CacheSourceConfig(ttl=1800, stale_ttl=SECURITY_STALE_TTL, negative_ttl=120, persist=True),
+    # Bonding status only moves towards graduation; errors are retried soon
+    'moralis': CacheSourceConfig(ttl=300, stale_ttl=900, negative_ttl=30,
+                                 persist=True, is_negative=_has_error),
+    # OHLCV history (empty list = nothing returned)
+    'birdeye': CacheSourceConfig(ttl=86400, negative_ttl=300, max_entries=2000,
+                                 is_negative=lambda candles: not candles),
+}
+
+FRESH, STALE = 'fresh', 'stale'
+
+
+class _DiskTier:
+    """
+    SQLite key/value tier. Writes are buffered and flushed in batches (or on
+    flush()/exit); reads go straight to the database.
+    """
+
+    FLUSH_EVERY = 32        # pending writes
+    FLUSH_INTERVAL = 5.0    # seconds
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._last_flush = time.time()
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_cache (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, source: str, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            pending = self._pending.get((source, key))
+            if pending is None:
+                row = self._conn.execute(
+                    "SELECT value, stored_at FROM api_cache WHERE source = ? AND key = ?", (source, key)
+                ).fetchone()
+            else:
+                row = pending
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            return None
+
+    def store(self, source: str, key: str, value: Any, stored_at: float):
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # not JSON-serializable: memory tier only
+        with self._lock:
+            self._pending[(source, key)] = (encoded, stored_at)
+            due = (len(self._pending) >= self.FLUSH_EVERY
+                   or time.time() - self._last_flush >= self.FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def delete(self, source: str, key: str):
+        with self._lock:
+            self._pending.pop((source, key), None)
+            self._conn.execute("DELETE FROM api_cache WHERE source = ? AND key = ?", (source, key))
+            self._conn.commit()
+
+    def prune(self, source: str, older_than: float):
+        with self._lock:
+            self._conn.execute("DELETE FROM api_cache WHERE source = ? AND stored_at < ?", (source, older_than))
+            self._conn.commit()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.time()
+            if not pending:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO api_cache (source, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                [(source, key, value, stored_at) for (source, key), (value, stored_at) in pending.items()],
+            )
+            self._conn.commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+class CacheSource:
+    """One source's entries, policy and hit/miss counters."""
+
+    def __init__(self, name: str, config: CacheSourceConfig, disk: Optional[_DiskTier],
+                 executor: Callable[[], ThreadPoolExecutor]):
+        self.name = name
+        self.config = config
+        self._disk = disk if config.persist else None
+        self._executor = executor
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float, bool]]' = OrderedDict()  # key -> (value, stored_at, negative)
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._sync_locks: Dict[Hashable, list] = {}  # key -> [lock, waiters] for blocking misses
+        self._tasks: set = set()
+        self.stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'negative_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'coalesced': 0,     # misses served by another caller's fetch
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0,
+        }
+
+        if self._disk is not None:
+            self._disk.prune(name, time.time() - config.ttl - config.stale_ttl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def _state(self, stored_at: float, negative: bool, now: float) -> Optional[str]:
+        age = now - stored_at
+        if negative:
+            return FRESH if age < self.config.negative_ttl else None
+        if age < self.config.ttl:
+            return FRESH
+        if age < self.config.ttl + self.config.stale_ttl:
+            return STALE
+        return None
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[str], Any]:
+        """(FRESH | STALE | None, value), counting the lookup."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        from_disk = False
+        if entry is None and self._disk is not None:
+            loaded = self._disk.load(self.name, str(key))
+            if loaded is not None:
+                entry = (loaded[0], loaded[1], False)
+                from_disk = True
+
+        state = self._state(entry[1], entry[2], now) if entry is not None else None
+        with self._lock:
+            if state is None:
+                self.stats['misses'] += 1
+                if entry is not None and not from_disk:
+                    self._entries.pop(key, None)
+                return None, None
+            if from_disk:
+                self.stats['disk_hits'] += 1
+                self._put(key, entry)
+            if entry[2]:
+                self.stats['negative_hits'] += 1
+            elif state == FRESH:
+                self.stats['hits'] += 1
+            else:
+                self.stats['stale_hits'] += 1
+        return state, entry[0]
+
+    def _put(self, key: Hashable, entry: Tuple[Any, float, bool]):
+        # caller holds self._lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get(self, key: Hashable, allow_stale: bool = True) -> Any:
+        """Cached value (None on miss) without fetching."""
+        state, value = self._lookup(key)
+        if state == STALE and not allow_stale:
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, refresh: bool = False):
+        """
+        Store a fetched value. Negative values are kept for negative_ttl; on a
+        background refresh they don't replace a usable positive entry.
+        """
+        now = time.time()
+        negative = self.config.is_negative(value)
+        with self._lock:
+            if negative and refresh:
+                current = self._entries.get(key)
+                if current is not None and not current[2] and self._state(current[1], False, now):
+                    return
+            self._put(key, (value, now, negative))
+        if self._disk is not None and not negative:
+            self._disk.store(self.name, str(key), value, now)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._disk is not None:
+            self._disk.delete(self.name, str(key))
+
+    # ------------------------------------------------------------------
+    # Fetch-through
+    # ------------------------------------------------------------------
+
+    async def get_or_fetch(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Fresh value, else the stale value (refreshing it in the background),
+        else await fetcher(). Concurrent misses share one fetch.
+        """
+        state, value = self._lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            self._schedule_refresh(key, fetcher)
+            return value
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetcher()
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise; don't warn if there are none
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _schedule_refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        task = asyncio.ensure_future(self._refresh(key, fetcher))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]]):
+        try:
+            self.set(key, await fetcher(), refresh=True)
+            self.stats['refreshes'] += 1
+        except Exception:
+            self.stats['refresh_errors'] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch_sync(self, key: Hashable, fetcher: Callable[[], Any]) -> Any:
+        """
+        Blocking get_or_fetch(); stale refreshes run on the cache's worker
+        threads. Concurrent misses for a key wait for the first fetch.
+        """
+        state, value = self._lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            with self._lock:
+                refreshing = key in self._refreshing
+                self._refreshing.add(key)
+            if not refreshing:
+                self._executor().submit(self._refresh_sync, key, fetcher)
+            return value
+
+        with self._lock:
+            slot = self._sync_locks.get(key)
+            if slot is None:
+                slot = self._sync_locks[key] = [threading.Lock(), 0]
+            slot[1] += 1
+        try:
+            with slot[0]:
+                # Stored by the fetch we waited for?
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and self._state(entry[1], entry[2], time.time()) == FRESH:
+                        self.stats['coalesced'] += 1
+                        return entry[0]
+                value = fetcher()
+                self.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._sync_locks[key]
+
+    def _refresh_sync(self, key: Hashable, fetcher: Callable[[], Any]):
+        try:
+            self.set(key, fetcher(), refresh=True)
+            self.stats['refreshes'] += 1
+        except Exception:
+            self.stats['refresh_errors'] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        served = stats['hits'] + stats['stale_hits'] + stats['negative_hits']
+        lookups = served + stats['misses']
+        stats['size'] = len(self._entries)
+        stats['hit_ratio_pct'] = served / lookups * 100 if lookups else 0.0
+        return stats
+
+
+class ApiCache:
+    """
+    Registry of CacheSources sharing one disk tier and refresh pool.
+
+    Args:
+        sources: CacheSourceConfig overrides by source name (merged over DEFAULT_SOURCES)
+        db_path: SQLite file for persisted sources (None: memory only)
+    """
+
+    def __init__(self, sources: Dict[str, CacheSourceConfig] = None,
+                 db_path: Optional[str] = "data/api_cache.db"):
+        self.configs: Dict[str, CacheSourceConfig] = {**DEFAULT_SOURCES, **(sources or {})}
+        self._sources: Dict[str, CacheSource] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._disk: Optional[_DiskTier] = None
+        if db_path:
+            try:
+                self._disk = _DiskTier(db_path)
+            except sqlite3.Error as e:
+                print(f"[CACHE] ⚠️ Disk tier unavailable ({e}) - memory only")
+
+    def source(self, name: str) -> CacheSource:
+        """Get or create a source (unknown names get a 5-minute memory-only policy)."""
+        source = self._sources.get(name)
+        if source is None:
+            with self._lock:
+                source = self._sources.get(name)
+                if source is None:
+                    config = self.configs.get(name) or CacheSourceConfig(ttl=300)
+                    source = self._sources[name] = CacheSource(name, config, self._disk, self._executor)
+        return source
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='api-cache-refresh')
+        return self._pool
+
+    def flush(self):
+        """Write buffered entries to disk."""
+        if self._disk is not None:
+            self._disk.flush()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def get_stats(self) -> Dict:
+        """Per-source hit ratios and counters."""
+        return {name: source.get_stats() for name, source in self._sources.items()}
+
+
+# Singleton
+_api_cache = None
+
+def get_api_cache() -> ApiCache:
+    """Get or create the process-wide ApiCache (disk tier flushed at exit)."""
+    global _api_cache
+    if _api_cache is None:
+        _api_cache = ApiCache()
+        atexit.register(_api_cache.flush)
+    return _api_cache
@@ -1,46 +1,22 @@
 """
 Birdeye API Client for Historical Price Data (OHLCV)
 Provides accurate ATH tracking for Rebound Scanner feature.
+
+calculate_ath() keeps candles in the local OHLCV store and only fetches
+candles newer than the last stored one (nothing at all within
+refresh_interval), so repeated rebound checks cost zero or one small call.
 """
 
-import aiohttp
 import asyncio
 import time
 from typing import Dict, List, Optional
 import os
 
-# Cache for OHLCV data (24h TTL)
-_ohlcv_cache = {}
-OHLCV_CACHE_TTL = 86400  # 24 hours
-
-# Rate limiting
-_last_birdeye_request = 0
-_birdeye_request_interval = 0.5  # 500ms between requests
-
-
-async def _rate_limit():
-    """Enforce Birdeye API rate limiting."""
-    global _last_birdeye_request
-    elapsed = time.time() - _last_birdeye_request
-    if elapsed < _birdeye_request_interval:
-        await asyncio.sleep(_birdeye_request_interval - elapsed)
-    _last_birdeye_request = time.time()
-
-
-def _get_cache(key: str) -> Optional[Dict]:
-    """Get cached OHLCV data if valid."""
-    if key in _ohlcv_cache:
-        timestamp, data = _ohlcv_cache[key]
-        if time.time() - timestamp < OHLCV_CACHE_TTL:
-            return data
-        else:
-            del _ohlcv_cache[key]
-    return None
+from api_cache import get_api_cache
+from http_client import get_http_client
+from ohlcv_store import OHLCVStore, get_ohlcv_store
 
-
-def _set_cache(key: str, data: Dict):
-    """Cache OHLCV data with timestamp."""
-    _ohlcv_cache[key] = (time.time(), data)
+# OHLCV data is cached in the shared API cache ('birdeye' source, 24h TTL)
 
 
 class BirdeyeClient:
@@ -49,10 +25,16 @@ class BirdeyeClient:
     Used to calculate accurate ATH for rebound detection.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, store: OHLCVStore = None,
+                 refresh_interval: float = 60):
         self.api_key = api_key or os.getenv('BIRDEYE_API_KEY')
         self.base_url = "https://public-api.birdeye.so"
         
+        # Local candle store for ATH tracking (opened on first use)
+        self._store = store
+        self.refresh_interval = refresh_interval  # seconds between incremental fetches per token
+        self._refresh_locks: Dict[tuple, asyncio.Lock] = {}
+        
         if not self.api_key:
             print("[BIRDEYE] ⚠️ Warning: No API key found. Set BIRDEYE_API_KEY in .env")
     
@@ -75,17 +57,29 @@ class BirdeyeClient:
         Returns:
             List of candles: [{'time': epoch, 'open': float, 'high': float, 'low': float, 'close': float, 'volume': float}]
         """
-        cache_key = f"{chain}_{token_address}_{timeframe}"
-        cached = _get_cache(cache_key)
-        if cached:
-            return cached
-        
         if not self.api_key:
             print("[BIRDEYE] ❌ Cannot fetch OHLCV: No API key")
             return []
         
-        await _rate_limit()
-        
+        cache_key = f"{chain}_{token_address}_{timeframe}"
+        return await get_api_cache().source('birdeye').get_or_fetch(
+            cache_key, lambda: self._fetch_ohlcv(token_address, chain, timeframe, limit)
+        )
+    
+    @property
+    def store(self) -> OHLCVStore:
+        if self._store is None:
+            self._store = get_ohlcv_store()
+        return self._store
+    
+    async def _fetch_ohlcv(self, token_address: str, chain: str, timeframe: str, limit: int) -> List[Dict]:
+        """Uncached get_ohlcv()."""
+        time_from = int(time.time()) - (730 * 86400)  # 730 days ago (max history)
+        return await self._request_ohlcv(token_address, chain, timeframe, time_from) or []
+    
+    async def _request_ohlcv(self, token_address: str, chain: str, timeframe: str,
+                             time_from: int) -> Optional[List[Dict]]:
+        """Candles from time_from to now (None on API error)."""
         # Map chain names to Birdeye format
         chain_map = {
             'solana': 'solana',
@@ -102,7 +96,7 @@ class BirdeyeClient:
         params = {
             'address': token_address,
             'type': timeframe,
-            'time_from': int(time.time()) - (730 * 86400),  # 730 days ago (max history)
+            'time_from': time_from,
             'time_to': int(time.time())
         }
         
@@ -112,59 +106,66 @@ class BirdeyeClient:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers, timeout=15) as resp:
-                    if resp.status != 200:
-                        print(f"[BIRDEYE] ⚠️ API Error {resp.status}")
-                        return []
-                    
-                    data = await resp.json()
-                    
-                    if not data.get('success'):
-                        print(f"[BIRDEYE] ⚠️ API returned error: {data.get('message')}")
-                        return []
-                    
-                    candles = data.get('data', {}).get('items', [])
-                    
-                    # Transform to standard format
-                    result = []
-                    for c in candles:
-                        result.append({
-                            'time': c.get('unixTime', 0),
-                            'open': c.get('o', 0),
-                            'high': c.get('h', 0),
-                            'low': c.get('l', 0),
-                            'close': c.get('c', 0),
-                            'volume': c.get('v', 0)
-                        })
-                    
-                    _set_cache(cache_key, result)
-                    print(f"[BIRDEYE] ✅ Fetched {len(result)} candles for {token_address[:10]}...")
-                    return result
-                    
+            resp = await get_http_client().get('birdeye', url, params=params, headers=headers, api_key=self.api_key)
+            if resp.status != 200:
+                print(f"[BIRDEYE] ⚠️ API Error {resp.status}")
+                return None
+            
+            data = resp.json()
+            
+            if not data.get('success'):
+                print(f"[BIRDEYE] ⚠️ API returned error: {data.get('message')}")
+                return None
+            
+            candles = data.get('data', {}).get('items', [])
+            
+            # Transform to standard format
+            result = []
+            for c in candles:
+                result.append({
+                    'time': c.get('unixTime', 0),
+                    'open': c.get('o', 0),
+                    'high': c.get('h', 0),
+                    'low': c.get('l', 0),
+                    'close': c.get('c', 0),
+                    'volume': c.get('v', 0)
+                })
+            
+            print(f"[BIRDEYE] ✅ Fetched {len(result)} candles for {token_address[:10]}...")
+            return result
+            
         except asyncio.TimeoutError:
             print(f"[BIRDEYE] ⚠️ Timeout fetching OHLCV")
-            return []
+            return None
         except Exception as e:
             print(f"[BIRDEYE] ❌ Error: {e}")
-            return []
+            return None
     
-    async def calculate_ath(self, token_address: str, chain: str = 'solana') -> Dict:
+    async def calculate_ath(self, token_address: str, chain: str = 'solana', timeframe: str = '1H') -> Dict:
         """
         Calculate All-Time High from historical OHLCV data.
         
+        The first call loads the full history into the local candle store;
+        later calls fetch only candles since the last stored one.
+        
         Returns:
             {
                 'ath': float,
                 'current_price': float,
                 'drop_percent': float,
                 'ath_time': int (epoch),
-                'candles_count': int
+                'candles_count': int,
+                'low_since_ath': float,
+                'max_drawdown_percent': float,
+                'rebound_percent': float (from low since ATH)
             }
         """
-        candles = await self.get_ohlcv(token_address, chain, timeframe='1H', limit=1000)
+        chain = chain.lower()
+        if self.api_key:
+            await self._refresh_series(token_address, chain, timeframe)
         
-        if not candles:
+        stats = self.store.get_stats(chain, token_address, timeframe)
+        if not stats or not stats['candles_count']:
             return {
                 'ath': 0,
                 'current_price': 0,
@@ -173,31 +174,29 @@ class BirdeyeClient:
                 'candles_count': 0,
                 'error': 'No candle data available'
             }
+        return stats
+    
+    async def _refresh_series(self, token_address: str, chain: str, timeframe: str):
+        """Fetch candles newer than the stored series (at most once per refresh_interval)."""
+        key = (chain, token_address, timeframe)
+        lock = self._refresh_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            series = self.store.series(chain, token_address, timeframe)
+            if series and time.time() - series['fetched_at'] < self.refresh_interval:
+                return
+            
+            if series and series['last_time'] is not None:
+                time_from = series['last_time']  # re-fetch the forming candle
+            else:
+                time_from = int(time.time()) - (730 * 86400)  # 730 days ago (max history)
+            
+            candles = await self._request_ohlcv(token_address, chain, timeframe, time_from)
+            if candles is None:
+                return  # API error: keep serving stored stats
+            self.store.append(chain, token_address, timeframe, candles)
         
-        # Find ATH from all candles
-        ath = 0
-        ath_time = 0
-        for candle in candles:
-            high = candle.get('high', 0)
-            if high > ath:
-                ath = high
-                ath_time = candle.get('time', 0)
-        
-        # Current price = last candle close
-        current_price = candles[-1].get('close', 0) if candles else 0
-        
-        # Calculate drop %
-        drop_percent = 0
-        if ath > 0 and current_price > 0:
-            drop_percent = ((ath - current_price) / ath) * 100
-        
-        return {
-            'ath': ath,
-            'current_price': current_price,
-            'drop_percent': drop_percent,
-            'ath_time': ath_time,
-            'candles_count': len(candles)
-        }
+        if not lock.locked():
+            self._refresh_locks.pop(key, None)
 
 
 # Global instance
@@ -10,6 +10,7 @@ from functools import wraps
 from typing import List, Dict, Optional
 from colorama import Fore
 from .base_adapter import ChainAdapter
+from goplus_batcher import get_goplus_batcher
 
 # Import V3 modules
 try:
@@ -664,14 +665,12 @@ class EVMAdapter(ChainAdapter):
             # Address validation or contract creation failed
             return False
     
-    @retry_with_backoff(max_retries=2, base_delay=1)
     def _get_goplus_data(self, token_address: str) -> Optional[Dict]:
-        """Fetch security data from GoPlus API"""
+        """Fetch security data from GoPlus API (batched; retries/backoff via the shared HTTP client)"""
         try:
-            url = f"{self.goplus_api_url}?contract_addresses={token_address}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = get_goplus_batcher().lookup_sync(self.goplus_api_url, token_address)
+            if data is None:
+                raise RuntimeError("HTTP error")
             
             if 'result' in data and token_address.lower() in data['result']:
                 return data['result'][token_address.lower()]
@@ -48,6 +48,7 @@ REALERT_COOLDOWN_MINUTES = 15
 REALERT_SCORE_IMPROVEMENT = 15
 REALERT_LIQUIDITY_IMPROVEMENT = 0.30  # 30%
 REALERT_MAX_PER_HOUR = 3
+REALERT_HISTORY_HOURS = 24  # Alert history retention (older tokens alert as new)
 
 # Auto-upgrade settings (TRADE-EARLY → TRADE)
 AUTO_UPGRADE_ENABLED = True
@@ -136,7 +137,8 @@ SOLANA_ALCHEMY_SAFE_CONFIG = {
 # ================================================
 SMART_WALLET_CONFIG = {
     # Database path
-    "db_path": "data/smart_wallets.json",
+    "db_path": "data/smart_wallets.db",
+    "legacy_json_path": "data/smart_wallets.json",  # Imported once on first start
     
     # Tier thresholds
     "tier1_min_success": 0.70,  # 70% win rate for elite tier
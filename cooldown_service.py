@@ -0,0 +1,446 @@
+"""
+Cooldown Service - Shared dedup / cooldown store
+
+One process-wide store for every "seen recently?" check:
+- offchain Deduplicator (pair + token cooldowns, BC watchlist)
+- DegenSniperFilter pair dedup (with bypass conditions)
+- TelegramNotifier re-alert history
+- SniperCooldown / RunningCooldown (JSON-persisted)
+
+Each consumer owns a namespace (CooldownTable). Inserts and checks are O(1)
+dict operations; expiry is driven by a hierarchical timing wheel, so entries
+are dropped as their slot comes due instead of by full scans, and memory stays
+bounded by (insert rate x cooldown) for every namespace.
+
+Usage:
+    table = get_cooldown_service().table('offchain.pairs')
+    if table.check_and_mark(key, cooldown_seconds=900):
+        return  # duplicate
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel.
+
+    Level 0 has `slots` buckets of one tick each, level N buckets span
+    slots**N ticks. Keys are bucketed by their deadline tick; advancing the
+    wheel pops due level-0 buckets and cascades higher-level buckets down as
+    their span begins. Deadlines beyond the top level go to an overflow bucket
+    that is re-examined once per full revolution.
+
+    schedule / cancel are O(1); advance is O(ticks elapsed + keys moved).
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 64, levels: int = 4,
+                 now: float = None):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[set]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._overflow: set = set()
+        self._due: set = set()
+        self._deadline: Dict[Hashable, int] = {}
+        self._bucket: Dict[Hashable, set] = {}
+        self._tick = self._to_tick(time.time() if now is None else now) - 1
+
+    def __len__(self) -> int:
+        return len(self._deadline)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadline
+
+    def _to_tick(self, timestamp: float) -> int:
+        return int(-(-timestamp // self.tick_seconds))
+
+    def _place(self, key: Hashable, deadline: int) -> None:
+        delta = deadline - self._tick
+        if delta <= 0:
+            bucket = self._due
+        else:
+            bucket = self._overflow
+            for level in range(self.levels):
+                if delta < self._spans[level + 1]:
+                    bucket = self._wheels[level][(deadline // self._spans[level]) % self.slots]
+                    break
+        bucket.add(key)
+        self._bucket[key] = bucket
+
+    def schedule(self, key: Hashable, expires_at: float) -> None:
+        """(Re)schedule key to fire once the wheel reaches expires_at."""
+        self.cancel(key)
+        deadline = self._to_tick(expires_at)
+        self._deadline[key] = deadline
+        self._place(key, deadline)
+
+    def cancel(self, key: Hashable) -> None:
+        bucket = self._bucket.pop(key, None)
+        if bucket is not None:
+            bucket.discard(key)
+            del self._deadline[key]
+
+    def _cascade(self, bucket: set) -> None:
+        keys = list(bucket)
+        bucket.clear()
+        for key in keys:
+            self._place(key, self._deadline[key])
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel up to now; return keys whose deadline has passed."""
+        target = int(now // self.tick_seconds)
+        if not self._deadline:
+            self._tick = max(self._tick, target)
+            return []
+
+        while self._tick < target:
+            self._tick += 1
+            tick = self._tick
+
+            if tick % self._spans[self.levels] == 0 and self._overflow:
+                self._cascade(self._overflow)
+            for level in range(self.levels - 1, 0, -1):
+                if tick % self._spans[level] == 0:
+                    self._cascade(self._wheels[level][(tick // self._spans[level]) % self.slots])
+
+            bucket = self._wheels[0][tick % self.slots]
+            if bucket:
+                self._due.update(bucket)
+                for key in bucket:
+                    self._bucket[key] = self._due
+                bucket.clear()
+
+            if not self._deadline or len(self._due) == len(self._deadline):
+                # Nothing left on the wheel, skip the idle ticks
+                self._tick = target
+
+        if not self._due:
+            return []
+        fired = list(self._due)
+        self._due.clear()
+        for key in fired:
+            del self._bucket[key]
+            del self._deadline[key]
+        return fired
+
+
+@dataclass(slots=True)
+class CooldownEntry:
+    """One active key. expires_at=None means it never expires."""
+    expires_at: Optional[float]
+    payload: Dict = field(default_factory=dict)
+
+
+class CooldownTable:
+    """
+    One namespace inside the CooldownService.
+
+    Entries are active while now < expires_at. Optional JSON persistence keeps
+    the {'version', 'last_updated', 'total_count', 'tokens': {key: payload}}
+    layout the sniper / running cooldown files already use.
+    """
+
+    def __init__(self, service: 'CooldownService', namespace: str,
+                 cooldown_seconds: Optional[float] = None,
+                 persist_path: Optional[Path] = None, persist_meta: Dict = None):
+        self.service = service
+        self.namespace = namespace
+        self.cooldown_seconds = cooldown_seconds
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.persist_meta = persist_meta or {}
+        self._entries: Dict[str, CooldownEntry] = {}
+        self._expired_pending = 0
+
+        self.stats = {
+            'checks': 0,
+            'duplicates': 0,
+            'bypasses': 0,
+            'marks': 0,
+            'expired': 0
+        }
+
+    def __len__(self) -> int:
+        with self.service._lock:
+            self.service._advance()
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def _active(self, key: str, now: float) -> Optional[CooldownEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and now >= entry.expires_at:
+            # Past deadline but its wheel tick has not fired yet
+            self._drop(key)
+            return None
+        return entry
+
+    def _drop(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.service._wheel.cancel((self.namespace, key))
+            self.stats['expired'] += 1
+            self._expired_pending += 1
+
+    def _set(self, key: str, payload: Dict, cooldown_seconds: Optional[float], now: float) -> Dict:
+        if cooldown_seconds is None:
+            cooldown_seconds = self.cooldown_seconds
+        expires_at = None if cooldown_seconds is None else now + cooldown_seconds
+
+        payload = dict(payload or {})
+        payload.setdefault('timestamp', now)
+        self._entries[key] = CooldownEntry(expires_at, payload)
+
+        wheel_key = (self.namespace, key)
+        if expires_at is None:
+            self.service._wheel.cancel(wheel_key)
+        else:
+            self.service._wheel.schedule(wheel_key, expires_at)
+        self.stats['marks'] += 1
+        return payload
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Copy of an active entry's payload, or None (change it with update())."""
+        with self.service._lock:
+            now = self.service._advance()
+            entry = self._active(key, now)
+            return dict(entry.payload) if entry else None
+
+    def update(self, key: str, changes: Dict) -> Optional[Dict]:
+        """
+        Merge changes into an active entry's payload, keeping its cooldown.
+
+        Returns:
+            The updated payload, or None if key is not active
+        """
+        with self.service._lock:
+            now = self.service._advance()
+            entry = self._active(key, now)
+            if entry is None:
+                return None
+            entry.payload.update(changes)
+            updated = dict(entry.payload)
+        self._save()
+        return updated
+
+    def remaining(self, key: str) -> float:
+        """Seconds left on the cooldown (inf for non-expiring entries, 0 if none)."""
+        with self.service._lock:
+            now = self.service._advance()
+            entry = self._active(key, now)
+            if entry is None:
+                return 0.0
+            if entry.expires_at is None:
+                return float('inf')
+            return entry.expires_at - now
+
+    def mark(self, key: str, payload: Dict = None, cooldown_seconds: float = None) -> Dict:
+        """Start (or restart) the cooldown for key. Returns the stored payload."""
+        with self.service._lock:
+            now = self.service._advance()
+            stored = self._set(key, payload, cooldown_seconds, now)
+        self._save()
+        return stored
+
+    def check_and_mark(self, key: str, payload: Dict = None, cooldown_seconds: float = None,
+                       bypass: Callable[[Dict, Dict], bool] = None) -> bool:
+        """
+        Atomic dedup check.
+
+        Args:
+            key: Key inside this namespace
+            payload: Data stored with the entry (handed to bypass on later checks)
+            cooldown_seconds: Cooldown for a new entry (defaults to the table's)
+            bypass: bypass(previous_payload, payload) -> True lets an active
+                    key through and restarts its cooldown
+
+        Returns:
+            True if duplicate (should skip), False if recorded as new
+        """
+        with self.service._lock:
+            now = self.service._advance()
+            self.stats['checks'] += 1
+            entry = self._active(key, now)
+
+            if entry is not None:
+                if bypass is None or not bypass(entry.payload, payload or {}):
+                    self.stats['duplicates'] += 1
+                    return True
+                self.stats['bypasses'] += 1
+
+            self._set(key, payload, cooldown_seconds, now)
+        self._save()
+        return False
+
+    def discard(self, key: str) -> None:
+        with self.service._lock:
+            if self._entries.pop(key, None) is not None:
+                self.service._wheel.cancel((self.namespace, key))
+        self._save()
+
+    def clear(self) -> None:
+        with self.service._lock:
+            for key in self._entries:
+                self.service._wheel.cancel((self.namespace, key))
+            self._entries.clear()
+        self._save()
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        """Snapshot of (key, payload) for active entries."""
+        with self.service._lock:
+            now = self.service._advance()
+            return iter([
+                (key, entry.payload) for key, entry in self._entries.items()
+                if entry.expires_at is None or now < entry.expires_at
+            ])
+
+    def drain_expired(self) -> int:
+        """Advance the wheel; return how many entries of this table expired since the last call."""
+        with self.service._lock:
+            self.service._advance()
+            expired, self._expired_pending = self._expired_pending, 0
+            return expired
+
+    def load(self) -> int:
+        """Load persisted entries (drops ones already past their cooldown)."""
+        if not self.persist_path or not self.persist_path.exists():
+            return 0
+
+        with open(self.persist_path, 'r') as f:
+            data = json.load(f)
+
+        with self.service._lock:
+            now = self.service._advance()
+            for key, payload in data.get('tokens', {}).items():
+                expires_at = payload.pop('expires_at', None)
+                if expires_at is None and self.cooldown_seconds is not None:
+                    expires_at = payload.get('timestamp', 0) + self.cooldown_seconds
+                if expires_at is not None and now >= expires_at:
+                    continue
+                self._entries[key] = CooldownEntry(expires_at, payload)
+                if expires_at is not None:
+                    self.service._wheel.schedule((self.namespace, key), expires_at)
+            return len(self._entries)
+
+    def _save(self) -> None:
+        if not self.persist_path:
+            return
+
+        with self.service._lock:
+            tokens = {}
+            for key, entry in self._entries.items():
+                tokens[key] = dict(entry.payload)
+                if entry.expires_at is not None:
+                    tokens[key]['expires_at'] = entry.expires_at
+
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'version': 1,
+                **self.persist_meta,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'total_count': len(tokens),
+                'tokens': tokens
+            }
+            with open(self.persist_path, 'w') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"[COOLDOWN] {self.namespace}: Error saving to {self.persist_path}: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'active': len(self),
+            'persist_path': str(self.persist_path) if self.persist_path else None
+        }
+
+
+class CooldownService:
+    """
+    Process-wide cooldown store: named CooldownTables sharing one timing wheel
+    and one lock.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, wheel_slots: int = 64, wheel_levels: int = 4,
+                 clock: Callable[[], float] = time.time):
+        # Wall clock by default: persisted timestamps must survive restarts
+        self.clock = clock
+        self._wheel = TimingWheel(tick_seconds, wheel_slots, wheel_levels, now=clock())
+        self._tables: Dict[str, CooldownTable] = {}
+        self._lock = threading.RLock()
+
+    def _advance(self) -> float:
+        """Expire everything due. Caller holds the lock."""
+        now = self.clock()
+        for namespace, key in self._wheel.advance(now):
+            table = self._tables.get(namespace)
+            if table is not None:
+                entry = table._entries.get(key)
+                if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+                    table._drop(key)
+        return now
+
+    def table(self, namespace: str, cooldown_seconds: Optional[float] = None,
+              persist_path: Optional[str] = None, persist_meta: Dict = None) -> CooldownTable:
+        """
+        Get or create the table for a namespace.
+
+        Args:
+            namespace: Unique name (e.g. 'offchain.pairs')
+            cooldown_seconds: Default cooldown for mark(); None = never expires
+            persist_path: Optional JSON file, loaded on creation and rewritten on change
+            persist_meta: Extra top-level fields written to the JSON file
+
+        Raises:
+            ValueError: namespace already exists with a different persist_path
+        """
+        with self._lock:
+            table = self._tables.get(namespace)
+            if table is not None and persist_path and Path(persist_path) != table.persist_path:
+                raise ValueError(
+                    f"Cooldown table {namespace!r} already persists to {table.persist_path}, not {persist_path}"
+                )
+            if table is None:
+                table = CooldownTable(self, namespace, cooldown_seconds, persist_path, persist_meta)
+                self._tables[namespace] = table
+                if table.persist_path:
+                    try:
+                        table.load()
+                    except Exception as e:
+                        print(f"[COOLDOWN] {namespace}: Error loading {table.persist_path}: {e}")
+            elif cooldown_seconds is not None:
+                table.cooldown_seconds = cooldown_seconds
+            return table
+
+    def expire(self) -> int:
+        """Advance the wheel now; returns total entries still tracked."""
+        with self._lock:
+            self._advance()
+            return sum(len(t._entries) for t in self._tables.values())
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._advance()
+            return {
+                'scheduled': len(self._wheel),
+                'tables': {name: {**t.stats, 'active': len(t._entries)} for name, t in self._tables.items()}
+            }
+
+
+# Singleton instance
+_service: Optional[CooldownService] = None
+
+
+def get_cooldown_service() -> CooldownService:
+    """Get or create the shared CooldownService."""
+    global _service
+    if _service is None:
+        _service = CooldownService()
+    return _service
@@ -19,6 +19,28 @@ This implementation follows the exact specifications:
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
 
+from cooldown_service import get_cooldown_service
+from pair_columns import NUMPY_AVAILABLE, PairColumns
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Batch stage codes (first failing stage wins, same order as apply_filters)
+STAGE_OK = 0
+STAGE_LOW_LIQUIDITY = 1
+STAGE_ZERO_VOLUME = 2
+STAGE_TOO_OLD = 3
+STAGE_MISSING_FIELDS = 4
+STAGE_NO_VIABILITY = 5
+STAGE_LOW_SCORE = 6
+
+GUARDRAIL_STAGES = (STAGE_LOW_LIQUIDITY, STAGE_ZERO_VOLUME, STAGE_TOO_OLD, STAGE_MISSING_FIELDS)
+
+# Flag names per batch mask, in the order the scalar checks append them
+LEVEL_1_FLAGS = ('EARLY_TX', 'EARLY_VOL', 'PRICE_MOVE')
+LEVEL_2_FLAGS = ('GOOD_LIQ', 'GOOD_VOL', 'GOOD_TXN', 'VOLATILE')
+BONUS_FLAGS = ('FRESH_LP', 'WARMUP', 'SOL_ACTIVE')
+
 
 class DegenSniperFilter:
     """
@@ -47,8 +69,8 @@ class DegenSniperFilter:
         self.dedup_config = self.config.get('deduplication', {})
         self.rate_limit = self.config.get('rate_limiting', {})
         
-        # Track seen pairs for deduplication
-        self.seen_pairs = {}  # pair_address -> last_seen_data
+        # Track seen pairs for deduplication (shared cooldown store, timing-wheel expiry)
+        self.seen_pairs = get_cooldown_service().table('degen.seen_pairs')  # pair_address -> last_seen_data
         
         # Track alerts for rate limiting
         self.alert_history = {}  # pair_address -> list of alert timestamps
@@ -188,6 +210,212 @@ class DegenSniperFilter:
         
         return True, None, metadata
     
+    def apply_filters_batch(self, pairs: List[Dict], log_evaluations: bool = True) -> List[Tuple[bool, Optional[str], Optional[Dict]]]:
+        """
+        Apply all DEGEN SNIPER filters to a whole poll of pairs.
+        
+        Guardrails, level-0/1/2, bonus signals and scoring are evaluated
+        column-wise (see evaluate_batch). Deduplication and rate limiting
+        are stateful, so pairs that clear the score gate go through them
+        one at a time in input order. Results and stats match calling
+        apply_filters on each pair in order. Falls back to the scalar path
+        when numpy is unavailable.
+        
+        Args:
+            pairs: Normalized pair data from DexScreener
+            log_evaluations: Print the per-pair evaluation lines
+        
+        Returns:
+            [(passed, reason, metadata), ...] aligned with pairs
+        """
+        if not NUMPY_AVAILABLE or not pairs:
+            return [self.apply_filters(pair) for pair in pairs]
+        
+        batch = self.evaluate_batch(PairColumns(pairs))
+        stages = batch['stages'].tolist()
+        scores = batch['score'].tolist()
+        level_1 = batch['level_1'].tolist()
+        level_2 = batch['level_2'].tolist()
+        bonus = batch['bonus'].tolist()
+        level_2_passed = batch['level_2_passed'].tolist()
+        level_2_count = batch['level_2_count'].tolist()
+        bonus_score = batch['bonus_score'].tolist()
+        
+        self.stats['total_evaluated'] += len(pairs)
+        results = []
+        for i, pair in enumerate(pairs):
+            stage = stages[i]
+        
+            if stage in GUARDRAIL_STAGES:
+                self.stats['guardrail_rejected'] += 1
+                reason = self._batch_reason(stage, pair)
+                if log_evaluations:
+                    self._log_evaluation(pair, 'GUARDRAIL_REJECT', reason, 0, [])
+                results.append((False, f"GUARDRAIL: {reason}", None))
+                continue
+        
+            if stage == STAGE_NO_VIABILITY:
+                self.stats['level_0_rejected'] += 1
+                reason = self._batch_reason(stage, pair)
+                if log_evaluations:
+                    self._log_evaluation(pair, 'LEVEL_0_FAIL', reason, 0, [])
+                results.append((False, f"LEVEL-0: {reason}", None))
+                continue
+        
+            # Reached scoring
+            if not level_2_passed[i]:
+                self.stats['level_2_failed'] += 1
+        
+            score = scores[i]
+            reason_flags = [flag for flag, hit in zip(LEVEL_1_FLAGS, level_1[i]) if hit]
+            if level_2_passed[i]:
+                reason_flags.extend(flag for flag, hit in zip(LEVEL_2_FLAGS, level_2[i]) if hit)
+            reason_flags.extend(flag for flag, hit in zip(BONUS_FLAGS, bonus[i]) if hit)
+        
+            if stage == STAGE_LOW_SCORE:
+                self.stats['score_failed'] += 1
+                reason = f"Score too low ({score} < {self.scoring.get('min_score_to_pass', 3)})"
+                if log_evaluations:
+                    self._log_evaluation(pair, 'SCORE_FAIL', reason, score, reason_flags)
+                results.append((False, f"SCORE: {reason}", None))
+                continue
+        
+            if self._check_deduplication(pair):
+                reason = "Duplicate within cooldown"
+                if log_evaluations:
+                    self._log_evaluation(pair, 'DUPLICATE', reason, score, reason_flags)
+                results.append((False, f"DEDUP: {reason}", None))
+                continue
+        
+            rate_limited, limit_reason = self._check_rate_limit(pair)
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+                if log_evaluations:
+                    self._log_evaluation(pair, 'RATE_LIMITED', limit_reason, score, reason_flags)
+                results.append((False, f"RATE_LIMIT: {limit_reason}", None))
+                continue
+        
+            self.stats['passed'] += 1
+            self._record_alert(pair)
+            if log_evaluations:
+                self._log_evaluation(pair, 'PASS', 'All filters passed', score, reason_flags)
+            results.append((True, None, {
+                'score': score,
+                'reason_flags': reason_flags,
+                'level_1_triggered': any(level_1[i]),
+                'level_2_passed': level_2_passed[i],
+                'level_2_count': level_2_count[i],
+                'bonus_score': bonus_score[i],
+            }))
+        
+        return results
+    
+    def evaluate_batch(self, cols: PairColumns) -> Dict[str, 'np.ndarray']:
+        """
+        Vectorized guardrails, level-0/1/2, bonus signals and score.
+        
+        Returns:
+            Dict of per-pair arrays:
+            - stages: first failing stage code (STAGE_OK if the pair clears
+              the score gate)
+            - score, level_2_count, level_2_passed, bonus_score (capped)
+            - level_1 / level_2 / bonus: boolean flag matrices, one column
+              per name in LEVEL_1_FLAGS / LEVEL_2_FLAGS / BONUS_FLAGS
+        """
+        never = np.zeros(cols.size, dtype=bool)
+        liquidity, volume_h24 = cols.liquidity, cols.volume_24h
+        txns_h1, txns_h24 = cols.tx_1h, cols.tx_24h
+        
+        # Global guardrails (_check_global_guardrails)
+        guard = self.global_guardrails
+        low_liquidity = liquidity < guard.get('min_liquidity_usd', 3000)
+        zero_volume = (volume_h24 == 0) if guard.get('require_h24_volume', True) else never
+        too_old = (cols.pair_age_hours > guard.get('max_age_hours_if_not_trending', 24)) & ~cols.is_trending
+        if guard.get('require_core_fields', True):
+            missing_fields = ~(cols.has_pair_address & cols.has_chain & cols.has_liquidity)
+        else:
+            missing_fields = never
+        
+        # Level-0 (_check_level_0)
+        no_viability = ~(
+            (liquidity >= self.level_0.get('min_liquidity_usd', 5000))
+            | (volume_h24 >= self.level_0.get('min_volume_h24', 2000))
+        )
+        
+        # Level-1 (_check_level_1)
+        level_1 = np.column_stack([
+            txns_h1 >= self.level_1.get('min_txns_h1', 1),
+            cols.volume_1h >= self.level_1.get('min_volume_h1', 10),
+            (cols.price_change_1h != 0) if self.level_1.get('detect_any_price_change_h1', True) else never,
+        ])
+        
+        # Level-2 (_check_level_2)
+        conditions = self.level_2.get('conditions', {})
+        level_2 = np.column_stack([
+            liquidity >= conditions.get('liquidity_usd', 10000),
+            volume_h24 >= conditions.get('volume_h24', 10000),
+            txns_h24 >= conditions.get('txns_h24', 20),
+            np.abs(cols.price_change_24h) >= conditions.get('abs_price_change_h24', 5),
+        ])
+        level_2_count = level_2.sum(axis=1)
+        level_2_passed = level_2_count >= self.level_2.get('require_count', 2)
+        
+        # Bonus signals (_check_bonus_signals)
+        ratio_config = self.bonus.get('h1_h24_txn_ratio', {})
+        solana_config = self.bonus.get('solana_active', {})
+        bonus = np.column_stack([
+            (liquidity > volume_h24) if self.bonus.get('fresh_lp', {}).get('enabled', True) else never,
+            (txns_h1 / np.maximum(txns_h24, 1) >= ratio_config.get('min_ratio', 0.2))
+            if ratio_config.get('enabled', True) else never,
+            (cols.is_solana & (txns_h24 >= solana_config.get('min_txns_h24', 10)))
+            if solana_config.get('enabled', True) else never,
+        ])
+        bonus_score = np.minimum(bonus.sum(axis=1), self.scoring.get('max_bonus_points', 2))
+        
+        # Scoring
+        score = (
+            np.where(level_1.any(axis=1), self.scoring.get('level_1_trigger_points', 1), 0)
+            + np.where(level_2_passed, self.scoring.get('level_2_pass_points', 2), 0)
+            + bonus_score
+        )
+        low_score = score < self.scoring.get('min_score_to_pass', 3)
+        
+        stages = np.select(
+            [low_liquidity, zero_volume, too_old, missing_fields, no_viability, low_score],
+            [STAGE_LOW_LIQUIDITY, STAGE_ZERO_VOLUME, STAGE_TOO_OLD, STAGE_MISSING_FIELDS,
+             STAGE_NO_VIABILITY, STAGE_LOW_SCORE],
+            default=STAGE_OK,
+        ).astype(np.int8)
+        
+        return {
+            'stages': stages,
+            'score': score,
+            'level_1': level_1,
+            'level_2': level_2,
+            'level_2_count': level_2_count,
+            'level_2_passed': level_2_passed,
+            'bonus': bonus,
+            'bonus_score': bonus_score,
+        }
+    
+    def _batch_reason(self, stage: int, pair: Dict) -> str:
+        """Reason text for a guardrail / level-0 batch stage, worded as in the scalar checks."""
+        liquidity = pair.get('liquidity', 0) or 0
+        volume_h24 = pair.get('volume_24h', 0) or 0
+        
+        if stage == STAGE_LOW_LIQUIDITY:
+            min_liq = self.global_guardrails.get('min_liquidity_usd', 3000)
+            return f"Liquidity too low (${liquidity:.0f} < ${min_liq})"
+        if stage == STAGE_ZERO_VOLUME:
+            return "Zero h24 volume"
+        if stage == STAGE_TOO_OLD:
+            max_age = self.global_guardrails.get('max_age_hours_if_not_trending', 24)
+            return f"Too old without trending ({pair.get('pair_age_hours', 0):.0f}h > {max_age}h)"
+        if stage == STAGE_MISSING_FIELDS:
+            missing = [f for f in ['pair_address', 'chain', 'liquidity'] if not pair.get(f)]
+            return f"Missing core fields: {missing}"
+        return f"No viability signal (Liq:${liquidity:.0f}, Vol24h:${volume_h24:.0f})"
+    
     def _check_global_guardrails(self, pair: Dict) -> Tuple[bool, Optional[str]]:
         """
         Check mandatory global guardrails.
@@ -382,82 +610,35 @@ class DegenSniperFilter:
         if not pair_address:
             return False
         
-        # Check if we've seen this pair before
-        if pair_address not in self.seen_pairs:
-            # First time seeing this pair
-            self.seen_pairs[pair_address] = {
-                'timestamp': datetime.now(),
-                'txns_h1': pair.get('tx_1h', 0) or 0,
-                'volume_h1': pair.get('volume_1h', 0) or 0,
-                'price_change_h1': pair.get('price_change_1h', 0) or 0,
-            }
-            return False
-        
-        last_seen = self.seen_pairs[pair_address]
-        now = datetime.now()
-        cooldown_seconds = self.dedup_config.get('base_cooldown_seconds', 120)
-        
-        # Check if still in cooldown
-        time_since_last = (now - last_seen['timestamp']).total_seconds()
-        if time_since_last < cooldown_seconds:
-            # Check bypass conditions
-            bypass = self.dedup_config.get('bypass_conditions', {})
-            
-            current_txns_h1 = pair.get('tx_1h', 0) or 0
-            current_volume_h1 = pair.get('volume_1h', 0) or 0
-            current_price_h1 = pair.get('price_change_1h', 0) or 0
-            
-            last_txns_h1 = last_seen['txns_h1']
-            last_volume_h1 = last_seen['volume_h1']
-            last_price_h1 = last_seen['price_change_h1']
-            
-            # Check txns.h1 increased
-            if bypass.get('txns_h1_increased', True) and current_txns_h1 > last_txns_h1:
-                # Bypass cooldown
-                self.seen_pairs[pair_address] = {
-                    'timestamp': now,
-                    'txns_h1': current_txns_h1,
-                    'volume_h1': current_volume_h1,
-                    'price_change_h1': current_price_h1,
-                }
-                return False
-            
-            # Check volume.h1 increased >= threshold
-            vol_threshold = bypass.get('volume_h1_increased', 5)
-            if current_volume_h1 >= last_volume_h1 + vol_threshold:
-                # Bypass cooldown
-                self.seen_pairs[pair_address] = {
-                    'timestamp': now,
-                    'txns_h1': current_txns_h1,
-                    'volume_h1': current_volume_h1,
-                    'price_change_h1': current_price_h1,
-                }
-                return False
-            
-            # Check abs price change delta
-            price_delta_threshold = bypass.get('abs_price_change_h1_delta', 0.1)
-            price_delta = abs(current_price_h1 - last_price_h1)
-            if price_delta >= price_delta_threshold:
-                # Bypass cooldown
-                self.seen_pairs[pair_address] = {
-                    'timestamp': now,
-                    'txns_h1': current_txns_h1,
-                    'volume_h1': current_volume_h1,
-                    'price_change_h1': current_price_h1,
-                }
-                return False
-            
-            # Still in cooldown, no bypass
-            return True
-        
-        # Cooldown expired, update last seen
-        self.seen_pairs[pair_address] = {
-            'timestamp': now,
+        current = {
             'txns_h1': pair.get('tx_1h', 0) or 0,
             'volume_h1': pair.get('volume_1h', 0) or 0,
             'price_change_h1': pair.get('price_change_1h', 0) or 0,
         }
-        return False
+        return self.seen_pairs.check_and_mark(
+            pair_address,
+            current,
+            cooldown_seconds=self.dedup_config.get('base_cooldown_seconds', 120),
+            bypass=self._dedup_bypass
+        )
+    
+    def _dedup_bypass(self, last_seen: Dict, current: Dict) -> bool:
+        """True if the pair moved enough since last scan to skip its cooldown."""
+        bypass = self.dedup_config.get('bypass_conditions', {})
+        
+        # Check txns.h1 increased
+        if bypass.get('txns_h1_increased', True) and current['txns_h1'] > last_seen['txns_h1']:
+            return True
+        
+        # Check volume.h1 increased >= threshold
+        vol_threshold = bypass.get('volume_h1_increased', 5)
+        if current['volume_h1'] >= last_seen['volume_h1'] + vol_threshold:
+            return True
+        
+        # Check abs price change delta
+        price_delta_threshold = bypass.get('abs_price_change_h1_delta', 0.1)
+        price_delta = abs(current['price_change_h1'] - last_seen['price_change_h1'])
+        return price_delta >= price_delta_threshold
     
     def _check_rate_limit(self, pair: Dict) -> Tuple[bool, Optional[str]]:
         """
@@ -0,0 +1,171 @@
+"""
+GoPlus Batcher - Micro-batched token_security lookups
+
+GoPlus accepts a comma-separated `contract_addresses` list. Lookups for the
+same endpoint (chain) are collected for a short window (default 50 ms) or
+until a batch is full (default 20 addresses), sent as one request through the
+shared HTTP client ('goplus' bucket / breaker), and the response is fanned
+back to every waiting caller. Duplicate addresses (pending in the window or
+already in flight) share one slot.
+
+Blocking callers (lookup_sync) do not wait out the window when nothing else
+is pending or in flight for the endpoint: a lone lookup is sent at once,
+and lookups arriving meanwhile batch as usual.
+
+Each caller gets a single-address response of the usual shape, so existing
+parsing keeps working:
+    {'code': 1, 'message': 'OK', 'result': {address_lower: token_data}}
+
+None is returned for a non-200 response; transport errors and
+CircuitOpenError are raised to every caller in the batch.
+
+Usage:
+    batcher = get_goplus_batcher()
+    data = await batcher.lookup(token_security_url('8453'), token_address)
+    data = batcher.lookup_sync(token_security_url('8453'), token_address)
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from http_client import HttpClient, get_http_client
+
+GOPLUS_TOKEN_SECURITY_URL = "https://api.gopluslabs.io/api/v1/token_security"
+
+
+def token_security_url(chain_id: str) -> str:
+    """GoPlus token_security endpoint for a chain id (e.g. '8453' for Base)."""
+    return f"{GOPLUS_TOKEN_SECURITY_URL}/{chain_id}"
+
+
+class GoPlusBatcher:
+    """
+    Collects token_security lookups per endpoint and sends them in batches.
+
+    Args:
+        window: Seconds to wait for more addresses after the first one
+        max_batch: Addresses per request (a full batch is sent immediately)
+        http: HttpClient (default: the shared client); batching runs on its loop
+    """
+
+    def __init__(self, window: float = 0.05, max_batch: int = 20, http: HttpClient = None):
+        self.window = window
+        self.max_batch = max_batch
+        self.http = http or get_http_client()
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}   # endpoint -> address -> future
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}  # (endpoint, address) -> future
+        self._inflight_batches: Dict[str, int] = {}  # endpoint -> batches being sent
+        self._tasks: set = set()
+        self.stats = {
+            'lookups': 0,
+            'coalesced': 0,     # duplicate of a pending or in-flight address
+            'batches': 0,
+            'addresses_sent': 0,
+            'failed_batches': 0,
+            'eager_flushes': 0,  # lone blocking lookups sent without the window
+        }
+
+    async def lookup(self, endpoint: str, address: str) -> Optional[Dict]:
+        """Single-address token_security response for `address` (see module docstring)."""
+        return await self.http.run(self._lookup(endpoint, address))
+
+    def lookup_sync(self, endpoint: str, address: str) -> Optional[Dict]:
+        """Blocking lookup() for synchronous callers (a lone lookup skips the window)."""
+        return self.http.run_sync(self._lookup(endpoint, address, eager=True))
+
+    # ------------------------------------------------------------------
+    # Batching (runs on the HTTP client's loop)
+    # ------------------------------------------------------------------
+
+    async def _lookup(self, endpoint: str, address: str, eager: bool = False) -> Optional[Dict]:
+        address = address.strip().lower()
+        self.stats['lookups'] += 1
+
+        pending = self._pending.setdefault(endpoint, {})
+        future = pending.get(address) or self._inflight.get((endpoint, address))
+        if future is None:
+            idle = eager and not pending and self._inflight_batches.get(endpoint, 0) == 0
+            future = pending[address] = asyncio.get_running_loop().create_future()
+            if idle or len(pending) >= self.max_batch:
+                if idle:
+                    self.stats['eager_flushes'] += 1
+                self._flush(endpoint)
+            elif endpoint not in self._timers:
+                self._timers[endpoint] = asyncio.get_running_loop().call_later(
+                    self.window, self._flush, endpoint
+                )
+        else:
+            self.stats['coalesced'] += 1
+
+        # shield: one caller giving up must not cancel the slot for the others
+        return await asyncio.shield(future)
+
+    def _flush(self, endpoint: str):
+        timer = self._timers.pop(endpoint, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(endpoint, None)
+        if not batch:
+            return
+        for address, future in batch.items():
+            self._inflight[(endpoint, address)] = future
+        self._inflight_batches[endpoint] = self._inflight_batches.get(endpoint, 0) + 1
+        task = asyncio.ensure_future(self._send(endpoint, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, endpoint: str, batch: Dict[str, asyncio.Future]):
+        self.stats['batches'] += 1
+        self.stats['addresses_sent'] += len(batch)
+        url = f"{endpoint}?contract_addresses={','.join(batch)}"
+
+        try:
+            await self._fetch(url, batch)
+        finally:
+            self._inflight_batches[endpoint] -= 1
+            for address in batch:
+                self._inflight.pop((endpoint, address), None)
+
+    async def _fetch(self, url: str, batch: Dict[str, asyncio.Future]):
+        try:
+            resp = await self.http.get('goplus', url)
+            data = resp.json() if resp.status == 200 else None
+        except Exception as e:
+            self.stats['failed_batches'] += 1
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # retrieved by waiters; don't warn if none are left
+            return
+
+        if data is None:
+            self.stats['failed_batches'] += 1
+        results = (data or {}).get('result') or {}
+        for address, future in batch.items():
+            if future.done():
+                continue
+            if data is None:
+                future.set_result(None)
+                continue
+            token_data = results.get(address)
+            future.set_result({
+                'code': data.get('code'),
+                'message': data.get('message'),
+                'result': {address: token_data} if token_data is not None else {},
+            })
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats['avg_batch_size'] = stats['addresses_sent'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+
+# Singleton
+_goplus_batcher = None
+
+def get_goplus_batcher() -> GoPlusBatcher:
+    """Get or create the process-wide GoPlusBatcher."""
+    global _goplus_batcher
+    if _goplus_batcher is None:
+        _goplus_batcher = GoPlusBatcher()
+    return _goplus_batcher
@@ -0,0 +1,570 @@
+"""
+Shared HTTP client for third-party APIs.
+
+One client per process (get_http_client()) owns, per API:
+- a connection pool per host (aiohttp session with a per-host connector)
+- a token bucket per API key
+- Retry-After-aware retries with exponential backoff
+- a CircuitBreaker
+- latency, status and error metrics (get_stats())
+
+Requests run on the client's own event loop thread, so async callers
+(`await client.get(...)`) on any loop and blocking callers
+(`client.get_sync(...)`) share the same pools, buckets and breakers.
+
+Non-2xx responses are returned (callers decide what a 404 means);
+transport errors are raised after retries, CircuitOpenError is raised
+while an API's circuit is open, and RateLimitedError when a token would
+take longer than the caller may wait (max_retry_after; blocking callers
+also no longer than their timeout).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker pattern for API resilience.
+    Tracks failure rate and disables failing APIs temporarily.
+    """
+    def __init__(self, name: str, failure_threshold: float = 0.5, timeout: int = 300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.timeout = timeout
+        self.results = []  # Last 10 results (True/False)
+        self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+        self.last_failure_time = 0
+        self.alert_sent = False
+
+    def record_success(self):
+        """Record successful API call."""
+        self.results.append(True)
+        if len(self.results) > 10:
+            self.results.pop(0)
+
+        # If we were open and got success, close circuit
+        if self.state == 'HALF_OPEN':
+            self.state = 'CLOSED'
+            self.alert_sent = False
+            print(f"[CIRCUIT] ✅ {self.name} recovered - Circuit CLOSED")
+
+    def record_failure(self):
+        """Record failed API call."""
+        self.results.append(False)
+        if len(self.results) > 10:
+            self.results.pop(0)
+
+        # Calculate failure rate
+        if len(self.results) >= 5:  # Need at least 5 samples
+            failure_rate = 1 - (sum(self.results) / len(self.results))
+
+            if failure_rate >= self.failure_threshold and self.state == 'CLOSED':
+                self.state = 'OPEN'
+                self.last_failure_time = time.time()
+                print(f"[CIRCUIT] 🔴 {self.name} failure rate {failure_rate:.0%} - Circuit OPEN")
+                return True  # Signal to send alert
+
+        return False
+
+    def can_attempt(self) -> bool:
+        """Check if API call is allowed."""
+        if self.state == 'CLOSED':
+            return True
+
+        if self.state == 'OPEN':
+            # Check if timeout elapsed
+            if time.time() - self.last_failure_time >= self.timeout:
+                self.state = 'HALF_OPEN'
+                print(f"[CIRCUIT] 🟡 {self.name} attempting recovery - Circuit HALF_OPEN")
+                return True
+            return False
+
+        # HALF_OPEN: Allow one test call
+        return True
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    - rate tokens per second, up to capacity (burst)
+    - acquire() waits for a token; waiters are served in order
+    - penalize() drains the bucket after a 429
+    - acquire(max_wait) gives up instead of waiting past max_wait
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, max_wait: float = None) -> bool:
+        """Take a token; False (no token taken) if it would take longer than max_wait."""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        if deadline is None:
+            await self._lock.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self._lock.acquire(), max_wait)
+            except asyncio.TimeoutError:
+                return False
+        try:
+            self._refill()
+            while self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                self.waited += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            return True
+        finally:
+            self._lock.release()
+
+    def penalize(self, seconds: float):
+        """No tokens for the next `seconds` (server asked us to back off)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the API's circuit is open."""
+
+    def __init__(self, api: str):
+        super().__init__(f"{api} circuit open")
+        self.api = api
+
+
+class RateLimitedError(Exception):
+    """Raised instead of sending a request when no token is available in time."""
+
+    def __init__(self, api: str, max_wait: float):
+        super().__init__(f"{api} rate limited (no token within {max_wait:.1f}s)")
+        self.api = api
+        self.max_wait = max_wait
+
+
+@dataclass
+class ApiConfig:
+    """Per-API limits and retry policy."""
+    name: str                           # display name (breaker / log messages)
+    rate: float = 5.0                   # requests per second, per API key
+    burst: float = 5.0
+    timeout: float = 10.0
+    max_retries: int = 2                # retries for idempotent requests
+    backoff: float = 1.0                # 1s, 2s, 4s ... when no Retry-After
+    max_retry_after: float = 30.0       # longer Retry-After / bucket wait: give up, bucket stays drained
+    default_retry_after: Optional[float] = None  # 429 without Retry-After (None: backoff)
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    failure_threshold: float = 0.5
+    breaker_timeout: int = 300
+    connections_per_host: int = 10
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+# Limits carried over from the per-module rate limiters they replace
+DEFAULT_APIS = {
+    'geckoterminal': ApiConfig('GeckoTerminal', rate=0.5, burst=4, max_retries=1, default_retry_after=60),
+    'dexscreener': ApiConfig('DexScreener', rate=5.0, burst=5, max_retries=1, default_retry_after=5),
+    'dextools': ApiConfig('DEXTools', rate=0.5, burst=1, max_retries=1, default_retry_after=10),
+    'rugcheck': ApiConfig('RugCheck', rate=5.0, burst=1, failure_threshold=0.6),
+    'goplus': ApiConfig('GoPlus', rate=5.0, burst=1, failure_threshold=0.6, timeout=12),
+    'tokensniffer': ApiConfig('TokenSniffer', rate=1.0, burst=1, timeout=8, max_retries=1),
+    'birdeye': ApiConfig('Birdeye', rate=2.0, burst=1, timeout=15),
+    'moralis': ApiConfig('Moralis', rate=10.0, burst=10, timeout=5, max_retries=1),
+    'okx': ApiConfig('OKX', rate=0.5, burst=1, max_retries=1),
+    'jupiter': ApiConfig('Jupiter', rate=2.0, burst=2, timeout=5, max_retries=1),
+    'solana_rpc': ApiConfig('Solana RPC', rate=10.0, burst=10),
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) as seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class HttpResponse:
+    """Fully read response (status, headers, body) with elapsed seconds."""
+
+    __slots__ = ('status', 'headers', 'body', 'elapsed')
+
+    def __init__(self, status: int, headers, body: bytes, elapsed: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self, decoder: Callable[[bytes], Any] = None) -> Any:
+        return (decoder or _loads)(self.body)
+
+
+class ApiMetrics:
+    """Request, retry, status and latency counters for one API."""
+
+    def __init__(self, window: int = 512):
+        self.requests = 0           # logical requests (retries not included)
+        self.attempts = 0
+        self.retries = 0
+        self.errors = 0             # transport errors
+        self.rate_limited = 0
+        self.circuit_rejected = 0
+        self.bucket_rejected = 0    # no token within the caller's max wait
+        self.status_counts: Dict[int, int] = {}
+        self.latencies = deque(maxlen=window)  # seconds, last `window` attempts
+        self.last_error: Optional[str] = None
+
+    def record(self, status: int, elapsed: float):
+        self.attempts += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.latencies.append(elapsed)
+
+    def record_error(self, error: BaseException, elapsed: float):
+        self.attempts += 1
+        self.errors += 1
+        self.last_error = repr(error)
+        self.latencies.append(elapsed)
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+        return {
+            'requests': self.requests,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'errors': self.errors,
+            'rate_limited': self.rate_limited,
+            'circuit_rejected': self.circuit_rejected,
+            'bucket_rejected': self.bucket_rejected,
+            'status_counts': dict(self.status_counts),
+            'latency_avg_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'latency_p50_ms': pct(0.5),
+            'latency_p95_ms': pct(0.95),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'last_error': self.last_error,
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client (see module docstring).
+
+    Args:
+        apis: ApiConfig overrides by API name (merged over DEFAULT_APIS)
+        session_factory: callable(ApiConfig) -> session with an aiohttp-style
+            request() context manager; defaults to one aiohttp session per host
+    """
+
+    def __init__(self, apis: Dict[str, ApiConfig] = None, session_factory: Callable = None):
+        self.apis: Dict[str, ApiConfig] = {**DEFAULT_APIS, **(apis or {})}
+        self._session_factory = session_factory or self._new_session
+        self._sessions: Dict[str, Any] = {}                       # host -> session
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}    # (api, api key) -> bucket
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.metrics: Dict[str, ApiMetrics] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def api_config(self, api: str) -> ApiConfig:
+        config = self.apis.get(api)
+        if config is None:
+            config = self.apis[api] = ApiConfig(api)
+        return config
+
+    def configure(self, api: str, **overrides) -> ApiConfig:
+        """Override limits for an API (e.g. from a module's config dict)."""
+        config = self.apis[api] = replace(self.api_config(api), **overrides)
+        for (name, _), bucket in self._buckets.items():
+            if name == api:
+                bucket.rate, bucket.capacity = config.rate, config.burst
+        breaker = self._breakers.get(api)
+        if breaker is not None:
+            breaker.failure_threshold, breaker.timeout = config.failure_threshold, config.breaker_timeout
+        return config
+
+    def breaker(self, api: str) -> CircuitBreaker:
+        breaker = self._breakers.get(api)
+        if breaker is None:
+            config = self.api_config(api)
+            breaker = self._breakers[api] = CircuitBreaker(
+                config.name, failure_threshold=config.failure_threshold, timeout=config.breaker_timeout
+            )
+        return breaker
+
+    def _bucket(self, api: str, api_key: Optional[str]) -> TokenBucket:
+        key = (api, api_key or '')
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            config = self.api_config(api)
+            bucket = self._buckets[key] = TokenBucket(config.rate, config.burst)
+        return bucket
+
+    def _metrics(self, api: str) -> ApiMetrics:
+        metrics = self.metrics.get(api)
+        if metrics is None:
+            metrics = self.metrics[api] = ApiMetrics()
+        return metrics
+
+    # ------------------------------------------------------------------
+    # Event loop / sessions
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name='http-client', daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _new_session(config: ApiConfig):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for HttpClient")
+        connector = aiohttp.TCPConnector(limit_per_host=config.connections_per_host, ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector)
+
+    def _session(self, config: ApiConfig, url: str):
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None or session.closed:
+            session = self._sessions[host] = self._session_factory(config)
+        return session
+
+    async def _close_sessions(self):
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+    async def close(self):
+        """Close all pooled connections (new requests reopen them)."""
+        if self._loop is not None:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close_sessions(), self._loop))
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def request(self, api: str, method: str, url: str, **kwargs) -> HttpResponse:
+        """
+        Send a request through the API's bucket, retry policy and breaker.
+
+        Args:
+            api: API name (DEFAULT_APIS key or a configured name)
+            method: HTTP method
+            url: Full URL (pre-encoded if encoded=True, e.g. signed OKX paths)
+            params, headers, json, data: passed to the session
+            api_key: Credential the rate limit applies to (one bucket per key)
+            timeout: Seconds, defaults to the API's timeout
+            idempotent: Allow retries (default: GET/HEAD only)
+            encoded: Send the URL exactly as given
+
+        Returns:
+            HttpResponse (any status)
+
+        Raises:
+            CircuitOpenError, RateLimitedError, or the last transport error after retries
+        """
+        return await self.run(self._request(api, method.upper(), url, **kwargs))
+
+    def request_sync(self, api: str, method: str, url: str, **kwargs) -> HttpResponse:
+        """Blocking request() for synchronous callers (bucket wait bounded by the timeout)."""
+        config = self.api_config(api)
+        max_wait = min(kwargs.get('timeout') or config.timeout, config.max_retry_after)
+        return self.run_sync(self._request(api, method.upper(), url, max_wait=max_wait, **kwargs))
+
+    async def run(self, coro) -> Any:
+        """Await a coroutine on the client's loop (for request pipelines such as batchers)."""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def run_sync(self, coro) -> Any:
+        """Blocking run() for synchronous callers."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("blocking call from the HTTP client loop; use the async API")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def get(self, api: str, url: str, **kwargs) -> HttpResponse:
+        return await self.request(api, 'GET', url, **kwargs)
+
+    async def post(self, api: str, url: str, **kwargs) -> HttpResponse:
+        return await self.request(api, 'POST', url, **kwargs)
+
+    def get_sync(self, api: str, url: str, **kwargs) -> HttpResponse:
+        return self.request_sync(api, 'GET', url, **kwargs)
+
+    def post_sync(self, api: str, url: str, **kwargs) -> HttpResponse:
+        return self.request_sync(api, 'POST', url, **kwargs)
+
+    async def _request(self, api: str, method: str, url: str, params: Dict = None,
+                       headers: Dict = None, json: Any = None, data: Any = None,
+                       api_key: str = None, timeout: float = None,
+                       idempotent: bool = None, encoded: bool = False,
+                       max_wait: float = None) -> HttpResponse:
+        config = self.api_config(api)
+        metrics = self._metrics(api)
+        breaker = self.breaker(api)
+        metrics.requests += 1
+
+        if not breaker.can_attempt():
+            metrics.circuit_rejected += 1
+            raise CircuitOpenError(api)
+
+        if idempotent is None:
+            idempotent = method in ('GET', 'HEAD')
+        retries = config.max_retries if idempotent else 0
+        if config.headers:
+            headers = {**config.headers, **(headers or {})}
+        if encoded:
+            from yarl import URL
+            target = URL(url, encoded=True)
+        else:
+            target = url
+
+        timeout = timeout or config.timeout
+        if AIOHTTP_AVAILABLE:
+            timeout = aiohttp.ClientTimeout(total=timeout)
+
+        bucket = self._bucket(api, api_key)
+        if max_wait is None:
+            max_wait = config.max_retry_after
+        attempt = 0
+        response = None
+        while True:
+            if not await bucket.acquire(max_wait):
+                metrics.bucket_rejected += 1
+                if response is not None:
+                    # Retry would wait too long: return the last response as-is
+                    if response.status != 429:
+                        breaker.record_failure()
+                    return response
+                raise RateLimitedError(api, max_wait)
+            start = time.monotonic()
+            try:
+                session = self._session(config, url)
+                async with session.request(method, target, params=params, headers=headers, json=json,
+                                           data=data, timeout=timeout) as resp:
+                    body = await resp.read()
+                    response = HttpResponse(resp.status, resp.headers, body, time.monotonic() - start)
+            except Exception as e:
+                metrics.record_error(e, time.monotonic() - start)
+                if attempt < retries:
+                    attempt += 1
+                    metrics.retries += 1
+                    await asyncio.sleep(config.backoff * 2 ** (attempt - 1))
+                    continue
+                breaker.record_failure()
+                raise
+
+            metrics.record(response.status, response.elapsed)
+            if response.status not in config.retry_statuses:
+                breaker.record_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status == 429:
+                # Rate limits are not outages: drain the bucket, don't trip the breaker
+                metrics.rate_limited += 1
+                if retry_after is None:
+                    retry_after = config.default_retry_after
+                bucket.penalize(retry_after if retry_after is not None else config.backoff * 2 ** attempt)
+                if attempt < retries and (retry_after is None or retry_after <= config.max_retry_after):
+                    attempt += 1
+                    metrics.retries += 1
+                    continue  # bucket.acquire() waits out the penalty
+                return response
+
+            if attempt < retries and (retry_after is None or retry_after <= config.max_retry_after):
+                attempt += 1
+                metrics.retries += 1
+                await asyncio.sleep(retry_after if retry_after is not None else config.backoff * 2 ** (attempt - 1))
+                continue
+            breaker.record_failure()
+            return response
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        """Per-API metrics, circuit state and time spent waiting on buckets."""
+        stats = {}
+        for api, metrics in self.metrics.items():
+            stats[api] = {
+                **metrics.snapshot(),
+                'circuit': self.breaker(api).state,
+                'bucket_wait_s': sum(b.waited for (name, _), b in self._buckets.items() if name == api),
+            }
+        return stats
+
+
+# Singleton
+_http_client = None
+
+def get_http_client() -> HttpClient:
+    """Get or create the process-wide HttpClient."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
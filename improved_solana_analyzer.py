@@ -8,11 +8,13 @@ Uses multiple data sources to get comprehensive token information:
 4. RugCheck API - Security analysis (optional)
 """
 
-import requests
+import asyncio
 import time
 from typing import Dict, Optional
 from colorama import Fore
 
+from http_client import get_http_client
+
 
 class ImprovedSolanaAnalyzer:
     """Enhanced Solana token analyzer with multiple data sources."""
@@ -37,6 +39,26 @@ class ImprovedSolanaAnalyzer:
         """
         print(f"{Fore.CYAN}Analyzing Solana token: {token_address}")
         
+        # 1. Try DexScreener API (most reliable for market data)
+        print(f"{Fore.YELLOW}Fetching data from DexScreener...")
+        dex_data = self._get_dexscreener_data(token_address)
+        
+        # 2. Try Solana RPC for on-chain data
+        print(f"{Fore.YELLOW}Fetching on-chain data...")
+        rpc_data = self._get_rpc_data(token_address)
+        
+        return self._merge_results(token_address, dex_data, rpc_data)
+    
+    async def analyze_token_async(self, token_address: str) -> Dict:
+        """analyze_token() for callers on an event loop (both sources fetched concurrently)."""
+        print(f"{Fore.CYAN}Analyzing Solana token: {token_address}")
+        dex_data, rpc_data = await asyncio.gather(
+            self._get_dexscreener_data_async(token_address),
+            self._get_rpc_data_async(token_address)
+        )
+        return self._merge_results(token_address, dex_data, rpc_data)
+    
+    def _merge_results(self, token_address: str, dex_data: Optional[Dict], rpc_data: Optional[Dict]) -> Dict:
         result = {
             'token_address': token_address,
             'name': 'UNKNOWN',
@@ -56,10 +78,6 @@ class ImprovedSolanaAnalyzer:
             'state': 'UNKNOWN'
         }
         
-        # 1. Try DexScreener API (most reliable for market data)
-        print(f"{Fore.YELLOW}Fetching data from DexScreener...")
-        dex_data = self._get_dexscreener_data(token_address)
-        
         if dex_data:
             result.update(dex_data)
             result['metadata_ok'] = True
@@ -69,10 +87,6 @@ class ImprovedSolanaAnalyzer:
         else:
             print(f"{Fore.YELLOW}⚠️  No DexScreener data found")
         
-        # 2. Try Solana RPC for on-chain data
-        print(f"{Fore.YELLOW}Fetching on-chain data...")
-        rpc_data = self._get_rpc_data(token_address)
-        
         if rpc_data:
             # Merge RPC data (don't overwrite DexScreener data)
             if not result['metadata_ok']:
@@ -85,81 +99,105 @@ class ImprovedSolanaAnalyzer:
         """Get token data from DexScreener API."""
         try:
             url = f"{self.dexscreener_api}/tokens/{token_address}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-            
-            data = response.json()
-            
-            if 'pairs' not in data or not data['pairs']:
-                return None
-            
-            # Get the pair with highest liquidity
-            pairs = data['pairs']
-            main_pair = max(pairs, key=lambda p: float(p.get('liquidity', {}).get('usd', 0) or 0))
-            
-            # Extract data
-            base_token = main_pair.get('baseToken', {})
-            quote_token = main_pair.get('quoteToken', {})
-            liquidity = main_pair.get('liquidity', {})
-            volume = main_pair.get('volume', {})
-            price_change = main_pair.get('priceChange', {})
-            txns = main_pair.get('txns', {})
-            
-            # Determine which is the meme token
-            if base_token.get('address', '').lower() == token_address.lower():
-                token_info = base_token
-            else:
-                token_info = quote_token
-            
-            return {
-                'name': token_info.get('name', 'UNKNOWN'),
-                'symbol': token_info.get('symbol', '???'),
-                'decimals': 9,  # Standard for Solana SPL tokens
-                'liquidity_usd': float(liquidity.get('usd', 0) or 0),
-                'liquidity_sol': float(liquidity.get('quote', 0) or 0),  # Assuming quote is SOL
-                'pool_address': main_pair.get('pairAddress', 'N/A'),
-                'dex': main_pair.get('dexId', 'UNKNOWN'),
-                'price_usd': float(main_pair.get('priceUsd', 0) or 0),
-                'price_change_24h': float(price_change.get('h24', 0) or 0),
-                'volume_24h': float(volume.get('h24', 0) or 0),
-                'tx_24h': txns.get('h24', {}).get('buys', 0) + txns.get('h24', {}).get('sells', 0),
-                'age_minutes': (time.time() - main_pair.get('pairCreatedAt', time.time())) / 60000 if main_pair.get('pairCreatedAt') else 0
-            }
-            
+            response = get_http_client().get_sync('dexscreener', url, timeout=10)
+            return self._parse_dexscreener(token_address, response)
         except Exception as e:
             print(f"{Fore.RED}DexScreener API error: {e}")
             return None
     
+    async def _get_dexscreener_data_async(self, token_address: str) -> Optional[Dict]:
+        try:
+            url = f"{self.dexscreener_api}/tokens/{token_address}"
+            response = await get_http_client().get('dexscreener', url, timeout=10)
+            return self._parse_dexscreener(token_address, response)
+        except Exception as e:
+            print(f"{Fore.RED}DexScreener API error: {e}")
+            return None
+    
+    def _parse_dexscreener(self, token_address: str, response) -> Optional[Dict]:
+        if response.status != 200:
+            return None
+        
+        data = response.json()
+        
+        if 'pairs' not in data or not data['pairs']:
+            return None
+        
+        # Get the pair with highest liquidity
+        pairs = data['pairs']
+        main_pair = max(pairs, key=lambda p: float(p.get('liquidity', {}).get('usd', 0) or 0))
+        
+        # Extract data
+        base_token = main_pair.get('baseToken', {})
+        quote_token = main_pair.get('quoteToken', {})
+        liquidity = main_pair.get('liquidity', {})
+        volume = main_pair.get('volume', {})
+        price_change = main_pair.get('priceChange', {})
+        txns = main_pair.get('txns', {})
+        
+        # Determine which is the meme token
+        if base_token.get('address', '').lower() == token_address.lower():
+            token_info = base_token
+        else:
+            token_info = quote_token
+        
+        return {
+            'name': token_info.get('name', 'UNKNOWN'),
+            'symbol': token_info.get('symbol', '???'),
+            'decimals': 9,  # Standard for Solana SPL tokens
+            'liquidity_usd': float(liquidity.get('usd', 0) or 0),
+            'liquidity_sol': float(liquidity.get('quote', 0) or 0),  # Assuming quote is SOL
+            'pool_address': main_pair.get('pairAddress', 'N/A'),
+            'dex': main_pair.get('dexId', 'UNKNOWN'),
+            'price_usd': float(main_pair.get('priceUsd', 0) or 0),
+            'price_change_24h': float(price_change.get('h24', 0) or 0),
+            'volume_24h': float(volume.get('h24', 0) or 0),
+            'tx_24h': txns.get('h24', {}).get('buys', 0) + txns.get('h24', {}).get('sells', 0),
+            'age_minutes': (time.time() - main_pair.get('pairCreatedAt', time.time())) / 60000 if main_pair.get('pairCreatedAt') else 0
+        }
+    
+    @staticmethod
+    def _rpc_payload(token_address: str) -> Dict:
+        # Get token supply
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getTokenSupply",
+            "params": [token_address]
+        }
+    
     def _get_rpc_data(self, token_address: str) -> Optional[Dict]:
         """Get basic token data from Solana RPC."""
         try:
-            # Get token supply
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenSupply",
-                "params": [token_address]
-            }
-            
-            response = requests.post(self.rpc_url, json=payload, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'result' in data and 'value' in data['result']:
-                    decimals = data['result']['value'].get('decimals', 9)
-                    return {
-                        'decimals': decimals,
-                        'state': 'DETECTED'
-                    }
-            
+            # getTokenSupply is a read: safe to retry
+            response = get_http_client().post_sync('solana_rpc', self.rpc_url, json=self._rpc_payload(token_address),
+                                                    timeout=10, idempotent=True)
+            return self._parse_rpc(response)
+        except Exception as e:
+            print(f"{Fore.RED}RPC error: {e}")
             return None
-            
+    
+    async def _get_rpc_data_async(self, token_address: str) -> Optional[Dict]:
+        try:
+            response = await get_http_client().post('solana_rpc', self.rpc_url, json=self._rpc_payload(token_address),
+                                                    timeout=10, idempotent=True)
+            return self._parse_rpc(response)
         except Exception as e:
             print(f"{Fore.RED}RPC error: {e}")
             return None
     
+    @staticmethod
+    def _parse_rpc(response) -> Optional[Dict]:
+        if response.status == 200:
+            data = response.json()
+            if 'result' in data and 'value' in data['result']:
+                decimals = data['result']['value'].get('decimals', 9)
+                return {
+                    'decimals': decimals,
+                    'state': 'DETECTED'
+                }
+        return None
+    
     def get_security_analysis(self, token_address: str) -> Dict:
         """
         Get security analysis for Solana token.
@@ -170,8 +208,14 @@ class ImprovedSolanaAnalyzer:
         - Price volatility
         - Volume/Liquidity ratio
         """
-        analysis = self.analyze_token(token_address)
-        
+        return self._score_security(self.analyze_token(token_address))
+    
+    async def get_security_analysis_async(self, token_address: str) -> Dict:
+        """get_security_analysis() for callers on an event loop."""
+        return self._score_security(await self.analyze_token_async(token_address))
+    
+    @staticmethod
+    def _score_security(analysis: Dict) -> Dict:
         security_score = 100
         risk_flags = []
         
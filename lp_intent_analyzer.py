@@ -9,13 +9,21 @@ Core Metrics:
 4. Market Divergence - LP vs Volume anomalies
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
+from array import array
+import bisect
 import time
 
 
-@dataclass
+# History is time-based: snapshots arrive from 5s polls and, for streamed
+# Solana positions, from per-slot reserve updates
+HISTORY_MAX_AGE = 3600  # seconds
+HISTORY_MAX_SNAPSHOTS = 5000
+
+
+@dataclass(slots=True)
 class LPSnapshot:
     """Single liquidity pool snapshot at a point in time."""
     timestamp: float
@@ -23,6 +31,60 @@ class LPSnapshot:
     volume_usd: float
     price: float
     marketcap: float
+
+
+class LPHistory:
+    """
+    Time-ordered LP snapshots in five array('d') columns.
+    
+    40 bytes per snapshot instead of a slotted object plus five float
+    objects; reads build LPSnapshot objects on demand, and the columns
+    (times, lp_usd, ...) can be scanned directly.
+    """
+    
+    __slots__ = ('times', 'lp_usd', 'volume_usd', 'price', 'marketcap')
+    
+    def __init__(self, snapshots=()):
+        self.times = array('d')
+        self.lp_usd = array('d')
+        self.volume_usd = array('d')
+        self.price = array('d')
+        self.marketcap = array('d')
+        for snapshot in snapshots:
+            self.append(snapshot)
+    
+    def append(self, snapshot: LPSnapshot):
+        self.times.append(snapshot.timestamp)
+        self.lp_usd.append(snapshot.lp_usd)
+        self.volume_usd.append(snapshot.volume_usd)
+        self.price.append(snapshot.price)
+        self.marketcap.append(snapshot.marketcap)
+    
+    def trim(self, cutoff: float, max_points: int):
+        """Drop snapshots older than `cutoff`, keeping at most `max_points`."""
+        start = max(bisect.bisect_left(self.times, cutoff), len(self.times) - max_points)
+        if start > 0:
+            for column in (self.times, self.lp_usd, self.volume_usd, self.price, self.marketcap):
+                del column[:start]
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._snapshot(i) for i in range(*index.indices(len(self.times)))]
+        if index < 0:
+            index += len(self.times)
+        if not 0 <= index < len(self.times):
+            raise IndexError("LP history index out of range")
+        return self._snapshot(index)
+    
+    def __iter__(self):
+        for i in range(len(self.times)):
+            yield self._snapshot(i)
+    
+    def _snapshot(self, i: int) -> LPSnapshot:
+        return LPSnapshot(self.times[i], self.lp_usd[i], self.volume_usd[i], self.price[i], self.marketcap[i])
     
     
 class LPIntentAnalyzer:
@@ -38,7 +100,7 @@ class LPIntentAnalyzer:
     
     def __init__(self, chain_name: str):
         self.chain_name = chain_name.lower()
-        self.lp_history: Dict[str, List[LPSnapshot]] = {}
+        self.lp_history: Dict[str, LPHistory] = {}
         
     def calculate_risk(self, pair_data: Dict) -> Dict:
         """
@@ -85,13 +147,7 @@ class LPIntentAnalyzer:
                 marketcap=marketcap
             )
             
-            if token_address not in self.lp_history:
-                self.lp_history[token_address] = []
-            self.lp_history[token_address].append(snapshot)
-            
-            # Keep only last 120 snapshots (1 hour at 30s intervals)
-            if len(self.lp_history[token_address]) > 120:
-                self.lp_history[token_address] = self.lp_history[token_address][-120:]
+            self._append_snapshot(token_address, snapshot)
             
             # Calculate risk components
             control_risk = self._calculate_control_risk(pair_data)
@@ -129,6 +185,74 @@ class LPIntentAnalyzer:
         
         return result
     
+    def _append_snapshot(self, token_address: str, snapshot: LPSnapshot):
+        """Append a snapshot and trim history to the last hour."""
+        history = self.lp_history.get(token_address)
+        if history is None:
+            history = self.lp_history[token_address] = LPHistory()
+        history.append(snapshot)
+        
+        cutoff = snapshot.timestamp - HISTORY_MAX_AGE
+        if history.times[0] < cutoff or len(history) > HISTORY_MAX_SNAPSHOTS:
+            history.trim(cutoff, HISTORY_MAX_SNAPSHOTS)
+    
+    def _snapshot_at(self, history: LPHistory, seconds: float) -> LPSnapshot:
+        """
+        Snapshot that was current `seconds` before the latest one
+        (the oldest snapshot if history is shorter than that).
+        """
+        cutoff = history.times[-1] - seconds
+        index = bisect.bisect_right(history.times, cutoff) - 1
+        return history[max(index, 0)]
+    
+    def ingest_reserves(self, token_address: str, lp_usd: float, price: Optional[float] = None) -> Optional[float]:
+        """
+        Record a streamed liquidity update (e.g. pool vault / bonding curve
+        account change) without a full pair_data payload.
+        
+        Volume and marketcap are carried over from the previous snapshot,
+        so divergence checks keep working between HTTP polls.
+        
+        Returns:
+            Percentage change vs the previous snapshot, None if no history
+        """
+        history = self.lp_history.get(token_address)
+        previous = history[-1] if history else None
+        
+        self._append_snapshot(token_address, LPSnapshot(
+            timestamp=time.time(),
+            lp_usd=lp_usd,
+            volume_usd=previous.volume_usd if previous else 0.0,
+            price=price if price is not None else (previous.price if previous else 0.0),
+            marketcap=previous.marketcap if previous else 0.0
+        ))
+        
+        if not previous or previous.lp_usd == 0:
+            return None
+        return ((lp_usd - previous.lp_usd) / previous.lp_usd) * 100
+    
+    def get_lp_drawdown(self, token_address: str, seconds: float = 60) -> Optional[float]:
+        """
+        Drop from the peak LP within the window to the latest LP.
+        
+        Returns:
+            Drawdown percentage (0 = at peak, 100 = fully pulled)
+            None if insufficient data
+        """
+        history = self.lp_history.get(token_address, ())
+        
+        if len(history) < 2:
+            return None
+        
+        cutoff = history.times[-1] - seconds
+        start = bisect.bisect_left(history.times, cutoff)
+        peak = max(history.lp_usd[start:])
+        
+        if peak <= 0:
+            return None
+        
+        return ((peak - history.lp_usd[-1]) / peak) * 100
+    
     def _calculate_control_risk(self, pair_data: Dict) -> float:
         """
         Calculate LP control risk (0-75).
@@ -191,15 +315,15 @@ class LPIntentAnalyzer:
         """
         risk = 0
         
-        history = self.lp_history.get(token_address, [])
+        history = self.lp_history.get(token_address, ())
         
         if len(history) < 2:
             # Not enough data yet
             return 0
         
-        # Calculate LP delta over last 5 minutes (10 snapshots at 30s interval)
-        if len(history) >= 10:
-            lp_5m_ago = history[-10].lp_usd
+        # Calculate LP delta over last 5 minutes
+        if history.times[-1] - history.times[0] >= 300 or len(history) >= 10:
+            lp_5m_ago = self._snapshot_at(history, 300).lp_usd
             lp_now = current_lp
             
             if lp_5m_ago > 0:
@@ -214,9 +338,10 @@ class LPIntentAnalyzer:
         # Detect stepwise pattern (gradual drain)
         if len(history) >= 6:
             # Check if LP consistently declining
+            lp = history.lp_usd
             declining_count = 0
-            for i in range(len(history) - 5, len(history)):
-                if history[i].lp_usd < history[i-1].lp_usd:
+            for i in range(len(lp) - 5, len(lp)):
+                if lp[i] < lp[i-1]:
                     declining_count += 1
             
             if declining_count >= 4:  # 4 out of 5 declining
@@ -233,20 +358,17 @@ class LPIntentAnalyzer:
         """
         risk = 0
         
-        history = self.lp_history.get(token_address, [])
+        history = self.lp_history.get(token_address, ())
         
         if len(history) < 6:
             return 0
         
         # Compare last 3 snapshots to previous 3
-        recent_3 = history[-3:]
-        previous_3 = history[-6:-3]
-        
-        avg_lp_recent = sum(s.lp_usd for s in recent_3) / 3
-        avg_lp_previous = sum(s.lp_usd for s in previous_3) / 3
+        avg_lp_recent = sum(history.lp_usd[-3:]) / 3
+        avg_lp_previous = sum(history.lp_usd[-6:-3]) / 3
         
-        avg_vol_recent = sum(s.volume_usd for s in recent_3) / 3
-        avg_vol_previous = sum(s.volume_usd for s in previous_3) / 3
+        avg_vol_recent = sum(history.volume_usd[-3:]) / 3
+        avg_vol_previous = sum(history.volume_usd[-6:-3]) / 3
         
         lp_decreasing = avg_lp_recent < avg_lp_previous * 0.95  # 5% drop
         vol_increasing = avg_vol_recent > avg_vol_previous * 1.2  # 20% increase
@@ -276,19 +398,13 @@ class LPIntentAnalyzer:
             Percentage change (positive = increase, negative = decrease)
             None if insufficient data
         """
-        history = self.lp_history.get(token_address, [])
+        history = self.lp_history.get(token_address, ())
         
         if len(history) < 2:
             return None
         
-        # Calculate number of snapshots (30s interval)
-        snapshots_needed = (minutes * 60) // 30
-        
-        if len(history) < snapshots_needed:
-            snapshots_needed = len(history)
-        
-        lp_past = history[-snapshots_needed].lp_usd
-        lp_now = history[-1].lp_usd
+        lp_past = self._snapshot_at(history, minutes * 60).lp_usd
+        lp_now = history.lp_usd[-1]
         
         if lp_past == 0:
             return None
@@ -310,7 +426,7 @@ class LPIntentAnalyzer:
             return (True, f"LP dropped {abs(lp_delta_5m):.1f}% in 5 minutes")
         
         # Check risk score
-        history = self.lp_history.get(token_address, [])
+        history = self.lp_history.get(token_address, ())
         if not history:
             return (False, "")
         
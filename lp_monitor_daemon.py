@@ -15,9 +15,23 @@ from trading.trade_executor import TradeExecutor
 from lp_intent_analyzer import LPIntentAnalyzer
 import requests
 
+try:
+    from modules.solana.position_watcher import SolanaPositionWatcher
+    from modules.solana.solana_utils import get_sol_price_usd, get_cached_sol_price_usd
+    SOLANA_WATCHER_AVAILABLE = True
+except ImportError:
+    SOLANA_WATCHER_AVAILABLE = False
+
 init(autoreset=True)
 load_dotenv()
 
+# Streamed (accountSubscribe) exit trigger: liquidity drop from the recent peak
+STREAM_DRAWDOWN_EXIT_PCT = 20.0
+STREAM_DRAWDOWN_WINDOW = 60  # seconds
+
+# Streamed Solana positions only need the HTTP poll as a backstop
+WATCHED_POLL_INTERVAL = 30  # seconds
+
 
 class LPMonitorDaemon:
     """Continuous LP monitor that tracks open positions and auto-exits on rugpull signals."""
@@ -48,6 +62,18 @@ class LPMonitorDaemon:
         # Tracking
         self.last_check = {}
         self.exit_triggered = set()  # Track which positions already exited
+        self.exits_in_progress = set()
+        
+        # Solana: stream pool vault / bonding curve changes of open positions
+        self.solana_watcher = None
+        self.watched_positions = {}  # str(position_id) -> position (has subscribed accounts)
+        self.watched_pairs = {}  # str(position_id) -> (dexId, pairAddress) last resolved
+        if SOLANA_WATCHER_AVAILABLE:
+            self.solana_watcher = SolanaPositionWatcher(
+                rpc_url=os.getenv('SOLANA_RPC_URL'),
+                ws_url=os.getenv('SOLANA_WS_URL'),
+                on_change=self.on_solana_liquidity_change
+            )
         
     async def get_pair_data(self, token_address: str, chain: str) -> dict:
         """Fetch latest pair data from DexScreener."""
@@ -104,6 +130,14 @@ class LPMonitorDaemon:
             if not analyzer:
                 return (False, f"No analyzer for chain {chain}", {})
             
+            # Streamed Solana positions: keep one LP source (on-chain) in the history
+            if chain == 'solana':
+                await self.watch_solana_position(position, pair_data)
+                streamed_sol = self.solana_watcher.get_liquidity(str(position_id)) if self.solana_watcher else None
+                if streamed_sol is not None:
+                    sol_price = await asyncio.to_thread(get_sol_price_usd)
+                    pair_data = {**pair_data, 'liquidity': {**(pair_data.get('liquidity') or {}), 'usd': streamed_sol * sol_price}}
+            
             # Calculate LP risk
             lp_risk = analyzer.calculate_risk(pair_data)
             
@@ -129,6 +163,79 @@ class LPMonitorDaemon:
             print(f"{Fore.RED}Error checking position LP: {e}")
             return (False, f"Error: {e}", {})
     
+    async def watch_solana_position(self, position: dict, pair_data: dict):
+        """
+        Subscribe a Solana position's bonding curve / Raydium pool.
+        
+        Re-resolved whenever DexScreener reports a different pair (e.g. the
+        Raydium pool after a pump.fun curve completes).
+        """
+        if not self.solana_watcher or not self.solana_watcher.available:
+            return
+        
+        key = str(position['id'])
+        pair = ((pair_data.get('dexId') or '').lower(), pair_data.get('pairAddress'))
+        if key not in self.watched_positions and self.watched_pairs.get(key) == pair:
+            return  # Nothing streamable for this pair; wait for it to change
+        self.watched_pairs[key] = pair
+        pool_address = pair[1] if pair[0] == 'raydium' else None
+        
+        try:
+            if await self.solana_watcher.watch_position(key, position['token_address'], pool_address):
+                self.watched_positions[key] = position
+            else:
+                self.watched_positions.pop(key, None)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not stream LP for #{position['id']}: {e}")
+    
+    async def on_solana_liquidity_change(self, key: str, mint: str, liquidity_sol: float,
+                                         previous_sol: float, slot: int):
+        """
+        accountSubscribe callback: feed the reserve delta into the analyzer
+        and exit right away on a large pull.
+        """
+        position = self.watched_positions.get(key)
+        if not position or position['id'] in self.exit_triggered or key in self.exits_in_progress:
+            return
+        
+        analyzer = self.lp_analyzers['solana']
+        analyzer.ingest_reserves(mint, liquidity_sol * get_cached_sol_price_usd())
+        
+        drawdown = analyzer.get_lp_drawdown(mint, seconds=STREAM_DRAWDOWN_WINDOW)
+        if drawdown is not None and drawdown >= STREAM_DRAWDOWN_EXIT_PCT:
+            reason = f"LP pulled {drawdown:.1f}% in {STREAM_DRAWDOWN_WINDOW}s (slot {slot})"
+        else:
+            should_exit, reason = analyzer.should_emergency_exit(mint)
+            if not should_exit:
+                return
+        
+        self.exits_in_progress.add(key)
+        try:
+            await self.execute_emergency_exit(position, reason)
+        finally:
+            self.exits_in_progress.discard(key)
+        
+        if position['id'] in self.exit_triggered:
+            self.solana_watcher.unwatch_position(key)
+            self.watched_positions.pop(key, None)
+    
+    def sync_solana_watches(self, positions: list):
+        """
+        Drop streams of positions that are no longer open, and positions
+        whose accounts all went away (completed curve) so they fall back
+        to the fast HTTP poll until their new pool is subscribed.
+        """
+        open_keys = {str(pos['id']) for pos in positions}
+        for key in list(self.watched_positions):
+            if key not in open_keys:
+                self.solana_watcher.unwatch_position(key)
+                del self.watched_positions[key]
+            elif not self.solana_watcher.is_watching(key):
+                del self.watched_positions[key]
+        for key in list(self.watched_pairs):
+            if key not in open_keys:
+                del self.watched_pairs[key]
+    
     async def check_position_balance(self, position: dict) -> tuple[bool, str]:
         """
         Check if wallet still holds position tokens (manual sell detection).
@@ -259,6 +366,8 @@ class LPMonitorDaemon:
         print(f"  - LP Risk Score > 50 (was 70 - more aggressive)")
         print(f"  - LP Drop > 2% in 5 minutes (was 5% - more sensitive)")
         print(f"  - Market Divergence detected (LP↓ + Vol↑)")
+        if self.solana_watcher and self.solana_watcher.available:
+            print(f"  - Solana LP pull > {STREAM_DRAWDOWN_EXIT_PCT:.0f}% in {STREAM_DRAWDOWN_WINDOW}s (accountSubscribe, per slot)")
         print(f"{Fore.CYAN}{'='*60}\n")
         
         iteration = 0
@@ -274,6 +383,12 @@ class LPMonitorDaemon:
                 # Get all open positions
                 positions = self.position_tracker.get_open_positions()
                 
+                if self.solana_watcher:
+                    self.sync_solana_watches(positions)
+                    if self.watched_positions:
+                        # Keep the SOL price cached for the streamed exit path
+                        await asyncio.to_thread(get_sol_price_usd)
+                
                 if not positions:
                     print(f"{Fore.YELLOW}📭 No open positions to monitor")
                 else:
@@ -283,9 +398,15 @@ class LPMonitorDaemon:
                         position_id = pos['id']
                         
                         # Skip if already exited
-                        if position_id in self.exit_triggered:
+                        if position_id in self.exit_triggered or str(position_id) in self.exits_in_progress:
                             continue
                         
+                        # Streamed positions: HTTP poll is only a backstop
+                        if str(position_id) in self.watched_positions:
+                            if time.time() - self.last_check.get(position_id, 0) < WATCHED_POLL_INTERVAL:
+                                continue
+                        self.last_check[position_id] = time.time()
+                        
                         token_addr_short = f"{pos['token_address'][:10]}...{pos['token_address'][-8:]}"
                         print(f"\n  Position #{position_id} ({pos['chain'].upper()}): {token_addr_short}")
                         
@@ -326,7 +447,11 @@ class LPMonitorDaemon:
                         # Execute exits based on check results
                         if should_exit_lp:
                             # LP risk triggered - execute emergency sell
-                            await self.execute_emergency_exit(pos, lp_reason)
+                            self.exits_in_progress.add(str(position_id))
+                            try:
+                                await self.execute_emergency_exit(pos, lp_reason)
+                            finally:
+                                self.exits_in_progress.discard(str(position_id))
                         elif should_exit_bal:
                             # Balance check failed - mark as closed (no sell needed)
                             await self.execute_detected_close(pos, bal_reason)
@@ -347,7 +472,13 @@ class LPMonitorDaemon:
     
     async def run(self):
         """Start the monitoring daemon."""
-        await self.monitor_loop()
+        if self.solana_watcher:
+            self.solana_watcher.start()
+        try:
+            await self.monitor_loop()
+        finally:
+            if self.solana_watcher:
+                await self.solana_watcher.stop()
 
 
 async def main():
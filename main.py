@@ -12,6 +12,7 @@ from analyzer import TokenAnalyzer
 from scorer import TokenScorer
 from telegram_notifier import TelegramNotifier
 from error_monitor import ErrorMonitor
+from cooldown_service import get_cooldown_service
 from config import BASE_RPC_URL, UNISWAP_V2_FACTORY, MIN_LIQUIDITY_USD, ALERT_THRESHOLDS, AUTO_UPGRADE_ENABLED, AUTO_UPGRADE_COOLDOWN_SECONDS, AUTO_UPGRADE_MAX_WAIT_MINUTES, ROTATION_CONFIG, PATTERN_CONFIG, NARRATIVE_CONFIG, SMART_MONEY_CONFIG, CONVICTION_CONFIG
 
 # Market Intelligence Layer
@@ -34,6 +35,8 @@ try:
         SolanaAlert,
         solana_log
     )
+    from modules.global_block_events import EventBus
+    from modules.solana_slot_events import SolanaSlotService, CoalescedJob
     SOLANA_MODULE_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️  Solana module not available: {e}")
@@ -438,36 +441,58 @@ async def main():
             # MultiChainScanner now manages its own isolated tasks per chain
             await scanner.start_async(queue)
             
-            # 2. Solana Producer Task
+            # 2. Solana Producer Task (driven by SolanaSlotService ticks)
             async def run_solana_producer():
                 if not (solana_enabled and solana_scanner): return
-                print(f"{Fore.MAGENTA}🟣 Solana scanner task started (Source: Modules)")
+                print(f"{Fore.MAGENTA}🟣 Solana scanner task started (Source: Slot ticks)")
                 
-                while True:
-                    try:
-                        # Yield control to event loop
-                        await asyncio.sleep(0.1)
-                        
-                        # Run async scan directly (no thread wrapper needed)
-                        # Enforce 45s timeout for the entire scan cycle
-                        try:
-                            tokens = await asyncio.wait_for(
-                                solana_scanner.scan_new_pairs_async(),
-                                timeout=45.0
-                            )
-                        except asyncio.TimeoutError:
-                            print(f"{Fore.YELLOW}⚠️  [SOL] Scan timed out (>45s)")
-                            tokens = []
-                        
-                        if tokens:
-                            print(f"{Fore.MAGENTA}🟣 [SOL] Received {len(tokens)} candidates from scanner")
-                            for t in tokens:
-                                t['chain'] = 'solana'  # Ensure chain tag
-                                await queue.put(t)
-                                
-                    except Exception as e:
-                        print(f"{Fore.YELLOW}⚠️  [SOL] Loop error: {e}")
-                        await asyncio.sleep(5)
+                async def scan_on_slot(snapshot):
+                    tokens = await solana_scanner.scan_new_pairs_async()
+                    if tokens:
+                        print(f"{Fore.MAGENTA}🟣 [SOL] Received {len(tokens)} candidates from scanner (slot {snapshot.block_number})")
+                        for t in tokens:
+                            t['chain'] = 'solana'  # Ensure chain tag
+                            await queue.put(t)
+                
+                # Completed enrichments (metadata / LP / curve that missed the first
+                # deadline) come back as update events and are re-scored
+                async def push_enriched_update(event):
+                    event['chain'] = 'solana'
+                    await queue.put(event)
+                
+                solana_scanner.on_event_update = push_enriched_update
+                
+                # Coalesced jobs: a slow run never overlaps; ticks during a run fold into one rerun
+                # Enforce 45s timeout for the entire scan cycle
+                solana_jobs = [
+                    CoalescedJob("scan", scan_on_slot,
+                                 min_interval=solana_config.get('scan_interval', 5), timeout=45.0),
+                    CoalescedJob("raydium-liquidity", solana_scanner.refresh_raydium_liquidity,
+                                 min_interval=1.0, timeout=30.0),
+                    CoalescedJob("jupiter-momentum", solana_scanner.refresh_jupiter_momentum,
+                                 min_interval=solana_config.get('jupiter_refresh_interval', 15), timeout=30.0),
+                    CoalescedJob("holder-concentration", solana_scanner.refresh_holder_concentration,
+                                 min_interval=solana_config.get('holder_refresh_interval', 10), timeout=30.0),
+                ]
+                for job in solana_jobs:
+                    EventBus.subscribe("NEW_BLOCK_SOLANA", job.trigger)
+                
+                slot_service = SolanaSlotService.get_instance(
+                    solana_scanner.rpc_url,
+                    ws_url=solana_config.get('ws_url'),
+                    tick_interval=solana_config.get('slot_tick_interval', 1.0)
+                )
+                slot_service.start()
+                
+                # Keep task alive but idle (slot service runs in background tasks)
+                try:
+                    while True:
+                        await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    slot_service.stop()
+                    for job in solana_jobs:
+                        job.cancel()
+                    raise
 
             if solana_enabled:
                 tasks.append(asyncio.create_task(run_solana_producer(), name="solana-producer"))
@@ -550,6 +575,9 @@ async def main():
             async def consumer_task():
                 print(f"{Fore.GREEN}✅ Event consumer started")
                 
+                # Per-token record of Solana side effects (for enrichment update events)
+                solana_processed = get_cooldown_service().table('solana.processed', cooldown_seconds=3600)
+                
                 while True:
                     # BLOCKING wait for next pair
                     pair_data = await queue.get()
@@ -567,21 +595,31 @@ async def main():
                                 token_address = sol_token.get('token_address', '')
                                 sol_prefix = "[SOL]"
                                 
+                                # Enrichment updates re-score the token; side effects that
+                                # already ran for it (trade registration, alerts) are skipped
+                                is_update = bool(sol_token.get('is_update'))
+                                done = dict(solana_processed.get(token_address) or {}) if is_update else {}
+                                
                                 # Score the token
                                 sol_score_result = solana_score_engine.calculate_score(sol_token)
                                 score = sol_score_result.get('score', 0)
                                 verdict = sol_score_result.get('verdict', 'SKIP')
+                                solana_scanner.update_token_score(token_address, score)
                                 
                                 # Log detection
-                                print(f"{Fore.MAGENTA}🟣 {sol_prefix} Token: {sol_token.get('name', 'UNKNOWN')} | Score: {score} | Verdict: {verdict}")
-                                
+                                if is_update:
+                                    print(f"{Fore.MAGENTA}🔄 {sol_prefix} Update: {sol_token.get('name', 'UNKNOWN')} | Score: {done.get('score', '?')} → {score} | Verdict: {verdict}")
+                                else:
+                                    print(f"{Fore.MAGENTA}🟣 {sol_prefix} Token: {sol_token.get('name', 'UNKNOWN')} | Score: {score} | Verdict: {verdict}")
+
                                 # Trigger TRADE logic for Solana if verdict is TRADE
-                                if verdict == 'TRADE' and upgrade_integration.enabled:
+                                if verdict == 'TRADE' and upgrade_integration.enabled and not done.get('trade_registered'):
                                     upgrade_integration.register_trade(sol_token, sol_score_result)
+                                    done['trade_registered'] = True
                                     print(f"{Fore.CYAN}[AUTO-UPGRADE] {sol_prefix} {sol_token.get('name', 'UNKNOWN')}: Registered for SNIPER upgrade monitoring")
                                 
                                 # SOLANA SNIPER CHECK
-                                if solana_sniper and solana_sniper.is_enabled():
+                                if solana_sniper and solana_sniper.is_enabled() and not done.get('sniper_alerted'):
                                     sniper_result = solana_sniper.check_sniper_eligibility(sol_token)
                                     
                                     if sniper_result.get('eligible'):
@@ -589,10 +627,11 @@ async def main():
                                             alert_sent = solana_alert.send_sniper_alert(sol_token, sniper_result)
                                             if alert_sent:
                                                 solana_sniper.mark_alerted(token_address)
+                                                done['sniper_alerted'] = True
                                                 print(f"{Fore.MAGENTA}🔥 {sol_prefix} SNIPER ALERT SENT! Score: {sniper_result.get('sniper_score', 0)}")
                                 
                                 # SOLANA RUNNING CHECK
-                                if solana_running and solana_running.is_enabled():
+                                if solana_running and solana_running.is_enabled() and not done.get('running_alerted'):
                                     running_result = solana_running.check_running_eligibility(
                                         sol_token, 
                                         solana_scanner.jupiter
@@ -603,9 +642,17 @@ async def main():
                                             alert_sent = solana_alert.send_running_alert(sol_token, running_result)
                                             if alert_sent:
                                                 solana_running.mark_alerted(token_address)
+                                                done['running_alerted'] = True
                                                 print(f"{Fore.MAGENTA}🏃 {sol_prefix} RUNNING ALERT SENT! Phase: {running_result.get('phase')}")
                                 
-                                print(f"{Fore.MAGENTA}🏃 {sol_prefix} RUNNING ALERT SENT! Phase: {running_result.get('phase')}")
+                                # Off-chain URI JSON is only fetched for tokens that pass scoring,
+                                # after the sniper/running checks (never on the sniper path);
+                                # image / socials come back as an update event
+                                if verdict in ('WATCH', 'TRADE') and not done.get('offchain_requested'):
+                                    solana_scanner.request_offchain_metadata(token_address)
+                                    done['offchain_requested'] = True
+                                
+                                solana_processed.mark(token_address, {**done, 'score': score, 'verdict': verdict})
                                 
                             except Exception as sol_token_e:
                                 print(f"{Fore.YELLOW}⚠️  [SOL] Token processing error: {sol_token_e}")
@@ -649,9 +696,10 @@ async def main():
                                     print(f"{Fore.RED}⚠️  {chain_prefix} No adapter available for chain '{chain_name}'")
                                     continue
                                 
-                                # Analyze the token using the chain adapter
+                                # Analyze the token using the chain adapter (web3 + GoPlus
+                                # calls are blocking: keep them off the event loop)
                                 analyzer = TokenAnalyzer(adapter=adapter)
-                                analysis = analyzer.analyze_token(pair_data)
+                                analysis = await asyncio.to_thread(analyzer.analyze_token, pair_data)
                                 
                                 # Skip if analysis failed
                                 if analysis is None:
@@ -817,7 +865,7 @@ async def main():
                                         if not sniper_cooldown.is_token_sniped(token_address):
                                             from sniper import SniperDetector
                                             sniper_detector = SniperDetector(adapter=adapter)
-                                            eligibility = sniper_detector.is_eligible(analysis)
+                                            eligibility = await asyncio.to_thread(sniper_detector.is_eligible, analysis)
                                             if eligibility['eligible']:
                                                 # Get momentum data (from analysis if available)
                                                 momentum_data = analysis.get('momentum_data', {
@@ -936,6 +984,9 @@ async def main():
 
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Monitoring stopped.")
+        finally:
+            if solana_scanner:
+                await solana_scanner.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
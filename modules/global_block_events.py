@@ -20,7 +20,7 @@ from web3 import Web3
 # 1. SHARED BLOCK SNAPSHOT
 # -----------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BlockSnapshot:
     """
     Immutable snapshot of a block event.
@@ -0,0 +1,448 @@
+"""
+Solana Holder Concentration Reader
+
+Computes holder concentration for SPL mints locally from chain data:
+- getTokenLargestAccounts per mint (top 20 token accounts)
+- One batched getMultipleAccounts for token account owners/amounts and
+  mint supplies
+- Bonding curve, AMM vault and burn owners excluded
+- Top-10 share of circulating supply and Gini coefficient
+
+Concurrent get_concentration() calls are batched per window. Tracked
+mints are refreshed incrementally: known top accounts are re-read with
+getMultipleAccounts; getTokenLargestAccounts only runs again every
+rediscover_interval seconds.
+
+Replaces per-mint RugCheck topHolders parsing where an RPC client is
+available.
+"""
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .solana_utils import (
+    solana_log,
+    rate_limit_rpc,
+    is_valid_solana_address,
+    create_solana_client,
+    get_multiple_accounts,
+    decode_token_account_amount,
+    pubkey_from_bytes
+)
+from .pumpfun_curve import derive_bonding_curve_pda
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Owners whose balances are not "holders"
+RAYDIUM_AMM_AUTHORITY = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+INCINERATOR_ADDRESS = "1nc1nerator11111111111111111111111111111111"
+
+DEFAULT_EXCLUDED_OWNERS = frozenset({
+    RAYDIUM_AMM_AUTHORITY,
+    SYSTEM_PROGRAM_ID,
+    INCINERATOR_ADDRESS,
+})
+
+# SPL token account: mint (0..32), owner (32..64), amount (64..72)
+SPL_TOKEN_ACCOUNT_OWNER_OFFSET = 32
+
+# SPL mint: mint_authority COption (0..36), supply u64 (36..44), decimals (44)
+SPL_MINT_SUPPLY_OFFSET = 36
+SPL_MINT_DECIMALS_OFFSET = 44
+
+
+def gini_coefficient(balances: List[int]) -> float:
+    """
+    Gini coefficient of a list of balances (0 = equal, 1 = one holder).
+
+    Args:
+        balances: Non-negative balances
+
+    Returns:
+        Gini in [0, 1]
+    """
+    values = sorted(b for b in balances if b > 0)
+    n = len(values)
+    total = sum(values)
+    if n < 2 or not total:
+        return 0.0
+    weighted = sum(i * v for i, v in enumerate(values, 1))
+    return max(0.0, (2 * weighted) / (n * total) - (n + 1) / n)
+
+
+@dataclass
+class HolderConcentration:
+    """Holder concentration for a mint."""
+    mint: str
+    supply: int
+    decimals: int
+    accounts: Dict[str, Tuple[str, int]] = field(default_factory=dict)  # token account -> (owner, amount)
+    excluded_owners: Set[str] = field(default_factory=set)
+    discovered_at: float = None
+    timestamp: float = None
+
+    def __post_init__(self):
+        now = time.time()
+        if self.timestamp is None:
+            self.timestamp = now
+        if self.discovered_at is None:
+            self.discovered_at = now
+
+    def _balances(self) -> Tuple[Dict[str, int], int]:
+        """Amounts per holder owner, plus the excluded amount."""
+        holders: Dict[str, int] = {}
+        excluded = 0
+        for owner, amount in self.accounts.values():
+            if owner in self.excluded_owners:
+                excluded += amount
+            else:
+                holders[owner] = holders.get(owner, 0) + amount
+        return holders, excluded
+
+    @property
+    def circulating(self) -> int:
+        """Supply minus bonding curve / vault / burn balances."""
+        return max(0, self.supply - self._balances()[1])
+
+    @property
+    def top10_pct(self) -> float:
+        """Share of circulating supply held by the 10 largest holders (percent)."""
+        holders, excluded = self._balances()
+        circulating = self.supply - excluded
+        if circulating <= 0:
+            return 0.0
+        top = sorted(holders.values(), reverse=True)[:10]
+        return min(100.0, sum(top) * 100 / circulating)
+
+    @property
+    def gini(self) -> float:
+        """Gini coefficient over the sampled (largest) holders."""
+        return gini_coefficient(list(self._balances()[0].values()))
+
+    def to_dict(self) -> Dict:
+        """Convert to dict output."""
+        holders, excluded = self._balances()
+        return {
+            "mint": self.mint,
+            "top10_holders_percent": round(self.top10_pct, 2),
+            "gini": round(self.gini, 4),
+            "sampled_holders": len(holders),
+            "excluded_percent": round(excluded * 100 / self.supply, 2) if self.supply else 0.0,
+            "source": "onchain",
+            "timestamp": self.timestamp
+        }
+
+
+class HolderConcentrationReader:
+    """
+    Computes holder concentration for many mints at once.
+
+    Concurrent get_concentration() calls are collected for a short window
+    and resolved together (one getTokenLargestAccounts per new mint, one
+    getMultipleAccounts for all owners and supplies). Results are cached
+    for cache_ttl seconds; tracked mints are refreshed incrementally.
+    The cache and missing list are LRU-bounded at max_entries.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        cache_ttl: float = 30.0,
+        rediscover_interval: float = 300.0,
+        batch_window: float = 0.1,
+        max_batch: int = 25,
+        excluded_owners: Optional[Iterable[str]] = None,
+        max_entries: int = 20000
+    ):
+        """
+        Initialize holder concentration reader.
+
+        Args:
+            client: Solana RPC client (created lazily from SOLANA_RPC_URL if None)
+            cache_ttl: Cache TTL in seconds
+            rediscover_interval: Seconds before a tracked mint's largest accounts are re-listed
+            batch_window: Seconds to collect pending mints before a batch load
+            max_batch: Flush early once this many mints are pending
+            excluded_owners: Extra owners to exclude (lockers, team vaults)
+            max_entries: Max cached concentrations / missing mints (oldest dropped first)
+        """
+        self.client = client
+        self.cache_ttl = cache_ttl
+        self.rediscover_interval = rediscover_interval
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.excluded_owners = DEFAULT_EXCLUDED_OWNERS | set(excluded_owners or ())
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, HolderConcentration]" = OrderedDict()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()  # mint -> time no holders were found
+        self._tracked: Set[str] = set()
+        self._client_attempted = client is not None
+
+        # Batch state
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batches = 0
+        self._largest_calls = 0
+        self._refreshes = 0
+
+    def set_client(self, client):
+        """Update Solana RPC client."""
+        self.client = client
+        self._client_attempted = True
+
+    def _get_client(self):
+        """Return the RPC client, creating one on first use."""
+        if self.client is None and not self._client_attempted:
+            self._client_attempted = True
+            self.client = create_solana_client(os.getenv('SOLANA_RPC_URL'))
+        return self.client
+
+    @property
+    def available(self) -> bool:
+        """True when concentration can be computed on-chain."""
+        return self._get_client() is not None
+
+    def _lookup(self, mint: str) -> tuple:
+        """
+        Check cache and missing list.
+
+        Returns:
+            (hit, concentration) - hit is True when no fetch is needed
+        """
+        now = time.time()
+        cached = self._cache.get(mint)
+        if cached and now - cached.timestamp < self.cache_ttl:
+            self._cache.move_to_end(mint)
+            return True, cached
+
+        missing_at = self._missing.get(mint)
+        if missing_at is not None:
+            if now - missing_at < self.cache_ttl:
+                return True, None
+            del self._missing[mint]
+
+        return False, None
+
+    def _store(self, mint: str, concentration: HolderConcentration):
+        """Cache a concentration, evicting the least recently used past max_entries."""
+        self._cache[mint] = concentration
+        self._cache.move_to_end(mint)
+        self._missing.pop(mint, None)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _remember_missing(self, mint: str, now: float):
+        """Negatively cache a mint; expired and excess entries are dropped."""
+        self._missing.pop(mint, None)
+        self._missing[mint] = now
+        while self._missing:
+            oldest_mint, missing_at = next(iter(self._missing.items()))
+            if now - missing_at < self.cache_ttl and len(self._missing) <= self.max_entries:
+                break
+            del self._missing[oldest_mint]
+
+    def _largest_accounts(self, mint: str) -> List[str]:
+        """Top token accounts of a mint (getTokenLargestAccounts)."""
+        from solders.pubkey import Pubkey
+
+        try:
+            rate_limit_rpc()
+            self._largest_calls += 1
+            response = self.client.get_token_largest_accounts(Pubkey.from_string(mint))
+            return [str(entry.address) for entry in (response.value or [])]
+        except Exception as e:
+            solana_log(f"[HOLDERS] getTokenLargestAccounts error for {mint[:8]}...: {e}", "DEBUG")
+            return []
+
+    def fetch_concentrations(self, mints: Iterable[str]) -> Dict[str, Optional[HolderConcentration]]:
+        """
+        Compute holder concentration for many mints (sync, batched).
+
+        Fresh cached mints are returned as-is. Stale mints with an account
+        list younger than rediscover_interval only have their known
+        accounts re-read; others are re-listed via getTokenLargestAccounts.
+
+        Args:
+            mints: Token mint addresses
+
+        Returns:
+            Dict of mint -> HolderConcentration (None if unavailable)
+        """
+        results: Dict[str, Optional[HolderConcentration]] = {}
+        to_fetch: List[str] = []
+        for mint in dict.fromkeys(mints):
+            hit, concentration = self._lookup(mint)
+            results[mint] = concentration
+            if not hit and mint and is_valid_solana_address(mint):
+                to_fetch.append(mint)
+
+        client = self._get_client()
+        if not to_fetch or client is None:
+            return results
+
+        now = time.time()
+        account_lists: Dict[str, List[str]] = {}
+        discovered_at: Dict[str, float] = {}
+        for mint in to_fetch:
+            cached = self._cache.get(mint)
+            if cached and cached.accounts and now - cached.discovered_at < self.rediscover_interval:
+                account_lists[mint] = list(cached.accounts)
+                discovered_at[mint] = cached.discovered_at
+            else:
+                account_lists[mint] = self._largest_accounts(mint)
+
+        self._batches += 1
+        addresses = list(account_lists) + [a for accounts in account_lists.values() for a in accounts]
+        loaded = get_multiple_accounts(client, addresses)
+        now = time.time()
+
+        for mint, token_accounts in account_lists.items():
+            mint_account = loaded.get(mint)
+            data = bytes(mint_account.data) if mint_account and mint_account.data else b""
+            if len(data) < SPL_MINT_DECIMALS_OFFSET + 1 or not token_accounts:
+                self._remember_missing(mint, now)
+                results[mint] = None
+                continue
+
+            accounts: Dict[str, Tuple[str, int]] = {}
+            for address in token_accounts:
+                account = loaded.get(address)
+                raw = bytes(account.data) if account and account.data else b""
+                amount = decode_token_account_amount(raw)
+                if amount is None:
+                    continue
+                owner = pubkey_from_bytes(raw, SPL_TOKEN_ACCOUNT_OWNER_OFFSET)
+                accounts[address] = (owner, amount)
+
+            excluded = set(self.excluded_owners)
+            curve = derive_bonding_curve_pda(mint)
+            if curve:
+                excluded.add(curve)
+
+            concentration = HolderConcentration(
+                mint=mint,
+                supply=int.from_bytes(data[SPL_MINT_SUPPLY_OFFSET:SPL_MINT_SUPPLY_OFFSET + 8], byteorder='little'),
+                decimals=data[SPL_MINT_DECIMALS_OFFSET],
+                accounts=accounts,
+                excluded_owners=excluded,
+                discovered_at=discovered_at.get(mint, now),
+                timestamp=now
+            )
+            self._store(mint, concentration)
+            results[mint] = concentration
+
+        return results
+
+    async def get_concentration(self, mint: str) -> Optional[HolderConcentration]:
+        """
+        Get holder concentration for a mint.
+
+        The mint joins the current batch window; all mints pending in the
+        window are resolved together.
+
+        Args:
+            mint: Token mint address
+
+        Returns:
+            HolderConcentration or None
+        """
+        hit, concentration = self._lookup(mint)
+        if hit:
+            return concentration
+
+        future = self._pending.get(mint)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[mint] = future
+
+            if len(self._pending) >= self.max_batch:
+                self._schedule_flush(0)
+            elif self._flush_task is None:
+                self._schedule_flush(self.batch_window)
+
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self, delay: float):
+        """Start (or restart sooner) the batch flush task."""
+        if self._flush_task is not None:
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.ensure_future(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        """Wait out the batch window, then resolve everything pending."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        if not pending:
+            return
+
+        try:
+            results = await asyncio.to_thread(self.fetch_concentrations, list(pending))
+        except Exception as e:
+            solana_log(f"[HOLDERS] Batch read error: {e}", "ERROR")
+            results = {}
+
+        for mint, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(mint))
+
+    def set_tracked(self, mints: Iterable[str]):
+        """Replace the set of mints kept fresh by refresh_tracked()."""
+        self._tracked = set(mints)
+
+    async def refresh_tracked(self) -> int:
+        """
+        Refresh stale tracked mints in one batch.
+
+        Returns:
+            Number of mints refreshed
+        """
+        now = time.time()
+        due = [
+            mint for mint in self._tracked
+            if mint not in self._cache or now - self._cache[mint].timestamp >= self.cache_ttl
+        ]
+        if not due:
+            return 0
+
+        await asyncio.to_thread(self.fetch_concentrations, due)
+        self._refreshes += 1
+        return len(due)
+
+    def get_cached(self, mint: str) -> Optional[HolderConcentration]:
+        """Get cached concentration without fetching."""
+        return self._cache.get(mint)
+
+    def get_stats(self) -> Dict:
+        """Get reader statistics."""
+        return {
+            "cached_mints": len(self._cache),
+            "tracked_mints": len(self._tracked),
+            "missing": len(self._missing),
+            "pending_mints": len(self._pending),
+            "batches": self._batches,
+            "largest_accounts_calls": self._largest_calls,
+            "tracked_refreshes": self._refreshes,
+            "client": self.client is not None
+        }
+
+
+# Singleton instance
+_holder_reader = None
+
+def get_holder_concentration_reader() -> HolderConcentrationReader:
+    """Get or create singleton HolderConcentrationReader instance."""
+    global _holder_reader
+    if _holder_reader is None:
+        _holder_reader = HolderConcentrationReader()
+    return _holder_reader
@@ -12,7 +12,10 @@ Output: Momentum confirmation data for scoring
 CRITICAL: READ-ONLY - No execution, no wallets
 """
 import time
+import threading
 import requests
+from array import array
+from collections import OrderedDict
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass, field
 
@@ -25,32 +28,147 @@ from .solana_utils import (
 )
 
 
-@dataclass
+# Rolling window: 1-minute buckets over 24h
+BUCKET_SECONDS = 60
+WINDOW_BUCKETS = 1440
+HOUR_BUCKETS = 60
+
+
+class VolumeRing:
+    """
+    Fixed-width time-bucket ring counter (1m buckets over 24h).
+    
+    Keeps running totals for the 24h window, the last hour and the hour
+    before it, so adds and trend/spike queries are O(1) amortized.
+    Memory is fixed (~17 KB per token) regardless of trade count.
+    """
+    
+    __slots__ = (
+        'volumes', 'counts', 'head', 'first_minute',
+        'volume_24h', 'count_24h', 'volume_1h', 'volume_prev_1h'
+    )
+    
+    def __init__(self):
+        self.volumes = array('d', bytes(8 * WINDOW_BUCKETS))
+        self.counts = array('I', bytes(4 * WINDOW_BUCKETS))
+        self.head = -1  # Most recent minute covered
+        self.first_minute = -1
+        self.volume_24h = 0.0
+        self.count_24h = 0
+        self.volume_1h = 0.0
+        self.volume_prev_1h = 0.0
+    
+    def _reset(self, minute: int):
+        """Clear all buckets (gap longer than the window)."""
+        self.volumes = array('d', bytes(8 * WINDOW_BUCKETS))
+        self.counts = array('I', bytes(4 * WINDOW_BUCKETS))
+        self.volume_24h = 0.0
+        self.count_24h = 0
+        self.volume_1h = 0.0
+        self.volume_prev_1h = 0.0
+        self.head = minute
+    
+    def advance(self, timestamp: float):
+        """Roll the window forward to the minute containing timestamp."""
+        minute = int(timestamp // BUCKET_SECONDS)
+        if self.head < 0:
+            self.head = minute
+            self.first_minute = minute
+            return
+        if minute <= self.head:
+            return
+        if minute - self.head >= WINDOW_BUCKETS:
+            self._reset(minute)
+            return
+        
+        volumes = self.volumes
+        counts = self.counts
+        for m in range(self.head + 1, minute + 1):
+            # Bucket m currently holds minute m - 24h: drop it from the window
+            idx = m % WINDOW_BUCKETS
+            self.volume_24h -= volumes[idx]
+            self.count_24h -= counts[idx]
+            volumes[idx] = 0.0
+            counts[idx] = 0
+            # Minute m - 1h moves to the previous hour, m - 2h leaves it
+            moved = volumes[(m - HOUR_BUCKETS) % WINDOW_BUCKETS]
+            self.volume_1h -= moved
+            self.volume_prev_1h += moved - volumes[(m - 2 * HOUR_BUCKETS) % WINDOW_BUCKETS]
+        
+        self.head = minute
+        # Guard against float drift from repeated subtraction
+        self.volume_24h = max(self.volume_24h, 0.0)
+        self.volume_1h = max(self.volume_1h, 0.0)
+        self.volume_prev_1h = max(self.volume_prev_1h, 0.0)
+    
+    def add(self, timestamp: float, volume: float):
+        """Record one trade."""
+        self.advance(timestamp)
+        minute = int(timestamp // BUCKET_SECONDS)
+        age = self.head - minute
+        if age >= WINDOW_BUCKETS:
+            return  # Older than the window
+        
+        idx = minute % WINDOW_BUCKETS
+        self.volumes[idx] += volume
+        self.counts[idx] += 1
+        self.volume_24h += volume
+        self.count_24h += 1
+        if age < HOUR_BUCKETS:
+            self.volume_1h += volume
+        elif age < 2 * HOUR_BUCKETS:
+            self.volume_prev_1h += volume
+        if minute < self.first_minute:
+            self.first_minute = minute
+    
+    def covered_minutes(self) -> int:
+        """Minutes of history inside the window."""
+        if self.head < 0:
+            return 0
+        return min(self.head - self.first_minute + 1, WINDOW_BUCKETS)
+
+
+@dataclass(slots=True)
 class JupiterTokenData:
     """Represents Jupiter routing data for a token."""
     token_mint: str
     first_seen: float
     total_volume_usd: float = 0.0
-    volume_24h_usd: float = 0.0
-    trade_count_24h: int = 0
     avg_slippage_bps: float = 0.0
     routing_count: int = 0
     last_trade_timestamp: float = 0.0
-    volume_history: List[tuple] = field(default_factory=list)  # (timestamp, volume)
+    volume_ring: VolumeRing = field(default_factory=VolumeRing)
+    
+    def record_trade(self, timestamp: float, volume_usd: float):
+        """Add a routed trade to the rolling counters."""
+        self.total_volume_usd += volume_usd
+        self.routing_count += 1
+        self.last_trade_timestamp = max(self.last_trade_timestamp, timestamp)
+        self.volume_ring.add(timestamp, volume_usd)
+    
+    @property
+    def volume_24h_usd(self) -> float:
+        """Rolling 24h volume."""
+        self.volume_ring.advance(time.time())
+        return self.volume_ring.volume_24h
+    
+    @property
+    def trade_count_24h(self) -> int:
+        """Rolling 24h trade count."""
+        self.volume_ring.advance(time.time())
+        return self.volume_ring.count_24h
     
     @property
     def volume_trend(self) -> str:
         """Determine volume trend: increasing, stable, decreasing."""
-        if len(self.volume_history) < 2:
+        ring = self.volume_ring
+        if ring.count_24h < 2:
             return "stable"
         
         # Compare last hour to previous hour
-        now = time.time()
-        hour_ago = now - 3600
-        two_hours_ago = now - 7200
-        
-        recent_vol = sum(v for t, v in self.volume_history if t > hour_ago)
-        prev_vol = sum(v for t, v in self.volume_history if two_hours_ago < t <= hour_ago)
+        ring.advance(time.time())
+        recent_vol = ring.volume_1h
+        prev_vol = ring.volume_prev_1h
         
         if prev_vol == 0:
             return "increasing" if recent_vol > 0 else "stable"
@@ -86,6 +204,10 @@ class JupiterTokenData:
         }
 
 
+# Approximate per-token footprint (ring buffers + record) for the memory budget
+TOKEN_FOOTPRINT_BYTES = WINDOW_BUCKETS * (8 + 4) + 1024
+
+
 class JupiterScanner:
     """
     Scanner for Jupiter aggregator activity.
@@ -106,7 +228,9 @@ class JupiterScanner:
             'jupiter', JUPITER_AGGREGATOR_V6
         )
         self.client = None
-        self._tokens: Dict[str, JupiterTokenData] = {}
+        # Ordered by last activity (least recently traded first)
+        self._tokens: "OrderedDict[str, JupiterTokenData]" = OrderedDict()
+        self._tokens_lock = threading.Lock()
         self._processed_signatures: Set[str] = set()
         self._enabled = True
         
@@ -114,8 +238,12 @@ class JupiterScanner:
         self._price_api = "https://price.jup.ag/v4/price"
         self._quote_api = "https://quote-api.jup.ag/v6/quote"
         
-        # Tracking limits
-        self._max_tracked_tokens = 200
+        # Tracking limits (count cap and memory budget for ring buffers)
+        budget_mb = self.config.get('jupiter_memory_budget_mb', 32)
+        self._max_tracked_tokens = min(
+            self.config.get('jupiter_max_tracked_tokens', 200),
+            max(1, int(budget_mb * 1024 * 1024 // TOKEN_FOOTPRINT_BYTES))
+        )
         self._signature_history_limit = 1000
         
     def connect(self, client) -> bool:
@@ -241,25 +369,22 @@ class JupiterScanner:
             # Update token tracking
             result = None
             for token_mint, volume_sol in tokens_involved:
-                if token_mint not in self._tokens:
-                    self._tokens[token_mint] = JupiterTokenData(
-                        token_mint=token_mint,
-                        first_seen=block_time
-                    )
-                
-                token = self._tokens[token_mint]
                 volume_usd = sol_to_usd(volume_sol)
                 
-                token.total_volume_usd += volume_usd
-                token.routing_count += 1
-                token.last_trade_timestamp = block_time
-                token.volume_history.append((block_time, volume_usd))
-                
-                # Keep history bounded
-                if len(token.volume_history) > 1000:
-                    token.volume_history = token.volume_history[-500:]
-                
-                result = token.to_dict()
+                with self._tokens_lock:
+                    token = self._tokens.get(token_mint)
+                    if token is None:
+                        token = JupiterTokenData(
+                            token_mint=token_mint,
+                            first_seen=block_time
+                        )
+                        self._tokens[token_mint] = token
+                    else:
+                        self._tokens.move_to_end(token_mint)
+                    
+                    token.record_trade(block_time, volume_usd)
+                    self._evict_over_budget()
+                    result = token.to_dict()
             
             return result
             
@@ -323,48 +448,32 @@ class JupiterScanner:
         return tokens
     
     def _update_volume_stats(self):
-        """Update 24h volume statistics for all tokens."""
-        now = time.time()
-        day_ago = now - 86400
-        
-        for token in self._tokens.values():
-            # Calculate 24h volume
-            vol_24h = sum(
-                v for t, v in token.volume_history
-                if t > day_ago
-            )
-            token.volume_24h_usd = vol_24h
-            
-            # Calculate 24h trade count
-            token.trade_count_24h = sum(
-                1 for t, _ in token.volume_history
-                if t > day_ago
-            )
+        """
+        Maintain tracked tokens after a scan.
         
-        # Cleanup old tokens
-        self._cleanup_inactive_tokens()
+        24h volume and trade counts are kept incrementally by each token's
+        VolumeRing, so only inactive tokens need handling here.
+        """
+        with self._tokens_lock:
+            self._cleanup_inactive_tokens()
     
     def _cleanup_inactive_tokens(self):
-        """Remove tokens inactive for more than 24 hours."""
-        now = time.time()
-        cutoff = now - 86400
-        
-        to_remove = [
-            mint for mint, token in self._tokens.items()
-            if token.last_trade_timestamp < cutoff
-        ]
-        
-        for mint in to_remove:
-            del self._tokens[mint]
-        
-        # Also limit total
-        if len(self._tokens) > self._max_tracked_tokens:
-            sorted_tokens = sorted(
-                self._tokens.items(),
-                key=lambda x: x[1].last_trade_timestamp
-            )
-            for mint, _ in sorted_tokens[:len(self._tokens) - self._max_tracked_tokens]:
-                del self._tokens[mint]
+        """Remove tokens inactive for more than 24 hours (oldest first)."""
+        cutoff = time.time() - 86400
+        tokens = self._tokens
+        
+        while tokens:
+            mint, token = next(iter(tokens.items()))
+            if token.last_trade_timestamp >= cutoff:
+                break
+            del tokens[mint]
+        
+        self._evict_over_budget()
+    
+    def _evict_over_budget(self):
+        """Evict least recently traded tokens beyond the tracking budget."""
+        while len(self._tokens) > self._max_tracked_tokens:
+            self._tokens.popitem(last=False)
     
     def is_listed(self, token_mint: str) -> bool:
         """Check if token has Jupiter routing activity."""
@@ -402,6 +511,9 @@ class JupiterScanner:
         """
         Check if token has a volume spike.
         
+        Compares last-hour volume with the average hourly volume over the
+        rest of the 24h window.
+        
         Args:
             token_mint: Token mint address
             multiplier: Spike threshold (e.g., 2.0 = 2x average)
@@ -410,23 +522,22 @@ class JupiterScanner:
             True if volume spike detected
         """
         token = self._tokens.get(token_mint)
-        if not token or len(token.volume_history) < 10:
+        if not token:
             return False
         
-        # Calculate average volume per hour
-        now = time.time()
-        hour_ago = now - 3600
-        
-        recent_vol = sum(v for t, v in token.volume_history if t > hour_ago)
+        ring = token.volume_ring
+        ring.advance(time.time())
+        if ring.count_24h < 10:
+            return False
         
         # Average over previous hours
-        older_vols = [v for t, v in token.volume_history if t <= hour_ago]
-        if not older_vols:
+        older_hours = (ring.covered_minutes() - HOUR_BUCKETS) / HOUR_BUCKETS
+        if older_hours <= 0:
             return False
         
-        avg_vol = sum(older_vols) / len(older_vols)
+        avg_vol = (ring.volume_24h - ring.volume_1h) / older_hours
         
-        return recent_vol > avg_vol * multiplier if avg_vol > 0 else False
+        return ring.volume_1h > avg_vol * multiplier if avg_vol > 0 else False
     
     def get_all_tokens(self) -> List[Dict]:
         """Get all tracked tokens."""
@@ -437,6 +548,7 @@ class JupiterScanner:
         return {
             "enabled": self._enabled,
             "tracked_tokens": len(self._tokens),
+            "max_tracked_tokens": self._max_tracked_tokens,
             "processed_signatures": len(self._processed_signatures),
             "program_id": self.program_id
         }
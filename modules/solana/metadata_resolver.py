@@ -5,13 +5,17 @@ Resolves token metadata via Metaplex:
 - Token name and symbol
 - Decimals and supply
 - Metadata URI
-- Caching with TTL
+- Caching with TTL (persisted to disk across restarts)
+- Batched getMultipleAccounts resolution
 
 Used for enriching token data beyond Pump.fun detection.
 """
+import json
+import os
 import time
 import asyncio
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass
 from functools import lru_cache
 
@@ -21,18 +25,82 @@ from .solana_utils import (
     TOKEN_PROGRAM_ID,
     solana_log,
     rate_limit_rpc,
-    is_valid_solana_address
+    is_valid_solana_address,
+    get_multiple_accounts,
+    MAX_ACCOUNTS_PER_CALL
 )
+from .uri_fetcher import get_uri_fetcher
 
 # =============================================================================
 # METAPLEX CONSTANTS
 # =============================================================================
 
-METAPLEX_PROGRAM_ID = "metaqbxxUerdq28cj1RbAqKEsbh9EwMaFQBi5kLSeled"
+METAPLEX_PROGRAM_ID = "metaqbxxUerdq28cj1RbAqKEsbh9EwMaFQBi5kLSeed"
 
 # Metadata seed for PDA derivation
 METADATA_SEED = b"metadata"
 
+@lru_cache(maxsize=65536)
+def derive_metadata_pda(mint: str) -> Optional[str]:
+    """
+    Derive Metaplex metadata PDA for a mint (memoized).
+    
+    PDA = findProgramAddress(
+        seeds = [b"metadata", METAPLEX_PROGRAM_ID, mint_pubkey],
+        program_id = METAPLEX_PROGRAM_ID
+    )
+    
+    Args:
+        mint: Token mint address
+        
+    Returns:
+        Metadata PDA address or None
+    """
+    try:
+        mint_pubkey = Pubkey.from_string(mint)
+        metaplex_pubkey = Pubkey.from_string(METAPLEX_PROGRAM_ID)
+        
+        pda, bump = Pubkey.find_program_address(
+            [METADATA_SEED, bytes(metaplex_pubkey), bytes(mint_pubkey)],
+            metaplex_pubkey
+        )
+        
+        return str(pda)
+    
+    except Exception as e:
+        solana_log(f"[META] PDA derivation error: {e}", "DEBUG")
+        return None
+
+
+SOCIAL_KEYS = ("twitter", "telegram", "website")
+
+
+def offchain_fields(offchain: Optional[Dict]) -> Dict:
+    """
+    Event fields from an off-chain URI JSON document.
+    
+    Pump.fun puts socials at the top level; Metaplex-standard JSON keeps
+    them under "extensions".
+    
+    Args:
+        offchain: URI JSON (None / {} when not fetched or unavailable)
+        
+    Returns:
+        Dict with image, description, twitter, telegram, website, has_socials
+    """
+    offchain = offchain if isinstance(offchain, dict) else {}
+    extensions = offchain.get("extensions")
+    extensions = extensions if isinstance(extensions, dict) else {}
+    
+    fields = {
+        "image": str(offchain.get("image") or ""),
+        "description": str(offchain.get("description") or "")[:500],
+    }
+    for key in SOCIAL_KEYS:
+        fields[key] = str(offchain.get(key) or extensions.get(key) or "")
+    fields["has_socials"] = any(fields[key] for key in SOCIAL_KEYS)
+    return fields
+
 
 @dataclass
 class TokenMetadata:
@@ -45,6 +113,7 @@ class TokenMetadata:
     uri: str = ""
     metadata_status: str = "RESOLVED"
     timestamp: float = None
+    offchain: Optional[Dict] = None  # URI JSON, fetched lazily
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -76,31 +145,92 @@ class MetadataResolver:
     - Mint account (decimals, supply)
     - Metadata PDA (name, symbol, uri)
     
-    Caches results with TTL.
+    Concurrent resolve() calls are collected for a short window and
+    loaded together via getMultipleAccounts (mint + metadata accounts).
+    Caches results with TTL and persists them to disk.
     """
     
-    def __init__(self, client=None, cache_ttl: int = 1800):
+    def __init__(
+        self,
+        client=None,
+        cache_ttl: int = 1800,
+        batch_window: float = 0.05,
+        max_batch: int = 50,
+        cache_file: Optional[str] = 'data/solana_metadata_cache.json',
+        persist_ttl: int = 7 * 86400
+    ):
         """
         Initialize metadata resolver.
         
         Args:
             client: Solana RPC client
             cache_ttl: Cache TTL in seconds (default 30 minutes)
+            batch_window: Seconds to collect pending mints before a batch load
+            max_batch: Flush early once this many mints are pending
+            cache_file: JSON file for the persistent cache (None disables)
+            persist_ttl: Max age of persisted entries reused after restart
         """
         self.client = client
         self.cache_ttl = cache_ttl
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.persist_ttl = persist_ttl
         self._metadata_cache: Dict[str, TokenMetadata] = {}
         self._failed_mints: Dict[str, float] = {}  # Track failed resolves
         self._skip_ttl = 300  # Don't retry failed mints for 5 minutes
+        
+        # Batch state
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batches = 0
+        self._rpc_calls = 0
+        
+        # Persistence (entries loaded from disk stay valid for persist_ttl)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._persisted: set = set()
+        self._dirty = 0
+        self._last_save = time.time()
+        self._save_interval = 60
+        self._load_from_file()
     
     def set_client(self, client):
         """Update Solana RPC client."""
         self.client = client
     
+    def _is_fresh(self, mint: str, cached: TokenMetadata) -> bool:
+        """Freshness check (persisted entries use persist_ttl)."""
+        ttl = self.persist_ttl if mint in self._persisted else self.cache_ttl
+        return cached.is_fresh(ttl)
+    
+    def _lookup(self, mint: str) -> tuple:
+        """
+        Check cache and skip list.
+        
+        Returns:
+            (hit, metadata) - hit is True when no fetch is needed
+        """
+        cached = self._metadata_cache.get(mint)
+        if cached and self._is_fresh(mint, cached):
+            solana_log(f"[META] Cache hit: {cached.symbol} ({cached.name})", "DEBUG")
+            return True, cached
+        
+        # Check skip list (recent failures)
+        if mint in self._failed_mints:
+            if time.time() - self._failed_mints[mint] < self._skip_ttl:
+                solana_log(f"[META] Skipping recent failure: {mint}", "DEBUG")
+                return True, None
+            # TTL expired, try again
+            del self._failed_mints[mint]
+        
+        return False, None
+    
     async def resolve(self, mint: str) -> Optional[TokenMetadata]:
         """
         Resolve token metadata for a mint address.
         
+        The mint joins the current batch window; all mints pending in the
+        window are loaded with one getMultipleAccounts round trip.
+        
         Args:
             mint: Solana token mint address
             
@@ -111,52 +241,105 @@ class MetadataResolver:
             solana_log(f"[META] Invalid mint address: {mint}", "WARN")
             return None
         
-        # Check cache
-        if mint in self._metadata_cache:
-            cached = self._metadata_cache[mint]
-            if cached.is_fresh(self.cache_ttl):
-                solana_log(f"[META] Cache hit: {cached.symbol} ({cached.name})", "DEBUG")
-                return cached
+        hit, metadata = self._lookup(mint)
+        if hit:
+            return metadata
         
-        # Check skip list (recent failures)
-        if mint in self._failed_mints:
-            if time.time() - self._failed_mints[mint] < self._skip_ttl:
-                solana_log(f"[META] Skipping recent failure: {mint}", "DEBUG")
-                return None
+        future = self._pending.get(mint)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[mint] = future
+            
+            if len(self._pending) >= self.max_batch:
+                self._schedule_flush(0)
+            elif self._flush_task is None:
+                self._schedule_flush(self.batch_window)
+        
+        return await asyncio.shield(future)
+    
+    def _schedule_flush(self, delay: float):
+        """Start (or restart sooner) the batch flush task."""
+        if self._flush_task is not None:
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.ensure_future(self._flush_after(delay))
+    
+    async def _flush_after(self, delay: float):
+        """Wait out the batch window, then resolve everything pending."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        if not pending:
+            return
+        
+        try:
+            results = await self.resolve_many(pending.keys())
+        except Exception as e:
+            solana_log(f"[META] Batch resolution error: {e}", "ERROR")
+            results = {}
+        
+        for mint, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(mint))
+    
+    async def resolve_many(self, mints: Iterable[str]) -> Dict[str, Optional[TokenMetadata]]:
+        """
+        Resolve metadata for many mints with batched account loads.
+        
+        Args:
+            mints: Token mint addresses
+            
+        Returns:
+            Dict of mint -> TokenMetadata (None if unresolved)
+        """
+        results: Dict[str, Optional[TokenMetadata]] = {}
+        to_fetch: List[str] = []
+        
+        for mint in dict.fromkeys(mints):
+            if not mint or not is_valid_solana_address(mint):
+                results[mint] = None
+                continue
+            hit, metadata = self._lookup(mint)
+            if hit:
+                results[mint] = metadata
             else:
-                # TTL expired, try again
-                del self._failed_mints[mint]
+                to_fetch.append(mint)
+        
+        if not to_fetch:
+            return results
         
-        # Resolve metadata
         try:
-            metadata = await self._fetch_metadata(mint)
+            fetched = await self._fetch_metadata_batch(to_fetch)
+        except Exception as e:
+            solana_log(f"[META] Batch fetch error: {e}", "ERROR")
+            fetched = {}
+        
+        now = time.time()
+        for mint in to_fetch:
+            metadata = fetched.get(mint)
+            results[mint] = metadata
             if metadata:
                 self._metadata_cache[mint] = metadata
+                self._persisted.discard(mint)
+                self._dirty += 1
                 solana_log(
                     f"[SOLANA][META] Resolved token {metadata.name} ({metadata.symbol}) "
                     f"decimals={metadata.decimals} supply={metadata.supply:,}",
                     "INFO"
                 )
-                return metadata
             else:
-                # Failed to resolve
-                self._failed_mints[mint] = time.time()
+                self._failed_mints[mint] = now
                 solana_log(f"[SOLANA][META][WARN] Metadata not found for mint {mint}", "WARN")
-                return None
         
-        except Exception as e:
-            self._failed_mints[mint] = time.time()
-            solana_log(f"[META] Resolution error for {mint}: {e}", "ERROR")
-            return None
+        self._maybe_save()
+        return results
     
     async def _fetch_metadata(self, mint: str) -> Optional[TokenMetadata]:
         """
-        Fetch metadata from Metaplex.
-        
-        Steps:
-        1. Fetch mint account (decimals, supply)
-        2. Derive metadata PDA
-        3. Fetch metadata account (name, symbol, uri)
+        Fetch metadata for a single mint from Metaplex.
         
         Args:
             mint: Token mint address
@@ -164,39 +347,55 @@ class MetadataResolver:
         Returns:
             TokenMetadata or None
         """
+        fetched = await self._fetch_metadata_batch([mint])
+        return fetched.get(mint)
+    
+    async def _fetch_metadata_batch(self, mints: List[str]) -> Dict[str, TokenMetadata]:
+        """
+        Fetch mint + metadata accounts for many mints.
+        
+        Steps:
+        1. Derive metadata PDAs (memoized)
+        2. Load [mint, pda] account pairs via chunked getMultipleAccounts
+        3. Parse mint (decimals, supply) and metadata (name, symbol, uri)
+        
+        Args:
+            mints: Token mint addresses
+            
+        Returns:
+            Dict of mint -> TokenMetadata for mints that resolved
+        """
         if not self.client:
             solana_log("[META] No RPC client available", "ERROR")
-            return None
+            return {}
         
-        try:
-            # Step 1: Get mint account info
-            rate_limit_rpc()
-            mint_pubkey = Pubkey.from_string(mint)  # Convert string to Pubkey
-            mint_info = self.client.get_account_info(mint_pubkey)
-            
-            if not mint_info.value or not mint_info.value.data:
-                return None
-            
-            # Parse mint account to get decimals and supply
-            decimals, supply = self._parse_mint_account(mint_info.value.data)
-            
-            # Step 2: Derive metadata PDA
-            metadata_pda = await self._derive_metadata_pda(mint)
-            if not metadata_pda:
-                return None
-            
-            # Step 3: Get metadata account
-            rate_limit_rpc()
-            metadata_pubkey = Pubkey.from_string(metadata_pda)  # Convert to Pubkey
-            metadata_info = self.client.get_account_info(metadata_pubkey)
-            
-            if not metadata_info.value or not metadata_info.value.data:
-                return None
+        pairs = []
+        for mint in mints:
+            pda = derive_metadata_pda(mint)
+            if pda:
+                pairs.append((mint, pda))
+        
+        if not pairs:
+            return {}
+        
+        addresses = [address for pair in pairs for address in pair]
+        accounts = await asyncio.to_thread(get_multiple_accounts, self.client, addresses)
+        self._rpc_calls += (len(addresses) + MAX_ACCOUNTS_PER_CALL - 1) // MAX_ACCOUNTS_PER_CALL
+        self._batches += 1
+        
+        resolved: Dict[str, TokenMetadata] = {}
+        for mint, pda in pairs:
+            mint_account = accounts.get(mint)
+            metadata_account = accounts.get(pda)
+            if not mint_account or not mint_account.data:
+                continue
+            if not metadata_account or not metadata_account.data:
+                continue
             
-            # Parse metadata account
-            name, symbol, uri = self._parse_metadata_account(metadata_info.value.data)
+            decimals, supply = self._parse_mint_account(bytes(mint_account.data))
+            name, symbol, uri = self._parse_metadata_account(bytes(metadata_account.data))
             
-            return TokenMetadata(
+            resolved[mint] = TokenMetadata(
                 mint=mint,
                 name=name or "UNKNOWN",
                 symbol=symbol or "???",
@@ -205,40 +404,40 @@ class MetadataResolver:
                 uri=uri or ""
             )
         
-        except Exception as e:
-            solana_log(f"[META] Fetch error: {e}", "DEBUG")
-            return None
+        solana_log(
+            f"[META] Batch loaded {len(pairs)} mints ({len(resolved)} resolved) "
+            f"in {(len(addresses) + MAX_ACCOUNTS_PER_CALL - 1) // MAX_ACCOUNTS_PER_CALL} RPC call(s)",
+            "DEBUG"
+        )
+        return resolved
     
     async def _derive_metadata_pda(self, mint: str) -> Optional[str]:
+        """Derive Metaplex metadata PDA for a mint (see derive_metadata_pda)."""
+        return derive_metadata_pda(mint)
+    
+    async def fetch_offchain_metadata(self, mint: str) -> Optional[Dict]:
         """
-        Derive Metaplex metadata PDA for a mint.
+        Fetch the off-chain URI JSON for a resolved mint.
         
-        PDA = findProgramAddress(
-            seeds = [b"metadata", METAPLEX_PROGRAM_ID, mint_pubkey],
-            program_id = METAPLEX_PROGRAM_ID
-        )
+        Lazy: only call this for tokens that passed scoring. Goes through
+        the async URI fetcher (gateway racing, size cap, CID cache); the
+        result is cached on the TokenMetadata record.
         
         Args:
             mint: Token mint address
             
         Returns:
-            Metadata PDA address or None
+            URI JSON dict or None
         """
-        try:
-            mint_pubkey = Pubkey.from_string(mint)
-            metaplex_pubkey = Pubkey.from_string(METAPLEX_PROGRAM_ID)
-            
-            # Find PDA
-            pda, bump = Pubkey.find_program_address(
-                [METADATA_SEED, metaplex_pubkey.encode(), mint_pubkey.encode()],
-                metaplex_pubkey
-            )
-            
-            return str(pda)
-        
-        except Exception as e:
-            solana_log(f"[META] PDA derivation error: {e}", "DEBUG")
+        metadata = self._metadata_cache.get(mint)
+        if not metadata or not metadata.uri:
             return None
+        if metadata.offchain is not None:
+            return metadata.offchain
+        
+        offchain = await get_uri_fetcher().fetch(metadata.uri)
+        metadata.offchain = offchain or {}
+        return metadata.offchain
     
     def _parse_mint_account(self, data: bytes) -> tuple:
         """
@@ -353,11 +552,74 @@ class MetadataResolver:
         """Clear all cached metadata."""
         self._metadata_cache.clear()
         self._failed_mints.clear()
+        self._persisted.clear()
+        self._dirty += 1
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
         return {
             "cached_tokens": len(self._metadata_cache),
+            "persisted_tokens": len(self._persisted),
             "failed_mints": len(self._failed_mints),
+            "pending_mints": len(self._pending),
+            "batches": self._batches,
+            "rpc_calls": self._rpc_calls,
+            "pda_cache": derive_metadata_pda.cache_info().currsize,
             "cache_ttl_seconds": self.cache_ttl
         }
+    
+    def _maybe_save(self):
+        """Persist the cache when enough entries changed or interval elapsed."""
+        if not self._dirty:
+            return
+        if self._dirty >= 100 or time.time() - self._last_save >= self._save_interval:
+            self.save_cache()
+    
+    def save_cache(self) -> None:
+        """Save resolved metadata to the persistence file."""
+        if not self.cache_file:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            cutoff = time.time() - self.persist_ttl
+            data = {
+                'version': 1,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'tokens': {
+                    mint: meta.to_dict()
+                    for mint, meta in self._metadata_cache.items()
+                    if meta.timestamp >= cutoff
+                }
+            }
+            
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+            
+            self._dirty = 0
+            self._last_save = time.time()
+        
+        except Exception as e:
+            solana_log(f"[META] Error saving cache: {e}", "ERROR")
+    
+    def _load_from_file(self) -> None:
+        """Load persisted metadata (entries younger than persist_ttl)."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            
+            cutoff = time.time() - self.persist_ttl
+            for mint, entry in data.get('tokens', {}).items():
+                if entry.get('timestamp', 0) < cutoff:
+                    continue
+                self._metadata_cache[mint] = TokenMetadata(**entry)
+                self._persisted.add(mint)
+            
+            solana_log(f"[META] Loaded {len(self._persisted)} cached mints from {self.cache_file}", "DEBUG")
+        
+        except Exception as e:
+            solana_log(f"[META] Error loading cache: {e}", "ERROR")
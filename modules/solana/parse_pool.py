@@ -0,0 +1,148 @@
+"""
+Transaction Parse Pool - Process-pool offload for Solana parsing
+
+Moves the CPU-heavy part of transaction handling off the event loop:
+- JSON decoding of jsonParsed getTransaction bodies
+- Instruction flattening + program filtering + detectors
+- Token transfer extraction
+
+Workers take raw response bytes and return compact event tuples
+(see raw_solana_parser.parse_raw_transaction). A bounded in-flight
+window applies backpressure: callers await once the window is full
+instead of queueing unbounded work.
+
+workers=0 parses inline (no processes), for small hosts and tests.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from . import raw_solana_parser
+from .raw_solana_parser import parse_raw_batch, parse_raw_transaction
+from .solana_utils import solana_log
+
+
+def _init_worker():
+    """Worker initializer: keep per-instruction DEBUG logs out of worker stdout."""
+    log = raw_solana_parser.solana_log
+
+    def quiet_log(message: str, level: str = "INFO"):
+        if level != "DEBUG":
+            log(message, level)
+
+    raw_solana_parser.solana_log = quiet_log
+
+
+class TransactionParsePool:
+    """
+    Process pool stage: raw getTransaction bytes -> compact event tuples.
+
+    - parse(raw): one transaction (awaits a free slot in the window)
+    - parse_many(raws): chunks the batch across workers
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 chunk_size: int = 32):
+        """
+        Initialize parse pool.
+
+        Args:
+            workers: Worker processes (None = all cores, 0 = inline parsing)
+            max_in_flight: Max submitted-but-unfinished jobs (default 4 per worker)
+            chunk_size: Transactions per worker job in parse_many
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_in_flight = max_in_flight or max(1, self.workers) * 4
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._window = asyncio.Semaphore(self.max_in_flight)
+
+        # Stats
+        self.submitted = 0
+        self.parsed = 0
+        self.events = 0
+        self.waits = 0  # Times a caller hit backpressure
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            solana_log(f"[PARSE] Process pool started ({self.workers} workers, window {self.max_in_flight})")
+        return self._executor
+
+    async def _run(self, func, arg):
+        """Run one job inside the in-flight window."""
+        if self._window.locked():
+            self.waits += 1
+        async with self._window:
+            self.submitted += 1
+            executor = self._get_executor()
+            if executor is None:
+                return func(arg)
+            return await asyncio.get_running_loop().run_in_executor(executor, func, arg)
+
+    async def parse(self, raw: bytes) -> Optional[tuple]:
+        """
+        Parse one getTransaction response body.
+
+        Args:
+            raw: Response body bytes
+
+        Returns:
+            Compact event tuple or None
+        """
+        try:
+            event = await self._run(parse_raw_transaction, raw)
+        except Exception as e:
+            solana_log(f"[PARSE] Worker error: {e}", "ERROR")
+            event = None
+        self.parsed += 1
+        if event is not None:
+            self.events += 1
+        return event
+
+    async def parse_many(self, raws: Sequence[bytes]) -> List[Optional[tuple]]:
+        """
+        Parse many response bodies, chunked across workers.
+
+        Args:
+            raws: Response body bytes
+
+        Returns:
+            Event tuples (or None) in input order
+        """
+        chunks = [list(raws[i:i + self.chunk_size]) for i in range(0, len(raws), self.chunk_size)]
+        results = await asyncio.gather(
+            *(self._run(parse_raw_batch, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        events: List[Optional[tuple]] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                solana_log(f"[PARSE] Worker error: {result}", "ERROR")
+                result = [None] * len(chunk)
+            events.extend(result)
+
+        self.parsed += len(events)
+        self.events += sum(1 for event in events if event is not None)
+        return events
+
+    def shutdown(self):
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict:
+        """Get pool statistics."""
+        return {
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "parsed": self.parsed,
+            "events": self.events,
+            "backpressure_waits": self.waits
+        }
@@ -0,0 +1,404 @@
+"""
+Solana Position Watcher - accountSubscribe on open-position liquidity
+
+Streams the accounts holding the liquidity of open Solana positions:
+- pump.fun bonding curve (real SOL reserves)
+- Raydium AMM v4 pool SOL vault (WSOL token account)
+
+Every accountNotification is decoded locally into SOL liquidity and
+handed to the on_change callback, so a liquidity pull is seen within
+one slot notification instead of on the next HTTP poll.
+"""
+import asyncio
+import base64
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .solana_utils import (
+    WRAPPED_SOL_MINT,
+    solana_log,
+    create_solana_client,
+    get_multiple_accounts,
+    decode_token_account_amount
+)
+from .pumpfun_curve import derive_bonding_curve_pda, decode_bonding_curve
+from .raydium_lp_detector import parse_raydium_pool_vaults
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+# on_change(key, mint, liquidity_sol, previous_sol, slot)
+ChangeCallback = Callable[[str, str, float, Optional[float], int], Optional[Awaitable[Any]]]
+
+
+@dataclass
+class WatchedAccount:
+    """One subscribed liquidity account."""
+    address: str
+    kind: str  # "curve" | "vault"
+    decimals: int = 9
+    weight: float = 1.0  # Raydium vault counts both pool sides (2x SOL side)
+    sol: Optional[float] = None
+
+
+class SolanaPositionWatcher:
+    """
+    accountSubscribe watcher for open-position pools and bonding curves.
+
+    - watch_position(key, mint, pool_address) resolves the liquidity
+      accounts, seeds their balances and subscribes them
+    - liquidity per position = sum of its accounts in SOL
+    - reconnects with backoff and re-subscribes everything
+    - a curve that completes (migration to Raydium) is dropped instead
+      of being reported as a liquidity pull
+    """
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        ws_url: Optional[str] = None,
+        on_change: Optional[ChangeCallback] = None,
+        client=None,
+        commitment: str = "processed"
+    ):
+        """
+        Initialize position watcher.
+
+        Args:
+            rpc_url: HTTP RPC endpoint (SOLANA_RPC_URL if None)
+            ws_url: Websocket endpoint (derived from rpc_url if None)
+            on_change: Callback for liquidity changes
+            client: Solana RPC client for seeding (created lazily if None)
+            commitment: Subscription commitment level
+        """
+        self.rpc_url = rpc_url or os.getenv('SOLANA_RPC_URL') or ""
+        self.ws_url = ws_url or self.rpc_url.replace("https://", "wss://").replace("http://", "ws://")
+        self.on_change = on_change
+        self.commitment = commitment
+        self.client = client
+        self._client_attempted = client is not None
+
+        self._positions: Dict[str, Dict] = {}  # key -> {"mint", "accounts": {address: WatchedAccount}}
+        self._owners: Dict[str, Set[str]] = {}  # account address -> position keys
+        self._subscriptions: Dict[int, str] = {}  # subscription id -> account address
+        self._by_address: Dict[str, int] = {}  # account address -> subscription id
+        self._requests: Dict[int, str] = {}  # request id -> account address
+        self._next_id = 1
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending_tasks: Set[asyncio.Task] = set()  # unsubscribes / async callbacks
+        self.is_running = False
+
+        # Stats
+        self.notifications = 0
+        self.changes = 0
+        self.reconnects = 0
+        self.last_notification = 0.0
+
+    @property
+    def available(self) -> bool:
+        """True when accounts can be streamed."""
+        return WEBSOCKETS_AVAILABLE and bool(self.ws_url)
+
+    def _get_client(self):
+        """Return the RPC client, creating one on first use."""
+        if self.client is None and not self._client_attempted:
+            self._client_attempted = True
+            self.client = create_solana_client(self.rpc_url or None)
+        return self.client
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the subscription loop."""
+        if not self.is_running and self.available:
+            self.is_running = True
+            self._task = asyncio.create_task(self._run(), name="solana-position-watcher")
+            solana_log("[WATCH] Position watcher started (accountSubscribe)")
+
+    async def stop(self):
+        """Stop the subscription loop."""
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        backoff = 1.0
+        while self.is_running:
+            try:
+                await self._stream()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                solana_log(f"[WATCH] accountSubscribe error: {e} → reconnecting in {backoff:.0f}s", "WARN")
+
+            self._ws = None
+            self._subscriptions.clear()
+            self._by_address.clear()
+            self._requests.clear()
+            if not self.is_running:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _stream(self):
+        """Subscribe every watched account and read notifications until the socket drops."""
+        async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+            self._ws = ws
+            for address in list(self._owners):
+                await self._subscribe(address)
+
+            async for message in ws:
+                if not self.is_running:
+                    return
+                self.handle_message(json.loads(message))
+
+    # -------------------------------------------------------------------------
+    # Positions
+    # -------------------------------------------------------------------------
+
+    async def watch_position(self, key: str, mint: str, pool_address: Optional[str] = None) -> bool:
+        """
+        Start streaming liquidity for a position.
+
+        Args:
+            key: Caller's position key (e.g. position id)
+            mint: Token mint
+            pool_address: Raydium AMM v4 pool address, if known
+
+        Returns:
+            True if at least one liquidity account is watched
+        """
+        existing = self._positions.get(key)
+        if existing and existing["accounts"] and (pool_address is None or existing.get("pool_address") == pool_address):
+            return True
+
+        # New position, new pool, or every account dropped (e.g. curve completed)
+        accounts = await asyncio.to_thread(self._resolve_accounts, mint, pool_address)
+        if not accounts:
+            if existing and not existing["accounts"]:
+                self.unwatch_position(key)
+                return False
+            return existing is not None
+
+        if existing:
+            self.unwatch_position(key)
+
+        self._positions[key] = {
+            "mint": mint,
+            "pool_address": pool_address,
+            "accounts": {account.address: account for account in accounts}
+        }
+        for account in accounts:
+            owners = self._owners.setdefault(account.address, set())
+            owners.add(key)
+            if len(owners) == 1 and self._ws is not None:
+                await self._subscribe(account.address)
+
+        solana_log(f"[WATCH] Watching {mint[:8]}... ({', '.join(a.kind for a in accounts)})", "DEBUG")
+        return True
+
+    def unwatch_position(self, key: str):
+        """Stop streaming a position (e.g. after exit)."""
+        position = self._positions.pop(key, None)
+        if not position:
+            return
+        for address in position["accounts"]:
+            self._release(address, key)
+
+    def _release(self, address: str, key: str):
+        owners = self._owners.get(address)
+        if owners is None:
+            return
+        owners.discard(key)
+        if owners:
+            return
+        del self._owners[address]
+        subscription = self._by_address.pop(address, None)
+        if subscription is not None:
+            self._subscriptions.pop(subscription, None)
+            if self._ws is not None:
+                self._spawn(self._send("accountUnsubscribe", [subscription]))
+
+    def watched_keys(self) -> List[str]:
+        return list(self._positions)
+
+    def is_watching(self, key: str) -> bool:
+        """True while the position has at least one subscribed account."""
+        position = self._positions.get(key)
+        return bool(position and position["accounts"])
+
+    def get_liquidity(self, key: str) -> Optional[float]:
+        """Current liquidity of a position in SOL (None if unknown)."""
+        position = self._positions.get(key)
+        if not position:
+            return None
+        values = [a.sol * a.weight for a in position["accounts"].values() if a.sol is not None]
+        return sum(values) if values else None
+
+    def _resolve_accounts(self, mint: str, pool_address: Optional[str]) -> List[WatchedAccount]:
+        """Resolve and seed the liquidity accounts of a mint (sync, batched)."""
+        client = self._get_client()
+        if client is None:
+            return []
+
+        curve_address = derive_bonding_curve_pda(mint)
+        loaded = get_multiple_accounts(client, [curve_address, pool_address])
+
+        accounts: List[WatchedAccount] = []
+
+        curve = loaded.get(curve_address) if curve_address else None
+        if curve:
+            state = decode_bonding_curve(mint, bytes(curve.data))
+            if state and not state.complete:
+                accounts.append(WatchedAccount(curve_address, "curve", sol=state.real_sol))
+
+        pool = loaded.get(pool_address) if pool_address else None
+        vaults = parse_raydium_pool_vaults(bytes(pool.data)) if pool else None
+        if vaults:
+            if vaults["quote_mint"] == WRAPPED_SOL_MINT:
+                vault, decimals = vaults["quote_vault"], vaults["quote_decimals"]
+            elif vaults["base_mint"] == WRAPPED_SOL_MINT:
+                vault, decimals = vaults["base_vault"], vaults["base_decimals"]
+            else:
+                vault = None  # Non-SOL pair: not expressed in SOL
+
+            if vault:
+                amount = None
+                vault_account = get_multiple_accounts(client, [vault]).get(vault)
+                if vault_account:
+                    raw = decode_token_account_amount(bytes(vault_account.data))
+                    amount = raw / (10 ** decimals) if raw is not None else None
+                accounts.append(WatchedAccount(vault, "vault", decimals=decimals, weight=2.0, sol=amount))
+
+        return accounts
+
+    # -------------------------------------------------------------------------
+    # Websocket protocol
+    # -------------------------------------------------------------------------
+
+    async def _send(self, method: str, params: list) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            await self._ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        except Exception as e:
+            solana_log(f"[WATCH] {method} send error: {e}", "DEBUG")
+        return request_id
+
+    async def _subscribe(self, address: str):
+        request_id = await self._send(
+            "accountSubscribe",
+            [address, {"encoding": "base64", "commitment": self.commitment}]
+        )
+        self._requests[request_id] = address
+
+    def handle_message(self, data: Dict):
+        """Process one websocket message (subscription ack or accountNotification)."""
+        if "id" in data:
+            address = self._requests.pop(data["id"], None)
+            if address is not None and isinstance(data.get("result"), int):
+                if address in self._owners:
+                    self._subscriptions[data["result"]] = address
+                    self._by_address[address] = data["result"]
+                elif self._ws is not None:
+                    # Unwatched before the ack arrived
+                    self._spawn(self._send("accountUnsubscribe", [data["result"]]))
+            return
+
+        if data.get("method") != "accountNotification":
+            return
+
+        params = data.get("params", {})
+        address = self._subscriptions.get(params.get("subscription"))
+        if address is None:
+            return
+
+        result = params.get("result", {})
+        slot = result.get("context", {}).get("slot", 0)
+        value = result.get("value") or {}
+        encoded = value.get("data")
+        raw = base64.b64decode(encoded[0]) if isinstance(encoded, list) and encoded else b""
+
+        self.notifications += 1
+        self.last_notification = time.time()
+        self.apply_account_data(address, raw, slot)
+
+    def apply_account_data(self, address: str, raw: bytes, slot: int = 0):
+        """Decode new account data and report liquidity changes of owning positions."""
+        for key in list(self._owners.get(address, ())):
+            position = self._positions.get(key)
+            if not position:
+                continue
+            account = position["accounts"].get(address)
+            if account is None:
+                continue
+
+            if account.kind == "curve":
+                state = decode_bonding_curve(position["mint"], raw)
+                if state is None:
+                    continue
+                if state.complete:
+                    # Migration, not a pull: liquidity moves to the Raydium pool
+                    solana_log(f"[WATCH] {position['mint'][:8]}... curve complete, dropping curve watch", "DEBUG")
+                    del position["accounts"][address]
+                    self._release(address, key)
+                    continue
+                sol = state.real_sol
+            else:
+                amount = decode_token_account_amount(raw)
+                if amount is None:
+                    continue
+                sol = amount / (10 ** account.decimals)
+
+            if sol == account.sol:
+                continue
+
+            previous = self.get_liquidity(key)
+            account.sol = sol
+            self.changes += 1
+            self._emit(key, position["mint"], self.get_liquidity(key), previous, slot)
+
+    def _emit(self, key: str, mint: str, liquidity: float, previous: Optional[float], slot: int):
+        if self.on_change is None:
+            return
+        try:
+            result = self.on_change(key, mint, liquidity, previous, slot)
+            if asyncio.iscoroutine(result):
+                self._spawn(result)
+        except Exception as e:
+            solana_log(f"[WATCH] on_change error: {e}", "ERROR")
+
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+
+    def get_stats(self) -> Dict:
+        """Get watcher statistics."""
+        return {
+            "running": self.is_running,
+            "connected": self._ws is not None,
+            "positions": len(self._positions),
+            "accounts": len(self._owners),
+            "subscriptions": len(self._subscriptions),
+            "notifications": self.notifications,
+            "changes": self.changes,
+            "reconnects": self.reconnects,
+            "last_notification_age": round(time.time() - self.last_notification, 1) if self.last_notification else None
+        }
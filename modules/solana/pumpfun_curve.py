@@ -0,0 +1,383 @@
+"""
+Pump.fun Bonding Curve Reader
+
+Decodes pump.fun bonding-curve accounts directly from chain:
+- Bonding curve PDA derivation (memoized)
+- Virtual / real reserves and `complete` flag
+- Local progress, price and graduation computation
+- Batched getMultipleAccounts reads with a short TTL cache
+
+Replaces per-mint Moralis HTTP calls on the signal hot path; Moralis
+remains the fallback when no RPC client is available.
+"""
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from .solana_utils import (
+    PUMPFUN_PROGRAM_ID,
+    solana_log,
+    is_valid_solana_address,
+    create_solana_client,
+    get_multiple_accounts
+)
+
+# =============================================================================
+# BONDING CURVE LAYOUT
+# =============================================================================
+
+BONDING_CURVE_SEED = b"bonding-curve"
+
+# Anchor account: 8-byte discriminator followed by the curve state
+BONDING_CURVE_VIRTUAL_TOKEN_OFFSET = 8
+BONDING_CURVE_VIRTUAL_SOL_OFFSET = 16
+BONDING_CURVE_REAL_TOKEN_OFFSET = 24
+BONDING_CURVE_REAL_SOL_OFFSET = 32
+BONDING_CURVE_TOTAL_SUPPLY_OFFSET = 40
+BONDING_CURVE_COMPLETE_OFFSET = 48
+BONDING_CURVE_MIN_SIZE = 49
+
+# Real token reserves at launch (793.1M tokens, 6 decimals); progress is
+# the share of these sold into the curve
+PUMPFUN_INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+PUMPFUN_TOKEN_DECIMALS = 6
+
+
+@lru_cache(maxsize=65536)
+def derive_bonding_curve_pda(mint: str) -> Optional[str]:
+    """
+    Derive the pump.fun bonding curve PDA for a mint (memoized).
+
+    PDA = findProgramAddress(
+        seeds = [b"bonding-curve", mint_pubkey],
+        program_id = PUMPFUN_PROGRAM_ID
+    )
+
+    Args:
+        mint: Token mint address
+
+    Returns:
+        Bonding curve address or None
+    """
+    try:
+        from solders.pubkey import Pubkey
+
+        program_pubkey = Pubkey.from_string(PUMPFUN_PROGRAM_ID)
+        pda, bump = Pubkey.find_program_address(
+            [BONDING_CURVE_SEED, bytes(Pubkey.from_string(mint))],
+            program_pubkey
+        )
+        return str(pda)
+
+    except Exception as e:
+        solana_log(f"[CURVE] PDA derivation error: {e}", "DEBUG")
+        return None
+
+
+@dataclass
+class BondingCurveState:
+    """Decoded pump.fun bonding curve account."""
+    mint: str
+    virtual_token_reserves: int
+    virtual_sol_reserves: int
+    real_token_reserves: int
+    real_sol_reserves: int
+    token_total_supply: int
+    complete: bool
+    timestamp: float = None
+
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = time.time()
+
+    @property
+    def progress(self) -> float:
+        """Bonding progress in percent (100 once complete)."""
+        if self.complete:
+            return 100.0
+        sold = PUMPFUN_INITIAL_REAL_TOKEN_RESERVES - self.real_token_reserves
+        return max(0.0, min(100.0, sold * 100 / PUMPFUN_INITIAL_REAL_TOKEN_RESERVES))
+
+    @property
+    def is_graduated(self) -> bool:
+        return self.complete
+
+    @property
+    def price_sol(self) -> float:
+        """Spot price in SOL per token from virtual reserves."""
+        if not self.virtual_token_reserves:
+            return 0.0
+        sol = self.virtual_sol_reserves / 1_000_000_000
+        tokens = self.virtual_token_reserves / (10 ** PUMPFUN_TOKEN_DECIMALS)
+        return sol / tokens
+
+    @property
+    def real_sol(self) -> float:
+        return self.real_sol_reserves / 1_000_000_000
+
+    def to_dict(self) -> Dict:
+        """Convert to dict output (same keys as MoralisClient.check_bonding_status)."""
+        return {
+            "mint": self.mint,
+            "is_graduated": self.is_graduated,
+            "progress": round(self.progress, 2),
+            "price_sol": self.price_sol,
+            "real_sol": self.real_sol,
+            "source": "onchain",
+            "error": None
+        }
+
+
+def decode_bonding_curve(mint: str, data: bytes) -> Optional[BondingCurveState]:
+    """
+    Decode a pump.fun bonding curve account.
+
+    Args:
+        mint: Token mint the curve belongs to
+        data: Raw account data
+
+    Returns:
+        BondingCurveState or None if data is too short
+    """
+    if not data or len(data) < BONDING_CURVE_MIN_SIZE:
+        return None
+
+    def u64(offset: int) -> int:
+        return int.from_bytes(data[offset:offset + 8], byteorder='little')
+
+    return BondingCurveState(
+        mint=mint,
+        virtual_token_reserves=u64(BONDING_CURVE_VIRTUAL_TOKEN_OFFSET),
+        virtual_sol_reserves=u64(BONDING_CURVE_VIRTUAL_SOL_OFFSET),
+        real_token_reserves=u64(BONDING_CURVE_REAL_TOKEN_OFFSET),
+        real_sol_reserves=u64(BONDING_CURVE_REAL_SOL_OFFSET),
+        token_total_supply=u64(BONDING_CURVE_TOTAL_SUPPLY_OFFSET),
+        complete=data[BONDING_CURVE_COMPLETE_OFFSET] != 0
+    )
+
+
+class BondingCurveReader:
+    """
+    Reads pump.fun bonding curve state for many mints at once.
+
+    Concurrent get_state() calls are collected for a short window and
+    loaded with one getMultipleAccounts round trip (chunked at 100).
+    Graduated curves never change and stay cached until evicted; active
+    curves are cached for cache_ttl seconds. Both caches are LRU-bounded
+    at max_entries.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        cache_ttl: float = 10.0,
+        batch_window: float = 0.05,
+        max_batch: int = 100,
+        max_entries: int = 20000
+    ):
+        """
+        Initialize bonding curve reader.
+
+        Args:
+            client: Solana RPC client (created lazily from SOLANA_RPC_URL if None)
+            cache_ttl: Cache TTL for active curves in seconds
+            batch_window: Seconds to collect pending mints before a batch load
+            max_batch: Flush early once this many mints are pending
+            max_entries: Max cached curves / missing mints (oldest dropped first)
+        """
+        self.client = client
+        self.cache_ttl = cache_ttl
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, BondingCurveState]" = OrderedDict()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()  # mint -> time no curve was found
+        self._client_attempted = client is not None
+
+        # Batch state
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batches = 0
+
+    def set_client(self, client):
+        """Update Solana RPC client."""
+        self.client = client
+        self._client_attempted = True
+
+    def _get_client(self):
+        """Return the RPC client, creating one on first use."""
+        if self.client is None and not self._client_attempted:
+            self._client_attempted = True
+            self.client = create_solana_client(os.getenv('SOLANA_RPC_URL'))
+        return self.client
+
+    @property
+    def available(self) -> bool:
+        """True when curves can be read on-chain."""
+        return self._get_client() is not None
+
+    def _lookup(self, mint: str) -> tuple:
+        """
+        Check cache and missing list.
+
+        Returns:
+            (hit, state) - hit is True when no fetch is needed
+        """
+        now = time.time()
+        cached = self._cache.get(mint)
+        if cached and (cached.complete or now - cached.timestamp < self.cache_ttl):
+            self._cache.move_to_end(mint)
+            return True, cached
+
+        missing_at = self._missing.get(mint)
+        if missing_at is not None:
+            if now - missing_at < self.cache_ttl:
+                return True, None
+            del self._missing[mint]
+
+        return False, None
+
+    def _store(self, mint: str, state: BondingCurveState):
+        """Cache a curve, evicting the least recently used past max_entries."""
+        self._cache[mint] = state
+        self._cache.move_to_end(mint)
+        self._missing.pop(mint, None)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _remember_missing(self, mint: str, now: float):
+        """Negatively cache a mint; expired and excess entries are dropped."""
+        self._missing.pop(mint, None)
+        self._missing[mint] = now
+        while self._missing:
+            oldest_mint, missing_at = next(iter(self._missing.items()))
+            if now - missing_at < self.cache_ttl and len(self._missing) <= self.max_entries:
+                break
+            del self._missing[oldest_mint]
+
+    def fetch_states(self, mints: Iterable[str]) -> Dict[str, Optional[BondingCurveState]]:
+        """
+        Read bonding curve state for many mints (sync, batched).
+
+        Args:
+            mints: Token mint addresses
+
+        Returns:
+            Dict of mint -> BondingCurveState (None if the mint has no curve)
+        """
+        results: Dict[str, Optional[BondingCurveState]] = {}
+        to_fetch: Dict[str, str] = {}  # curve address -> mint
+
+        for mint in mints:
+            if mint in results:
+                continue
+            hit, state = self._lookup(mint)
+            if hit:
+                results[mint] = state
+                continue
+            curve = derive_bonding_curve_pda(mint) if is_valid_solana_address(mint) else None
+            results[mint] = None
+            if curve:
+                to_fetch[curve] = mint
+
+        client = self._get_client()
+        if not to_fetch or client is None:
+            return results
+
+        self._batches += 1
+        accounts = get_multiple_accounts(client, list(to_fetch))
+        now = time.time()
+
+        for curve, mint in to_fetch.items():
+            account = accounts.get(curve)
+            state = decode_bonding_curve(mint, bytes(account.data)) if account else None
+            if state:
+                self._store(mint, state)
+            else:
+                self._remember_missing(mint, now)
+            results[mint] = state
+
+        return results
+
+    async def get_state(self, mint: str) -> Optional[BondingCurveState]:
+        """
+        Get bonding curve state for a mint.
+
+        The mint joins the current batch window; all mints pending in the
+        window are read with one getMultipleAccounts round trip.
+
+        Args:
+            mint: Token mint address
+
+        Returns:
+            BondingCurveState or None if the mint has no pump.fun curve
+        """
+        hit, state = self._lookup(mint)
+        if hit:
+            return state
+
+        future = self._pending.get(mint)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[mint] = future
+
+            if len(self._pending) >= self.max_batch:
+                self._schedule_flush(0)
+            elif self._flush_task is None:
+                self._schedule_flush(self.batch_window)
+
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self, delay: float):
+        """Start (or restart sooner) the batch flush task."""
+        if self._flush_task is not None:
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.ensure_future(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        """Wait out the batch window, then read everything pending."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        if not pending:
+            return
+
+        try:
+            results = await asyncio.to_thread(self.fetch_states, list(pending))
+        except Exception as e:
+            solana_log(f"[CURVE] Batch read error: {e}", "ERROR")
+            results = {}
+
+        for mint, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(mint))
+
+    def get_stats(self) -> Dict:
+        """Get reader statistics."""
+        return {
+            "cached_curves": len(self._cache),
+            "graduated": sum(1 for s in self._cache.values() if s.complete),
+            "missing": len(self._missing),
+            "pending_mints": len(self._pending),
+            "batches": self._batches,
+            "client": self.client is not None
+        }
+
+
+# Singleton instance
+_bonding_curve_reader = None
+
+def get_bonding_curve_reader() -> BondingCurveReader:
+    """Get or create singleton BondingCurveReader instance."""
+    global _bonding_curve_reader
+    if _bonding_curve_reader is None:
+        _bonding_curve_reader = BondingCurveReader()
+    return _bonding_curve_reader
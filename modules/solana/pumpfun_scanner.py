@@ -28,7 +28,7 @@ from config import SOLANA_ALCHEMY_SAFE_CONFIG
 import asyncio
 
 
-@dataclass
+@dataclass(slots=True)
 class PumpfunToken:
     """Represents a token detected from Pump.fun."""
     token_address: str
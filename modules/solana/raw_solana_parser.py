@@ -24,12 +24,12 @@ from .solana_utils import (
     solana_log,
     parse_lamports_to_sol,
     sol_to_usd,
+    extract_token_transfers,
     PUMPFUN_PROGRAM_ID,
     RAYDIUM_AMM_PROGRAM_ID,
     TOKEN_PROGRAM_ID
 )
 from .token_state import TokenStateMachine, TokenState, TokenStateRecord
-from .token_state import TokenStateMachine, TokenState
 
 
 # =============================================================================
@@ -76,17 +76,9 @@ class RawSolanaFetcher:
         if self.session:
             await self.session.close()
 
-    async def fetch_transaction(self, signature: str) -> Optional[RawTransactionResponse]:
-        """
-        Fetch transaction using raw JSON-RPC getTransaction.
-
-        Args:
-            signature: Transaction signature
-
-        Returns:
-            RawTransactionResponse or None if failed/null
-        """
-        payload = {
+    @staticmethod
+    def _payload(signature: str) -> Dict:
+        return {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "getTransaction",
@@ -100,10 +92,51 @@ class RawSolanaFetcher:
             ]
         }
 
+    async def fetch_raw(self, signature: str) -> Optional[bytes]:
+        """
+        Fetch the undecoded getTransaction response body.
+
+        JSON decoding is left to the caller (e.g. a TransactionParsePool
+        worker) so it does not run on the event loop thread.
+
+        Args:
+            signature: Transaction signature
+
+        Returns:
+            Response body bytes or None if the request failed
+        """
+        try:
+            async with self.session.post(
+                self.rpc_url,
+                json=self._payload(signature),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    solana_log(f"RPC error {response.status} for {signature[:8]}", "ERROR")
+                    return None
+                return await response.read()
+
+        except asyncio.TimeoutError:
+            solana_log(f"[SOLANA][RAW] timeout fetching {signature[:8]}", "DEBUG")
+            return None
+        except Exception as e:
+            solana_log(f"[SOLANA][RAW] error fetching {signature[:8]}: {e}", "ERROR")
+            return None
+
+    async def fetch_transaction(self, signature: str) -> Optional[RawTransactionResponse]:
+        """
+        Fetch transaction using raw JSON-RPC getTransaction.
+
+        Args:
+            signature: Transaction signature
+
+        Returns:
+            RawTransactionResponse or None if failed/null
+        """
         try:
             async with self.session.post(
                 self.rpc_url,
-                json=payload,
+                json=self._payload(signature),
                 timeout=aiohttp.ClientTimeout(total=self.timeout)
             ) as response:
                 if response.status != 200:
@@ -144,14 +177,104 @@ class RawSolanaFetcher:
 # INSTRUCTION FLATTENING
 # =============================================================================
 
-@dataclass
+# Small-integer codes for the hardcoded programs. Instructions carry the code
+# so filtering and detector dispatch compare ints instead of base58 strings.
+PROGRAM_UNKNOWN = -1
+PROGRAM_PUMPFUN = 0
+PROGRAM_RAYDIUM_AMM = 1
+PROGRAM_SPL_TOKEN = 2
+
+PROGRAM_CODES: Dict[str, int] = {
+    PROGRAM_IDS['pumpfun']: PROGRAM_PUMPFUN,
+    PROGRAM_IDS['raydium_amm']: PROGRAM_RAYDIUM_AMM,
+    PROGRAM_IDS['spl_token']: PROGRAM_SPL_TOKEN,
+}
+
+
+class AccountKeyTable:
+    """
+    Per-transaction account-key table.
+
+    Each pubkey is stored once and referenced by its index in the message,
+    so instructions only hold small integers.
+    """
+
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, account_keys: List[Any]):
+        # New format entries are objects ({'pubkey': ...}); normalize each
+        # entry so a list mixing objects and plain strings still resolves
+        keys = [acc.get('pubkey', '') if isinstance(acc, dict) else acc for acc in account_keys]
+        self.keys: List[str] = keys
+        self.index: Optional[Dict[str, int]] = {key: i for i, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def index_of(self, pubkey: str) -> int:
+        """Resolve an already-resolved pubkey string to its table index."""
+        idx = self.index.get(pubkey)
+        if idx is None:
+            # Not in the static keys (e.g. loaded from a lookup table)
+            idx = len(self.keys)
+            self.keys.append(pubkey)
+            self.index[pubkey] = idx
+        return idx
+
+    def release_index(self):
+        """Drop the reverse lookup dict once resolution is done."""
+        self.index = None
+
+
 class FlatInstruction:
-    """Flattened instruction with all context."""
-    program_id: str
-    accounts: List[str]
-    data: Any
-    instruction_type: Optional[str] = None
-    parsed: Optional[Dict] = None
+    """Flattened instruction with all context (compact, index-based)."""
+
+    __slots__ = (
+        'program_code', 'program_index', 'account_indices',
+        'data', 'instruction_type', 'parsed', 'key_table'
+    )
+
+    def __init__(
+        self,
+        program_code: int,
+        program_index: int,
+        account_indices: Tuple[int, ...],
+        data: Any,
+        key_table: AccountKeyTable,
+        instruction_type: Optional[str] = None,
+        parsed: Optional[Dict] = None
+    ):
+        self.program_code = program_code
+        self.program_index = program_index
+        self.account_indices = account_indices
+        self.data = data
+        self.key_table = key_table
+        self.instruction_type = instruction_type
+        self.parsed = parsed
+
+    @property
+    def program_id(self) -> str:
+        """Program ID as base58 string."""
+        return self.key_table.keys[self.program_index]
+
+    @property
+    def accounts(self) -> List[str]:
+        """Instruction accounts as base58 strings."""
+        keys = self.key_table.keys
+        return [keys[i] for i in self.account_indices]
+
+    def account(self, position: int) -> Optional[str]:
+        """Resolve a single instruction account without building the list."""
+        if position >= len(self.account_indices):
+            return None
+        return self.key_table.keys[self.account_indices[position]]
+
+    def __repr__(self) -> str:
+        return (
+            f"FlatInstruction(program_id={self.program_id!r}, "
+            f"accounts={len(self.account_indices)}, "
+            f"instruction_type={self.instruction_type!r})"
+        )
 
 
 class InstructionFlattener:
@@ -176,125 +299,113 @@ class InstructionFlattener:
 
         # Get account keys for resolving indices
         message = tx_response.transaction.get('message', {})
-        account_keys = message.get('accountKeys', [])
-        
-        solana_log(f"[SOLANA][RAW] message keys: {list(message.keys())}", "DEBUG")
-        solana_log(f"[SOLANA][RAW] account keys count: {len(account_keys)}", "DEBUG")
-        
-        # Check if account keys are in the right format
-        if account_keys and isinstance(account_keys[0], dict):
-            # Handle new format where accountKeys is array of objects
-            account_keys = [acc.get('pubkey', '') for acc in account_keys]
-            solana_log(f"[SOLANA][RAW] converted account keys to strings: {len(account_keys)}", "DEBUG")
+        key_table = AccountKeyTable(message.get('accountKeys', []))
 
         # 1. Top-level instructions
         top_level = message.get('instructions', [])
-        solana_log(f"[SOLANA][RAW] top-level instructions: {len(top_level)}", "DEBUG")
-        
-        # Debug first instruction if exists
-        if top_level:
-            first_instr = top_level[0]
-            solana_log(f"[SOLANA][RAW] first instruction keys: {list(first_instr.keys())}", "DEBUG")
-            if 'programIdIndex' in first_instr:
-                solana_log(f"[SOLANA][RAW] programIdIndex: {first_instr['programIdIndex']}", "DEBUG")
-        
+        parse = InstructionFlattener._parse_instruction
+
         for instr in top_level:
-            flat = InstructionFlattener._parse_instruction(instr, account_keys)
+            flat = parse(instr, key_table)
             if flat:
                 instructions.append(flat)
 
         # 2. Inner instructions (CRITICAL for Pump.fun + Raydium)
+        inner_instructions = []
         if tx_response.meta:
-            inner_instructions = tx_response.meta.get('innerInstructions', [])
-            solana_log(f"[SOLANA][RAW] inner instruction groups: {len(inner_instructions)}", "DEBUG")
+            inner_instructions = tx_response.meta.get('innerInstructions') or []
             for inner_group in inner_instructions:
-                inner_instrs = inner_group.get('instructions', [])
-                solana_log(f"[SOLANA][RAW] inner instructions in group: {len(inner_instrs)}", "DEBUG")
-                for instr in inner_instrs:
-                    flat = InstructionFlattener._parse_instruction(instr, account_keys)
+                for instr in inner_group.get('instructions', []):
+                    flat = parse(instr, key_table)
                     if flat:
                         instructions.append(flat)
 
-        solana_log(f"[SOLANA][RAW] total instructions: {len(instructions)}", "DEBUG")
+        # The reverse index is only needed while resolving; drop it so
+        # retained instructions don't keep a dict per transaction alive
+        key_table.release_index()
+
+        solana_log(
+            f"[SOLANA][RAW] flattened {len(instructions)} instructions "
+            f"(top-level={len(top_level)}, inner groups={len(inner_instructions)}, "
+            f"keys={len(key_table)})",
+            "DEBUG"
+        )
         return instructions
 
     @staticmethod
-    def _parse_instruction(instr: Dict, account_keys: List[str]) -> Optional[FlatInstruction]:
+    def _parse_instruction(instr: Dict, key_table: AccountKeyTable) -> Optional[FlatInstruction]:
         """Parse single instruction into FlatInstruction."""
         try:
-            # Debug: log instruction structure
-            solana_log(f"[SOLANA][RAW] parsing instruction: keys={list(instr.keys())}", "DEBUG")
-            
-            # Handle both old and new instruction formats
-            program_id = None
-            
+            keys = key_table.keys
+
             # Format 1: New format with direct programId
-            if 'programId' in instr:
-                program_id = instr['programId']
-                solana_log(f"[SOLANA][RAW] using direct programId: {program_id[:8]}...", "DEBUG")
+            program_id = instr.get('programId')
+            if program_id is not None:
+                program_index = key_table.index_of(program_id)
             # Format 2: Old format with programIdIndex
-            elif 'programIdIndex' in instr:
-                program_id_index = instr.get('programIdIndex')
-                if program_id_index is None:
-                    solana_log(f"[SOLANA][RAW] no programIdIndex in instruction", "DEBUG")
-                    return None
-                    
-                if program_id_index >= len(account_keys):
-                    solana_log(f"[SOLANA][RAW] programIdIndex {program_id_index} >= account_keys {len(account_keys)}", "DEBUG")
+            else:
+                program_index = instr.get('programIdIndex')
+                if program_index is None or program_index >= len(keys):
+                    solana_log(f"[SOLANA][RAW] invalid programIdIndex {program_index} (keys: {len(keys)})", "DEBUG")
                     return None
-
-                program_id = account_keys[program_id_index]
-                solana_log(f"[SOLANA][RAW] resolved programId from index: {program_id[:8]}...", "DEBUG")
+                program_id = keys[program_index]
+
+            # Resolve accounts to table indices
+            accounts = instr.get('accounts')
+            if not accounts:
+                account_indices = ()
+            elif isinstance(accounts[0], str):
+                # Already-resolved string addresses (jsonParsed / versioned tx)
+                index = key_table.index
+                try:
+                    account_indices = tuple([index[acc] for acc in accounts])
+                except (KeyError, TypeError):
+                    account_indices = InstructionFlattener._resolve_accounts(accounts, key_table)
             else:
-                solana_log(f"[SOLANA][RAW] no programId or programIdIndex in instruction", "DEBUG")
-                return None
-
-            # Resolve accounts
-            accounts = []
-            instr_accounts = instr.get('accounts', [])
-            solana_log(f"[SOLANA][RAW] instruction accounts: {len(instr_accounts)}", "DEBUG")
-            
-            for acc_idx in instr_accounts:
-                # Handle both formats:
-                # 1. Integer indices (old format or non-versioned tx)
-                # 2. Already-resolved string addresses (versioned tx with lookup tables)
-                if isinstance(acc_idx, int):
-                    # Integer index - resolve from account_keys
-                    if acc_idx < len(account_keys):
-                        accounts.append(account_keys[acc_idx])
-                    else:
-                        solana_log(f"[SOLANA][RAW] account index {acc_idx} out of range (max: {len(account_keys)-1})", "DEBUG")
-                elif isinstance(acc_idx, str):
-                    # Already resolved address (versioned tx)
-                    accounts.append(acc_idx)
-                else:
-                    solana_log(f"[SOLANA][RAW] unknown account format: {type(acc_idx)}", "DEBUG")
-
-            # Get data and parsed info
-            data = instr.get('data', '')
-            parsed = instr.get('parsed')
+                # Integer indices (old format or non-versioned tx)
+                account_indices = tuple(accounts)
+                try:
+                    in_range = min(account_indices) >= 0 and max(account_indices) < len(keys)
+                except TypeError:
+                    # Indices mixed with str keys: resolve entry by entry
+                    in_range = False
+                if not in_range:
+                    account_indices = InstructionFlattener._resolve_accounts(accounts, key_table)
 
             # Extract instruction type if available
-            instruction_type = None
-            if parsed and isinstance(parsed, dict):
-                instruction_type = parsed.get('type')
-                solana_log(f"[SOLANA][RAW] instruction type: {instruction_type}", "DEBUG")
-
-            flat = FlatInstruction(
-                program_id=program_id,
-                accounts=accounts,
-                data=data,
+            parsed = instr.get('parsed')
+            instruction_type = parsed.get('type') if isinstance(parsed, dict) else None
+
+            return FlatInstruction(
+                program_code=PROGRAM_CODES.get(program_id, PROGRAM_UNKNOWN),
+                program_index=program_index,
+                account_indices=account_indices,
+                data=instr.get('data', ''),
+                key_table=key_table,
                 instruction_type=instruction_type,
                 parsed=parsed
             )
-            
-            solana_log(f"[SOLANA][RAW] ✓ parsed instruction: {program_id[:8]}... ({instruction_type})", "DEBUG")
-            return flat
 
         except Exception as e:
             solana_log(f"[SOLANA][RAW] Error parsing instruction: {e}", "ERROR")
             return None
 
+    @staticmethod
+    def _resolve_accounts(accounts: List[Any], key_table: AccountKeyTable) -> Tuple[int, ...]:
+        """Slow path: mixed formats, lookup-table keys or out-of-range indices."""
+        resolved = []
+        for acc in accounts:
+            if isinstance(acc, int):
+                if 0 <= acc < len(key_table.keys):
+                    resolved.append(acc)
+                else:
+                    solana_log(f"[SOLANA][RAW] account index {acc} out of range (max: {len(key_table.keys)-1})", "DEBUG")
+            elif isinstance(acc, str):
+                resolved.append(key_table.index_of(acc))
+            else:
+                solana_log(f"[SOLANA][RAW] unknown account format: {type(acc)}", "DEBUG")
+        return tuple(resolved)
+
 
 # =============================================================================
 # PROGRAM ID FILTERING
@@ -318,21 +429,32 @@ class ProgramFilter:
         Returns:
             Filtered instructions from known programs
         """
-        known_programs = set(PROGRAM_IDS.values())
-        filtered = []
-
-        solana_log(f"[SOLANA][RAW] filtering {len(instructions)} instructions", "DEBUG")
-        
-        for instr in instructions:
-            if instr.program_id in known_programs:
-                filtered.append(instr)
-                solana_log(f"[SOLANA][RAW] ✓ kept {instr.program_id[:8]}... ({instr.instruction_type})", "DEBUG")
-            else:
-                solana_log(f"[SOLANA][RAW] ✗ filtered {instr.program_id[:8]}...", "DEBUG")
+        filtered = [instr for instr in instructions if instr.program_code != PROGRAM_UNKNOWN]
 
-        solana_log(f"[SOLANA][RAW] filtered to {len(filtered)} known program instructions", "DEBUG")
+        solana_log(
+            f"[SOLANA][RAW] filtered {len(instructions)} → {len(filtered)} known program instructions",
+            "DEBUG"
+        )
         return filtered
 
+    @staticmethod
+    def group_by_program(instructions: List[FlatInstruction]) -> Dict[int, List[FlatInstruction]]:
+        """
+        Bucket known-program instructions by program code.
+
+        Args:
+            instructions: All flattened instructions
+
+        Returns:
+            Dict of program code -> instructions, in original order
+        """
+        groups: Dict[int, List[FlatInstruction]] = {}
+        for instr in instructions:
+            code = instr.program_code
+            if code != PROGRAM_UNKNOWN:
+                groups.setdefault(code, []).append(instr)
+        return groups
+
 
 # =============================================================================
 # PUMP.FUN CREATE DETECTOR
@@ -357,7 +479,7 @@ class PumpfunCreateDetector:
             Token creation info or None
         """
         for instr in instructions:
-            if instr.program_id == PROGRAM_IDS['pumpfun']:
+            if instr.program_code == PROGRAM_PUMPFUN:
                 solana_log(f"[SOLANA][PUMP] found Pump.fun instruction: {instr.instruction_type}", "DEBUG")
                 
                 # Check for various Pump.fun instructions that indicate token creation
@@ -374,20 +496,9 @@ class PumpfunCreateDetector:
                         if mint:
                             solana_log(f"[SOLANA][PUMP] new token detected: {mint[:8]}...", "INFO")
 
-                            return {
-                                'token_address': mint,
-                                'creator_wallet': creator or mint_authority or '',
-                                'source': 'pumpfun',
-                                'name': 'UNKNOWN',  # Will be filled by metadata resolver if available
-                                'symbol': '???',
-                                'creation_timestamp': time.time(),
-                                'age_seconds': 0,
-                                'sol_inflow': 0.0,
-                                'buy_count': 0,
-                                'unique_buyers': 0,
-                                'creator_sold': False,
-                                'metadata_status': 'missing'  # Will be updated if metadata found
-                            }
+                            return PumpfunCreateDetector.build_event(
+                                mint, creator or mint_authority or ''
+                            )
                 
                 # Also check for other Pump.fun instructions that might indicate creation
                 elif instr.instruction_type and 'mint' in instr.instruction_type.lower():
@@ -395,6 +506,24 @@ class PumpfunCreateDetector:
 
         return None
 
+    @staticmethod
+    def build_event(mint: str, creator: str) -> Dict:
+        """Token creation event dict (metadata filled in later if available)."""
+        return {
+            'token_address': mint,
+            'creator_wallet': creator,
+            'source': 'pumpfun',
+            'name': 'UNKNOWN',  # Will be filled by metadata resolver if available
+            'symbol': '???',
+            'creation_timestamp': time.time(),
+            'age_seconds': 0,
+            'sol_inflow': 0.0,
+            'buy_count': 0,
+            'unique_buyers': 0,
+            'creator_sold': False,
+            'metadata_status': 'missing'  # Will be updated if metadata found
+        }
+
 
 # =============================================================================
 # RAYDIUM LP DETECTOR
@@ -425,13 +554,14 @@ class RaydiumLPDetector:
             LP creation info or None
         """
         for instr in instructions:
-            if instr.program_id == PROGRAM_IDS['raydium_amm']:
+            if instr.program_code == PROGRAM_RAYDIUM_AMM:
+                n_accounts = len(instr.account_indices)
                 # Raydium AMM v4 initialize2 instruction for pool creation
-                if instr.instruction_type == 'initialize2' or len(instr.accounts) >= 14:
+                if instr.instruction_type == 'initialize2' or n_accounts >= 14:
                     # Extract both mints
-                    if len(instr.accounts) >= 14:
-                        coin_mint = instr.accounts[12]  # amm_coin_mint
-                        pc_mint = instr.accounts[13]    # amm_pc_mint (usually the new token)
+                    if n_accounts >= 14:
+                        coin_mint = instr.account(12)  # amm_coin_mint
+                        pc_mint = instr.account(13)    # amm_pc_mint (usually the new token)
                         
                         # Determine which one is likely the new token
                         # Usually pc_mint is the token being listed (new Pump.fun token)
@@ -442,18 +572,25 @@ class RaydiumLPDetector:
                             solana_log(f"[SOLANA][RAYDIUM][LP] detected pool creation for token: {base_mint[:8]}...", "INFO")
                             solana_log(f"[SOLANA][RAYDIUM][LP] coin_mint: {coin_mint[:8]}, pc_mint: {pc_mint[:8]}", "DEBUG")
 
-                            return {
-                                'base_mint': base_mint,
-                                'coin_mint': coin_mint,
-                                'pc_mint': pc_mint,
-                                'lp_event': 'RAYDIUM_LP_CREATED',
-                                'program_id': instr.program_id,
-                                'instruction_accounts': len(instr.accounts),
-                                'detection_method': 'initialize2_parsing'
-                            }
+                            return RaydiumLPDetector.build_event(
+                                coin_mint, pc_mint, instr.program_id, n_accounts
+                            )
 
         return None
 
+    @staticmethod
+    def build_event(coin_mint: str, pc_mint: str, program_id: str, n_accounts: int) -> Dict:
+        """LP creation event dict (pc_mint is treated as the new token)."""
+        return {
+            'base_mint': pc_mint,
+            'coin_mint': coin_mint,
+            'pc_mint': pc_mint,
+            'lp_event': 'RAYDIUM_LP_CREATED',
+            'program_id': program_id,
+            'instruction_accounts': n_accounts,
+            'detection_method': 'initialize2_parsing'
+        }
+
 
 # =============================================================================
 # METADATA-LESS SAFE MODE
@@ -493,6 +630,94 @@ class MetadataLessScorer:
         return token_data
 
 
+# =============================================================================
+# COMPACT PARSED EVENTS (picklable, used by TransactionParsePool workers)
+# =============================================================================
+
+# ('create', slot, block_time, transfers, mint, creator, has_logs)
+# ('lp',     slot, block_time, transfers, coin_mint, pc_mint, program_id, n_accounts)
+# transfers: tuple of (mint, change, decimals, owner)
+EVENT_CREATE = 'create'
+EVENT_LP = 'lp'
+
+
+def detect_transaction_event(tx_response: RawTransactionResponse) -> Optional[tuple]:
+    """
+    Flatten, filter and run the detectors on a fetched transaction.
+
+    Pure function of the response (no state machine access), so it can
+    run in a worker process.
+
+    Args:
+        tx_response: Raw transaction response with meta ok
+
+    Returns:
+        Compact event tuple or None
+    """
+    all_instructions = InstructionFlattener.flatten_instructions(tx_response)
+    by_program = ProgramFilter.group_by_program(all_instructions)
+
+    event = None
+    if PROGRAM_PUMPFUN in by_program:
+        creation = PumpfunCreateDetector.detect_creation(by_program[PROGRAM_PUMPFUN])
+        if creation:
+            event = (
+                EVENT_CREATE, creation['token_address'], creation['creator_wallet'],
+                bool(tx_response.meta.get('logMessages'))
+            )
+
+    if event is None and PROGRAM_RAYDIUM_AMM in by_program:
+        lp = RaydiumLPDetector.detect_lp_creation(by_program[PROGRAM_RAYDIUM_AMM])
+        if lp:
+            event = (EVENT_LP, lp['coin_mint'], lp['pc_mint'], lp['program_id'], lp['instruction_accounts'])
+
+    if event is None:
+        return None
+
+    transfers = tuple(
+        (t['mint'], t['change'], t['decimals'], t['owner'])
+        for t in extract_token_transfers({'meta': tx_response.meta})
+    )
+    return (event[0], tx_response.slot, tx_response.block_time, transfers) + event[1:]
+
+
+def parse_raw_transaction(raw: bytes) -> Optional[tuple]:
+    """
+    Decode a getTransaction response body and detect its event.
+
+    Args:
+        raw: JSON-RPC response body
+
+    Returns:
+        Compact event tuple or None (null result, failed tx, no event)
+    """
+    result = json.loads(raw).get('result')
+    if not result:
+        return None
+
+    meta = result.get('meta')
+    if meta is None or meta.get('err') is not None:
+        return None
+
+    return detect_transaction_event(RawTransactionResponse(
+        transaction=result.get('transaction', {}),
+        meta=meta,
+        slot=result.get('slot', 0),
+        block_time=result.get('blockTime')
+    ))
+
+
+def parse_raw_batch(raws: List[bytes]) -> List[Optional[tuple]]:
+    """Parse several response bodies (one worker round trip per batch)."""
+    events = []
+    for raw in raws:
+        try:
+            events.append(parse_raw_transaction(raw))
+        except Exception:
+            events.append(None)
+    return events
+
+
 # =============================================================================
 # MAIN RAW PARSER
 # =============================================================================
@@ -504,15 +729,20 @@ class RawSolanaParser:
     Orchestrates all components for sniper-grade parsing.
     """
 
-    def __init__(self, rpc_url: str):
+    def __init__(self, rpc_url: str, state_machine: Optional[TokenStateMachine] = None,
+                 parse_pool=None):
         self.rpc_url = rpc_url
-        self.state_machine = TokenStateMachine()
+        self.state_machine = state_machine or TokenStateMachine()
+        self.parse_pool = parse_pool  # Optional TransactionParsePool
         self._last_health_log = 0
 
     async def parse_transaction(self, signature: str) -> Optional[Dict]:
         """
         Parse single transaction for token events.
 
+        With a parse pool, JSON decoding, flattening and detection run in a
+        worker process; only the state machine update runs here.
+
         Args:
             signature: Transaction signature
 
@@ -520,89 +750,109 @@ class RawSolanaParser:
             Token event dict or None
         """
         async with RawSolanaFetcher(self.rpc_url) as fetcher:
-            # STEP 1: RAW TRANSACTION FETCH
-            tx_response = await fetcher.fetch_transaction(signature)
-            if not tx_response:
-                return None
-
-            # STEP 2: META VALIDATION FIX
-            meta_ok = tx_response.meta is not None and tx_response.meta.get('err') is None
-            solana_log(f"[SOLANA][RAW] meta ok: {meta_ok}", "DEBUG")
-
-            if not meta_ok:
-                # Skip silently if meta validation fails
-                return None
-
-            # STEP 3: INSTRUCTION FLATTENING
-            all_instructions = InstructionFlattener.flatten_instructions(tx_response)
-
-            # STEP 4: PROGRAM ID FILTERING
-            filtered_instructions = ProgramFilter.filter_instructions(all_instructions)
-
-            # STEP 5: PUMP.FUN CREATE DETECTOR
-            token_creation = PumpfunCreateDetector.detect_creation(filtered_instructions)
-            if token_creation:
-                # Create state record
-                state_record = self.state_machine.create_token(
-                    token_creation['token_address'],
-                    token_creation['symbol']
-                )
+            if self.parse_pool is not None:
+                # STEP 1-7 OFFLOADED: raw bytes -> compact event tuple
+                raw = await fetcher.fetch_raw(signature)
+                event = await self.parse_pool.parse(raw) if raw else None
+            else:
+                # STEP 1: RAW TRANSACTION FETCH
+                tx_response = await fetcher.fetch_transaction(signature)
+                if not tx_response:
+                    return None
 
-                # STEP 6: METADATA-LESS SAFE MODE
-                if not meta_ok or not tx_response.meta.get('logMessages'):
-                    # Metadata missing, use safe mode
-                    token_creation = MetadataLessScorer.score_without_metadata(token_creation)
-                    state_record.update_metadata(name='UNKNOWN', symbol='???', decimals=9)
-                    solana_log(f"[SOLANA][STATE] {token_creation['symbol']} → DETECTED (metadata-less)", "DEBUG")
-                else:
-                    # Metadata available, would resolve here
-                    state_record.update_metadata(name=token_creation['name'], symbol=token_creation['symbol'], decimals=9)
-                    solana_log(f"[SOLANA][STATE] {token_creation['symbol']} → DETECTED", "DEBUG")
+                # STEP 2: META VALIDATION FIX
+                meta_ok = tx_response.meta is not None and tx_response.meta.get('err') is None
+                solana_log(f"[SOLANA][RAW] meta ok: {meta_ok}", "DEBUG")
+
+                if not meta_ok:
+                    # Skip silently if meta validation fails
+                    return None
+
+                # STEP 3-7: FLATTEN, FILTER, PUMP.FUN + RAYDIUM DETECTORS
+                event = detect_transaction_event(tx_response)
+
+        if event is not None:
+            return self.apply_event(event)
+
+        # STEP 9: TIMEOUT & HANG FIX - Add watchdog logging
+        now = time.time()
+        if now - self._last_health_log > 30:  # Every 30 seconds
+            solana_log("[SOLANA][HEALTH] scanner alive", "DEBUG")
+            self._last_health_log = now
 
-                return token_creation
+        return None
 
-            # STEP 7: RAYDIUM LP DETECTOR
-            lp_creation = RaydiumLPDetector.detect_lp_creation(filtered_instructions)
-            if lp_creation:
-                base_mint = lp_creation['base_mint']
+    def apply_event(self, event: tuple) -> Optional[Dict]:
+        """
+        Apply a compact parsed event to the state machine.
 
-                # Check if we have this token in state machine (tracked Pump.fun mint)
-                if self.state_machine.has_token(base_mint):
-                    state_record = self.state_machine.get_token(base_mint)
-                    if state_record:
-                        # STEP 8: AUTO SCORE BOOST CALCULATION
-                        boost_score = self._calculate_lp_score_boost(state_record)
-                        new_score = min(state_record.score + boost_score, 100.0)
+        Args:
+            event: Tuple from detect_transaction_event / parse_raw_transaction
 
-                        # Update score
-                        state_record.last_score = state_record.score
-                        state_record.score = new_score
-                        state_record.lp_detected = True
-                        state_record.lp_info.update(lp_creation)
+        Returns:
+            Token event dict or None
+        """
+        kind, slot, block_time, transfers = event[:4]
 
-                        solana_log(f"[SOLANA][SCORE] LP boost: +{boost_score} → {new_score}", "INFO")
+        if kind == EVENT_CREATE:
+            mint, creator, has_logs = event[4:]
+            token_creation = PumpfunCreateDetector.build_event(mint, creator)
+            token_creation['token_transfers'] = [
+                {'mint': m, 'change': c, 'decimals': d, 'owner': o} for m, c, d, o in transfers
+            ]
 
-                        # STEP 9: STATE TRANSITION
-                        old_state = state_record.current_state
-                        if old_state in [TokenState.DETECTED, TokenState.METADATA_PENDING, TokenState.METADATA_OK]:
-                            state_record.current_state = TokenState.LP_DETECTED
-                            solana_log(f"[SOLANA][STATE] {base_mint[:8]} → LP_DETECTED", "DEBUG")
+            # Create state record
+            self.state_machine.create_token(
+                token_creation['token_address'],
+                token_creation['symbol']
+            )
 
-                            # Check for SNIPER_ARMED transition
-                            if new_score >= 85:
-                                state_record.current_state = TokenState.SNIPER_ARMED
-                                solana_log(f"[SOLANA][SNIPER] ARMED: {base_mint[:8]} (score: {new_score})", "INFO")
+            # STEP 6: METADATA-LESS SAFE MODE
+            # (metadata itself is resolved by SolanaScanner enrichment)
+            if not has_logs:
+                # Metadata missing, use safe mode
+                token_creation = MetadataLessScorer.score_without_metadata(token_creation)
+                solana_log(f"[SOLANA][STATE] {token_creation['symbol']} → DETECTED (metadata-less)", "DEBUG")
+            else:
+                solana_log(f"[SOLANA][STATE] {token_creation['symbol']} → DETECTED", "DEBUG")
 
-                        # Emit event
-                        solana_log(f"[SOLANA][RAYDIUM][LP] {base_mint[:8]}", "INFO")
+            return token_creation
 
-                return lp_creation
+        if kind == EVENT_LP:
+            lp_creation = RaydiumLPDetector.build_event(*event[4:])
+            base_mint = lp_creation['base_mint']
 
-        # STEP 9: TIMEOUT & HANG FIX - Add watchdog logging
-        now = time.time()
-        if now - self._last_health_log > 30:  # Every 30 seconds
-            solana_log("[SOLANA][HEALTH] scanner alive", "DEBUG")
-            self._last_health_log = now
+            # Check if we have this token in state machine (tracked Pump.fun mint)
+            if self.state_machine.has_token(base_mint):
+                state_record = self.state_machine.get_token(base_mint)
+                if state_record:
+                    # STEP 8: AUTO SCORE BOOST CALCULATION
+                    boost_score = self._calculate_lp_score_boost(state_record)
+                    new_score = min(state_record.score + boost_score, 100.0)
+
+                    # Update score
+                    state_record.last_score = state_record.score
+                    state_record.score = new_score
+                    state_record.lp_detected = True
+                    state_record.lp_info.update(lp_creation)
+
+                    solana_log(f"[SOLANA][SCORE] LP boost: +{boost_score} → {new_score}", "INFO")
+
+                    # STEP 9: STATE TRANSITION
+                    old_state = state_record.current_state
+                    if old_state in [TokenState.DETECTED, TokenState.METADATA_PENDING, TokenState.METADATA_OK]:
+                        self.state_machine.transition(base_mint, TokenState.LP_DETECTED)
+                        solana_log(f"[SOLANA][STATE] {base_mint[:8]} → LP_DETECTED", "DEBUG")
+
+                        # Check for SNIPER_ARMED transition
+                        if new_score >= 85:
+                            self.state_machine.transition(base_mint, TokenState.SNIPER_ARMED)
+                            solana_log(f"[SOLANA][SNIPER] ARMED: {base_mint[:8]} (score: {new_score})", "INFO")
+
+                    # Emit event
+                    solana_log(f"[SOLANA][RAYDIUM][LP] {base_mint[:8]}", "INFO")
+
+            return lp_creation
 
         return None
 
@@ -25,9 +25,15 @@ from dataclasses import dataclass, field
 from .solana_utils import (
     RAYDIUM_AMM_PROGRAM_ID,
     WRAPPED_SOL_MINT,
+    USDC_MINT,
     solana_log,
     rate_limit_rpc,
-    is_valid_solana_address
+    is_valid_solana_address,
+    get_multiple_accounts,
+    decode_token_account_amount,
+    pubkey_from_bytes,
+    sol_to_usd,
+    usd_to_sol
 )
 
 # =============================================================================
@@ -41,6 +47,93 @@ RAYDIUM_INIT_POOL2 = "initialize2"
 # Pool events to monitor
 RAYDIUM_POOL_EVENTS = [RAYDIUM_INIT_POOL, RAYDIUM_INIT_POOL2]
 
+# Raydium AMM v4 pool state layout (LIQUIDITY_STATE_LAYOUT_V4, 752 bytes)
+RAYDIUM_V4_BASE_DECIMAL_OFFSET = 32
+RAYDIUM_V4_QUOTE_DECIMAL_OFFSET = 40
+RAYDIUM_V4_BASE_VAULT_OFFSET = 336
+RAYDIUM_V4_QUOTE_VAULT_OFFSET = 368
+RAYDIUM_V4_BASE_MINT_OFFSET = 400
+RAYDIUM_V4_QUOTE_MINT_OFFSET = 432
+RAYDIUM_V4_POOL_SIZE = 752
+
+
+def parse_raydium_pool_vaults(data: bytes) -> Optional[Dict]:
+    """
+    Extract vault accounts and decimals from a Raydium AMM v4 pool account.
+    
+    Args:
+        data: Raw pool account data
+        
+    Returns:
+        Dict with base/quote vaults, mints and decimals, or None
+    """
+    if not data or len(data) < RAYDIUM_V4_POOL_SIZE:
+        return None
+    
+    def u64(offset: int) -> int:
+        return int.from_bytes(data[offset:offset + 8], byteorder='little')
+    
+    return {
+        "base_vault": pubkey_from_bytes(data, RAYDIUM_V4_BASE_VAULT_OFFSET),
+        "quote_vault": pubkey_from_bytes(data, RAYDIUM_V4_QUOTE_VAULT_OFFSET),
+        "base_mint": pubkey_from_bytes(data, RAYDIUM_V4_BASE_MINT_OFFSET),
+        "quote_mint": pubkey_from_bytes(data, RAYDIUM_V4_QUOTE_MINT_OFFSET),
+        "base_decimals": u64(RAYDIUM_V4_BASE_DECIMAL_OFFSET),
+        "quote_decimals": u64(RAYDIUM_V4_QUOTE_DECIMAL_OFFSET)
+    }
+
+
+def read_vault_balances(client, vaults: Dict[str, Dict]) -> Dict[str, tuple]:
+    """
+    Read base/quote vault balances for many pools in chunked batches.
+    
+    Args:
+        client: Solana RPC client
+        vaults: pool_address -> parse_raydium_pool_vaults() result
+        
+    Returns:
+        pool_address -> (base_amount, quote_amount) in UI units
+    """
+    addresses = []
+    for info in vaults.values():
+        addresses.append(info["base_vault"])
+        addresses.append(info["quote_vault"])
+    
+    accounts = get_multiple_accounts(client, addresses)
+    
+    balances = {}
+    for pool_address, info in vaults.items():
+        base_account = accounts.get(info["base_vault"])
+        quote_account = accounts.get(info["quote_vault"])
+        if not base_account or not quote_account:
+            continue
+        base_raw = decode_token_account_amount(bytes(base_account.data))
+        quote_raw = decode_token_account_amount(bytes(quote_account.data))
+        if base_raw is None or quote_raw is None:
+            continue
+        balances[pool_address] = (
+            base_raw / (10 ** info["base_decimals"]),
+            quote_raw / (10 ** info["quote_decimals"])
+        )
+    
+    return balances
+
+
+def sol_liquidity(vaults: Dict, base_amount: float, quote_amount: float) -> float:
+    """
+    SOL value of a pool's SOL / USDC side.
+    
+    The side is picked by mint, so pools listing SOL or USDC as the base
+    mint are read correctly. 0.0 when neither side is SOL or USDC.
+    """
+    for mint, amount in ((vaults["quote_mint"], quote_amount), (vaults["base_mint"], base_amount)):
+        if mint == WRAPPED_SOL_MINT:
+            return amount
+    for mint, amount in ((vaults["quote_mint"], quote_amount), (vaults["base_mint"], base_amount)):
+        if mint == USDC_MINT:
+            return usd_to_sol(amount)
+    return 0.0
+
 
 @dataclass
 class RaydiumLPInfo:
@@ -109,6 +202,7 @@ class RaydiumLPDetector:
         self._detected_pools: Dict[str, RaydiumLPInfo] = {}
         self._detected_tokens: Set[str] = set()  # Tokens with detected LPs
         self._processed_txids: Set[str] = set()  # Avoid reprocessing
+        self._pool_vaults: Dict[str, Optional[Dict]] = {}  # pool -> vault layout (None: not AMM v4)
         self._last_slot_checked: int = 0
     
     def set_client(self, client):
@@ -359,29 +453,71 @@ class RaydiumLPDetector:
         if not pool_address in self._detected_pools:
             return None
         
-        lp_info = self._detected_pools[pool_address]
+        verified = await self.verify_liquidity_batch([pool_address])
+        return verified.get(pool_address)
+    
+    async def verify_liquidity_batch(self, pool_addresses: List[str]) -> Dict[str, RaydiumLPInfo]:
+        """
+        Verify liquidity for many pools with batched account reads.
+        
+        Pool accounts (for vault addresses) and then all base/quote vaults
+        are loaded with chunked getMultipleAccounts calls; SPL amounts are
+        decoded directly from the vault account bytes.
+        
+        Args:
+            pool_addresses: Raydium pool addresses
+            
+        Returns:
+            pool_address -> RaydiumLPInfo for pools that passed (status VALID)
+        """
+        pools = [a for a in pool_addresses if a in self._detected_pools]
+        if not pools or not self.client:
+            return {}
+        
+        verified: Dict[str, RaydiumLPInfo] = {}
         
         try:
-            # TODO: Fetch pool state and extract liquidity amounts
-            # This requires decoding Raydium pool account structure
-            # For now, mark as requiring verification
+            # Vault addresses never change, only resolve them once per pool;
+            # accounts that exist but are not AMM v4 are remembered as None
+            missing = [a for a in pools if a not in self._pool_vaults]
+            if missing:
+                pool_accounts = await asyncio.to_thread(get_multiple_accounts, self.client, missing)
+                for address, account in pool_accounts.items():
+                    if account:
+                        self._pool_vaults[address] = parse_raydium_pool_vaults(bytes(account.data))
             
-            if lp_info.quote_liquidity >= self.min_liquidity_sol:
-                lp_info.status = "VALID"
-                return lp_info
-            else:
-                lp_info.status = "LOW_LIQUIDITY"
-                solana_log(
-                    f"[SOLANA][LP][SKIP] LP detected but liquidity too low "
-                    f"({lp_info.quote_liquidity:.2f} SOL)",
-                    "WARN"
-                )
-                return None
+            vaults = {a: self._pool_vaults[a] for a in pools if self._pool_vaults.get(a)}
+            balances = await asyncio.to_thread(read_vault_balances, self.client, vaults)
+            
+            for pool_address in pools:
+                lp_info = self._detected_pools[pool_address]
+                if pool_address not in balances:
+                    lp_info.status = "ERROR"
+                    continue
+                
+                base_amount, quote_amount = balances[pool_address]
+                lp_info.base_liquidity = base_amount
+                lp_info.quote_liquidity = sol_liquidity(vaults[pool_address], base_amount, quote_amount)
+                lp_info.quote_liquidity_usd = sol_to_usd(lp_info.quote_liquidity)
+                
+                if lp_info.quote_liquidity >= self.min_liquidity_sol:
+                    lp_info.status = "VALID"
+                    verified[pool_address] = lp_info
+                else:
+                    lp_info.status = "LOW_LIQUIDITY"
+                    solana_log(
+                        f"[SOLANA][LP][SKIP] LP detected but liquidity too low "
+                        f"({lp_info.quote_liquidity:.2f} SOL)",
+                        "WARN"
+                    )
         
         except Exception as e:
             solana_log(f"[LP] Liquidity verification error: {e}", "ERROR")
-            lp_info.status = "ERROR"
-            return None
+            for pool_address in pools:
+                self._detected_pools[pool_address].status = "ERROR"
+            return {}
+        
+        return verified
     
     def has_lp(self, token_mint: str) -> bool:
         """
@@ -415,6 +551,7 @@ class RaydiumLPDetector:
         self._detected_pools.clear()
         self._detected_tokens.clear()
         self._processed_txids.clear()
+        self._pool_vaults.clear()
     
     def get_cache_stats(self) -> Dict:
         """Get detector statistics."""
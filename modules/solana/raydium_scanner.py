@@ -12,6 +12,7 @@ Output: Liquidity confirmation data for scoring
 CRITICAL: READ-ONLY - No execution, no wallets
 """
 import time
+from array import array
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass, field
 
@@ -22,13 +23,46 @@ from .solana_utils import (
     is_valid_solana_address,
     solana_log,
     rate_limit_rpc,
-    sol_to_usd
+    sol_to_usd,
+    get_multiple_accounts
 )
+from .raydium_lp_detector import parse_raydium_pool_vaults, read_vault_balances, sol_liquidity
 from config import SOLANA_ALCHEMY_SAFE_CONFIG
 import asyncio
 
 
-@dataclass
+class LiquidityHistory:
+    """
+    Bounded (timestamp, amount) series in two array('d') buffers.
+    
+    16 bytes per point instead of a tuple plus two float objects; once
+    max_points is exceeded the oldest half is dropped.
+    """
+    
+    __slots__ = ('times', 'amounts')
+    
+    max_points = 100
+    
+    def __init__(self):
+        self.times = array('d')
+        self.amounts = array('d')
+    
+    def append(self, timestamp: float, amount: float):
+        self.times.append(timestamp)
+        self.amounts.append(amount)
+        if len(self.times) > self.max_points:
+            keep = self.max_points // 2
+            del self.times[:-keep]
+            del self.amounts[:-keep]
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, index: int) -> tuple:
+        return (self.times[index], self.amounts[index])
+
+
+@dataclass(slots=True)
 class RaydiumPool:
     """Represents a Raydium liquidity pool."""
     pool_address: str
@@ -37,8 +71,9 @@ class RaydiumPool:
     creation_timestamp: float
     initial_liquidity_sol: float = 0.0
     current_liquidity_sol: float = 0.0
-    liquidity_history: List[tuple] = field(default_factory=list)  # (timestamp, amount)
+    liquidity_history: LiquidityHistory = field(default_factory=LiquidityHistory)
     last_updated: float = field(default_factory=time.time)
+    vaults: Optional[Dict] = None  # parse_raydium_pool_vaults() result ({} if not AMM v4)
     
     @property
     def liquidity_usd(self) -> float:
@@ -50,12 +85,12 @@ class RaydiumPool:
         if len(self.liquidity_history) < 2:
             return "stable"
         
-        recent = self.liquidity_history[-3:]  # Last 3 data points
+        recent = self.liquidity_history.amounts[-3:]  # Last 3 data points
         if len(recent) < 2:
             return "stable"
         
-        first_val = recent[0][1]
-        last_val = recent[-1][1]
+        first_val = recent[0]
+        last_val = recent[-1]
         
         if first_val == 0:
             return "growing" if last_val > 0 else "stable"
@@ -114,6 +149,14 @@ class RaydiumScanner:
         self._max_tracked_pools = 200
         self._signature_history_limit = 1000
         
+        # Tiered liquidity refresh: (max pool age seconds, refresh interval seconds)
+        self._refresh_tiers = self.config.get('raydium_refresh_tiers', [
+            (600, 5),      # < 10 min old: every 5s
+            (3600, 30),    # < 1h old: every 30s
+        ])
+        self._refresh_cold_interval = self.config.get('raydium_refresh_cold_interval', 120)
+        self._hot_change_pct = self.config.get('raydium_hot_change_pct', 0.05)
+        
     def connect(self, client) -> bool:
         """
         Set the Solana RPC client.
@@ -368,7 +411,7 @@ class RaydiumScanner:
                 initial_liquidity_sol=initial_liquidity,
                 current_liquidity_sol=initial_liquidity
             )
-            pool.liquidity_history.append((block_time, initial_liquidity))
+            pool.liquidity_history.append(block_time, initial_liquidity)
             
             self._pools[pool_address] = pool
             self._token_to_pool[token_mint] = pool_address
@@ -382,46 +425,162 @@ class RaydiumScanner:
         
         return None
     
+    def track_pool(
+        self,
+        pool_address: str,
+        token_mint: str,
+        quote_mint: str = WRAPPED_SOL_MINT,
+        liquidity_sol: float = 0.0,
+        created_at: Optional[float] = None
+    ) -> bool:
+        """
+        Register a pool found elsewhere in the pipeline (LP detector,
+        migrated bonding curves) for tiered liquidity refresh.
+        
+        Args:
+            pool_address: Raydium AMM pool account
+            token_mint: Token mint traded in the pool
+            quote_mint: Quote mint (SOL by default)
+            liquidity_sol: Liquidity known at detection time
+            created_at: Pool creation / detection time (default now)
+            
+        Returns:
+            True if the pool was newly tracked
+        """
+        if not is_valid_solana_address(pool_address) or not is_valid_solana_address(token_mint):
+            return False
+        if pool_address in self._pools:
+            self._token_to_pool[token_mint] = pool_address
+            return False
+        
+        if len(self._pools) >= self._max_tracked_pools:
+            oldest = min(self._pools.values(), key=lambda p: p.creation_timestamp)
+            self._token_to_pool.pop(oldest.token_mint, None)
+            del self._pools[oldest.pool_address]
+        
+        created_at = created_at or time.time()
+        pool = RaydiumPool(
+            pool_address=pool_address,
+            token_mint=token_mint,
+            quote_mint=quote_mint,
+            creation_timestamp=created_at,
+            initial_liquidity_sol=liquidity_sol,
+            current_liquidity_sol=liquidity_sol,
+            last_updated=created_at
+        )
+        pool.liquidity_history.append(created_at, liquidity_sol)
+        self._pools[pool_address] = pool
+        self._token_to_pool[token_mint] = pool_address
+        return True
+    
+    def _refresh_interval(self, pool: RaydiumPool, now: float) -> float:
+        """Refresh interval for a pool based on age and recent liquidity movement."""
+        age = now - pool.creation_timestamp
+        
+        # Pools whose liquidity just moved are refreshed at the fastest tier
+        history = pool.liquidity_history.amounts
+        if len(history) >= 2 and history[-2] > 0:
+            change = abs(history[-1] - history[-2]) / history[-2]
+            if change > self._hot_change_pct:
+                return self._refresh_tiers[0][1]
+        
+        for max_age, interval in self._refresh_tiers:
+            if age < max_age:
+                return interval
+        return self._refresh_cold_interval
+    
     def _update_pool_liquidity(self):
-        """Update liquidity for tracked pools."""
+        """
+        Update liquidity for tracked pools (blocking).
+        
+        Due pools are selected by tier, vault addresses are resolved once
+        from the pool accounts, and all due vault balances are read with
+        chunked getMultipleAccounts calls. Liquidity is the quote (SOL)
+        vault balance.
+        """
+        if not self.client:
+            return
+        
+        now = time.time()
+        targets = self._due_pools(now)
+        if targets:
+            self._apply_liquidity(targets, self._fetch_liquidity(targets), now)
+        self._cleanup_old_pools()
+    
+    async def refresh_liquidity(self):
+        """
+        Async _update_pool_liquidity: only the RPC reads run in a worker
+        thread; _pools is read and updated on the event loop.
+        """
         if not self.client:
             return
         
         now = time.time()
-        update_interval = 60  # Update every 60 seconds
+        targets = self._due_pools(now)
+        if targets:
+            self._apply_liquidity(targets, await asyncio.to_thread(self._fetch_liquidity, targets), now)
+        self._cleanup_old_pools()
+    
+    def _due_pools(self, now: float) -> Dict[str, Optional[Dict]]:
+        """
+        Pools due for a refresh: pool address -> known vaults (None if
+        unresolved). Pools already found not to be AMM v4 are skipped.
+        """
+        return {
+            address: pool.vaults for address, pool in self._pools.items()
+            if pool.vaults != {} and now - pool.last_updated >= self._refresh_interval(pool, now)
+        }
+    
+    def _fetch_liquidity(self, targets: Dict[str, Optional[Dict]]) -> Optional[tuple]:
+        """
+        RPC reads for due pools; touches no scanner state.
         
-        for pool in self._pools.values():
-            if now - pool.last_updated < update_interval:
+        Returns:
+            (resolved vaults by pool, (base, quote) balances by pool),
+            or None when the reads failed
+        """
+        try:
+            # Resolve vaults for pools seen for the first time
+            resolved = {}
+            missing = [address for address, vaults in targets.items() if vaults is None]
+            if missing:
+                accounts = get_multiple_accounts(self.client, missing)
+                for address in missing:
+                    account = accounts.get(address)
+                    if account:
+                        resolved[address] = parse_raydium_pool_vaults(bytes(account.data)) or {}
+            
+            vaults = {
+                address: known or resolved.get(address)
+                for address, known in targets.items()
+                if known or resolved.get(address)
+            }
+            balances = read_vault_balances(self.client, vaults) if vaults else {}
+            return resolved, balances
+        except Exception as e:
+            solana_log(f"Raydium liquidity refresh error: {e}", "WARN")
+            return None
+    
+    def _apply_liquidity(self, targets: Dict[str, Optional[Dict]], fetched: Optional[tuple], now: float):
+        """Store fetched vaults and balances on the due pools."""
+        if fetched is None:
+            return
+        resolved, balances = fetched
+        
+        for address in targets:
+            pool = self._pools.get(address)
+            if pool is None:
+                continue  # Evicted while the reads were in flight
+            pool_vaults = targets[address] or resolved.get(address)
+            if pool_vaults is not None:
+                pool.vaults = pool_vaults
+            pool.last_updated = now
+            if address not in balances:
                 continue
             
-            try:
-                rate_limit_rpc()
-                
-                from solders.pubkey import Pubkey
-                
-                pool_key = Pubkey.from_string(pool.pool_address)
-                
-                # Get account info
-                response = self.client.get_account_info(pool_key)
-                
-                if response.value:
-                    # Parse lamports as liquidity proxy
-                    lamports = response.value.lamports
-                    new_liquidity = parse_lamports_to_sol(lamports)
-                    
-                    pool.current_liquidity_sol = new_liquidity
-                    pool.liquidity_history.append((now, new_liquidity))
-                    pool.last_updated = now
-                    
-                    # Keep history bounded
-                    if len(pool.liquidity_history) > 100:
-                        pool.liquidity_history = pool.liquidity_history[-50:]
-                        
-            except Exception:
-                pass
-        
-        # Clean old pools
-        self._cleanup_old_pools()
+            liquidity = sol_liquidity(pool_vaults, *balances[address])
+            pool.current_liquidity_sol = liquidity
+            pool.liquidity_history.append(now, liquidity)
     
     def _cleanup_old_pools(self):
         """Remove pools older than 24 hours."""
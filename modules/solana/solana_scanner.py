@@ -23,18 +23,36 @@ CRITICAL: READ-ONLY - No execution, no wallets
 """
 import time
 import asyncio
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 import requests
 
 from .solana_utils import solana_log, create_solana_client, is_valid_solana_address
 from .raw_solana_parser import RawSolanaParser
-from .token_state import TokenStateMachine
+from .token_state import TokenStateMachine, TokenState
 from .pumpfun_scanner import PumpfunScanner
 from .raydium_scanner import RaydiumScanner
 from .jupiter_scanner import JupiterScanner
-from .metadata_resolver import MetadataResolver
+from .metadata_resolver import MetadataResolver, offchain_fields
 from .raydium_lp_detector import RaydiumLPDetector
-
+from .pumpfun_curve import get_bonding_curve_reader
+from .parse_pool import TransactionParsePool
+from .uri_fetcher import get_uri_fetcher
+from .holder_concentration import get_holder_concentration_reader
+
+# Token states whose holder concentration is kept fresh
+HOLDER_TRACKED_STATES = (
+    TokenState.LP_DETECTED,
+    TokenState.WATCH,
+    TokenState.SNIPER_ARMED,
+    TokenState.BOUGHT,
+)
+
+# Per-source enrichment deadlines (seconds)
+ENRICHMENT_DEADLINES = {
+    "metadata": 2.0,
+    "lp": 5.0,
+    "curve": 1.0,
+}
 
 class SolanaScanner:
     """
@@ -58,8 +76,20 @@ class SolanaScanner:
         # Raw RPC URL
         self.rpc_url = self.config.get('rpc_url', 'https://api.mainnet-beta.solana.com')
 
+        # Token state machine (shared with the raw parser, snapshotted to disk
+        # so LP_DETECTED / SNIPER_ARMED state survives restarts)
+        self.state_machine = TokenStateMachine(
+            snapshot_file=self.config.get('state_snapshot_file', 'data/solana_token_state.json')
+        )
+
+        # Optional process-pool stage for CPU-heavy parsing (0 = inline)
+        parse_workers = self.config.get('parse_workers', 0)
+        self.parse_pool = TransactionParsePool(workers=parse_workers) if parse_workers else None
+
         # Raw parser
-        self.raw_parser = RawSolanaParser(self.rpc_url)
+        self.raw_parser = RawSolanaParser(
+            self.rpc_url, state_machine=self.state_machine, parse_pool=self.parse_pool
+        )
 
         # State
         self._connected = True  # Always connected for raw RPC
@@ -72,14 +102,29 @@ class SolanaScanner:
 
         # Components
         self.client = create_solana_client(self.rpc_url)
-        self.state_machine = TokenStateMachine()
         self.metadata_resolver = MetadataResolver(self.client)
         self.lp_detector = RaydiumLPDetector(self.client)
-        
+        self.holder_reader = get_holder_concentration_reader()
+        if self.client:
+            get_bonding_curve_reader().set_client(self.client)
+            self.holder_reader.set_client(self.client)
+
         # Sub-scanners
         self.pumpfun = PumpfunScanner(self.config)
         self.raydium = RaydiumScanner(self.config)
         self.jupiter = JupiterScanner(self.config)
+        if self.client:
+            # Pools are registered from LP detection (track_pool); the client
+            # drives their tiered liquidity refresh
+            self.raydium.connect(self.client)
+        
+        # Concurrent enrichment: events are emitted after the first deadline
+        # with partial data; on_event_update receives the completed event
+        self.enrichment_first_deadline = self.config.get('enrichment_first_deadline', 0.25)
+        self.enrichment_deadlines = {**ENRICHMENT_DEADLINES, **self.config.get('enrichment_deadlines', {})}
+        self.on_event_update: Optional[Callable[[Dict], Awaitable[Any]]] = None
+        self._enrichment_tasks: Set[asyncio.Task] = set()
+        self._enrich_stats = {'events': 0, 'partial': 0, 'updates': 0, 'timeouts': {}}
         
     def connect(self) -> bool:
         """
@@ -301,6 +346,10 @@ class SolanaScanner:
                 # Parse transaction for token events
                 try:
                     event = await self.raw_parser.parse_transaction(signature)
+                    if event and event.get('source') == 'pumpfun':
+                        # Concurrent enrichment; slow sources arrive via on_event_update
+                        event['tx_signature'] = signature
+                        event = await self._create_unified_event_async(event)
                     if event:
                         token_events.append(event)
                         self._token_cache[signature] = time.time()
@@ -326,8 +375,8 @@ class SolanaScanner:
             return []
     
     async def _create_unified_event_async_wrapper(self, token: Dict) -> Optional[Dict]:
-        """Wrapper for async metadata resolution."""
-        return await self._create_unified_event_async(token)
+        """Wrapper for async metadata resolution (waits for every enrichment)."""
+        return await self._create_unified_event_async(token, wait_all=True)
     
     def _create_unified_event(self, pumpfun_token: Dict) -> Optional[Dict]:
         """
@@ -405,21 +454,29 @@ class SolanaScanner:
         
         return unified
     
-    async def _create_unified_event_async(self, pumpfun_token: Dict) -> Optional[Dict]:
+    async def _create_unified_event_async(self, pumpfun_token: Dict, wait_all: bool = False) -> Optional[Dict]:
         """
-        Create unified token event with METADATA RESOLUTION.
+        Create unified token event with CONCURRENT ENRICHMENT.
         
-        This is the NEW async version that:
-        1. Resolves metadata from Metaplex
-        2. Detects Raydium LP
-        3. Updates state machine
+        Independent enrichments run concurrently, each under its own
+        deadline (enrichment_deadlines):
+        1. metadata - Metaplex metadata (updates state machine)
+        2. lp - Raydium LP detection (updates state machine)
+        3. curve - pump.fun bonding curve state
+        
+        The event is returned after enrichment_first_deadline with
+        whatever finished (partial=True, pending_enrichments listed in the
+        event and the state record). Slow enrichments complete in the
+        background and the rebuilt event is passed to on_event_update.
         
         Args:
             pumpfun_token: Token data from Pump.fun scanner
+            wait_all: Wait for every enrichment (manual audits)
             
         Returns:
             Unified token dict with resolved metadata and state
         """
+        started = time.perf_counter()
         token_address = pumpfun_token.get('token_address')
         if not token_address:
             return None
@@ -432,49 +489,144 @@ class SolanaScanner:
         if not token_address:
             return None
         
-        # ====== STEP 1: RESOLVE METADATA ======
-        metadata = await self.metadata_resolver.resolve(token_address)
-        name = metadata.get('name', 'UNKNOWN') if metadata else 'UNKNOWN'
-        symbol = metadata.get('symbol', '???') if metadata else '???'
-        decimals = metadata.get('decimals', 0) if metadata else 0
+        self.state_machine.create_token(token_address, pumpfun_token.get('symbol', '???'))
         
-        if metadata:
-            solana_log(f"[META] ✅ Resolved {token_address[:8]}... | {name} ({symbol}) | decimals={decimals}", "DEBUG")
-        else:
-            solana_log(f"[META] ⚠️  Cannot resolve {token_address[:8]}... | Skipping...", "DEBUG")
+        tasks: Dict[str, asyncio.Future] = {}
+        for name, coro in self._enrichment_sources(token_address, pumpfun_token.get('tx_signature'), tasks):
+            tasks[name] = asyncio.ensure_future(self._run_enrichment(token_address, name, coro))
+        self.state_machine.set_pending_enrichments(token_address, tasks)
         
-        # Get or create state record
-        state_record = self.state_machine.create_token(token_address, symbol)
+        await asyncio.wait(tasks.values(), timeout=None if wait_all else self.enrichment_first_deadline)
         
-        # If metadata resolved, update state machine
-        if metadata:
-            state_record.update_metadata(
-                name=name,
-                symbol=symbol,
-                decimals=decimals
+        results = {name: task.result() for name, task in tasks.items() if task.done()}
+        pending = [name for name, task in tasks.items() if not task.done()]
+        
+        # Detector fields (safe-mode flags, transfers) are kept under the unified keys
+        unified = {**pumpfun_token, **self._build_unified_event(token_address, pumpfun_token, results, pending)}
+        unified['enrichment_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        self._token_cache[token_address] = unified
+        
+        self._enrich_stats['events'] += 1
+        if pending:
+            self._enrich_stats['partial'] += 1
+            follow_up = asyncio.create_task(
+                self._finish_enrichment(token_address, pumpfun_token, tasks, started)
             )
-            solana_log(f"[STATE] {symbol} → METADATA_OK", "DEBUG")
-        
-        # ====== STEP 2: DETECT RAYDIUM LP ======
-        lp_info = None
-        if metadata:  # Only check LP if metadata is available
-            tx_sig = pumpfun_token.get('tx_signature')
-            if tx_sig:
-                lp_info = await self.lp_detector.detect_from_transaction(tx_sig, token_address)
-                if lp_info:
-                    solana_log(f"[LP] ✅ Raydium LP detected | SOL={lp_info.get('liquidity_sol', 0):.2f} | Pool={lp_info.get('pool_address', '???')[:8]}...", "DEBUG")
-                    state_record.update_lp(
-                        pool_address=lp_info.get('pool_address'),
-                        liquidity_sol=lp_info.get('liquidity_sol', 0)
-                    )
-                    solana_log(f"[STATE] {symbol} → LP_DETECTED", "DEBUG")
+            self._enrichment_tasks.add(follow_up)
+            follow_up.add_done_callback(self._enrichment_tasks.discard)
         
-        # Get additional data from other scanners
+        return unified
+    
+    def _enrichment_sources(self, token_address: str, tx_signature: Optional[str],
+                            tasks: Dict[str, asyncio.Future]):
+        """
+        Enrichment coroutines for a token: (name, coroutine).
+        
+        The caller stores each task in `tasks` before the next source is
+        built, so LP detection can hold its state transition until the
+        metadata task has finished (safe mode rejects LP before metadata).
+        """
+        yield "metadata", self.resolve_token_metadata(token_address)
+        yield "lp", self.detect_token_lp(token_address, tx_signature, metadata_ready=tasks.get("metadata"))
+        yield "curve", get_bonding_curve_reader().get_state(token_address)
+    
+    async def _run_enrichment(self, token_address: str, name: str, coro) -> Any:
+        """Run one enrichment under its deadline; failures and timeouts yield None."""
+        try:
+            return await asyncio.wait_for(coro, timeout=self.enrichment_deadlines.get(name, 5.0))
+        except asyncio.TimeoutError:
+            self._enrich_stats['timeouts'][name] = self._enrich_stats['timeouts'].get(name, 0) + 1
+            solana_log(f"[ENRICH] {name} deadline exceeded for {token_address[:8]}...", "DEBUG")
+        except Exception as e:
+            solana_log(f"[ENRICH] {name} error for {token_address[:8]}...: {e}", "DEBUG")
+        finally:
+            self.state_machine.complete_enrichment(token_address, name)
+        return None
+    
+    async def _finish_enrichment(self, token_address: str, pumpfun_token: Dict,
+                                 tasks: Dict[str, asyncio.Future], started: float):
+        """Wait for slow enrichments, then emit the completed event as an update."""
+        await asyncio.wait(tasks.values())
+        results = {name: task.result() for name, task in tasks.items()}
+        
+        unified = {**pumpfun_token, **self._build_unified_event(token_address, pumpfun_token, results, [])}
+        unified['enrichment_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        unified['is_update'] = True
+        self._token_cache[token_address] = unified
+        self._enrich_stats['updates'] += 1
+        
+        if self.on_event_update:
+            try:
+                await self.on_event_update(unified)
+            except Exception as e:
+                solana_log(f"[ENRICH] Update delivery error: {e}", "ERROR")
+    
+    def request_offchain_metadata(self, token_address: str):
+        """
+        Fetch a token's off-chain URI JSON in the background.
+        
+        Only for tokens that passed scoring (never on the sniper path).
+        If the JSON has an image or socials, the cached event is re-sent
+        with them through on_event_update.
+        """
+        task = asyncio.create_task(self._emit_offchain_update(token_address))
+        self._enrichment_tasks.add(task)
+        task.add_done_callback(self._enrichment_tasks.discard)
+    
+    async def _emit_offchain_update(self, token_address: str):
+        try:
+            offchain = await self.metadata_resolver.fetch_offchain_metadata(token_address)
+        except Exception as e:
+            solana_log(f"[URI] Off-chain fetch error for {token_address[:8]}...: {e}", "DEBUG")
+            return
+        
+        fields = offchain_fields(offchain)
+        event = self._token_cache.get(token_address)
+        if not (fields['image'] or fields['has_socials']) or not isinstance(event, dict):
+            return
+        
+        update = {**event, **fields, 'is_update': True}
+        self._token_cache[token_address] = update
+        if self.on_event_update:
+            try:
+                await self.on_event_update(update)
+            except Exception as e:
+                solana_log(f"[URI] Update delivery error: {e}", "ERROR")
+    
+    async def close(self):
+        """Stop background enrichment and parse workers, flush caches and the state snapshot."""
+        for task in list(self._enrichment_tasks):
+            task.cancel()
+        if self.parse_pool:
+            self.parse_pool.shutdown()
+        await get_uri_fetcher().close()
+        self.metadata_resolver.save_cache()
+        self.state_machine.save_snapshot()
+    
+    def _build_unified_event(self, token_address: str, pumpfun_token: Dict,
+                             results: Dict[str, Any], pending: List[str]) -> Dict:
+        """Build the unified event from Pump.fun data and finished enrichments."""
+        metadata = results.get("metadata")
+        lp_info = results.get("lp")
+        curve = results.get("curve")
+        
+        name = metadata.get('name', 'UNKNOWN') if metadata else pumpfun_token.get('name', 'UNKNOWN')
+        symbol = metadata.get('symbol', '???') if metadata else pumpfun_token.get('symbol', '???')
+        decimals = metadata.get('decimals', 0) if metadata else 0
+        if metadata:
+            metadata_status = 'resolved'
+        elif 'metadata' in pending:
+            metadata_status = 'pending'
+        else:
+            metadata_status = 'missing'
+        
+        # Get additional data from other scanners (cached, no I/O)
         raydium_data = self.raydium.get_liquidity_data(token_address)
         jupiter_data = self.jupiter.get_momentum_data(token_address)
+        state_record = self.state_machine.get_token(token_address) or self.state_machine.create_token(token_address, symbol)
+        cached_metadata = self.metadata_resolver.get_cached(token_address)
         
-        # Build unified event
-        unified = {
+        return {
             # Core identity
             'chain': 'solana',
             'chain_prefix': self.chain_prefix,
@@ -495,19 +647,27 @@ class SolanaScanner:
             'buy_velocity': pumpfun_token.get('buy_velocity', 0),
             'unique_buyers': pumpfun_token.get('unique_buyers', 0),
             'creator_sold': pumpfun_token.get('creator_sold', False),
-            'metadata_status': 'resolved' if metadata else 'missing',
+            'metadata_status': metadata_status,
             
-            # Metadata (NEW)
+            # Metadata
             'metadata': metadata if metadata else {},
             'decimals': decimals,
             
+            # Off-chain URI JSON (filled in by request_offchain_metadata)
+            **offchain_fields(cached_metadata.offchain if cached_metadata else None),
+            
             # Raydium data
             'has_raydium_pool': raydium_data.get('has_raydium_pool', False) or bool(lp_info),
-            'liquidity_usd': raydium_data.get('liquidity_usd', 0),
-            'liquidity_sol': raydium_data.get('liquidity_sol', 0),
+            'liquidity_usd': raydium_data.get('liquidity_usd', 0) or (lp_info or {}).get('quote_liquidity_usd', 0),
+            'liquidity_sol': raydium_data.get('liquidity_sol', 0) or (lp_info or {}).get('quote_liquidity', 0),
             'liquidity_trend': raydium_data.get('liquidity_trend', 'unknown'),
+            'pool_address': (lp_info or {}).get('pool_address', ''),
             'lp_info': lp_info if lp_info else {},
             
+            # Bonding curve
+            'bonding_curve_progress': curve.progress if curve else None,
+            'bonding_curve_complete': curve.complete if curve else None,
+            
             # Jupiter data
             'jupiter_listed': jupiter_data.get('jupiter_listed', False),
             'jupiter_volume_24h': jupiter_data.get('volume_24h_usd', 0),
@@ -521,14 +681,13 @@ class SolanaScanner:
             'lp_valid': state_record.lp_valid,
             'token_state_record': state_record.to_dict(),
             
+            # Enrichment progress
+            'partial': bool(pending),
+            'pending_enrichments': list(pending),
+            
             # Computed fields
             'timestamp': time.time()
         }
-        
-        # Cache for later updates
-        self._token_cache[token_address] = unified
-        
-        return unified
     
     def _cleanup_cache(self):
         """Remove old cache entries."""
@@ -598,6 +757,31 @@ class SolanaScanner:
         
         return candidates
     
+    async def refresh_raydium_liquidity(self, snapshot=None):
+        """
+        Tiered Raydium liquidity refresh (run from Solana slot ticks).
+        
+        RaydiumScanner selects the pools that are due, so this can be
+        triggered on every tick.
+        """
+        await self.raydium.refresh_liquidity()
+    
+    async def refresh_holder_concentration(self, snapshot=None) -> int:
+        """
+        Incremental holder concentration refresh for tracked tokens
+        (LP_DETECTED / WATCH / SNIPER_ARMED / BOUGHT), run from Solana
+        slot ticks. Only mints whose cached result expired are re-read.
+        """
+        tracked = []
+        for state in HOLDER_TRACKED_STATES:
+            tracked.extend(record.mint for record in self.state_machine.get_by_state(state))
+        self.holder_reader.set_tracked(tracked)
+        return await self.holder_reader.refresh_tracked()
+    
+    async def refresh_jupiter_momentum(self, snapshot=None) -> List[Dict]:
+        """Jupiter routing/volume refresh (run from Solana slot ticks)."""
+        return await asyncio.to_thread(self.jupiter.scan)
+    
     def get_chain_prefix(self) -> str:
         """Get chain prefix for logging."""
         return self.chain_prefix
@@ -611,8 +795,12 @@ class SolanaScanner:
             "raydium": self.raydium.get_stats(),
             "jupiter": self.jupiter.get_stats(),
             "metadata_resolver": self.metadata_resolver.get_cache_stats(),
+            "uri_fetcher": get_uri_fetcher().get_stats(),
+            "holder_concentration": self.holder_reader.get_stats(),
             "lp_detector": self.lp_detector.get_cache_stats(),
-            "state_machine": self.state_machine.get_stats()
+            "state_machine": self.state_machine.get_stats(),
+            "parse_pool": self.parse_pool.get_stats() if self.parse_pool else None,
+            "enrichment": {**self._enrich_stats, "in_flight": len(self._enrichment_tasks)}
         }
     
     async def resolve_token_metadata(self, token_mint: str) -> Optional[Dict]:
@@ -650,7 +838,8 @@ class SolanaScanner:
     async def detect_token_lp(
         self,
         token_mint: str,
-        txid: Optional[str] = None
+        txid: Optional[str] = None,
+        metadata_ready: Optional[asyncio.Future] = None
     ) -> Optional[Dict]:
         """
         Detect Raydium LP for a token.
@@ -661,6 +850,8 @@ class SolanaScanner:
         Args:
             token_mint: Token mint address
             txid: Optional transaction to scan for LP
+            metadata_ready: Concurrent metadata resolution; the LP state
+                transition waits for it so an early LP is not rejected
             
         Returns:
             LP info dict or None if not found/valid
@@ -675,6 +866,19 @@ class SolanaScanner:
             lp_info = await self.lp_detector.detect_for_token(token_mint)
         
         if lp_info:
+            # Tiered liquidity refresh from now on (refresh_raydium_liquidity)
+            self.raydium.track_pool(
+                lp_info.pool_address,
+                token_mint,
+                quote_mint=lp_info.quote_mint,
+                liquidity_sol=lp_info.quote_liquidity,
+                created_at=lp_info.detected_timestamp
+            )
+            
+            # LP found before metadata: wait for it (bounded by its own deadline)
+            if metadata_ready is not None and not metadata_ready.done():
+                await asyncio.wait([metadata_ready])
+            
             # Update state machine
             state_record = self.state_machine.set_lp_detected(
                 mint=token_mint,
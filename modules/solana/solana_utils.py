@@ -11,7 +11,7 @@ CRITICAL: This module must NOT import any EVM adapters.
 """
 import time
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from functools import lru_cache
 
 # =============================================================================
@@ -33,6 +33,9 @@ TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
 # Native SOL mint
 WRAPPED_SOL_MINT = "So11111111111111111111111111111111111111112"
 
+# USDC mint (second supported quote)
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
 # =============================================================================
 # RPC ENDPOINTS
 # =============================================================================
@@ -88,6 +91,13 @@ def get_sol_price_usd() -> float:
     except Exception as e:
         print(f"[SOLANA] ⚠️  Price fetch error: {e}")
     
+    # Keep serving the last price for another TTL instead of retrying every call
+    _sol_price_cache['timestamp'] = now
+    return _sol_price_cache['price']
+
+
+def get_cached_sol_price_usd() -> float:
+    """Last known SOL price in USD without any I/O (for event-loop callbacks)."""
     return _sol_price_cache['price']
 
 
@@ -173,29 +183,29 @@ def extract_token_transfers(transaction_data: Dict) -> list:
     transfers = []
     
     try:
-        meta = transaction_data.get('meta', {})
-        pre_balances = meta.get('preTokenBalances', [])
-        post_balances = meta.get('postTokenBalances', [])
+        meta = transaction_data.get('meta') or {}
+        pre_balances = meta.get('preTokenBalances') or []
+        post_balances = meta.get('postTokenBalances') or []
+        
+        # Index pre-balances once instead of scanning them per post-balance
+        pre_amounts = {
+            (pre.get('accountIndex'), pre.get('mint')): pre.get('uiTokenAmount', {}).get('amount', 0)
+            for pre in reversed(pre_balances)
+        }
         
         # Build balance change map
         for post in post_balances:
-            account_index = post.get('accountIndex')
             mint = post.get('mint', '')
-            post_amount = int(post.get('uiTokenAmount', {}).get('amount', 0))
-            
-            # Find matching pre-balance
-            pre_amount = 0
-            for pre in pre_balances:
-                if pre.get('accountIndex') == account_index and pre.get('mint') == mint:
-                    pre_amount = int(pre.get('uiTokenAmount', {}).get('amount', 0))
-                    break
+            ui_amount = post.get('uiTokenAmount', {})
+            post_amount = int(ui_amount.get('amount', 0))
+            pre_amount = int(pre_amounts.get((post.get('accountIndex'), mint), 0))
             
             change = post_amount - pre_amount
             if change != 0:
                 transfers.append({
                     'mint': mint,
                     'change': change,
-                    'decimals': post.get('uiTokenAmount', {}).get('decimals', 9),
+                    'decimals': ui_amount.get('decimals', 9),
                     'owner': post.get('owner', '')
                 })
                 
@@ -205,6 +215,75 @@ def extract_token_transfers(transaction_data: Dict) -> list:
     return transfers
 
 
+# =============================================================================
+# BATCHED ACCOUNT READS
+# =============================================================================
+
+# getMultipleAccounts accepts at most 100 pubkeys per call
+MAX_ACCOUNTS_PER_CALL = 100
+
+# SPL token account layout: mint(32) | owner(32) | amount(u64) | ...
+SPL_TOKEN_ACCOUNT_MINT_OFFSET = 0
+SPL_TOKEN_ACCOUNT_OWNER_OFFSET = 32
+SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
+
+
+def get_multiple_accounts(client, addresses: List[str]) -> Dict[str, Any]:
+    """
+    Load many accounts with chunked getMultipleAccounts calls.
+    
+    Args:
+        client: Solana RPC client (sync)
+        addresses: Account addresses (base58)
+        
+    Returns:
+        Dict of address -> account (None if missing or failed)
+    """
+    from solders.pubkey import Pubkey
+    
+    accounts: Dict[str, Any] = {}
+    unique = list(dict.fromkeys(a for a in addresses if a))
+    
+    for start in range(0, len(unique), MAX_ACCOUNTS_PER_CALL):
+        chunk = unique[start:start + MAX_ACCOUNTS_PER_CALL]
+        values = []
+        try:
+            rate_limit_rpc()
+            response = client.get_multiple_accounts([Pubkey.from_string(a) for a in chunk])
+            values = response.value if response and response.value else []
+        except Exception as e:
+            print(f"[SOLANA] ⚠️  getMultipleAccounts error: {e}")
+        
+        for i, address in enumerate(chunk):
+            accounts[address] = values[i] if i < len(values) else None
+    
+    return accounts
+
+
+def decode_token_account_amount(data: bytes) -> Optional[int]:
+    """
+    Decode the raw amount of an SPL token account from its bytes.
+    
+    Args:
+        data: Raw token account data (165 bytes for SPL Token)
+        
+    Returns:
+        Raw u64 amount or None if data is too short
+    """
+    end = SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET + 8
+    if not data or len(data) < end:
+        return None
+    return int.from_bytes(data[SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET:end], byteorder='little')
+
+
+def pubkey_from_bytes(data: bytes, offset: int) -> Optional[str]:
+    """Decode a 32-byte pubkey at offset into base58."""
+    if not data or len(data) < offset + 32:
+        return None
+    from solders.pubkey import Pubkey
+    return str(Pubkey.from_bytes(bytes(data[offset:offset + 32])))
+
+
 # =============================================================================
 # SIGNATURE HELPERS
 # =============================================================================
@@ -271,6 +350,8 @@ def get_token_metadata_from_uri(uri: str) -> Optional[Dict]:
     """
     Fetch token metadata from URI (IPFS, Arweave, HTTP).
     
+    Blocking; async code should use uri_fetcher.get_uri_fetcher().fetch().
+    
     Args:
         uri: Metadata URI
         
@@ -15,11 +15,19 @@ Rules:
 - No buy without metadata + LP
 - LP must exceed min_liquidity_sol
 - Score must meet sniper_threshold
+
+Storage:
+- Per-state indexes (get_armed_tokens / get_by_state without full scans)
+- Creation-ordered expiry queue (cleanup is O(expired))
+- Periodic JSON snapshot of LP_DETECTED / SNIPER_ARMED / BOUGHT records
 """
+from array import array
+from collections import deque
 from enum import Enum
-from typing import Dict, Optional, Any
-from dataclasses import dataclass, field
-from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Any, Tuple
+import json
+import os
 import time
 
 from .solana_utils import solana_log
@@ -37,25 +45,129 @@ class TokenState(Enum):
     SKIPPED = "SKIPPED"  # Failed validation
 
 
-@dataclass
+_STATE_CODES = {state.value: code for code, state in enumerate(TokenState)}
+_STATE_VALUES = [state.value for state in TokenState]
+
+
+class StateHistory:
+    """
+    Compact transition log.
+    
+    Stores [from_code, to_code, timestamp] triples in one array('d')
+    (24 bytes per transition); reads yield
+    (from_state, to_state, timestamp) tuples of state values.
+    """
+    
+    __slots__ = ('_data',)
+    
+    def __init__(self, entries=()):
+        self._data = array('d')
+        for entry in entries:
+            self.append(entry)
+    
+    def append(self, entry: Tuple[str, str, float]):
+        from_state, to_state, timestamp = entry
+        self._data.extend((_STATE_CODES[from_state], _STATE_CODES[to_state], timestamp))
+    
+    def __len__(self) -> int:
+        return len(self._data) // 3
+    
+    def __getitem__(self, index: int) -> Tuple[str, str, float]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("state history index out of range")
+        data = self._data
+        i = index * 3
+        return (_STATE_VALUES[int(data[i])], _STATE_VALUES[int(data[i + 1])], data[i + 2])
+    
+    def __iter__(self):
+        data = self._data
+        for i in range(0, len(data), 3):
+            yield (_STATE_VALUES[int(data[i])], _STATE_VALUES[int(data[i + 1])], data[i + 2])
+
+
 class TokenStateRecord:
-    """State transition record for a token."""
-    mint: str
-    symbol: str = "???"
-    current_state: TokenState = TokenState.DETECTED
-    state_history: list = field(default_factory=list)
-    metadata_resolved: bool = False
-    lp_detected: bool = False
-    lp_valid: bool = False
-    score: float = 0.0
-    last_score: float = 0.0
-    last_transition: float = field(default_factory=time.time)
-    created_at: float = field(default_factory=time.time)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    lp_info: Dict[str, Any] = field(default_factory=dict)
-    reason_skipped: str = ""
-    buy_velocity: float = 0.0  # Buys per minute
-    smart_wallet_detected: bool = False  # Smart money wallet activity
+    """
+    State transition record for a token.
+    
+    Slotted to keep 100k+ tracked mints small. metadata/lp_info dicts are
+    only allocated on first access; state_history is a StateHistory of
+    (from_state, to_state, timestamp) entries.
+    """
+    
+    __slots__ = (
+        'mint', 'symbol', 'current_state', 'state_history',
+        'metadata_resolved', 'lp_detected', 'lp_valid',
+        'score', 'last_score', 'last_transition', 'created_at',
+        '_metadata', '_lp_info', 'reason_skipped',
+        'buy_velocity', 'smart_wallet_detected', 'pending_enrichments'
+    )
+    
+    def __init__(
+        self,
+        mint: str,
+        symbol: str = "???",
+        current_state: TokenState = TokenState.DETECTED,
+        state_history: Optional[Any] = None,
+        metadata_resolved: bool = False,
+        lp_detected: bool = False,
+        lp_valid: bool = False,
+        score: float = 0.0,
+        last_score: float = 0.0,
+        last_transition: Optional[float] = None,
+        created_at: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        lp_info: Optional[Dict[str, Any]] = None,
+        reason_skipped: str = "",
+        buy_velocity: float = 0.0,  # Buys per minute
+        smart_wallet_detected: bool = False,  # Smart money wallet activity
+        pending_enrichments: tuple = ()  # Enrichment sources still running
+    ):
+        now = time.time()
+        self.mint = mint
+        self.symbol = symbol
+        self.current_state = current_state
+        self.state_history = StateHistory(state_history or ())
+        self.metadata_resolved = metadata_resolved
+        self.lp_detected = lp_detected
+        self.lp_valid = lp_valid
+        self.score = score
+        self.last_score = last_score
+        self.last_transition = last_transition if last_transition is not None else now
+        self.created_at = created_at if created_at is not None else now
+        self._metadata = metadata or None
+        self._lp_info = lp_info or None
+        self.reason_skipped = reason_skipped
+        self.buy_velocity = buy_velocity
+        self.smart_wallet_detected = smart_wallet_detected
+        self.pending_enrichments = pending_enrichments
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+    
+    @property
+    def lp_info(self) -> Dict[str, Any]:
+        if self._lp_info is None:
+            self._lp_info = {}
+        return self._lp_info
+    
+    @lp_info.setter
+    def lp_info(self, value: Dict[str, Any]):
+        self._lp_info = value
+    
+    def __repr__(self) -> str:
+        return (
+            f"TokenStateRecord(mint={self.mint!r}, symbol={self.symbol!r}, "
+            f"state={self.current_state.value}, score={self.score})"
+        )
     
     def to_dict(self) -> Dict:
         """Convert to dict."""
@@ -71,15 +183,63 @@ class TokenStateRecord:
             "age_seconds": time.time() - self.created_at,
             "reason_skipped": self.reason_skipped,
             "buy_velocity": self.buy_velocity,
+            "smart_wallet_detected": self.smart_wallet_detected,
+            "pending_enrichments": list(self.pending_enrichments)
+        }
+    
+    def to_snapshot(self) -> Dict:
+        """Serialize every field for persistence."""
+        return {
+            "mint": self.mint,
+            "symbol": self.symbol,
+            "state": self.current_state.value,
+            "history": [list(entry) for entry in self.state_history],
+            "metadata_resolved": self.metadata_resolved,
+            "lp_detected": self.lp_detected,
+            "lp_valid": self.lp_valid,
+            "score": self.score,
+            "last_score": self.last_score,
+            "last_transition": self.last_transition,
+            "created_at": self.created_at,
+            "metadata": self._metadata,
+            "lp_info": self._lp_info,
+            "reason_skipped": self.reason_skipped,
+            "buy_velocity": self.buy_velocity,
             "smart_wallet_detected": self.smart_wallet_detected
         }
     
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> 'TokenStateRecord':
+        """Rebuild a record written by to_snapshot()."""
+        return cls(
+            mint=data["mint"],
+            symbol=data.get("symbol", "???"),
+            current_state=TokenState(data.get("state", TokenState.DETECTED.value)),
+            state_history=data.get("history", ()),
+            metadata_resolved=data.get("metadata_resolved", False),
+            lp_detected=data.get("lp_detected", False),
+            lp_valid=data.get("lp_valid", False),
+            score=data.get("score", 0.0),
+            last_score=data.get("last_score", 0.0),
+            last_transition=data.get("last_transition"),
+            created_at=data.get("created_at"),
+            metadata=data.get("metadata"),
+            lp_info=data.get("lp_info"),
+            reason_skipped=data.get("reason_skipped", ""),
+            buy_velocity=data.get("buy_velocity", 0.0),
+            smart_wallet_detected=data.get("smart_wallet_detected", False)
+        )
+    
     @property
     def age_seconds(self) -> float:
         """Token age in seconds."""
         return time.time() - self.created_at
 
 
+# States written to the snapshot file (worth surviving a restart)
+SNAPSHOT_STATES = (TokenState.LP_DETECTED, TokenState.SNIPER_ARMED, TokenState.BOUGHT)
+
+
 class TokenStateMachine:
     """
     Manages token state transitions.
@@ -100,7 +260,9 @@ class TokenStateMachine:
         self,
         min_lp_sol: float = 10.0,
         sniper_score_threshold: float = 70.0,
-        safe_mode: bool = True
+        safe_mode: bool = True,
+        snapshot_file: Optional[str] = None,
+        snapshot_interval: float = 60.0
     ):
         """
         Initialize state machine.
@@ -109,11 +271,28 @@ class TokenStateMachine:
             min_lp_sol: Minimum SOL liquidity required
             sniper_score_threshold: Minimum score to arm sniper
             safe_mode: Enforce strict validation rules
+            snapshot_file: JSON file for periodic snapshots (None disables)
+            snapshot_interval: Minimum seconds between snapshots
         """
         self.min_lp_sol = min_lp_sol
         self.sniper_score_threshold = sniper_score_threshold
         self.safe_mode = safe_mode
         self._states: Dict[str, TokenStateRecord] = {}
+        
+        # Secondary index: state -> {mint: record} (insertion ordered)
+        self._by_state: Dict[TokenState, Dict[str, TokenStateRecord]] = {
+            state: {} for state in TokenState
+        }
+        
+        # Expiry queue of (created_at, mint), ordered by creation time
+        self._expiry: Deque[Tuple[float, str]] = deque()
+        
+        # Snapshot persistence
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else None
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot = time.time()
+        self._snapshot_dirty = False
+        self._load_snapshot()
     
     def create_token(self, mint: str, symbol: str = "???") -> TokenStateRecord:
         """
@@ -130,7 +309,7 @@ class TokenStateMachine:
             return self._states[mint]
         
         record = TokenStateRecord(mint=mint, symbol=symbol)
-        self._states[mint] = record
+        self._add_record(record)
         
         solana_log(f"[STATE] Token created: {symbol} ({mint[:8]}...)", "DEBUG")
         
@@ -382,13 +561,49 @@ class TokenStateMachine:
             new_state: New state to transition to
         """
         old_state = record.current_state
+        now = time.time()
+        
+        if old_state is not new_state:
+            self._by_state[old_state].pop(record.mint, None)
+            self._by_state[new_state][record.mint] = record
+        
         record.current_state = new_state
-        record.last_transition = time.time()
-        record.state_history.append({
-            "from": old_state.value,
-            "to": new_state.value,
-            "timestamp": time.time()
-        })
+        record.last_transition = now
+        record.state_history.append((old_state.value, new_state.value, now))
+        
+        if new_state in SNAPSHOT_STATES or old_state in SNAPSHOT_STATES:
+            self._snapshot_dirty = True
+        self.maybe_snapshot()
+    
+    def transition(self, mint: str, new_state: TokenState) -> Optional[TokenStateRecord]:
+        """
+        Move a tracked token to a new state (keeps indexes consistent).
+        
+        Args:
+            mint: Token mint
+            new_state: Target state
+            
+        Returns:
+            Updated TokenStateRecord or None if not tracked
+        """
+        record = self._states.get(mint)
+        if record:
+            self._transition(record, new_state)
+        return record
+    
+    def _add_record(self, record: TokenStateRecord):
+        """Insert a record into the main map, state index and expiry queue."""
+        self._states[record.mint] = record
+        self._by_state[record.current_state][record.mint] = record
+        self._expiry.append((record.created_at, record.mint))
+    
+    def _remove_record(self, mint: str):
+        """Drop a record from the main map and state index."""
+        record = self._states.pop(mint, None)
+        if record:
+            self._by_state[record.current_state].pop(mint, None)
+            if record.current_state in SNAPSHOT_STATES:
+                self._snapshot_dirty = True
     
     def get_token(self, mint: str) -> Optional[TokenStateRecord]:
         """Get token record."""
@@ -400,17 +615,15 @@ class TokenStateMachine:
     
     def get_armed_tokens(self) -> list:
         """Get all tokens ready for execution."""
-        return [
-            record for record in self._states.values()
-            if record.current_state == TokenState.SNIPER_ARMED
-        ]
+        return list(self._by_state[TokenState.SNIPER_ARMED].values())
     
     def get_by_state(self, state: TokenState) -> list:
         """Get all tokens in a specific state."""
-        return [
-            record for record in self._states.values()
-            if record.current_state == state
-        ]
+        return list(self._by_state[state].values())
+    
+    def count_by_state(self, state: TokenState) -> int:
+        """Number of tokens in a specific state."""
+        return len(self._by_state[state])
     
     def update_buy_velocity(self, mint: str, velocity: float) -> Optional[TokenStateRecord]:
         """
@@ -444,32 +657,131 @@ class TokenStateMachine:
             record.smart_wallet_detected = detected
         return record
     
+    def set_pending_enrichments(self, mint: str, sources) -> Optional[TokenStateRecord]:
+        """
+        Record which enrichment sources are still running for a token.
+    
+        Args:
+            mint: Token mint
+            sources: Enrichment source names (e.g. "metadata", "lp")
+    
+        Returns:
+            Updated TokenStateRecord
+        """
+        record = self._states.get(mint)
+        if record:
+            record.pending_enrichments = tuple(sources)
+        return record
+    
+    def complete_enrichment(self, mint: str, source: str) -> Optional[TokenStateRecord]:
+        """
+        Mark one enrichment source as finished (or timed out).
+    
+        Args:
+            mint: Token mint
+            source: Enrichment source name
+    
+        Returns:
+            Updated TokenStateRecord
+        """
+        record = self._states.get(mint)
+        if record and source in record.pending_enrichments:
+            record.pending_enrichments = tuple(s for s in record.pending_enrichments if s != source)
+        return record
+    
     def cleanup(self, max_age_hours: int = 24):
         """
         Clean up old token records.
         
+        Pops from the creation-ordered expiry queue, so the cost is
+        proportional to the number of expired records.
+        
         Args:
             max_age_hours: Remove records older than this
         """
         cutoff = time.time() - (max_age_hours * 3600)
-        to_remove = [
-            mint for mint, record in self._states.items()
-            if record.created_at < cutoff
-        ]
+        expiry = self._expiry
+        
+        while expiry and expiry[0][0] < cutoff:
+            created_at, mint = expiry.popleft()
+            record = self._states.get(mint)
+            # Skip stale queue entries (record removed or re-created since)
+            if record is not None and record.created_at == created_at:
+                self._remove_record(mint)
         
-        for mint in to_remove:
-            del self._states[mint]
+        self.maybe_snapshot()
     
     def get_stats(self) -> Dict:
         """Get state machine statistics."""
-        by_state = {}
-        for state in TokenState:
-            by_state[state.value] = len(self.get_by_state(state))
+        by_state = {
+            state.value: len(records)
+            for state, records in self._by_state.items()
+        }
         
         return {
             "total_tokens": len(self._states),
             "by_state": by_state,
-            "armed_tokens": len(self.get_armed_tokens()),
+            "armed_tokens": len(self._by_state[TokenState.SNIPER_ARMED]),
             "min_lp_sol": self.min_lp_sol,
             "sniper_score_threshold": self.sniper_score_threshold
         }
+    
+    # =========================================================================
+    # SNAPSHOT PERSISTENCE
+    # =========================================================================
+    
+    def maybe_snapshot(self):
+        """Write a snapshot if state changed and the interval elapsed."""
+        if not self.snapshot_file or not self._snapshot_dirty:
+            return
+        if time.time() - self._last_snapshot >= self.snapshot_interval:
+            self.save_snapshot()
+    
+    def save_snapshot(self) -> None:
+        """Save LP_DETECTED / SNIPER_ARMED / BOUGHT records to the snapshot file."""
+        if not self.snapshot_file:
+            return
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            tokens = [
+                record.to_snapshot()
+                for state in SNAPSHOT_STATES
+                for record in self._by_state[state].values()
+            ]
+            data = {
+                'version': 1,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'total_count': len(tokens),
+                'tokens': tokens
+            }
+            
+            tmp_file = self.snapshot_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.snapshot_file)
+            
+            self._snapshot_dirty = False
+            self._last_snapshot = time.time()
+        
+        except Exception as e:
+            solana_log(f"[STATE] Error saving snapshot: {e}", "ERROR")
+    
+    def _load_snapshot(self) -> None:
+        """Restore records from the snapshot file."""
+        if not self.snapshot_file or not self.snapshot_file.exists():
+            return
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                data = json.load(f)
+            
+            records = [TokenStateRecord.from_snapshot(t) for t in data.get('tokens', [])]
+            # Expiry queue must stay ordered by creation time
+            records.sort(key=lambda r: r.created_at)
+            for record in records:
+                self._add_record(record)
+            
+            solana_log(f"[STATE] Restored {len(records)} tokens from snapshot", "INFO")
+        
+        except Exception as e:
+            solana_log(f"[STATE] Error loading snapshot: {e}", "ERROR")
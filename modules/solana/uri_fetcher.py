@@ -0,0 +1,353 @@
+"""
+Token Metadata URI Fetcher - Async off-chain JSON resolution
+
+Fetches the JSON behind Metaplex / Pump.fun metadata URIs:
+- IPFS URIs are raced across several public gateways (first valid JSON wins)
+- Response size is capped and timeouts are short
+- Dead URIs are negatively cached
+- Both caches are bounded (LRU documents, expiring failures)
+- Results are persisted content-addressed (ipfs CID / arweave tx id),
+  so the same document is never fetched twice, whatever gateway the
+  URI points at
+
+Only used for tokens that already passed cheap scoring; never on the
+sniper path.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .solana_utils import solana_log
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+IPFS_GATEWAYS = [
+    "https://ipfs.io/ipfs/",
+    "https://cf-ipfs.com/ipfs/",
+    "https://gateway.pinata.cloud/ipfs/",
+    "https://dweb.link/ipfs/",
+]
+
+ARWEAVE_GATEWAY = "https://arweave.net/"
+
+MAX_METADATA_BYTES = 256 * 1024  # Token JSON is a few KB; anything bigger is not metadata
+
+# ipfs://<cid>[/path], https://<host>/ipfs/<cid>[/path], https://<cid>.ipfs.<host>[/path]
+_IPFS_PATH_RE = re.compile(r"^(?:ipfs://(?:ipfs/)?|https?://[^/]+/ipfs/)([A-Za-z0-9]{46,})(/[^?#]*)?")
+_IPFS_SUBDOMAIN_RE = re.compile(r"^https?://([a-z0-9]{46,})\.ipfs\.[^/]+(/[^?#]*)?")
+_ARWEAVE_RE = re.compile(r"^(?:ar://|https?://(?:www\.)?arweave\.net/)([A-Za-z0-9_-]{43})(/[^?#]*)?")
+
+
+def content_key(uri: str) -> Tuple[str, List[str]]:
+    """
+    Map a metadata URI to its cache key and candidate fetch URLs.
+
+    Content-addressed URIs (IPFS, Arweave) get a stable key
+    ("ipfs:<cid><path>" / "ar:<tx>") and one URL per gateway;
+    other URIs key on themselves.
+
+    Args:
+        uri: Metadata URI
+
+    Returns:
+        (cache_key, urls) tuple
+    """
+    uri = uri.strip()
+
+    match = _IPFS_PATH_RE.match(uri) or _IPFS_SUBDOMAIN_RE.match(uri)
+    if match:
+        cid, path = match.group(1), match.group(2) or ""
+        return f"ipfs:{cid}{path}", [f"{gateway}{cid}{path}" for gateway in IPFS_GATEWAYS]
+
+    match = _ARWEAVE_RE.match(uri)
+    if match:
+        tx_id, path = match.group(1), match.group(2) or ""
+        return f"ar:{tx_id}{path}", [f"{ARWEAVE_GATEWAY}{tx_id}{path}"]
+
+    return uri, [uri]
+
+
+class UriMetadataFetcher:
+    """
+    Async fetcher for token metadata URIs.
+
+    - fetch(uri): cached / negatively cached / raced gateway fetch
+    - concurrent fetches of the same content share one request
+    - content-addressed entries are immutable and persisted to disk
+    """
+
+    def __init__(
+        self,
+        timeout: float = 3.0,
+        hedge_delay: float = 0.25,
+        max_bytes: int = MAX_METADATA_BYTES,
+        max_concurrent: int = 16,
+        negative_ttl: int = 1800,
+        http_ttl: int = 3600,
+        cache_file: Optional[str] = 'data/solana_uri_cache.json',
+        max_entries: int = 50000
+    ):
+        """
+        Initialize URI fetcher.
+
+        Args:
+            timeout: Total timeout per URI (all gateways)
+            hedge_delay: Seconds before the next gateway joins the race
+            max_bytes: Response size cap
+            max_concurrent: Max URIs being fetched at once
+            negative_ttl: Seconds to skip URIs that failed
+            http_ttl: Cache TTL for plain HTTP URIs (content-addressed never expire)
+            cache_file: JSON file for the persistent cache (None disables)
+            max_entries: Max cached documents / failed URIs (oldest dropped first)
+        """
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.http_ttl = http_ttl
+        self.max_entries = max_entries
+
+        self._cache: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()  # key -> (json, fetched_at), LRU order
+        self._failed: "OrderedDict[str, float]" = OrderedDict()  # key -> failed_at, oldest first
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Stats
+        self.hits = 0
+        self.negative_hits = 0
+        self.fetches = 0
+        self.failures = 0
+        self.gateway_wins: Dict[str, int] = {}
+
+        # Persistence
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._dirty = 0
+        self._last_save = time.time()
+        self._save_interval = 60
+        self._load_from_file()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+                headers={"Accept": "application/json"}
+            )
+        return self._session
+
+    async def close(self):
+        """Close HTTP session and flush the cache."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self.save_cache()
+
+    def get_cached(self, uri: str) -> Optional[Dict]:
+        """Cached JSON for a URI without fetching."""
+        key, _ = content_key(uri)
+        entry = self._cache.get(key)
+        if entry and self._is_fresh(key, entry[1]):
+            return entry[0]
+        return None
+
+    def _is_fresh(self, key: str, fetched_at: float) -> bool:
+        if key.startswith(("ipfs:", "ar:")):
+            return True
+        return time.time() - fetched_at < self.http_ttl
+
+    async def fetch(self, uri: str) -> Optional[Dict]:
+        """
+        Fetch metadata JSON for a URI.
+
+        Args:
+            uri: Metadata URI (ipfs://, ar://, gateway or plain HTTP URL)
+
+        Returns:
+            Metadata dict or None
+        """
+        if not uri:
+            return None
+
+        key, urls = content_key(uri)
+
+        entry = self._cache.get(key)
+        if entry and self._is_fresh(key, entry[1]):
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return entry[0]
+
+        failed_at = self._failed.get(key)
+        if failed_at is not None:
+            if time.time() - failed_at < self.negative_ttl:
+                self.negative_hits += 1
+                return None
+            del self._failed[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_key(key, urls))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch_key(self, key: str, urls: List[str]) -> Optional[Dict]:
+        async with self._semaphore:
+            self.fetches += 1
+            try:
+                data = await asyncio.wait_for(self._race(urls), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                data = None
+
+        if data is None:
+            self.failures += 1
+            self._remember_failure(key)
+            solana_log(f"[URI] No metadata from {urls[0]}", "DEBUG")
+            return None
+
+        self._store(key, data, time.time())
+        self._dirty += 1
+        self._maybe_save()
+        return data
+
+    def _store(self, key: str, data: Dict, fetched_at: float):
+        """Cache a document, evicting the least recently used past max_entries."""
+        self._cache[key] = (data, fetched_at)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _remember_failure(self, key: str):
+        """Negatively cache a key; expired and excess failures are dropped."""
+        now = time.time()
+        self._failed.pop(key, None)
+        self._failed[key] = now
+        while self._failed:
+            oldest_key, failed_at = next(iter(self._failed.items()))
+            if now - failed_at < self.negative_ttl and len(self._failed) <= self.max_entries:
+                break
+            del self._failed[oldest_key]
+
+    async def _race(self, urls: List[str]) -> Optional[Dict]:
+        """
+        Hedged race: gateway i joins after i * hedge_delay, or as soon as
+        an earlier one fails. First valid JSON object wins; the rest are
+        cancelled.
+        """
+        tasks: Dict[asyncio.Task, str] = {}
+        remaining = list(urls)
+        try:
+            while remaining or tasks:
+                if remaining:
+                    url = remaining.pop(0)
+                    tasks[asyncio.ensure_future(self._fetch_url(url))] = url
+
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self.hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url = tasks.pop(task)
+                    if not task.cancelled() and task.exception() is None and isinstance(task.result(), dict):
+                        gateway = url.split("/", 3)[2]
+                        self.gateway_wins[gateway] = self.gateway_wins.get(gateway, 0) + 1
+                        return task.result()
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_url(self, url: str) -> Optional[Dict]:
+        """GET one URL, reading at most max_bytes."""
+        session = await self._get_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            if response.status != 200:
+                return None
+            if (response.content_length or 0) > self.max_bytes:
+                return None
+
+            body = await response.content.read(self.max_bytes + 1)
+            if len(body) > self.max_bytes:
+                return None
+            return json.loads(body)
+
+    def get_stats(self) -> Dict:
+        """Get fetcher statistics."""
+        return {
+            "cached": len(self._cache),
+            "failed": len(self._failed),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "gateway_wins": dict(self.gateway_wins)
+        }
+
+    def _maybe_save(self):
+        """Persist the cache when enough entries changed or interval elapsed."""
+        if self._dirty >= 100 or (self._dirty and time.time() - self._last_save >= self._save_interval):
+            self.save_cache()
+
+    def save_cache(self) -> None:
+        """Save fetched metadata to the persistence file."""
+        if not self.cache_file or not self._dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+            entries = sorted(self._cache.items(), key=lambda item: item[1][1])
+            data = {
+                'version': 1,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'entries': {key: [value, fetched_at] for key, (value, fetched_at) in entries}
+            }
+
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+
+            self._dirty = 0
+            self._last_save = time.time()
+
+        except Exception as e:
+            solana_log(f"[URI] Error saving cache: {e}", "ERROR")
+
+    def _load_from_file(self) -> None:
+        """Load persisted metadata."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+
+            entries = sorted(data.get('entries', {}).items(), key=lambda item: item[1][1])
+            for key, (value, fetched_at) in entries:
+                if self._is_fresh(key, fetched_at):
+                    self._store(key, value, fetched_at)
+
+            solana_log(f"[URI] Loaded {len(self._cache)} cached documents from {self.cache_file}", "DEBUG")
+
+        except Exception as e:
+            solana_log(f"[URI] Error loading cache: {e}", "ERROR")
+
+
+# Singleton instance
+_uri_fetcher: Optional[UriMetadataFetcher] = None
+
+
+def get_uri_fetcher() -> UriMetadataFetcher:
+    """Get or create URI fetcher singleton."""
+    global _uri_fetcher
+    if _uri_fetcher is None:
+        _uri_fetcher = UriMetadataFetcher()
+    return _uri_fetcher
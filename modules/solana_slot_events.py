@@ -0,0 +1,249 @@
+"""
+SOLANA SLOT TICKER SERVICE
+==========================
+Solana counterpart of GlobalBlockService.
+
+Hard Constraints:
+1. Only ONE service tracks the Solana slot (slotSubscribe or getSlot)
+2. Slot ticks are published as BlockSnapshot on the shared EventBus
+   (topic NEW_BLOCK_SOLANA), at most once per tick_interval
+3. Consumers run through CoalescedJob, so a slow scan never queues
+   overlapping runs - ticks arriving mid-run collapse into one rerun
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from modules.global_block_events import EventBus, BlockSnapshot
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+SOLANA_CHAIN_NAME = "solana"
+SOLANA_CHAIN_ID = 0  # Not an EVM chain; kept for BlockSnapshot compatibility
+
+# -----------------------------------------------------------------------------
+# 1. COALESCED JOB
+# -----------------------------------------------------------------------------
+
+class CoalescedJob:
+    """
+    Runs an async job from event ticks without overlap.
+
+    - trigger() never blocks the publisher: it starts the job in a task
+    - ticks arriving while the job runs are collapsed into ONE rerun
+      with the latest snapshot
+    - min_interval throttles runs (ticks inside the window are dropped)
+    """
+
+    def __init__(self, name: str, job: Callable[[BlockSnapshot], Awaitable[Any]],
+                 min_interval: float = 0.0, timeout: Optional[float] = None):
+        self.name = name
+        self.job = job
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[BlockSnapshot] = None
+        self._last_run = 0.0
+
+        # Stats
+        self.runs = 0
+        self.coalesced = 0
+        self.throttled = 0
+
+    async def trigger(self, snapshot: BlockSnapshot):
+        """EventBus callback: schedule the job or fold the tick into a rerun."""
+        if self._task is not None and not self._task.done():
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = snapshot
+            return
+
+        if time.time() - self._last_run < self.min_interval:
+            self.throttled += 1
+            return
+
+        self._task = asyncio.create_task(self._run(snapshot), name=f"slot-job-{self.name}")
+
+    async def _run(self, snapshot: BlockSnapshot):
+        while snapshot is not None:
+            self._last_run = time.time()
+            self.runs += 1
+            try:
+                if self.timeout:
+                    await asyncio.wait_for(self.job(snapshot), timeout=self.timeout)
+                else:
+                    await self.job(snapshot)
+            except asyncio.TimeoutError:
+                print(f"⚠️  [SOL-SLOT] Job '{self.name}' timed out (>{self.timeout}s)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  [SOL-SLOT] Job '{self.name}' error: {e}")
+
+            snapshot, self._pending = self._pending, None
+            if snapshot is not None:
+                # Honour the throttle before the coalesced rerun
+                wait = self.min_interval - (time.time() - self._last_run)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+    def cancel(self):
+        if self._task:
+            self._task.cancel()
+
+    def get_stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+            "throttled": self.throttled,
+            "running": self._task is not None and not self._task.done()
+        }
+
+# -----------------------------------------------------------------------------
+# 2. SOLANA SLOT SERVICE
+# -----------------------------------------------------------------------------
+
+class SolanaSlotService:
+    """
+    Singleton service that owns the Solana slot feed.
+    Responsible for:
+    - Tracking the latest slot via slotSubscribe (websockets) or
+      adaptive getSlot polling
+    - Creating BlockSnapshot (block_number = slot)
+    - Publishing to EventBus at most once per tick_interval
+    """
+    _instance: Optional['SolanaSlotService'] = None
+
+    def __init__(self, rpc_url: str, ws_url: Optional[str] = None, tick_interval: float = 1.0,
+                 max_poll_interval: float = 10.0, use_websocket: bool = True):
+        self.rpc_url = rpc_url
+        self.ws_url = ws_url or rpc_url.replace("https://", "wss://").replace("http://", "ws://")
+        self.tick_interval = tick_interval
+        self.max_poll_interval = max_poll_interval
+        self.use_websocket = use_websocket and WEBSOCKETS_AVAILABLE
+        self.latest_slot = 0
+        self.published_slot = 0
+        self.is_running = False
+        self.source = "poll"
+        self._slot_time = 0.0
+        self._tasks = []
+
+    @classmethod
+    def get_instance(cls, rpc_url: str, **kwargs) -> 'SolanaSlotService':
+        if cls._instance is None:
+            cls._instance = cls(rpc_url, **kwargs)
+        return cls._instance
+
+    def start(self):
+        if not self.is_running:
+            self.is_running = True
+            self._tasks = [
+                asyncio.create_task(self._feed_loop(), name="solana-slot-feed"),
+                asyncio.create_task(self._publish_loop(), name="solana-slot-publish"),
+            ]
+            print(f"🌍 [SOLANA] Slot Ticker Service STARTED ({'slotSubscribe' if self.use_websocket else 'getSlot polling'})")
+
+    def stop(self):
+        self.is_running = False
+        for task in self._tasks:
+            task.cancel()
+
+    def _record_slot(self, slot: int):
+        if slot > self.latest_slot:
+            self.latest_slot = slot
+            self._slot_time = time.time()
+
+    async def _feed_loop(self):
+        """Keep latest_slot current: websocket first, polling as fallback."""
+        while self.is_running:
+            if self.use_websocket:
+                try:
+                    await self._subscribe_slots()
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    print(f"⚠️  [SOLANA] slotSubscribe error: {e} → polling for 60s")
+
+                # Poll for a while before retrying the websocket
+                await self._poll_slots(until=time.time() + 60)
+            else:
+                await self._poll_slots()
+
+    async def _subscribe_slots(self):
+        """Read slotNotification messages until the socket drops."""
+        async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "slotSubscribe"}))
+            self.source = "ws"
+            async for message in ws:
+                if not self.is_running:
+                    return
+                data = json.loads(message)
+                result = data.get("params", {}).get("result")
+                if isinstance(result, dict) and "slot" in result:
+                    self._record_slot(result["slot"])
+
+    async def _poll_slots(self, until: Optional[float] = None):
+        """
+        Adaptive getSlot polling.
+        Interval starts at tick_interval and doubles (up to max_poll_interval)
+        while the slot does not advance or the RPC errors.
+        """
+        self.source = "poll"
+        interval = self.tick_interval
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getSlot", "params": [{"commitment": "confirmed"}]}
+
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+            while self.is_running and (until is None or time.time() < until):
+                try:
+                    async with session.post(self.rpc_url, json=payload) as resp:
+                        data = await resp.json(content_type=None)
+                    slot = data.get("result")
+                    if isinstance(slot, int) and slot > self.latest_slot:
+                        self._record_slot(slot)
+                        interval = self.tick_interval
+                    else:
+                        interval = min(interval * 2, self.max_poll_interval)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️  [SOLANA] RPC Error (getSlot): {e}")
+                    interval = min(interval * 2, self.max_poll_interval)
+
+                await asyncio.sleep(interval)
+
+    async def _publish_loop(self):
+        """Publish the latest slot once per tick_interval (intermediate slots are coalesced)."""
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.tick_interval)
+                if self.latest_slot <= self.published_slot:
+                    continue
+
+                self.published_slot = self.latest_slot
+                snapshot = BlockSnapshot(
+                    chain_name=SOLANA_CHAIN_NAME,
+                    chain_id=SOLANA_CHAIN_ID,
+                    block_number=self.latest_slot,
+                    timestamp=int(self._slot_time)
+                )
+                await EventBus.publish(f"NEW_BLOCK_{SOLANA_CHAIN_NAME.upper()}", snapshot)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"⚠️  [SOLANA] Slot publish error: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "source": self.source,
+            "latest_slot": self.latest_slot,
+            "published_slot": self.published_slot,
+            "slot_age_seconds": round(time.time() - self._slot_time, 1) if self._slot_time else None
+        }
@@ -13,10 +13,27 @@ Output:
 - priority_score (max 50)
 - is_priority flag
 - priority_reasons list
+
+Batch mode (analyze_batch) extracts fee / compute-budget / Jito tip
+fields for a whole batch into arrays (NumPy when available) and computes
+fee percentiles and sniper-bundle clusters in one pass.
 """
 
 import time
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import base58
+    BASE58_AVAILABLE = True
+except ImportError:
+    BASE58_AVAILABLE = False
 
 # Known Jito tip accounts (as of 2025)
 JITO_TIP_ACCOUNTS = [
@@ -29,6 +46,18 @@ JITO_TIP_ACCOUNTS = [
     "DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL",
     "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT"
 ]
+JITO_TIP_INDEX = {account: i for i, account in enumerate(JITO_TIP_ACCOUNTS)}
+
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+COMPUTE_BUDGET_PROGRAM_ID = "ComputeBudget111111111111111111111111111111"
+
+# Instruction tags
+SYSTEM_TRANSFER_TAG = 2                 # u32 LE tag + u64 lamports
+COMPUTE_SET_UNIT_LIMIT_TAG = 2          # u8 tag + u32 units
+COMPUTE_SET_UNIT_PRICE_TAG = 3          # u8 tag + u64 micro-lamports
+
+# Feature columns extracted per transaction (see _extract_features)
+FEATURE_FIELDS = ('slot', 'fee', 'compute_units', 'cu_limit', 'cu_price', 'jito_tip', 'tip_account')
 
 # Base fee for Solana transactions (lamports)
 SOLANA_BASE_FEE = 5000  # 0.000005 SOL
@@ -70,9 +99,15 @@ class SolanaPriorityDetector:
         self.score_jito_tip = self.config.get('score_jito_tip', 15)
         self.max_score = 50
         
-        # Cache for preventing duplicate processing
-        self.processed_txs = {}
-        self.cache_max_size = 1000
+        # Sniper-bundle clustering (same slot + same tip account + similar fees)
+        self.bundle_min_size = self.config.get('bundle_min_size', 3)
+        self.bundle_fee_tolerance = self.config.get('bundle_fee_tolerance', 0.25)  # max spread / median
+        
+        # LRU cache for preventing duplicate processing
+        self.processed_txs: OrderedDict = OrderedDict()
+        self.cache_max_size = self.config.get('cache_max_size', 1000)
+        self.cache_hits = 0
+        self.cache_misses = 0
         
     def analyze_transaction(self, tx_data: Dict) -> Dict:
         """
@@ -97,69 +132,167 @@ class SolanaPriorityDetector:
         signature = tx_data.get('signature', '')
         
         # Check cache
-        if signature in self.processed_txs:
-            return self.processed_txs[signature]
+        cached = self._get_cached(signature)
+        if cached is not None:
+            return cached
         
+        try:
+            features = self._extract_features(tx_data)
+            result = self._build_result(
+                features[2], max(0, features[1] - SOLANA_BASE_FEE), features[5], features[6]
+            )
+            
+            # Cache result
+            self._cache_result(signature, result)
+            
+            return result
+            
+        except Exception as e:
+            print(f"[PRIORITY] Error analyzing transaction: {e}")
+            return self._build_result(0, 0, 0, -1)
+    
+    def _build_result(self, compute_units: int, priority_fee: int, jito_tip: int, tip_account: int) -> Dict:
+        """
+        Score one transaction from its extracted fields.
+        
+        Args:
+            compute_units: Compute units consumed
+            priority_fee: Fee above the base fee (lamports)
+            jito_tip: Tip to a Jito account (lamports, 0 if none)
+            tip_account: Index into JITO_TIP_ACCOUNTS or -1
+        
+        Returns:
+            Result dict (see analyze_transaction)
+        """
         result = {
             'priority_score': 0,
             'is_priority': False,
             'priority_reasons': [],
-            'compute_units': 0,
-            'priority_fee': 0,
+            'compute_units': compute_units,
+            'priority_fee': priority_fee,
             'jito_tip': 0,
             'jito_tip_account': None
         }
         
-        try:
-            # Extract metadata
-            meta = tx_data.get('meta', {})
-            transaction = tx_data.get('transaction', {})
-            
-            # 1. Check compute units consumed
-            compute_units = meta.get('computeUnitsConsumed', 0)
-            result['compute_units'] = compute_units
-            
-            if compute_units > self.compute_threshold:
-                result['priority_score'] += self.score_compute
-                result['priority_reasons'].append(
-                    f"High compute: {compute_units:,} units (>{self.compute_threshold:,})"
-                )
-            
-            # 2. Check priority fee
-            total_fee = meta.get('fee', SOLANA_BASE_FEE)
-            priority_fee = max(0, total_fee - SOLANA_BASE_FEE)
-            result['priority_fee'] = priority_fee
-            
-            if priority_fee > self.priority_fee_threshold:
-                result['priority_score'] += self.score_priority_fee
-                priority_sol = priority_fee / 1e9
-                result['priority_reasons'].append(
-                    f"Priority fee: {priority_sol:.6f} SOL"
-                )
-            
-            # 3. Check for Jito tips
-            jito_info = self._detect_jito_tip(transaction)
-            if jito_info['detected']:
-                result['jito_tip'] = jito_info['amount']
-                result['jito_tip_account'] = jito_info['account']
-                result['priority_score'] += self.score_jito_tip
-                tip_sol = jito_info['amount'] / 1e9
-                result['priority_reasons'].append(
-                    f"Jito tip: {tip_sol:.6f} SOL to {jito_info['account'][:8]}..."
-                )
-            
-            # Cap score at max
-            result['priority_score'] = min(result['priority_score'], self.max_score)
-            result['is_priority'] = result['priority_score'] > 0
-            
-            # Cache result
-            self._cache_result(signature, result)
+        # 1. Check compute units consumed
+        if compute_units > self.compute_threshold:
+            result['priority_score'] += self.score_compute
+            result['priority_reasons'].append(
+                f"High compute: {compute_units:,} units (>{self.compute_threshold:,})"
+            )
+        
+        # 2. Check priority fee
+        if priority_fee > self.priority_fee_threshold:
+            result['priority_score'] += self.score_priority_fee
+            priority_sol = priority_fee / 1e9
+            result['priority_reasons'].append(
+                f"Priority fee: {priority_sol:.6f} SOL"
+            )
+        
+        # 3. Check for Jito tips
+        if tip_account >= 0:
+            account = JITO_TIP_ACCOUNTS[tip_account]
+            result['jito_tip'] = jito_tip
+            result['jito_tip_account'] = account
+            result['priority_score'] += self.score_jito_tip
+            tip_sol = jito_tip / 1e9
+            result['priority_reasons'].append(
+                f"Jito tip: {tip_sol:.6f} SOL to {account[:8]}..."
+            )
+        
+        # Cap score at max
+        result['priority_score'] = min(result['priority_score'], self.max_score)
+        result['is_priority'] = result['priority_score'] > 0
+        
+        return result
+    
+    def _extract_features(self, tx_data: Dict) -> Tuple[int, int, int, int, int, int, int]:
+        """
+        Pull fee, compute-budget and Jito tip fields in one instruction walk.
+        
+        Handles both raw (programIdIndex + base58 data) and jsonParsed
+        instruction formats.
+        
+        Args:
+            tx_data: Transaction data dict
+        
+        Returns:
+            Tuple in FEATURE_FIELDS order; tip_account is an index into
+            JITO_TIP_ACCOUNTS or -1
+        """
+        meta = tx_data.get('meta') or {}
+        transaction = tx_data.get('transaction') or {}
+        message = transaction.get('message', {})
+        account_keys = message.get('accountKeys', [])
+        if account_keys and isinstance(account_keys[0], dict):
+            account_keys = [acc.get('pubkey', '') for acc in account_keys]
+        key_count = len(account_keys)
+        
+        cu_limit = 0
+        cu_price = 0
+        jito_tip = 0
+        tip_account = -1
+        
+        for ix in message.get('instructions', []):
+            program_id = ix.get('programId')
+            if program_id is None:
+                program_id_index = ix.get('programIdIndex')
+                if program_id_index is None or program_id_index >= key_count:
+                    continue
+                program_id = account_keys[program_id_index]
             
-            return result
+            if program_id == SYSTEM_PROGRAM_ID and tip_account < 0:
+                parsed = ix.get('parsed')
+                if isinstance(parsed, dict):
+                    info = parsed.get('info', {})
+                    index = JITO_TIP_INDEX.get(info.get('destination'))
+                    if index is not None and parsed.get('type') == 'transfer':
+                        tip_account = index
+                        jito_tip = int(info.get('lamports', 0)) or self.min_jito_tip
+                    continue
+                
+                accounts = ix.get('accounts', [])
+                if len(accounts) >= 2:
+                    to_account = accounts[1]
+                    if isinstance(to_account, int):
+                        to_account = account_keys[to_account] if to_account < key_count else None
+                    index = JITO_TIP_INDEX.get(to_account)
+                    if index is not None:
+                        tip_account = index
+                        data = self._decode_data(ix.get('data', ''))
+                        if len(data) >= 12 and int.from_bytes(data[:4], 'little') == SYSTEM_TRANSFER_TAG:
+                            jito_tip = int.from_bytes(data[4:12], 'little')
+                        else:
+                            jito_tip = self.min_jito_tip
             
-        except Exception as e:
-            print(f"[PRIORITY] Error analyzing transaction: {e}")
-            return result
+            elif program_id == COMPUTE_BUDGET_PROGRAM_ID:
+                data = self._decode_data(ix.get('data', ''))
+                if len(data) >= 5 and data[0] == COMPUTE_SET_UNIT_LIMIT_TAG:
+                    cu_limit = int.from_bytes(data[1:5], 'little')
+                elif len(data) >= 9 and data[0] == COMPUTE_SET_UNIT_PRICE_TAG:
+                    cu_price = int.from_bytes(data[1:9], 'little')
+        
+        return (
+            tx_data.get('slot', 0) or 0,
+            meta.get('fee', SOLANA_BASE_FEE),
+            meta.get('computeUnitsConsumed', 0) or 0,
+            cu_limit,
+            cu_price,
+            jito_tip,
+            tip_account
+        )
+    
+    @staticmethod
+    def _decode_data(data: Any) -> bytes:
+        """Decode base58 instruction data (empty bytes if unavailable)."""
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+        if not data or not BASE58_AVAILABLE:
+            return b''
+        try:
+            return base58.b58decode(data)
+        except Exception:
+            return b''
     
     def _detect_jito_tip(self, transaction: Dict) -> Dict:
         """
@@ -176,53 +309,18 @@ class SolanaPriorityDetector:
                 - amount: int (lamports)
                 - account: str (recipient)
         """
-        result = {
-            'detected': False,
-            'amount': 0,
-            'account': None
-        }
-        
         try:
-            message = transaction.get('message', {})
-            instructions = message.get('instructions', [])
-            account_keys = message.get('accountKeys', [])
-            
-            # Look for system transfers to Jito accounts
-            for ix in instructions:
-                # Check if this is a system program transfer
-                program_id_index = ix.get('programIdIndex')
-                if program_id_index is not None:
-                    program_id = account_keys[program_id_index] if program_id_index < len(account_keys) else None
-                    
-                    # System Program: 11111111111111111111111111111111
-                    if program_id == "11111111111111111111111111111111":
-                        # Check destination account
-                        accounts = ix.get('accounts', [])
-                        if len(accounts) >= 2:
-                            to_index = accounts[1]
-                            to_account = account_keys[to_index] if to_index < len(account_keys) else None
-                            
-                            if to_account in JITO_TIP_ACCOUNTS:
-                                # Parse transfer amount from instruction data
-                                # System transfer instruction format: [2, 0, 0, 0, amount_bytes...]
-                                data = ix.get('data', '')
-                                if data:
-                                    try:
-                                        # Decode base58 data and extract amount
-                                        # Simplified - real implementation would decode properly
-                                        # For now, flag as detected with minimum tip
-                                        result['detected'] = True
-                                        result['amount'] = self.min_jito_tip
-                                        result['account'] = to_account
-                                        break
-                                    except:
-                                        pass
-            
-            return result
+            features = self._extract_features({'transaction': transaction})
+            tip_account = features[6]
+            return {
+                'detected': tip_account >= 0,
+                'amount': features[5],
+                'account': JITO_TIP_ACCOUNTS[tip_account] if tip_account >= 0 else None
+            }
             
         except Exception as e:
             print(f"[PRIORITY] Error detecting Jito tip: {e}")
-            return result
+            return {'detected': False, 'amount': 0, 'account': None}
     
     def batch_analyze(self, transactions: List[Dict]) -> List[Dict]:
         """
@@ -234,12 +332,155 @@ class SolanaPriorityDetector:
         Returns:
             List of analysis results
         """
-        results = []
-        for tx in transactions:
-            result = self.analyze_transaction(tx)
-            results.append(result)
+        return self.analyze_batch(transactions)['results']
+    
+    def analyze_batch(self, transactions: List[Dict]) -> Dict:
+        """
+        Analyze a batch of transactions in one pass.
+        
+        Fields for all uncached transactions are extracted into columns,
+        scored together, and used for batch-level fee percentiles and
+        sniper-bundle clustering.
+        
+        Args:
+            transactions: List of transaction dicts (with 'slot' for clustering)
+        
+        Returns:
+            Dict with:
+                - results: List[Dict] per transaction (same as analyze_transaction)
+                - fee_percentiles: priority fee / CU price / Jito tip p50-p99
+                - bundle_clusters: List[Dict] of suspected sniper bundles
+        """
+        results: List[Optional[Dict]] = [None] * len(transactions)
+        rows = []
+        columns = []
+        
+        for i, tx in enumerate(transactions):
+            signature = tx.get('signature', '')
+            cached = self._get_cached(signature)
+            try:
+                features = self._extract_features(tx)
+            except Exception as e:
+                print(f"[PRIORITY] Error analyzing transaction: {e}")
+                features = (0, SOLANA_BASE_FEE, 0, 0, 0, 0, -1)
+            columns.append(features)
+            if cached is not None:
+                results[i] = cached
+            else:
+                rows.append(i)
+        
+        batch = self._to_columns(columns)
+        
+        # Score uncached rows (plain ints; avoids per-element array access)
+        for i in rows:
+            slot, fee, compute_units, cu_limit, cu_price, jito_tip, tip_account = columns[i]
+            result = self._build_result(
+                compute_units, max(0, fee - SOLANA_BASE_FEE), jito_tip, tip_account
+            )
+            self._cache_result(transactions[i].get('signature', ''), result)
+            results[i] = result
+        
+        return {
+            'results': results,
+            'fee_percentiles': self._fee_percentiles(batch),
+            'bundle_clusters': self._find_bundles(batch, transactions)
+        }
+    
+    def _to_columns(self, columns: List[tuple]) -> Dict:
+        """Transpose extracted feature tuples into per-field columns."""
+        if NUMPY_AVAILABLE:
+            matrix = np.array(columns, dtype=np.int64).reshape(-1, len(FEATURE_FIELDS))
+            batch = {field: matrix[:, i] for i, field in enumerate(FEATURE_FIELDS)}
+            batch['priority_fee'] = np.maximum(batch['fee'] - SOLANA_BASE_FEE, 0)
+        else:
+            transposed = list(zip(*columns)) if columns else [()] * len(FEATURE_FIELDS)
+            batch = {field: list(transposed[i]) for i, field in enumerate(FEATURE_FIELDS)}
+            batch['priority_fee'] = [max(0, fee - SOLANA_BASE_FEE) for fee in batch['fee']]
+        return batch
+    
+    @staticmethod
+    def _percentiles(values) -> Dict:
+        """p50/p75/p90/p99 of a column (linear interpolation, as np.percentile)."""
+        if len(values) == 0:
+            return {'p50': 0, 'p75': 0, 'p90': 0, 'p99': 0}
+        if NUMPY_AVAILABLE:
+            p50, p75, p90, p99 = np.percentile(values, [50, 75, 90, 99])
+            return {'p50': float(p50), 'p75': float(p75), 'p90': float(p90), 'p99': float(p99)}
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        result = {}
+        for q in (50, 75, 90, 99):
+            pos = q / 100 * last
+            lower = int(pos)
+            upper = min(last, lower + 1)
+            result[f"p{q}"] = float(ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower))
+        return result
+    
+    def _fee_percentiles(self, batch: Dict) -> Dict:
+        """Batch-level percentiles for priority fee, CU price and Jito tips."""
+        tips = batch['jito_tip']
+        if NUMPY_AVAILABLE:
+            tips = tips[tips > 0]
+        else:
+            tips = [tip for tip in tips if tip > 0]
+        
+        return {
+            'priority_fee': self._percentiles(batch['priority_fee']),
+            'cu_price': self._percentiles(batch['cu_price']),
+            'jito_tip': self._percentiles(tips),
+            'jito_tip_count': len(tips)
+        }
+    
+    def _find_bundles(self, batch: Dict, transactions: List[Dict]) -> List[Dict]:
+        """
+        Cluster suspected sniper bundles.
+        
+        A bundle is >= bundle_min_size transactions in the same slot tipping
+        the same Jito account whose priority fees lie within
+        bundle_fee_tolerance of the group median.
+        """
+        slots = batch['slot']
+        tip_accounts = batch['tip_account']
+        priority_fees = batch['priority_fee']
+        groups = []
+        
+        if NUMPY_AVAILABLE:
+            mask = np.nonzero((tip_accounts >= 0) & (slots > 0))[0]
+            if len(mask) < self.bundle_min_size:
+                return []
+            order = mask[np.lexsort((tip_accounts[mask], slots[mask]))]
+            keys = slots[order] * len(JITO_TIP_ACCOUNTS) + tip_accounts[order]
+            bounds = np.flatnonzero(np.diff(keys)) + 1
+            starts = np.concatenate(([0], bounds))
+            sizes = np.diff(np.concatenate((starts, [len(order)])))
+            for start, size in zip(starts, sizes):
+                if size >= self.bundle_min_size:
+                    groups.append(order[start:start + size].tolist())
+        else:
+            by_key: Dict[tuple, List[int]] = {}
+            for i, (slot, tip_account) in enumerate(zip(slots, tip_accounts)):
+                if tip_account >= 0 and slot > 0:
+                    by_key.setdefault((slot, tip_account), []).append(i)
+            groups = [idx for idx in by_key.values() if len(idx) >= self.bundle_min_size]
         
-        return results
+        clusters = []
+        for idx in groups:
+            fees = sorted(int(priority_fees[i]) for i in idx)
+            median = fees[len(fees) // 2]
+            spread = (fees[-1] - fees[0]) / median if median else (0.0 if fees[-1] == 0 else float('inf'))
+            if spread > self.bundle_fee_tolerance:
+                continue
+            clusters.append({
+                'slot': int(slots[idx[0]]),
+                'jito_tip_account': JITO_TIP_ACCOUNTS[int(tip_accounts[idx[0]])],
+                'size': len(idx),
+                'median_priority_fee': median,
+                'fee_spread': round(spread, 4),
+                'total_jito_tips': int(sum(int(batch['jito_tip'][i]) for i in idx)),
+                'signatures': [transactions[i].get('signature', '') for i in idx]
+            })
+        
+        return clusters
     
     def get_priority_summary(self, tx_results: List[Dict]) -> Dict:
         """
@@ -276,17 +517,40 @@ class SolanaPriorityDetector:
             'total_jito_tips': sum(r.get('jito_tip', 0) for r in priority_txs)
         }
     
+    def _get_cached(self, signature: str) -> Optional[Dict]:
+        """LRU cache lookup (refreshes recency, counts hits/misses)."""
+        if not signature:
+            return None
+        result = self.processed_txs.get(signature)
+        if result is None:
+            self.cache_misses += 1
+            return None
+        self.processed_txs.move_to_end(signature)
+        self.cache_hits += 1
+        return result
+    
     def _cache_result(self, signature: str, result: Dict):
         """Cache transaction result to prevent duplicate processing."""
-        if len(self.processed_txs) >= self.cache_max_size:
-            # Remove oldest 20% of entries
-            remove_count = int(self.cache_max_size * 0.2)
-            keys_to_remove = list(self.processed_txs.keys())[:remove_count]
-            for key in keys_to_remove:
-                del self.processed_txs[key]
-        
+        if not signature:
+            return
         self.processed_txs[signature] = result
+        self.processed_txs.move_to_end(signature)
+        while len(self.processed_txs) > self.cache_max_size:
+            self.processed_txs.popitem(last=False)
+    
+    def get_cache_stats(self) -> Dict:
+        """Get LRU cache statistics."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self.processed_txs),
+            'max_size': self.cache_max_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
     
     def clear_cache(self):
         """Clear transaction cache."""
         self.processed_txs.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
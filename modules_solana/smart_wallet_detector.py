@@ -20,8 +20,10 @@ Output:
 """
 
 import json
+import sqlite3
+import threading
 import time
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 from pathlib import Path
 
 
@@ -30,11 +32,17 @@ class SmartWalletDetector:
     Detect and score known profitable wallets.
     
     Features:
-    - Wallet database with historical performance
+    - Wallet database with historical performance (SQLite, indexed)
     - Tier-based scoring
     - Early entry detection
     - Success rate tracking
     
+    Storage:
+    - Wallet rows live in SQLite; updates are single-row upserts/deletes
+    - Only address -> tier is held in memory for O(1) batch lookups
+    - Details are read from SQLite for matched wallets only
+    - A legacy smart_wallets.json is imported once on first start
+    
     Scoring:
     - Tier 1 (elite): +40 points
     - Tier 2 (good): +25 points
@@ -51,8 +59,12 @@ class SmartWalletDetector:
         """
         self.config = config or {}
         
-        # Database path
-        self.db_path = Path(self.config.get('db_path', 'data/smart_wallets.json'))
+        # Database path (a .json path is treated as the legacy import source)
+        self.db_path = Path(self.config.get('db_path', 'data/smart_wallets.db'))
+        self.legacy_json_path = Path(self.config.get('legacy_json_path', 'data/smart_wallets.json'))
+        if self.db_path.suffix == '.json':
+            self.legacy_json_path = self.db_path
+            self.db_path = self.db_path.with_suffix('.db')
         
         # Scoring weights
         self.score_tier1 = self.config.get('score_tier1', 40)
@@ -66,66 +78,132 @@ class SmartWalletDetector:
         self.tier2_min_success = self.config.get('tier2_min_success', 0.50)  # 50% win rate
         self.tier2_min_trades = self.config.get('tier2_min_trades', 5)
         
-        # Load wallet database
-        self.wallets = self._load_database()
+        # SQLite connection (shared across threads, guarded by lock)
+        self._lock = threading.Lock()
+        self._conn = self._open_database()
         
-        # Cache for quick lookups
-        self.tier_cache = self._build_tier_cache()
+        # Index for quick lookups: normalized address -> tier (qualified wallets only)
+        self.tier_index: Dict[str, int] = {}
+        self._tier_counts = {1: 0, 2: 0, 3: 0}
+        self._wallet_count = 0
+        self._load_tier_index()
         
-        print(f"[SMART_WALLET] Loaded {len(self.wallets)} wallets from database")
+        print(f"[SMART_WALLET] Loaded {self._wallet_count} wallets from database")
     
-    def _load_database(self) -> Dict:
+    def _open_database(self) -> sqlite3.Connection:
         """
-        Load wallet database from JSON file.
+        Open (and initialize) the wallet database.
         
         Returns:
-            Dict mapping wallet address to wallet data
+            SQLite connection
         """
-        if not self.db_path.exists():
-            # Create empty database
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            empty_db = {}
-            with open(self.db_path, 'w') as f:
-                json.dump(empty_db, f, indent=2)
-            return empty_db
-        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.db_path.exists()
+        
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS wallets (
+                address TEXT PRIMARY KEY,
+                display_address TEXT,
+                total_trades INTEGER NOT NULL DEFAULT 0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                avg_profit_multiplier REAL DEFAULT 0,
+                early_entries INTEGER DEFAULT 0,
+                last_updated INTEGER
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+        
+        if is_new and self.legacy_json_path.exists():
+            self._import_legacy_json(conn)
+        
+        return conn
+    
+    def _import_legacy_json(self, conn: sqlite3.Connection):
+        """One-time import of the legacy JSON wallet database."""
         try:
-            with open(self.db_path, 'r') as f:
+            with open(self.legacy_json_path, 'r') as f:
                 data = json.load(f)
-            return data
+            
+            conn.executemany(
+                "INSERT OR REPLACE INTO wallets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._to_row(address, wallet) for address, wallet in data.items())
+            )
+            conn.commit()
+            print(f"[SMART_WALLET] Imported {len(data)} wallets from {self.legacy_json_path}")
         except Exception as e:
-            print(f"[SMART_WALLET] Error loading database: {e}")
-            return {}
+            print(f"[SMART_WALLET] Error importing legacy database: {e}")
     
-    def _build_tier_cache(self) -> Dict[int, Set[str]]:
-        """
-        Build cache mapping tier levels to wallet addresses.
-        
-        Returns:
-            Dict with tier -> set of addresses
-        """
-        cache = {1: set(), 2: set(), 3: set()}
-        
-        for address, data in self.wallets.items():
-            tier = self._calculate_tier(data)
-            if tier:
-                cache[tier].add(address.lower())
-        
-        return cache
+    @staticmethod
+    def _to_row(address: str, wallet: Dict) -> tuple:
+        """Convert wallet data dict to a table row."""
+        return (
+            address.lower(),
+            wallet.get('address', address),
+            wallet.get('total_trades', 0),
+            wallet.get('wins', 0),
+            wallet.get('avg_profit_multiplier', 0),
+            wallet.get('early_entries', 0),
+            wallet.get('last_updated', int(time.time()))
+        )
     
-    def _calculate_tier(self, wallet_data: Dict) -> Optional[int]:
-        """
-        Calculate wallet tier based on performance.
-        
-        Args:
-            wallet_data: Wallet performance data
-        
-        Returns:
-            Tier level (1, 2, 3) or None if not qualified
-        """
-        total_trades = wallet_data.get('total_trades', 0)
-        wins = wallet_data.get('wins', 0)
+    def _load_tier_index(self):
+        """Build address -> tier index from the database."""
+        tier_for = self._tier_for
+        index = {}
+        counts = {1: 0, 2: 0, 3: 0}
+        total = 0
+        
+        with self._lock:
+            rows = self._conn.execute("SELECT address, total_trades, wins FROM wallets")
+            for address, total_trades, wins in rows:
+                total += 1
+                tier = tier_for(total_trades, wins)
+                if tier:
+                    index[address] = tier
+                    counts[tier] += 1
+        
+        self.tier_index = index
+        self._tier_counts = counts
+        self._wallet_count = total
+    
+    def _set_index(self, address: str, tier: Optional[int]):
+        """Incrementally update the tier index for one wallet."""
+        old = self.tier_index.pop(address, None)
+        if old:
+            self._tier_counts[old] -= 1
+        if tier:
+            self.tier_index[address] = tier
+            self._tier_counts[tier] += 1
+    
+    def _fetch_wallets(self, addresses: Iterable[str]) -> Dict[str, Dict]:
+        """Read full wallet rows for a set of normalized addresses."""
+        addresses = list(addresses)
+        if not addresses:
+            return {}
         
+        placeholders = ",".join("?" * len(addresses))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM wallets WHERE address IN ({placeholders})", addresses
+            ).fetchall()
+        
+        return {
+            row[0]: {
+                'address': row[1],
+                'total_trades': row[2],
+                'wins': row[3],
+                'avg_profit_multiplier': row[4],
+                'early_entries': row[5],
+                'last_updated': row[6]
+            }
+            for row in rows
+        }
+    
+    def _tier_for(self, total_trades: int, wins: int) -> Optional[int]:
+        """Tier from raw trade counts (see _calculate_tier)."""
         if total_trades == 0:
             return None
         
@@ -145,6 +223,18 @@ class SmartWalletDetector:
         
         return None
     
+    def _calculate_tier(self, wallet_data: Dict) -> Optional[int]:
+        """
+        Calculate wallet tier based on performance.
+        
+        Args:
+            wallet_data: Wallet performance data
+        
+        Returns:
+            Tier level (1, 2, 3) or None if not qualified
+        """
+        return self._tier_for(wallet_data.get('total_trades', 0), wallet_data.get('wins', 0))
+    
     def analyze_wallets(self, wallet_addresses: List[str]) -> Dict:
         """
         Analyze a list of wallet addresses for smart money signals.
@@ -171,13 +261,21 @@ class SmartWalletDetector:
         if not wallet_addresses:
             return result
         
-        # Normalize addresses
-        normalized = [addr.lower() for addr in wallet_addresses]
+        # Normalize addresses and look up tiers (one dict probe per wallet)
+        tier_index = self.tier_index
+        by_tier: Dict[int, Set[str]] = {}
+        for addr in wallet_addresses:
+            normalized_addr = addr.lower()
+            tier = tier_index.get(normalized_addr)
+            if tier:
+                by_tier.setdefault(tier, set()).add(normalized_addr)
+        
+        if not by_tier:
+            return result
         
         # Check each tier (start with highest)
         for tier in [1, 2, 3]:
-            tier_wallets = self.tier_cache.get(tier, set())
-            matches = tier_wallets.intersection(normalized)
+            matches = by_tier.get(tier)
             
             if matches:
                 # Found smart wallets in this tier
@@ -194,9 +292,10 @@ class SmartWalletDetector:
                     result['smart_wallet_score'] = self.score_tier3
                     tier_name = "AVERAGE"
                 
-                # Build reason
+                # Build reason (details only for matched wallets)
+                details = self._fetch_wallets(matches)
                 for wallet_addr in matches:
-                    wallet_data = self.wallets.get(wallet_addr, {})
+                    wallet_data = details.get(wallet_addr, {})
                     total_trades = wallet_data.get('total_trades', 0)
                     wins = wallet_data.get('wins', 0)
                     success_rate = (wins / total_trades * 100) if total_trades > 0 else 0
@@ -238,31 +337,60 @@ class SmartWalletDetector:
         Returns:
             True if successful
         """
+        return self.add_wallets({address: performance}) == 1
+    
+    def add_wallets(self, wallets: Dict[str, Dict]) -> int:
+        """
+        Add or update many wallets in one transaction.
+        
+        Args:
+            wallets: address -> performance dict (see add_wallet)
+        
+        Returns:
+            Number of wallets written
+        """
         try:
-            normalized_addr = address.lower()
-            
-            # Update wallet data
-            self.wallets[normalized_addr] = {
-                'address': address,
-                'total_trades': performance.get('total_trades', 0),
-                'wins': performance.get('wins', 0),
-                'avg_profit_multiplier': performance.get('avg_profit_multiplier', 0),
-                'early_entries': performance.get('early_entries', 0),
-                'last_updated': int(time.time())
-            }
+            now = int(time.time())
+            rows = [
+                self._to_row(address, {
+                    'address': address,
+                    'total_trades': performance.get('total_trades', 0),
+                    'wins': performance.get('wins', 0),
+                    'avg_profit_multiplier': performance.get('avg_profit_multiplier', 0),
+                    'early_entries': performance.get('early_entries', 0),
+                    'last_updated': now
+                })
+                for address, performance in wallets.items()
+            ]
             
-            # Save to file
-            with open(self.db_path, 'w') as f:
-                json.dump(self.wallets, f, indent=2)
+            with self._lock:
+                existing = self._count_existing([row[0] for row in rows])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO wallets VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.commit()
             
-            # Rebuild tier cache
-            self.tier_cache = self._build_tier_cache()
+            # Update tier index incrementally
+            self._wallet_count += len(rows) - existing
+            for row in rows:
+                self._set_index(row[0], self._tier_for(row[2], row[3]))
             
-            return True
+            return len(rows)
             
         except Exception as e:
             print(f"[SMART_WALLET] Error adding wallet: {e}")
-            return False
+            return 0
+    
+    def _count_existing(self, addresses: List[str]) -> int:
+        """Count addresses already stored (caller holds the lock)."""
+        count = 0
+        for start in range(0, len(addresses), 500):
+            chunk = addresses[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            count += self._conn.execute(
+                f"SELECT COUNT(*) FROM wallets WHERE address IN ({placeholders})", chunk
+            ).fetchone()[0]
+        return count
     
     def remove_wallet(self, address: str) -> bool:
         """
@@ -277,16 +405,13 @@ class SmartWalletDetector:
         try:
             normalized_addr = address.lower()
             
-            if normalized_addr in self.wallets:
-                del self.wallets[normalized_addr]
-                
-                # Save to file
-                with open(self.db_path, 'w') as f:
-                    json.dump(self.wallets, f, indent=2)
-                
-                # Rebuild tier cache
-                self.tier_cache = self._build_tier_cache()
-                
+            with self._lock:
+                cursor = self._conn.execute("DELETE FROM wallets WHERE address = ?", (normalized_addr,))
+                self._conn.commit()
+            
+            if cursor.rowcount:
+                self._wallet_count -= 1
+                self._set_index(normalized_addr, None)
                 return True
             
             return False
@@ -306,7 +431,7 @@ class SmartWalletDetector:
             Wallet data dict or None if not found
         """
         normalized_addr = address.lower()
-        wallet_data = self.wallets.get(normalized_addr)
+        wallet_data = self._fetch_wallets([normalized_addr]).get(normalized_addr)
         
         if wallet_data:
             tier = self._calculate_tier(wallet_data)
@@ -323,9 +448,9 @@ class SmartWalletDetector:
             Dict with tier -> count mapping
         """
         stats = {
-            'tier1': len(self.tier_cache.get(1, set())),
-            'tier2': len(self.tier_cache.get(2, set())),
-            'tier3': len(self.tier_cache.get(3, set())),
-            'total': len(self.wallets)
+            'tier1': self._tier_counts[1],
+            'tier2': self._tier_counts[2],
+            'tier3': self._tier_counts[3],
+            'total': self._wallet_count
         }
         return stats
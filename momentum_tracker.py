@@ -6,7 +6,8 @@ This module reduces false positives by requiring tokens to demonstrate
 consistent growth patterns before receiving high scores.
 """
 import time
-from typing import Dict, Optional, List
+from array import array
+from typing import Dict, Optional, List, Union
 from dataclasses import dataclass, field
 from config import (
     MOMENTUM_SNAPSHOTS,
@@ -17,7 +18,7 @@ from config import (
 from safe_math import safe_div, safe_ratio
 
 
-@dataclass
+@dataclass(slots=True)
 class Snapshot:
     """Single point-in-time snapshot of token metrics"""
     timestamp: float
@@ -25,13 +26,57 @@ class Snapshot:
     liquidity_usd: float
     price_estimate: float  # Derived from reserves ratio
     volume_indicator: float  # Simple volume proxy
+
+
+class SnapshotSeries:
+    """
+    Snapshots in five array('d') columns (40 bytes per snapshot);
+    reads build Snapshot objects, slices return lists of them.
+    """
+    
+    __slots__ = ('times', 'blocks', 'liquidity', 'prices', 'volumes')
+    
+    def __init__(self, snapshots=()):
+        self.times = array('d')
+        self.blocks = array('d')
+        self.liquidity = array('d')
+        self.prices = array('d')
+        self.volumes = array('d')
+        for snapshot in snapshots:
+            self.append(snapshot)
+    
+    def append(self, snapshot: Snapshot):
+        self.times.append(snapshot.timestamp)
+        self.blocks.append(snapshot.block_number)
+        self.liquidity.append(snapshot.liquidity_usd)
+        self.prices.append(snapshot.price_estimate)
+        self.volumes.append(snapshot.volume_indicator)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._snapshot(i) for i in range(*index.indices(len(self.times)))]
+        if index < 0:
+            index += len(self.times)
+        if not 0 <= index < len(self.times):
+            raise IndexError("snapshot index out of range")
+        return self._snapshot(index)
+    
+    def __iter__(self):
+        for i in range(len(self.times)):
+            yield self._snapshot(i)
+    
+    def _snapshot(self, i: int) -> Snapshot:
+        return Snapshot(self.times[i], int(self.blocks[i]), self.liquidity[i], self.prices[i], self.volumes[i])
     
 
-@dataclass
+@dataclass(slots=True)
 class TokenMomentum:
     """Aggregated momentum data for a token"""
     token_address: str
-    snapshots: List[Snapshot] = field(default_factory=list)
+    snapshots: SnapshotSeries = field(default_factory=SnapshotSeries)
     created_at: float = field(default_factory=time.time)
     
 
@@ -3,13 +3,15 @@ Moralis API Client
 Handles bonding curve status checks for Solana tokens with rate limiting.
 """
 
+import asyncio
 import os
-import time
-import requests
 import logging
 from typing import Dict, Optional
 from dotenv import load_dotenv
 
+from api_cache import get_api_cache
+from http_client import get_http_client
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -23,39 +25,16 @@ class MoralisClient:
         self.api_key = os.getenv('MORALIS_API_KEY', '').strip()
         self.base_url = "https://solana-gateway.moralis.io"
         
-        # Rate limiting (conservative for free tier)
-        self.min_request_interval = 0.1  # 100ms between requests (10 req/s max)
-        self._last_request_time = 0
+        # Rate limiting (conservative for free tier: 10 req/s) lives in the
+        # shared HTTP client's 'moralis' bucket
         
-        # Cache to avoid repeated API calls for same token
-        self._cache: Dict[str, dict] = {}
-        self._cache_ttl = 300  # 5 minutes cache
+        # Cache to avoid repeated API calls for same token (5 minutes fresh,
+        # shared 'moralis' source: served stale while refreshing, errors cached 30s)
+        self._cache = get_api_cache().source('moralis')
         
         if not self.api_key:
             print("[MORALIS] ⚠️ MORALIS_API_KEY not set - Bonding curve checks will be skipped")
     
-    def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self._last_request_time = time.time()
-    
-    def _get_cached(self, token_mint: str) -> Optional[dict]:
-        """Get cached result if still valid."""
-        if token_mint in self._cache:
-            cached = self._cache[token_mint]
-            if time.time() - cached['timestamp'] < self._cache_ttl:
-                return cached['data']
-        return None
-    
-    def _set_cache(self, token_mint: str, data: dict):
-        """Cache the result."""
-        self._cache[token_mint] = {
-            'data': data,
-            'timestamp': time.time()
-        }
-    
     def check_bonding_status(self, token_mint: str) -> dict:
         """
         Check if Solana token has completed bonding curve.
@@ -70,66 +49,74 @@ class MoralisClient:
         if not self.api_key:
             return {'is_graduated': True, 'progress': 100, 'error': 'No API key configured'}
         
-        # Check cache first
-        cached = self._get_cached(token_mint)
-        if cached:
-            logger.debug(f"[Moralis] Cache hit for {token_mint[:8]}...")
-            return cached
-        
-        # Rate limit before request
-        self._rate_limit()
+        return self._cache.get_or_fetch_sync(token_mint, lambda: self._fetch_sync(token_mint))
+    
+    async def check_bonding_status_async(self, token_mint: str) -> dict:
+        """Async check_bonding_status() for callers on an event loop."""
+        if not self.api_key:
+            return {'is_graduated': True, 'progress': 100, 'error': 'No API key configured'}
         
+        return await self._cache.get_or_fetch(token_mint, lambda: self._fetch_async(token_mint))
+    
+    def _fetch_sync(self, token_mint: str) -> dict:
+        try:
+            resp = get_http_client().get_sync('moralis', *self._request_args(token_mint), api_key=self.api_key)
+            return self._parse_response(token_mint, resp)
+        except Exception as e:
+            return self._error_result(token_mint, e)
+    
+    async def _fetch_async(self, token_mint: str) -> dict:
+        try:
+            resp = await get_http_client().get('moralis', *self._request_args(token_mint), api_key=self.api_key)
+            return self._parse_response(token_mint, resp)
+        except Exception as e:
+            return self._error_result(token_mint, e)
+    
+    def _request_args(self, token_mint: str):
         url = f"{self.base_url}/token/mainnet/{token_mint}/bonding"
         headers = {
             "accept": "application/json",
             "X-API-Key": self.api_key
         }
+        return url, headers
+    
+    def _parse_response(self, token_mint: str, resp) -> dict:
+        # Handle rate limit response (the HTTP client already backed off)
+        if resp.status == 429:
+            print(f"[MORALIS] ⚠️ Rate limited - backing off")
+            return {'is_graduated': True, 'progress': 100, 'error': 'Rate limited'}
         
-        try:
-            resp = requests.get(url, headers=headers, timeout=5)
-            
-            # Handle rate limit response
-            if resp.status_code == 429:
-                print(f"[MORALIS] ⚠️ Rate limited - backing off")
-                time.sleep(2)  # Back off for 2 seconds
-                return {'is_graduated': True, 'progress': 100, 'error': 'Rate limited'}
-            
-            if resp.status_code == 404:
-                # Token not found in bonding curve system - likely already graduated or not a BC token
-                result = {'is_graduated': True, 'progress': 100, 'error': None}
-                self._set_cache(token_mint, result)
-                return result
-            
-            if resp.status_code != 200:
-                # API error - assume graduated to avoid blocking (fail-safe)
-                print(f"[MORALIS] ⚠️ API error {resp.status_code}: {resp.text[:100]}")
-                return {'is_graduated': True, 'progress': 100, 'error': f'API {resp.status_code}'}
-            
-            data = resp.json()
-            progress = float(data.get('bondingProgress', 100))
-            is_completed = data.get('isCompleted', False)
-            
-            result = {
-                'is_graduated': is_completed or progress >= 100,
-                'progress': progress,
-                'error': None
-            }
-            
-            # Cache the result
-            self._set_cache(token_mint, result)
-            
-            # Always print BC check result for visibility
-            status_emoji = "✅" if result['is_graduated'] else "⏳"
-            print(f"[MORALIS] {status_emoji} {token_mint[:16]}... -> Progress: {progress:.1f}%, Graduated: {result['is_graduated']}")
-            return result
-            
-        except requests.Timeout:
+        if resp.status == 404:
+            # Token not found in bonding curve system - likely already graduated or not a BC token
+            return {'is_graduated': True, 'progress': 100, 'error': None}
+        
+        if resp.status != 200:
+            # API error - assume graduated to avoid blocking (fail-safe)
+            print(f"[MORALIS] ⚠️ API error {resp.status}: {resp.text[:100]}")
+            return {'is_graduated': True, 'progress': 100, 'error': f'API {resp.status}'}
+        
+        data = resp.json()
+        progress = float(data.get('bondingProgress', 100))
+        is_completed = data.get('isCompleted', False)
+        
+        result = {
+            'is_graduated': is_completed or progress >= 100,
+            'progress': progress,
+            'error': None
+        }
+        
+        # Always print BC check result for visibility
+        status_emoji = "✅" if result['is_graduated'] else "⏳"
+        print(f"[MORALIS] {status_emoji} {token_mint[:16]}... -> Progress: {progress:.1f}%, Graduated: {result['is_graduated']}")
+        return result
+    
+    def _error_result(self, token_mint: str, e: Exception) -> dict:
+        if isinstance(e, (asyncio.TimeoutError, TimeoutError)):
             print(f"[MORALIS] ⚠️ Timeout for {token_mint[:16]}...")
             return {'is_graduated': True, 'progress': 100, 'error': 'Timeout'}
-        except Exception as e:
-            print(f"[MORALIS] ❌ Error checking {token_mint[:16]}...: {e}")
-            # On error, assume graduated to avoid blocking (fail-safe)
-            return {'is_graduated': True, 'progress': 100, 'error': str(e)}
+        print(f"[MORALIS] ❌ Error checking {token_mint[:16]}...: {e}")
+        # On error, assume graduated to avoid blocking (fail-safe)
+        return {'is_graduated': True, 'progress': 100, 'error': str(e)}
     
     def is_graduated(self, token_mint: str) -> bool:
         """Simple helper - returns True if token has graduated from bonding curve."""
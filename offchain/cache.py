@@ -7,9 +7,11 @@ Implements TTL-based expiration and size limits.
 RPC SAVINGS: Caching prevents re-fetching same pair data multiple times.
 """
 
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import heapq
 import threading
+import time
 
 
 class OffChainCache:
@@ -17,8 +19,8 @@ class OffChainCache:
     Thread-safe in-memory cache for off-chain pair data.
     
     Features:
-    - TTL-based expiration
-    - Size limit with LRU eviction
+    - TTL-based expiration (monotonic clock, expiry heap)
+    - Size limit with LRU eviction (OrderedDict, O(1))
     - Thread-safe operations
     """
     
@@ -34,7 +36,11 @@ class OffChainCache:
         self.ttl_seconds = self.config.get('ttl_seconds', 300)  # 5 minutes default
         self.max_size = self.config.get('max_size', 1000)  # Max 1000 entries
         
-        self._cache: Dict[str, Dict] = {}
+        # key -> (value, expires_at); order = least recently used first
+        self._cache: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        # (expires_at, key) min-heap; entries whose expiry no longer matches
+        # the cached one are stale and skipped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._lock = threading.Lock()
         
         # Stats
@@ -53,23 +59,22 @@ class OffChainCache:
             Cached value or None
         """
         with self._lock:
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
                 self.misses += 1
                 return None
             
-            entry = self._cache[key]
-            
             # Check if expired
-            if self._is_expired(entry):
+            if time.monotonic() > entry[1]:
                 del self._cache[key]
                 self.misses += 1
                 return None
             
-            # Update access time for LRU
-            entry['last_accessed'] = datetime.now()
+            # Mark as most recently used
+            self._cache.move_to_end(key)
             self.hits += 1
             
-            return entry['value']
+            return entry[0]
     
     def set(self, key: str, value: Dict):
         """
@@ -80,17 +85,23 @@ class OffChainCache:
             value: Value to cache
         """
         with self._lock:
-            # Check size limit
+            now = time.monotonic()
+            
+            # Check size limit (expired entries go before live ones)
             if key not in self._cache and len(self._cache) >= self.max_size:
-                self._evict_lru()
+                self._expire(now)
+                if len(self._cache) >= self.max_size:
+                    self._evict_lru()
             
-            now = datetime.now()
-            self._cache[key] = {
-                'value': value,
-                'created_at': now,
-                'last_accessed': now,
-                'expires_at': now + timedelta(seconds=self.ttl_seconds)
-            }
+            expires_at = now + self.ttl_seconds
+            self._cache[key] = (value, expires_at)
+            self._cache.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            
+            # Drop stale heap entries once they outnumber live ones
+            if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+                self._expiry_heap = [(entry[1], k) for k, entry in self._cache.items()]
+                heapq.heapify(self._expiry_heap)
     
     def delete(self, key: str):
         """
@@ -100,47 +111,41 @@ class OffChainCache:
             key: Cache key
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            self._cache.pop(key, None)
     
     def clear(self):
         """Clear all cache entries."""
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
             self.hits = 0
             self.misses = 0
             self.evictions = 0
     
-    def _is_expired(self, entry: Dict) -> bool:
-        """Check if cache entry is expired."""
-        return datetime.now() > entry['expires_at']
-    
     def _evict_lru(self):
         """Evict least recently used entry."""
         if not self._cache:
             return
         
-        # Find LRU entry
-        lru_key = min(
-            self._cache.keys(),
-            key=lambda k: self._cache[k]['last_accessed']
-        )
-        
-        del self._cache[lru_key]
+        self._cache.popitem(last=False)
         self.evictions += 1
     
+    def _expire(self, now: float) -> int:
+        """Pop expired entries off the expiry heap (O(expired log n))."""
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._cache[key]
+                removed += 1
+        return removed
+    
     def cleanup_expired(self):
         """Remove all expired entries."""
         with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if self._is_expired(entry)
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-            
-            return len(expired_keys)
+            return self._expire(time.monotonic())
     
     def get_stats(self) -> Dict:
         """
@@ -6,36 +6,45 @@ Prevents duplicate processing at both PAIR and TOKEN levels.
 MODE C V2 Requirements:
 - Token-level deduplicator (30 min)
 - Pair-level deduplicator (15 min)
+
+State lives in the shared CooldownService (timing-wheel expiry), so
+entries drop out on their own instead of waiting for cleanup_expired().
 """
 
-from typing import Dict, Set
-from datetime import datetime, timedelta
-import threading
+from typing import Dict
+
+from cooldown_service import get_cooldown_service, CooldownService
+
+# Max graduation bypasses per BC token
+BC_MAX_BYPASSES = 3
+
 
 class Deduplicator:
     """
     Tracks seen pairs and tokens to prevent spam.
     """
     
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, service: CooldownService = None):
         self.config = config or {}
         
         # Cooldowns (in minutes)
         self.pair_cooldown = self.config.get('pair_cooldown_minutes', 15)
         self.token_cooldown = self.config.get('token_cooldown_minutes', 30)
+        # How long a BC token stays eligible for graduation bypass (hours)
+        self.bc_watch_hours = self.config.get('bc_watch_hours', 24)
         
-        # State: {chain: {address: {timestamp, ...}}}
-        self._seen_pairs: Dict[str, Dict[str, datetime]] = {}
-        self._seen_tokens: Dict[str, Dict[str, datetime]] = {}
-        
-        # Bonding Curve Bypass Tracking (NEW)
-        self._bc_watchlist: Dict[str, Dict] = {}  # Track BC tokens
-        self._graduation_bypass_count: Dict[str, int] = {}  # Count bypasses (max 3)
+        # State: key "chain:address" -> {timestamp}
+        service = service or get_cooldown_service()
+        self._seen_pairs = service.table('offchain.pairs')
+        self._seen_tokens = service.table('offchain.tokens')
         
-        self._lock = threading.Lock()
+        # Bonding Curve Bypass Tracking: token -> {completion, platform, bypasses}
+        self._bc_watchlist = service.table('offchain.bc_watchlist')
         
         # Stats
         self.stats = {
+            'pair_checks': 0,
+            'token_checks': 0,
             'pair_duplicates': 0,
             'token_duplicates': 0,
             'momentum_bypass': 0,
@@ -48,25 +57,12 @@ class Deduplicator:
         Check if pair was seen within pair_cooldown (15 min).
         Bypassed if SIGNIFICANT momentum shift occurs (e.g. 2x volume).
         """
-        with self._lock:
-            now = datetime.now()
-            
-            # Initialize chain bucket
-            if chain not in self._seen_pairs:
-                self._seen_pairs[chain] = {}
-                
-            last_seen = self._seen_pairs[chain].get(pair_address)
-            
-            if last_seen:
-                # Check cooldown
-                elapsed_minutes = (now - last_seen).total_seconds() / 60
-                if elapsed_minutes < self.pair_cooldown:
-                    self.stats['pair_duplicates'] += 1
-                    return True # Duplicate
-            
-            # Not duplicate or expired -> Record it
-            self._seen_pairs[chain][pair_address] = now
-            return False
+        self.stats['pair_checks'] += 1
+        if self._seen_pairs.check_and_mark(f"{chain}:{pair_address}",
+                                           cooldown_seconds=self.pair_cooldown * 60):
+            self.stats['pair_duplicates'] += 1
+            return True # Duplicate
+        return False
 
     def is_token_duplicate(self, token_address: str, chain: str = "base", bc_status: Dict = None) -> bool:
         """
@@ -74,78 +70,56 @@ class Deduplicator:
         
         NEW: Allow 3x bypass for graduated BC tokens.
         """
-        with self._lock:
-            now = datetime.now()
-            
-            if chain not in self._seen_tokens:
-                self._seen_tokens[chain] = {}
+        self.stats['token_checks'] += 1
+        
+        # Check if BC token needs bypass
+        if bc_status and bc_status.get('in_curve'):
+            # Token IN bonding curve -> Track for future bypass
+            previous = self._bc_watchlist.get(token_address) or {}
+            self._bc_watchlist.mark(token_address, {
+                'completion': bc_status.get('completion', 0),
+                'platform': bc_status.get('platform', 'unknown'),
+                'bypasses': previous.get('bypasses', 0)
+            }, cooldown_seconds=self.bc_watch_hours * 3600)
+            # Don't bypass yet (token blocked anyway)
             
-            # Check if BC token needs bypass
-            if bc_status and bc_status.get('in_curve'):
-                # Token IN bonding curve -> Track for future bypass
-                self._bc_watchlist[token_address] = {
-                    'added_at': now,
-                    'completion': bc_status.get('completion', 0),
-                    'platform': bc_status.get('platform', 'unknown')
-                }
-                # Don't bypass yet (token blocked anyway)
-                
-            elif token_address in self._bc_watchlist:
+        else:
+            watched = self._bc_watchlist.get(token_address)
+            if watched is not None:
                 # Token WAS in BC, check if should bypass
-                bypass_count = self._graduation_bypass_count.get(token_address, 0)
+                bypass_count = watched.get('bypasses', 0)
                 
-                if bypass_count < 3:
+                if bypass_count < BC_MAX_BYPASSES:
                     # BYPASS (up to 3 times)
-                    self._graduation_bypass_count[token_address] = bypass_count + 1
+                    self._bc_watchlist.update(token_address, {'bypasses': bypass_count + 1})
                     self.stats['bc_bypasses'] += 1
-                    print(f"   ✅ BC Graduation Bypass #{bypass_count + 1}/3 for {token_address[:8]}")
+                    print(f"   ✅ BC Graduation Bypass #{bypass_count + 1}/{BC_MAX_BYPASSES} for {token_address[:8]}")
                     
                     # Allow re-check by NOT marking as duplicate
                     return False
                 else:
                     # Max bypasses reached -> Remove from watchlist
-                    del self._bc_watchlist[token_address]
-                    print(f"   ⛔ BC Bypass limit reached (3/3) for {token_address[:8]}")
-            
-            # Normal dedup logic
-            last_seen = self._seen_tokens[chain].get(token_address)
-            
-            if last_seen:
-                elapsed_minutes = (now - last_seen).total_seconds() / 60
-                if elapsed_minutes < self.token_cooldown:
-                    self.stats['token_duplicates'] += 1
-                    return True
-            
-            self._seen_tokens[chain][token_address] = now
-            return False
+                    self._bc_watchlist.discard(token_address)
+                    print(f"   ⛔ BC Bypass limit reached ({BC_MAX_BYPASSES}/{BC_MAX_BYPASSES}) for {token_address[:8]}")
+        
+        # Normal dedup logic
+        if self._seen_tokens.check_and_mark(f"{chain}:{token_address}",
+                                            cooldown_seconds=self.token_cooldown * 60):
+            self.stats['token_duplicates'] += 1
+            return True
+        return False
             
     def cleanup_expired(self):
-        """Remove expired entries."""
-        with self._lock:
-            now = datetime.now()
-            removed = 0
-            
-            # Cleanup pairs
-            for chain in self._seen_pairs:
-                to_remove = []
-                for addr, ts in self._seen_pairs[chain].items():
-                    if (now - ts).total_seconds() / 60 > self.pair_cooldown:
-                        to_remove.append(addr)
-                for addr in to_remove:
-                    del self._seen_pairs[chain][addr]
-                    removed += 1
-                    
-            # Cleanup tokens
-            for chain in self._seen_tokens:
-                to_remove = []
-                for addr, ts in self._seen_tokens[chain].items():
-                    if (now - ts).total_seconds() / 60 > self.token_cooldown:
-                        to_remove.append(addr)
-                for addr in to_remove:
-                    del self._seen_tokens[chain][addr]
-                    removed += 1
-                    
-            return removed
+        """Return how many entries expired since the last call (expiry itself is continuous)."""
+        return (self._seen_pairs.drain_expired() + self._seen_tokens.drain_expired()
+                + self._bc_watchlist.drain_expired())
             
     def get_stats(self) -> Dict:
-        return self.stats
+        checks = self.stats['pair_checks'] + self.stats['token_checks']
+        duplicates = self.stats['pair_duplicates'] + self.stats['token_duplicates']
+        return {
+            **self.stats,
+            'dedup_rate_pct': (duplicates / checks * 100) if checks else 0.0,
+            'currently_tracked': len(self._seen_pairs) + len(self._seen_tokens),
+            'bc_watchlist': len(self._bc_watchlist)
+        }
@@ -12,11 +12,29 @@ DexScreener provides:
 - NO API KEY REQUIRED
 """
 
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
+from http_client import CircuitOpenError, get_http_client
 from .base_screener import BaseScreener
+from .json_codec import loads, compile_decoder
+from .normalizer import DEXSCREENER_PATHS
+
+# Pair paths read by the fetchers below (on top of the normalizer's)
+SCREENER_PATHS = (
+    ('priceChange', 'h6'),
+    ('priceChange', 'h24'),
+    ('txns', 'h1'),
+    ('txns', 'h6'),
+    ('dexId',),
+    ('url',),
+    ('priceUsd',),
+)
+
+# Typed decoder for {"pairs": [...]} pages (search results)
+_decode_pairs = compile_decoder(
+    'DexScreenerPair', 'pairs', DEXSCREENER_PATHS + SCREENER_PATHS
+)
 
 
 class DexScreenerAPI(BaseScreener):
@@ -38,58 +56,54 @@ class DexScreenerAPI(BaseScreener):
         super().__init__(config)
         self.rate_limit_per_minute = self.config.get('rate_limit_per_minute', 300)
         self.min_request_interval = self.config.get('min_request_interval_seconds', 0.2)  # 200ms between requests
-        self.session = None
         
-    async def _ensure_session(self):
-        """Ensure aiohttp session exists."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        rate = self.rate_limit_per_minute / 60
+        if self.min_request_interval:
+            rate = min(rate, 1 / self.min_request_interval)
+        self.http = get_http_client()
+        self.http.configure('dexscreener', rate=rate)
     
     async def close(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Nothing to release: connections are pooled by the shared HTTP client."""
     
-    async def _rate_limited_request(self, url: str, params: Dict = None) -> Optional[Dict]:
+    async def _rate_limited_request(self, url: str, params: Dict = None, decoder=loads) -> Optional[Dict]:
         """
         Make rate-limited HTTP request to DexScreener API.
         
         Args:
             url: Full API URL
             params: Optional query parameters
+            decoder: Body decoder (typed pair decoder for pair lists)
             
         Returns:
             JSON response or None on error
         """
-        await self._ensure_session()
-        
-        # Enforce minimum interval between requests
-        if self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < self.min_request_interval:
-                await asyncio.sleep(self.min_request_interval - elapsed)
-        
         try:
-            async with self.session.get(url, params=params, timeout=10) as response:
-                self._update_rate_limit()
-                
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    print(f"[DEXSCREENER] Rate limited! Backing off...")
-                    await asyncio.sleep(5)
-                    return None
-                else:
-                    print(f"[DEXSCREENER] HTTP {response.status}: {url}")
-                    return None
-                    
+            response = await self.http.get('dexscreener', url, params=params)
+        except CircuitOpenError:
+            print(f"[DEXSCREENER] Circuit open, skipping: {url}")
+            return None
         except asyncio.TimeoutError:
             print(f"[DEXSCREENER] Timeout: {url}")
             return None
         except Exception as e:
             print(f"[DEXSCREENER] Request error: {e}")
             return None
+        
+        self._update_rate_limit()
+        
+        if response.status == 200:
+            try:
+                return decoder(response.body)
+            except Exception as e:
+                print(f"[DEXSCREENER] Bad payload: {e}")
+                return None
+        elif response.status == 429:
+            print(f"[DEXSCREENER] Rate limited! Backing off...")
+            return None
+        else:
+            print(f"[DEXSCREENER] HTTP {response.status}: {url}")
+            return None
     
     def _get_search_queries(self, chain: str) -> list:
         """
@@ -158,7 +172,7 @@ class DexScreenerAPI(BaseScreener):
             
             print(f"[DEXSCREENER DEBUG] Query: '{query}'")
             
-            data = await self._rate_limited_request(url, params)
+            data = await self._rate_limited_request(url, params, decoder=_decode_pairs)
             
             if not data or 'pairs' not in data:
                 continue
@@ -245,7 +259,7 @@ class DexScreenerAPI(BaseScreener):
         search_url = f"{self.BASE_URL}/search"
         params = {'q': query}
         
-        data = await self._rate_limited_request(search_url, params)
+        data = await self._rate_limited_request(search_url, params, decoder=_decode_pairs)
         
         if not data or 'pairs' not in data:
             return []
@@ -305,7 +319,7 @@ class DexScreenerAPI(BaseScreener):
         for query in queries:
             params = {'q': query}
             
-            data = await self._rate_limited_request(url, params)
+            data = await self._rate_limited_request(url, params, decoder=_decode_pairs)
             
             if not data or 'pairs' not in data:
                 continue
@@ -11,11 +11,12 @@ DEXTools provides:
 - Requires API key for higher limits
 """
 
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
+from http_client import CircuitOpenError, get_http_client
 from .base_screener import BaseScreener
+from .json_codec import loads
 
 
 class DexToolsAPI(BaseScreener):
@@ -39,25 +40,19 @@ class DexToolsAPI(BaseScreener):
         self.api_key = self.config.get('api_key', '')
         self.rate_limit_per_minute = self.config.get('rate_limit_per_minute', 30)  # Conservative default
         self.min_request_interval = self.config.get('min_request_interval_seconds', 2.0)  # 2s between requests
-        self.session = None
         self.enabled = bool(self.api_key)
         
+        rate = self.rate_limit_per_minute / 60
+        if self.min_request_interval:
+            rate = min(rate, 1 / self.min_request_interval)
+        self.http = get_http_client()
+        self.http.configure('dextools', rate=rate)
+        
         if not self.enabled:
             print("[DEXTOOLS] WARNING: No API key provided, DEXTools screener disabled")
     
-    async def _ensure_session(self):
-        """Ensure aiohttp session exists."""
-        if self.session is None:
-            headers = {
-                'X-API-Key': self.api_key
-            }
-            self.session = aiohttp.ClientSession(headers=headers)
-    
     async def close(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Nothing to release: connections are pooled by the shared HTTP client."""
     
     async def _rate_limited_request(self, url: str, params: Dict = None) -> Optional[Dict]:
         """
@@ -73,38 +68,38 @@ class DexToolsAPI(BaseScreener):
         if not self.enabled:
             return None
         
-        await self._ensure_session()
-        
-        # Enforce minimum interval between requests (CRITICAL for DEXTools)
-        if self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < self.min_request_interval:
-                await asyncio.sleep(self.min_request_interval - elapsed)
-        
         try:
-            async with self.session.get(url, params=params, timeout=10) as response:
-                self._update_rate_limit()
-                
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    print(f"[DEXTOOLS] Rate limited! Backing off...")
-                    await asyncio.sleep(10)
-                    return None
-                elif response.status == 401:
-                    print(f"[DEXTOOLS] Unauthorized - check API key")
-                    self.enabled = False
-                    return None
-                else:
-                    print(f"[DEXTOOLS] HTTP {response.status}: {url}")
-                    return None
-                    
+            response = await self.http.get(
+                'dextools', url, params=params, headers={'X-API-Key': self.api_key}, api_key=self.api_key
+            )
+        except CircuitOpenError:
+            print(f"[DEXTOOLS] Circuit open, skipping: {url}")
+            return None
         except asyncio.TimeoutError:
             print(f"[DEXTOOLS] Timeout: {url}")
             return None
         except Exception as e:
             print(f"[DEXTOOLS] Request error: {e}")
             return None
+        
+        self._update_rate_limit()
+        
+        if response.status == 200:
+            try:
+                return loads(response.body)
+            except Exception as e:
+                print(f"[DEXTOOLS] Bad payload: {e}")
+                return None
+        elif response.status == 429:
+            print(f"[DEXTOOLS] Rate limited! Backing off...")
+            return None
+        elif response.status == 401:
+            print(f"[DEXTOOLS] Unauthorized - check API key")
+            self.enabled = False
+            return None
+        else:
+            print(f"[DEXTOOLS] HTTP {response.status}: {url}")
+            return None
    
     async def fetch_trending_pairs(self, chain: str = "base", limit: int = 50) -> List[Dict]:
         """
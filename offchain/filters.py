@@ -28,6 +28,22 @@ Normalized Data Input:
 from typing import Dict, Optional, Tuple, List
 from datetime import datetime
 
+from pair_columns import NUMPY_AVAILABLE, PairColumns, tiered_points
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Batch drop reason codes (first failing check wins, same order as the scalar path)
+PASS = 0
+DROP_LOW_LIQUIDITY = 1
+DROP_LOW_VOLUME = 2
+DROP_ZOMBIE = 3
+DROP_NO_SOCIALS = 4
+DROP_LOW_BUYERS = 5
+DROP_NO_IGNITION = 6
+
+LEVEL0_CODES = (DROP_LOW_LIQUIDITY, DROP_LOW_VOLUME, DROP_ZOMBIE, DROP_NO_SOCIALS, DROP_LOW_BUYERS)
+
 class OffChainFilter:
     """
     MODE C V3: DEGEN SNIPER Filter & Scorer
@@ -100,6 +116,119 @@ class OffChainFilter:
         
         return True, None, metadata
 
+    def apply_filters_batch(self, pairs: List[Dict], log_drops: bool = True) -> List[Tuple[bool, Optional[str], Optional[Dict]]]:
+        """
+        Apply V3 filters to a whole poll of normalized pairs.
+        
+        Level-0, level-1 and score_v3 are evaluated column-wise (see
+        evaluate_batch); results, stats, drop logs and the offchain_score
+        written onto passing pairs match calling apply_filters on each pair
+        in order. Falls back to the scalar path when numpy is unavailable.
+        
+        Returns:
+            [(passed, reason, metadata), ...] aligned with pairs
+        """
+        if not NUMPY_AVAILABLE or not pairs:
+            return [self.apply_filters(pair) for pair in pairs]
+        
+        cols = PairColumns(pairs)
+        codes, scores = self.evaluate_batch(cols)
+        
+        thresholds = self.scoring_config.get('thresholds', {})
+        verify_threshold = thresholds.get('verify', 65)
+        
+        self.stats['total_evaluated'] += cols.size
+        results = []
+        for i, (code, score) in enumerate(zip(codes.tolist(), scores.tolist())):
+            pair = pairs[i]
+            if code == PASS:
+                pair['offchain_score'] = score
+                self.stats['passed'] += 1
+                self.stats['scores'].append(score)
+                results.append((True, None, {
+                    'score': score,
+                    'verdict': "VERIFY" if score >= verify_threshold else "ALERT_ONLY",
+                    'verify_threshold': verify_threshold
+                }))
+                continue
+        
+            if code == DROP_NO_IGNITION:
+                self.stats['level1_rejected'] += 1
+                reason = f"LEVEL-1: {self._batch_reason(code, cols, i)}"
+            else:
+                self.stats['level0_rejected'] += 1
+                reason = f"LEVEL-0: {self._batch_reason(code, cols, i)}"
+            if log_drops:
+                self._log_drop(pair, reason)
+            results.append((False, reason, None))
+        
+        return results
+    
+    def evaluate_batch(self, cols: PairColumns) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Vectorized level-0, level-1 and score_v3 over PairColumns.
+        
+        Returns:
+            (codes, scores): int8 drop reason code per pair (PASS == 0, else
+            the first failing check) and the 0-100 score per pair (only
+            meaningful where the code is PASS)
+        """
+        never = np.zeros(cols.size, dtype=bool)
+        pc5m, pc1h, tx5m = cols.price_change_5m, cols.price_change_1h, cols.tx_5m
+        
+        # Level-0 (same order and thresholds as _check_level0_filter)
+        min_liq = self.global_guardrails.get('min_liquidity_usd', 2000)
+        min_vol = self.global_guardrails.get('min_volume_24h', 1000)
+        require_volume = self.global_guardrails.get('require_h24_volume', True)
+        quality_check = self.global_guardrails.get('quality_check', {})
+        min_buyers = quality_check.get('min_unique_buyers_5m', 0)
+        
+        low_volume = cols.volume_24h < min_vol if require_volume else never
+        is_zombie = (cols.age_days > 30) & (pc5m == 0) & (pc1h == 0) & (tx5m == 0)
+        no_socials = cols.no_socials if quality_check.get('socials_check', False) else never
+        low_buyers = cols.buys_5m < min_buyers if min_buyers > 0 else never
+        
+        # Level-1 (_check_level1_and_revival)
+        no_ignition = ~((pc5m > 0) | (pc1h > 0) | (tx5m >= 1))
+        
+        codes = np.select(
+            [cols.liquidity < min_liq, low_volume, is_zombie, no_socials, low_buyers, no_ignition],
+            [DROP_LOW_LIQUIDITY, DROP_LOW_VOLUME, DROP_ZOMBIE, DROP_NO_SOCIALS, DROP_LOW_BUYERS, DROP_NO_IGNITION],
+            default=PASS,
+        ).astype(np.int8)
+        
+        # Score (_calculate_score_v3 buckets, summed in the same order)
+        points_config = self.scoring_config.get('points', {})
+        score = tiered_points(np.abs(pc5m), points_config.get('price_change_5m', 30),
+                              [(50, 1), (20, 0.8), (10, 0.6), (5, 0.3)])
+        score = score + tiered_points(np.abs(pc1h), points_config.get('price_change_1h', 20),
+                                      [(100, 1), (50, 0.8), (20, 0.6), (10, 0.3)])
+        score = score + tiered_points(tx5m, points_config.get('tx_5m', 20),
+                                      [(50, 1), (20, 0.8), (10, 0.6), (5, 0.4)])
+        money_tiers = [(100000, 1), (50000, 0.8), (20000, 0.6), (10000, 0.4), (5000, 0.2)]
+        score = score + tiered_points(cols.liquidity, points_config.get('liquidity', 10), money_tiers)
+        score = score + tiered_points(cols.volume_24h, points_config.get('volume_24h', 10), money_tiers)
+        score = score + np.where(cols.age_days > 30, points_config.get('revival_bonus', 10), 0)
+        
+        return codes, np.minimum(score.astype(np.float64), 100.0)
+    
+    def _batch_reason(self, code: int, cols: PairColumns, i: int) -> str:
+        """Drop reason text for a batch code, worded as in the scalar checks."""
+        if code == DROP_LOW_LIQUIDITY:
+            min_liq = self.global_guardrails.get('min_liquidity_usd', 2000)
+            return f"LOW_LIQUIDITY (${cols.liquidity[i]:,.0f} < ${min_liq:,.0f})"
+        if code == DROP_LOW_VOLUME:
+            min_vol = self.global_guardrails.get('min_volume_24h', 1000)
+            return f"LOW_VOLUME (${cols.volume_24h[i]:,.0f} < ${min_vol:,.0f})"
+        if code == DROP_ZOMBIE:
+            return f"ZOMBIE (age={cols.age_days[i]:.1f}d, no activity)"
+        if code == DROP_NO_SOCIALS:
+            return "NO_SOCIALS (Requirement: Telegram/X/Web)"
+        if code == DROP_LOW_BUYERS:
+            min_buyers = self.global_guardrails.get('quality_check', {}).get('min_unique_buyers_5m', 0)
+            return f"LOW_BUYERS (buys={cols.buys_5m[i]} < {min_buyers})"
+        return "No ignition (pc5m=0, pc1h=0, tx5m=0)"
+    
     def _check_level0_filter(self, pair: Dict) -> Tuple[bool, Optional[str]]:
         """
         LEVEL-0 FILTER (HARD KILL) - TIGHTENED FOR HYBRID OPTION C
@@ -12,13 +12,47 @@ Rate Limits:
 Endpoints:
 - /networks/{network}/new_pools - Get recently created pools
 - /networks/{network}/trending_pools - Get trending pools
+
+Requests from all chains run concurrently through the shared HTTP client,
+whose token bucket keeps them inside the rate limit. Unchanged pages are skipped (ETag /
+Last-Modified, payload hash as fallback).
 """
 
-import aiohttp
 import asyncio
-from typing import List, Dict, Optional
+import hashlib
+import math
+import time
+from typing import List, Dict, Optional, Set
 from datetime import datetime, timedelta
 
+from http_client import CircuitOpenError, get_http_client, parse_retry_after
+from .json_codec import loads as json_loads, compile_decoder
+from .normalizer import _EMPTY
+
+# Returned by _rate_limited_request when the page did not change
+NOT_MODIFIED = object()
+
+# Pool key paths read by _normalize_pool (the typed page decoder keeps only these)
+POOL_PATHS = (
+    ('attributes', 'address'),
+    ('attributes', 'name'),
+    ('attributes', 'volume_usd', 'h24'),
+    ('attributes', 'reserve_in_usd'),
+    ('attributes', 'price_change_percentage', 'm5'),
+    ('attributes', 'price_change_percentage', 'h1'),
+    ('attributes', 'price_change_percentage', 'h24'),
+    ('attributes', 'transactions', 'm5'),
+    ('attributes', 'transactions', 'h1'),
+    ('attributes', 'transactions', 'h24'),
+    ('attributes', 'pool_created_at'),
+    ('attributes', 'base_token_price_usd'),
+    ('attributes', 'fdv_usd'),
+    ('attributes', 'market_cap_usd'),
+    ('relationships', 'base_token', 'data', 'id'),
+)
+
+_decode_pools = compile_decoder('GeckoPool', 'data', POOL_PATHS)
+
 
 class GeckoTerminalAPI:
     """
@@ -26,7 +60,7 @@ class GeckoTerminalAPI:
     
     Rate Limits (FREE tier):
     - 30 requests per minute
-    - We use 0.5 requests per second (30/min) to be safe
+    - Token bucket at 0.5 requests per second (30/min) with a small burst
     """
     
     BASE_URL = "https://api.geckoterminal.com/api/v2"
@@ -43,10 +77,27 @@ class GeckoTerminalAPI:
         # Rate limiting (conservative to avoid hitting limits)
         self.rate_limit_per_minute = self.config.get('rate_limit_per_minute', 30)
         self.min_request_interval = self.config.get('min_request_interval_seconds', 2.0)  # 2s between requests
+        self.burst = self.config.get('burst', 4)
+        self.max_pages = self.config.get('max_pages', 5)  # new_pools backlog pages per poll
+        
+        rate = self.rate_limit_per_minute / 60
+        if self.min_request_interval:
+            rate = min(rate, 1 / self.min_request_interval)
+        self.request_rate = rate
+        self.http = get_http_client()
+        self.http.configure('geckoterminal', rate=rate, burst=self.burst)
         
-        self.session = None
         self.last_request_time = None
         self.request_count = 0
+        self.not_modified_count = 0
+        self.rate_limited_count = 0
+        
+        # Conditional request state per URL: (etag, last_modified, payload_hash)
+        self._validators: Dict[str, tuple] = {}
+        
+        # new_pools state per network (pool addresses / newest creation time of last poll)
+        self._seen_new_pools: Dict[str, Set[str]] = {}
+        self._newest_created: Dict[str, float] = {}
         
         # Network name mapping
         self.network_map = {
@@ -56,63 +107,82 @@ class GeckoTerminalAPI:
             'eth': 'eth',
         }
     
-    async def _ensure_session(self):
-        """Ensure aiohttp session exists."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-    
     async def close(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Nothing to release: connections are pooled by the shared HTTP client."""
     
-    async def _rate_limited_request(self, url: str, params: Dict = None) -> Optional[Dict]:
+    async def _rate_limited_request(self, url: str, params: Dict = None, conditional: bool = False,
+                                    decoder=json_loads):
         """
         Make rate-limited HTTP request to GeckoTerminal API.
         
         Args:
             url: Full API URL
             params: Optional query parameters
+            conditional: Skip the page if unchanged since the last request
+            decoder: Body decoder (typed pool decoder for pool lists)
             
         Returns:
-            JSON response or None on error
+            JSON response, NOT_MODIFIED (conditional only) or None on error
         """
-        await self._ensure_session()
+        cache_key = url + ('?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items())) if params else '')
+        
+        headers = {
+            'Accept': 'application/json',
+        }
         
-        # Enforce minimum interval between requests (2 seconds)
-        if self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < self.min_request_interval:
-                wait_time = self.min_request_interval - elapsed
-                print(f"[GECKOTERMINAL] Rate limit: waiting {wait_time:.1f}s")
-                await asyncio.sleep(wait_time)
+        validators = self._validators.get(cache_key) if conditional else None
+        if validators:
+            etag, last_modified, _ = validators
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
         
         try:
-            headers = {
-                'Accept': 'application/json',
-            }
-            
-            async with self.session.get(url, params=params, headers=headers, timeout=10) as response:
-                self.last_request_time = datetime.now()
-                self.request_count += 1
-                
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    print(f"[GECKOTERMINAL] Rate limited! Backing off for 60s...")
-                    await asyncio.sleep(60)
-                    return None
-                else:
-                    print(f"[GECKOTERMINAL] HTTP {response.status}: {url}")
-                    return None
-                    
+            response = await self.http.get('geckoterminal', url, params=params, headers=headers)
+        except CircuitOpenError:
+            print(f"[GECKOTERMINAL] Circuit open, skipping: {url}")
+            return None
         except asyncio.TimeoutError:
             print(f"[GECKOTERMINAL] Timeout: {url}")
             return None
         except Exception as e:
             print(f"[GECKOTERMINAL] Request error: {e}")
             return None
+        
+        self.last_request_time = datetime.now()
+        self.request_count += 1
+        
+        if response.status == 304 and validators:
+            self.not_modified_count += 1
+            return NOT_MODIFIED
+        elif response.status == 200:
+            body = response.body
+            if conditional:
+                payload_hash = hashlib.blake2b(body, digest_size=16).digest()
+                unchanged = validators is not None and validators[2] == payload_hash
+                self._validators[cache_key] = (
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    payload_hash
+                )
+                if unchanged:
+                    self.not_modified_count += 1
+                    return NOT_MODIFIED
+            try:
+                return decoder(body)
+            except Exception as e:
+                print(f"[GECKOTERMINAL] Bad payload: {e}")
+                return None
+        elif response.status == 429:
+            # The client already drained the bucket for Retry-After
+            self.rate_limited_count += 1
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) or 60.0
+            print(f"[GECKOTERMINAL] Rate limited! Backing off for {retry_after:.0f}s...")
+            return None
+        else:
+            print(f"[GECKOTERMINAL] HTTP {response.status}: {url}")
+            return None
     
     def _normalize_network_name(self, chain: str) -> str:
         """Normalize chain name to GeckoTerminal network name."""
@@ -126,6 +196,11 @@ class GeckoTerminalAPI:
         This is the MAIN endpoint - returns pools sorted by creation time.
         NO keyword search needed!
         
+        Page 1 is requested conditionally. When every pool on it is new
+        and older pools since the last poll are still missing, the
+        backlog pages (estimated from the creation rate on page 1, up to
+        max_pages) are fetched concurrently.
+        
         Args:
             chain: Chain name (solana, base, ethereum)
             limit: Max number of pools to return (API returns 20 per page)
@@ -139,15 +214,36 @@ class GeckoTerminalAPI:
         
         url = f"{self.BASE_URL}/networks/{network}/new_pools"
         
-        data = await self._rate_limited_request(url)
+        data = await self._rate_limited_request(url, conditional=True, decoder=_decode_pools)
+        
+        if data is NOT_MODIFIED:
+            print(f"[GECKOTERMINAL] New pools unchanged for {network}")
+            return []
         
         if not data or 'data' not in data:
             print(f"[GECKOTERMINAL] No data returned for {network}")
             return []
         
         pools = data['data']
+        seen = self._seen_new_pools.get(network)
+        
+        extra_pages = self._backlog_pages(network, pools) if seen is not None else 0
+        if extra_pages:
+            print(f"[GECKOTERMINAL] {network}: >{len(pools)} new pools since last poll, fetching {extra_pages} more page(s)")
+            pages = await asyncio.gather(*(
+                self._rate_limited_request(url, params={'page': page}, decoder=_decode_pools)
+                for page in range(2, 2 + extra_pages)
+            ))
+            for page in pages:
+                if page and page is not NOT_MODIFIED:
+                    pools.extend(page.get('data', []))
+        
         print(f"[GECKOTERMINAL] Got {len(pools)} new pools for {network}")
         
+        self._seen_new_pools[network] = {p.get('attributes', {}).get('address') for p in pools}
+        newest = max((self._created_ts(p) for p in pools), default=0.0)
+        self._newest_created[network] = max(newest, self._newest_created.get(network, 0.0))
+        
         # Normalize to our format
         normalized_pools = []
         for pool in pools[:limit]:
@@ -158,6 +254,39 @@ class GeckoTerminalAPI:
         print(f"[GECKOTERMINAL] Normalized {len(normalized_pools)} pools")
         return normalized_pools
     
+    @staticmethod
+    def _created_ts(pool: Dict) -> float:
+        created_at_str = pool.get('attributes', {}).get('pool_created_at')
+        if not created_at_str:
+            return 0.0
+        try:
+            return datetime.fromisoformat(created_at_str.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return 0.0
+    
+    def _backlog_pages(self, network: str, pools: List[Dict]) -> int:
+        """
+        Extra new_pools pages needed to reach the last poll.
+        
+        Zero unless every pool on page 1 is unseen. The missing count is
+        extrapolated from the creation rate across page 1.
+        """
+        seen = self._seen_new_pools.get(network, set())
+        if not pools or any(p.get('attributes', {}).get('address') in seen for p in pools):
+            return 0
+        
+        times = [t for t in (self._created_ts(p) for p in pools) if t]
+        last_newest = self._newest_created.get(network, 0.0)
+        if not times or not last_newest:
+            return self.max_pages - 1
+        
+        oldest, newest = min(times), max(times)
+        if oldest <= last_newest:
+            return 0
+        span = max(newest - oldest, 1.0)
+        missing = (oldest - last_newest) * len(pools) / span
+        return max(1, min(self.max_pages - 1, math.ceil(missing / max(len(pools), 1))))
+    
     async def fetch_trending_pools(self, chain: str = "solana", limit: int = 20) -> List[Dict]:
         """
         Fetch trending pools.
@@ -175,7 +304,11 @@ class GeckoTerminalAPI:
         
         url = f"{self.BASE_URL}/networks/{network}/trending_pools"
         
-        data = await self._rate_limited_request(url)
+        data = await self._rate_limited_request(url, conditional=True, decoder=_decode_pools)
+        
+        if data is NOT_MODIFIED:
+            print(f"[GECKOTERMINAL] Trending pools unchanged for {network}")
+            return []
         
         if not data or 'data' not in data:
             return []
@@ -199,46 +332,30 @@ class GeckoTerminalAPI:
         This makes it compatible with existing bot infrastructure.
         """
         try:
-            attrs = pool.get('attributes', {})
-            
-            # Extract pool address
+            attrs = pool.get('attributes') or _EMPTY
             pool_address = attrs.get('address', '')
             if not pool_address:
                 return None
             
-            # Extract token info from relationships
-            relationships = pool.get('relationships', {})
-            base_token = relationships.get('base_token', {}).get('data', {})
-            quote_token = relationships.get('quote_token', {}).get('data', {})
-            
             # Get base token address (the actual new token)
-            base_token_id = base_token.get('id', '')
             # Format: "network_address"
+            base_token = ((pool.get('relationships') or _EMPTY).get('base_token') or _EMPTY).get('data') or _EMPTY
+            base_token_id = base_token.get('id', '')
             base_token_address = base_token_id.split('_')[-1] if '_' in base_token_id else ''
             
             # Parse pool name (e.g., "PEPE / WETH")
             pool_name = attrs.get('name', '')
-            token_symbol = pool_name.split(' / ')[0] if ' / ' in pool_name else 'UNKNOWN'
-            
-            # Get volume and liquidity
-            volume_24h = float(attrs.get('volume_usd', {}).get('h24', 0) or 0)
-            reserve_usd = float(attrs.get('reserve_in_usd', 0) or 0)
-            
-            # Get price changes
-            price_changes = attrs.get('price_change_percentage', {})
-            price_change_5m = float(price_changes.get('m5', 0) or 0)
-            price_change_1h = float(price_changes.get('h1', 0) or 0)
-            price_change_24h = float(price_changes.get('h24', 0) or 0)
+            if ' / ' in pool_name:
+                names = pool_name.split(' / ')
+                token_symbol, quote_symbol = names[0], names[1]
+            else:
+                token_symbol = quote_symbol = 'UNKNOWN'
             
-            # Get transactions
-            txns = attrs.get('transactions', {})
-            txns_5m = txns.get('m5', {})
-            txns_1h = txns.get('h1', {})
-            txns_24h = txns.get('h24', {})
-            
-            tx_5m = (txns_5m.get('buys', 0) or 0) + (txns_5m.get('sells', 0) or 0)
-            tx_1h = (txns_1h.get('buys', 0) or 0) + (txns_1h.get('sells', 0) or 0)
-            tx_24h = (txns_24h.get('buys', 0) or 0) + (txns_24h.get('sells', 0) or 0)
+            price_changes = attrs.get('price_change_percentage') or _EMPTY
+            txns = attrs.get('transactions') or _EMPTY
+            txns_5m = txns.get('m5') or _EMPTY
+            txns_1h = txns.get('h1') or _EMPTY
+            txns_24h = txns.get('h24') or _EMPTY
             
             # Get creation time
             created_at_str = attrs.get('pool_created_at')
@@ -247,16 +364,16 @@ class GeckoTerminalAPI:
             
             if created_at_str:
                 try:
-                    created_time = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
+                    created_ts = datetime.fromisoformat(created_at_str.replace('Z', '+00:00')).timestamp()
                     # Convert to timestamp (milliseconds)
-                    created_at = int(created_time.timestamp() * 1000)
+                    created_at = int(created_ts * 1000)
                     # Calculate age in hours
-                    age_hours = (datetime.now(created_time.tzinfo) - created_time).total_seconds() / 3600
+                    age_hours = (time.time() - created_ts) / 3600
                 except:
                     pass
             
             # Normalize to DexScreener-like format for compatibility
-            normalized = {
+            return {
                 'chainId': chain.lower(),
                 'dexId': 'geckoterminal',
                 'pairAddress': pool_address,
@@ -266,19 +383,19 @@ class GeckoTerminalAPI:
                     'name': token_symbol,
                 },
                 'quoteToken': {
-                    'symbol': pool_name.split(' / ')[1] if ' / ' in pool_name else 'UNKNOWN',
+                    'symbol': quote_symbol,
                 },
                 'priceUsd': str(attrs.get('base_token_price_usd', '0')),
                 'volume': {
-                    'h24': volume_24h,
+                    'h24': float((attrs.get('volume_usd') or _EMPTY).get('h24', 0) or 0),
                 },
                 'liquidity': {
-                    'usd': reserve_usd,
+                    'usd': float(attrs.get('reserve_in_usd', 0) or 0),
                 },
                 'priceChange': {
-                    'm5': price_change_5m,
-                    'h1': price_change_1h,
-                    'h24': price_change_24h,
+                    'm5': float(price_changes.get('m5', 0) or 0),
+                    'h1': float(price_changes.get('h1', 0) or 0),
+                    'h24': float(price_changes.get('h24', 0) or 0),
                 },
                 'txns': {
                     'm5': {'buys': txns_5m.get('buys', 0), 'sells': txns_5m.get('sells', 0)},
@@ -296,8 +413,6 @@ class GeckoTerminalAPI:
                 'source': 'geckoterminal',
             }
             
-            return normalized
-            
         except Exception as e:
             print(f"[GECKOTERMINAL] Error normalizing pool: {e}")
             return None
@@ -308,4 +423,7 @@ class GeckoTerminalAPI:
             'total_requests': self.request_count,
             'rate_limit': self.rate_limit_per_minute,
             'min_interval': self.min_request_interval,
+            'not_modified': self.not_modified_count,
+            'rate_limited': self.rate_limited_count,
+            'limiter_wait_seconds': round(self.http.get_stats().get('geckoterminal', {}).get('bucket_wait_s', 0.0), 1),
         }
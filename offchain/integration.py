@@ -34,6 +34,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from telegram_notifier import TelegramNotifier
+from api_cache import get_api_cache
 
 # Signal Mode Integration (2026-01-04)
 try:
@@ -80,7 +81,10 @@ class OffChainScreenerIntegration:
         self.filter = OffChainFilter(self.config.get('filters', {}))
         self.cache = OffChainCache(self.config.get('cache', {}))
         self.deduplicator = Deduplicator(self.config.get('deduplicator', {}))
-        self.scheduler = OffChainScheduler(self.config.get('scheduler', {}))
+        self.scheduler = OffChainScheduler({
+            'request_budget_per_minute': self.geckoterminal.rate_limit_per_minute,
+            **self.config.get('scheduler', {})
+        })
         
         # Output queue for normalized pairs
         self.pair_queue = asyncio.Queue()
@@ -130,13 +134,20 @@ class OffChainScreenerIntegration:
         tasks = []
         
         # GeckoTerminal scanner task (MANDATORY - replaced DexScreener)
-        geckoterminal_task = asyncio.create_task(
-            self.scheduler.schedule_dexscreener(  # Reuse scheduler (rename later)
+        if self.scheduler.adaptive_scaling:
+            # Per-chain intervals follow novelty within the API request budget
+            geckoterminal_schedule = self.scheduler.schedule_adaptive(
+                'geckoterminal',
+                self._scan_geckoterminal,
+                self.enabled_chains,
+                request_stats=self.geckoterminal.get_stats
+            )
+        else:
+            geckoterminal_schedule = self.scheduler.schedule_dexscreener(  # Reuse scheduler (rename later)
                 self._scan_geckoterminal,
                 self.enabled_chains
-            ),
-            name="offchain-geckoterminal"
-        )
+            )
+        geckoterminal_task = asyncio.create_task(geckoterminal_schedule, name="offchain-geckoterminal")
         tasks.append(geckoterminal_task)
         
         # DEXTools scanner task (OPTIONAL)
@@ -178,62 +189,67 @@ class OffChainScreenerIntegration:
         
         print(f"[OFFCHAIN DEBUG] _scan_geckoterminal called with chains: {chains}")
         
+        # Fetch every chain/endpoint concurrently (token bucket paces the requests)
+        new_limit = 20 * self.geckoterminal.max_pages
+        fetches = []
         for chain in chains:
-            try:
-                print(f"[OFFCHAIN DEBUG] Scanning chain: {chain}")
-                
-                # Fetch NEW pools (time-based, no keywords!)
-                new_pools = await self.geckoterminal.fetch_new_pools(chain, limit=20)
-                print(f"[OFFCHAIN DEBUG] New pools: {len(new_pools)}")
-                
-                # Optionally fetch trending pools too
-                trending = await self.geckoterminal.fetch_trending_pools(chain, limit=20)
-                print(f"[OFFCHAIN DEBUG] Trending pools: {len(trending)}")
-                
-                # Combine (deduplicate by pair_address)
-                all_pairs = new_pools + trending
-                print(f"[OFFCHAIN DEBUG] Combined (before dedup): {len(all_pairs)}")
-                
-                seen_addresses = set()
-                unique_pairs = []
-                
-                for pair in all_pairs:
-                    addr = pair.get('pairAddress', '')
-                    if addr and addr not in seen_addresses:
-                        seen_addresses.add(addr)
-                        unique_pairs.append(pair)
-                
-                print(f"[OFFCHAIN DEBUG] Unique pairs: {len(unique_pairs)}")
-                
-                self.stats['total_raw_pairs'] += len(unique_pairs)
-                
-                # Process each pair CONCURRENTLY
-                print(f"[OFFCHAIN] ⚡ Processing {len(unique_pairs)} pairs concurrently...")
-                
-                tasks = []
-                for idx, raw_pair in enumerate(unique_pairs, 1):
-                    pair_addr = raw_pair.get('pairAddress', 'UNKNOWN')
-                    # print(f"[OFFCHAIN DEBUG] [{idx}] Queueing: {pair_addr[:10]}...")
-                    tasks.append(self._process_pair(raw_pair, 'geckoterminal', chain))
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                processed = 0
-                for res in results:
-                    if isinstance(res, Exception):
-                        print(f"[OFFCHAIN ERROR] Task failed: {res}")
-                        continue
-                        
-                    if res:
-                        all_passed_pairs.append(res)
-                        processed += 1
-                
-                print(f"[OFFCHAIN] ✅ Processed {processed}/{len(unique_pairs)} pairs passed filters")
-                
-            except Exception as e:
-                print(f"[OFFCHAIN ERROR] Failed to scan {chain}: {e}")
-                import traceback
-                traceback.print_exc()
+            fetches.append(self.geckoterminal.fetch_new_pools(chain, limit=new_limit))
+            fetches.append(self.geckoterminal.fetch_trending_pools(chain, limit=20))
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+        
+        candidates = []
+        for i, chain in enumerate(chains):
+            new_pools, trending = results[2 * i], results[2 * i + 1]
+            for label, res in (('new', new_pools), ('trending', trending)):
+                if isinstance(res, Exception):
+                    print(f"[OFFCHAIN ERROR] Failed to fetch {label} pools for {chain}: {res}")
+            new_pools = new_pools if isinstance(new_pools, list) else []
+            trending = trending if isinstance(trending, list) else []
+            print(f"[OFFCHAIN DEBUG] {chain}: new pools {len(new_pools)}, trending pools {len(trending)}")
+            
+            # Combine (deduplicate by pair_address)
+            seen_addresses = set()
+            unique_pairs = []
+            
+            for pair in new_pools + trending:
+                addr = pair.get('pairAddress', '')
+                if addr and addr not in seen_addresses:
+                    seen_addresses.add(addr)
+                    unique_pairs.append(pair)
+            
+            self.stats['total_raw_pairs'] += len(unique_pairs)
+            self.scheduler.record_poll('geckoterminal', chain, seen_addresses)
+            
+            for raw_pair in unique_pairs:
+                try:
+                    normalized = self._normalize_pair(raw_pair, 'geckoterminal')
+                except Exception as e:
+                    print(f"[OFFCHAIN ERROR] Normalize failed: {e}")
+                    continue
+                if normalized:
+                    candidates.append((normalized, chain))
+        
+        # Filter & score the whole poll column-wise, then run the per-pair
+        # pipeline (dedup, tier, alert, queue) CONCURRENTLY on survivors only
+        verdicts = self.filter.apply_filters_batch([normalized for normalized, _ in candidates])
+        tasks = []
+        for (normalized, chain), (passed, _reason, metadata) in zip(candidates, verdicts):
+            if not passed:
+                self.stats['filtered_out'] += 1
+                continue
+            tasks.append(self._route_pair(normalized, metadata, chain))
+        
+        print(f"[OFFCHAIN] ⚡ {len(tasks)}/{len(candidates)} pairs passed filters, processing concurrently...")
+        
+        for res in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(res, Exception):
+                print(f"[OFFCHAIN ERROR] Task failed: {res}")
+                continue
+            
+            if res:
+                all_passed_pairs.append(res)
+        
+        print(f"[OFFCHAIN] ✅ Processed {len(all_passed_pairs)}/{len(tasks)} pairs passed pipeline")
         
         print(f"[OFFCHAIN DEBUG] Total passed pairs across all chains: {len(all_passed_pairs)}")
         return all_passed_pairs
@@ -280,9 +296,26 @@ class OffChainScreenerIntegration:
         4. Determine Tier
         5. Telegram Alert (MID/HIGH only - LOW tier suppressed)
         6. Enqueue for On-Chain Verify
+        
+        Batch scans (_scan_geckoterminal) run steps 1-2 over the whole poll
+        and call _route_pair for survivors instead.
         """
-        from typing import Optional # Added missing import
         # 1. NORMALIZE
+        normalized = self._normalize_pair(raw_pair, source)
+        if not normalized:
+            return None
+            
+        # 2. FILTERING & SCORING
+        passed, reason, metadata = self.filter.apply_filters(normalized)
+        
+        if not passed:
+            self.stats['filtered_out'] += 1
+            return None
+        
+        return await self._route_pair(normalized, metadata, chain)
+    
+    def _normalize_pair(self, raw_pair: Dict, source: str) -> Optional[Dict]:
+        """Normalize a raw pair; None when it has no pair or token address."""
         if source == 'dexscreener':
             normalized = self.normalizer.normalize_dexscreener(raw_pair, source)
         elif source == 'geckoterminal':
@@ -313,14 +346,13 @@ class OffChainScreenerIntegration:
             if pair_address and not token_address:
                 print(f"[OFFCHAIN] Pair {pair_address[:10]}... dropped (Stable/Quote Pair)")
             return None
-            
-        # 2. FILTERING & SCORING
-        passed, reason, metadata = self.filter.apply_filters(normalized)
         
-        if not passed:
-            self.stats['filtered_out'] += 1
-            return None
-            
+        return normalized
+    
+    async def _route_pair(self, normalized: Dict, metadata: Dict, chain: str) -> Optional[Dict]:
+        """Steps 3-6 of the pipeline for a pair that passed the filters."""
+        pair_address = normalized['pair_address']
+        token_address = normalized['token_address']
         score = metadata.get('score', 0)
         verdict = metadata.get('verdict', 'ALERT_ONLY')
         normalized['offchain_score'] = score
@@ -561,6 +593,7 @@ class OffChainScreenerIntegration:
             'scheduler': self.scheduler.get_stats(),
             'geckoterminal': self.geckoterminal.get_stats(),
             'dextools': self.dextools.get_stats() if self.dextools_enabled else {},
+            'api_cache': get_api_cache().get_stats(),
         }
     
     def print_stats(self):
@@ -606,6 +639,20 @@ class OffChainScreenerIntegration:
         print(f"\n⏰ SCHEDULER:")
         print(f"  Scans performed:     DexScreener={scheduler_stats['scans_performed']['dexscreener']}, DEXTools={scheduler_stats['scans_performed']['dextools']}")
         print(f"  Pairs found:         DexScreener={scheduler_stats['pairs_found']['dexscreener']}, DEXTools={scheduler_stats['pairs_found']['dextools']}")
+        for source, metrics in scheduler_stats['adaptive'].items():
+            print(f"  {source}: budget {metrics['budget_per_minute']:.0f}/min, "
+                  f"used {metrics['requests_last_minute']}/min, headroom {metrics['headroom_pct']:.0f}%")
+            for chain, chain_metrics in metrics['chains'].items():
+                print(f"    {chain:<10} every {chain_metrics['interval_seconds']:>5.1f}s | "
+                      f"novelty {chain_metrics['novelty_per_minute']:.1f} new/min")
+        
+        if stats['api_cache']:
+            print(f"\n🗄️ API CACHE:")
+            for source, source_stats in stats['api_cache'].items():
+                print(f"  {source:<16} hit {source_stats['hit_ratio_pct']:>5.1f}% | "
+                      f"stale {source_stats['stale_hits']} | negative {source_stats['negative_hits']} | "
+                      f"disk {source_stats['disk_hits']} | miss {source_stats['misses']} | "
+                      f"size {source_stats['size']}")
         
         print("="*60 + "\n")
     
@@ -0,0 +1,75 @@
+"""
+JSON DECODING FOR SCREENER RESPONSES
+
+Decodes raw response bytes with the fastest available backend:
+orjson, then msgspec, then the stdlib json module.
+
+compile_decoder() builds a typed msgspec decoder for list pages from the
+normalizer key paths: items decode straight into plain dicts holding
+only the fields the pipeline reads, skipping everything else in C.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypedDict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None
+    MSGSPEC_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    loads = orjson.loads
+    JSON_BACKEND = 'orjson'
+elif MSGSPEC_AVAILABLE:
+    loads = msgspec.json.Decoder().decode
+    JSON_BACKEND = 'msgspec'
+else:
+    loads = json.loads
+    JSON_BACKEND = 'json'
+
+
+def _typed_dict(name: str, tree: Dict) -> type:
+    fields = {}
+    for key, children in tree.items():
+        fields[key] = Any if not children else Optional[_typed_dict(f"{name}_{key}", children)]
+    return TypedDict(name, fields, total=False)
+
+
+def compile_decoder(name: str, list_key: str, paths: Iterable[Tuple[str, ...]]) -> Callable[[bytes], Any]:
+    """
+    Typed decoder for a {list_key: [item, ...]} page.
+    
+    Items keep only the given key paths (leaf values are kept whole) and
+    come back as plain dicts, so dict-walking consumers are unaffected.
+    Without msgspec, or for a page that does not match the schema, this
+    falls back to loads().
+    """
+    if not MSGSPEC_AVAILABLE:
+        return loads
+    
+    tree: Dict = {}
+    for path in paths:
+        node = tree
+        for key in path:
+            node = node.setdefault(key, {})
+    
+    page_type = TypedDict(f"{name}Page", {list_key: List[Optional[_typed_dict(name, tree)]]}, total=False)
+    decoder = msgspec.json.Decoder(page_type)
+    
+    def decode(body: bytes) -> Any:
+        try:
+            return decoder.decode(body)
+        except msgspec.ValidationError:
+            return loads(body)
+    
+    return decode
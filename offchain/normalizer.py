@@ -7,8 +7,76 @@ into the standardized NORMALIZED PAIR EVENT format.
 This ensures the existing score engine receives consistent data regardless of source.
 """
 
+from types import MappingProxyType
 from typing import Dict, Optional
 from datetime import datetime
+import time
+
+# Read-only {} used as the default for missing intermediate keys
+_EMPTY = MappingProxyType({})
+
+# Known Quote Tokens (WETH, SOL, USDC, USDT, DAI)
+QUOTE_TOKENS = frozenset({
+    '0x4200000000000000000000000000000000000006', # Base/Op WETH
+    'so11111111111111111111111111111111111111112', # Solana SOL
+    '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2', # Mainnet WETH
+    '0x833589fcd6edb6e08f4c7c32d4f71b54bda02913', # Base USDC
+    '0xdac17f958d2ee523a2206206994597c13d831ec7', # Ethereum USDT
+    '0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48', # Ethereum USDC
+    'epjfwdd5aufqssqem2qn1xzybapc8g4weggkzwytdt1v', # Solana USDC
+    'es9vmfrzacermjfrf4h2fyd4kconky11mcce8benwnyb', # Solana USDT
+    'usd1ttgy1n17neehlmeloaybftrbuserhqyiqzvemub', # Solana USD1 (Spam/Stable)
+    '0x50c5725949a6f0c7290c45f84749e64d8ad46442', # Base DAI
+    '0xfde4c96c8593536e31f229ea8f37b2adb2656a1d', # Base USDT (native-ish)
+})
+
+CHAIN_MAP = {
+    'base': 'base',
+    'ether': 'ethereum',
+    'ethereum': 'ethereum',
+    'arbitrum': 'arbitrum',
+    'optimism': 'optimism',
+    'polygon': 'polygon',
+    'blast': 'blast',
+}
+
+
+def safe_float(value, default=0.0) -> float:
+    """Safely convert to float."""
+    try:
+        return float(value) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+
+def safe_int(value, default=0) -> int:
+    """Safely convert to int."""
+    try:
+        return int(value) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+
+# Key paths read by the normalizers below (typed page decoders keep only these)
+DEXSCREENER_PATHS = (
+    ('chainId',),
+    ('pairAddress',),
+    ('baseToken', 'address'),
+    ('baseToken', 'name'),
+    ('baseToken', 'symbol'),
+    ('quoteToken', 'address'),
+    ('liquidity', 'usd'),
+    ('volume', 'h24'),
+    ('priceChange', 'm5'),
+    ('priceChange', 'h1'),
+    ('txns', 'm5', 'buys'),
+    ('txns', 'm5', 'sells'),
+    ('txns', 'h24', 'buys'),
+    ('txns', 'h24', 'sells'),
+    ('pairCreatedAt',),
+    ('info', 'socials'),
+    ('info', 'websites'),
+)
 
 
 class PairNormalizer:
@@ -33,6 +101,11 @@ class PairNormalizer:
       "confidence": 0.72,
       "event_type": "SECONDARY_MARKET"
     }
+    
+    Each nested object is looked up once (missing / null ones read as {})
+    and values are converted with safe_float / safe_int. Plain code on
+    purpose: output stays plain dicts, so a compiled extractor buys little
+    (see scripts/bench_normalizer.py).
     """
     
     def __init__(self):
@@ -42,88 +115,58 @@ class PairNormalizer:
         """
         Normalize DexScreener pair data into STRICT V2 format.
         """
-        # Extract core fields
-        chain = self._normalize_chain(raw_pair.get('chainId', 'unknown'))
-        pair_address = raw_pair.get('pairAddress', '')
-        base_token = raw_pair.get('baseToken', {})
-        quote_token = raw_pair.get('quoteToken', {})
-        
-        base_address = base_token.get('address', '').lower()
-        quote_address = quote_token.get('address', '').lower()
-        
-        # Known Quote Tokens (WETH, SOL, USDC, USDT, DAI)
-        QUOTE_TOKENS = {
-            '0x4200000000000000000000000000000000000006', # Base/Op WETH
-            'so11111111111111111111111111111111111111112', # Solana SOL
-            '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2', # Mainnet WETH
-            '0x833589fcd6edb6e08f4c7c32d4f71b54bda02913', # Base USDC
-            '0xdac17f958d2ee523a2206206994597c13d831ec7', # Ethereum USDT
-            '0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48', # Ethereum USDC
-            'epjfwdd5aufqssqem2qn1xzybapc8g4weggkzwytdt1v', # Solana USDC
-            'es9vmfrzacermjfrf4h2fyd4kconky11mcce8benwnyb', # Solana USDT
-            'usd1ttgy1n17neehlmeloaybftrbuserhqyiqzvemub', # Solana USD1 (Spam/Stable)
-            '0x50c5725949a6f0c7290c45f84749e64d8ad46442', # Base DAI
-            '0xfde4c96c8593536e31f229ea8f37b2adb2656a1d', # Base USDT (native-ish)
-        }
+        base_token = raw_pair.get('baseToken') or _EMPTY
+        quote_token = raw_pair.get('quoteToken') or _EMPTY
+        price_change = raw_pair.get('priceChange') or _EMPTY
+        txns = raw_pair.get('txns') or _EMPTY
+        txns_5m = txns.get('m5') or _EMPTY
+        txns_24h = txns.get('h24') or _EMPTY
+        info = raw_pair.get('info') or _EMPTY
+        
+        base_address = base_token.get('address', '')
+        quote_address = quote_token.get('address', '')
+        liquidity = safe_float((raw_pair.get('liquidity') or _EMPTY).get('usd', 0))
+        volume_24h = safe_float((raw_pair.get('volume') or _EMPTY).get('h24', 0))
+        price_change_5m = safe_float(price_change.get('m5', 0))
+        price_change_1h = safe_float(price_change.get('h1', 0))
+        buys_5m = safe_int(txns_5m.get('buys', 0))
+        created_at = raw_pair.get('pairCreatedAt')
         
         # LOGIC:
         # 1. If BOTH are Quote Tokens -> Stable pair (e.g. SOL/USDC) -> SKIP (Return None or flag)
         # 2. If Base is Quote, Quote is NOT -> Swap -> Subject is Quote Token (Meme)
         # 3. Else -> Subject is Base Token
+        base_is_quote = base_address.lower() in QUOTE_TOKENS
+        quote_is_quote = quote_address.lower() in QUOTE_TOKENS
         
-        if base_address in QUOTE_TOKENS and quote_address in QUOTE_TOKENS:
+        if base_is_quote and quote_is_quote:
             # Stable pair or noise. Return minimal dummy or None to filter later.
-            print(f"[NORMALIZER] Dropping stable pair: {base_address[:10]}... / {quote_address[:10]}...")
-            major_token = {} 
-        elif base_address in QUOTE_TOKENS:
-            major_token = quote_token
+            print(f"[NORMALIZER] Dropping stable pair: {base_address.lower()[:10]}... / {quote_address.lower()[:10]}...")
+            token_address = ''
+        elif base_is_quote:
+            token_address = quote_address
         else:
-            major_token = base_token
-
-        token_address = major_token.get('address', '')
-        token_name = major_token.get('name', 'UNKNOWN')
-        token_symbol = major_token.get('symbol', 'UNKNOWN')
-        
-        # Metrics
-        liquidity = self._safe_float(raw_pair.get('liquidity', {}).get('usd', 0))
-        volume_24h = self._safe_float(raw_pair.get('volume', {}).get('h24', 0))
+            token_address = base_address
         
-        price_change = raw_pair.get('priceChange', {})
-        price_change_5m = self._safe_float(price_change.get('m5', 0)) # DexScreener might not have this, default 0
-        price_change_1h = self._safe_float(price_change.get('h1', 0))
-        
-        txns = raw_pair.get('txns', {})
-        h24_txns = txns.get('h24', {})
-        m5_txns = txns.get('m5', {})
-        buys_5m = self._safe_int(m5_txns.get('buys', 0)) if m5_txns else 0
-        tx_24h = (h24_txns.get('buys', 0) + h24_txns.get('sells', 0)) if h24_txns else 0
-        tx_5m = (buys_5m + self._safe_int(m5_txns.get('sells', 0))) if m5_txns else 0
+        # Transactions (DexScreener might not have m5, default 0)
+        tx_24h = txns_24h.get('buys', 0) + txns_24h.get('sells', 0)
+        tx_5m = buys_5m + safe_int(txns_5m.get('sells', 0))
         
         # Age
-        created_at = raw_pair.get('pairCreatedAt')
         age_days = 0.0
         if created_at:
             try:
-                age_ms = datetime.now().timestamp() * 1000 - created_at
-                age_days = age_ms / (1000 * 60 * 60 * 24)
+                age_days = (time.time() * 1000 - created_at) / 86_400_000
                 if age_days < 0: age_days = 0
             except:
                 pass
                 
         # Event Type (simple logic for now)
-        event_type = "SECONDARY_MARKET"
-        if age_days < 1.0:
-            event_type = "NEW_PAIR"
+        event_type = "NEW_PAIR" if age_days < 1.0 else "SECONDARY_MARKET"
         
-        # Extract metadata
-        info = raw_pair.get('info', {})
-        socials = info.get('socials', [])
-        websites = info.get('websites', [])
-        has_socials = (len(socials) > 0 or len(websites) > 0)
-
         return {
-            "chain": chain,
-            "pair_address": pair_address,
+            "chain": self._normalize_chain(raw_pair.get('chainId', 'unknown')),
+            "pair_address": raw_pair.get('pairAddress', ''),
             "token_address": token_address,
             "token_name": base_token.get('name', 'UNKNOWN'),
             "token_symbol": base_token.get('symbol', 'UNKNOWN'),
@@ -138,7 +181,7 @@ class PairNormalizer:
             "offchain_score": 0, # To be calculated by filter
             "event_type": event_type,
             "source": source,
-            "has_socials": has_socials
+            "has_socials": bool(info.get('socials')) or bool(info.get('websites'))
         }
     
     def normalize_dextools(self, raw_pair: Dict, source: str = "dextools") -> Dict:
@@ -152,72 +195,49 @@ class PairNormalizer:
         Returns:
             Normalized pair event dict
         """
-        # DEXTools uses different structure
-        # Extract metrics
-        metrics = raw_pair.get('metrics', {})
-        
-        price_change_1h = self._safe_float(metrics.get('price_change_1h', 0))
-        price_change_24h = self._safe_float(metrics.get('price_change_24h', 0))
-        
-        volume_24h = self._safe_float(metrics.get('volume_24h', 0))
-        liquidity = self._safe_float(metrics.get('liquidity', 0))
-        
-        # DEXTools doesn't provide h1 volume/tx data reliably
-        volume_1h = None
-        tx_1h = None
-        
-        # Extract addresses
-        pair_address = raw_pair.get('id', {}).get('pair', '')
-        token_address = raw_pair.get('id', {}).get('token', '')
-        
-        # DEXTools structure doesn't always have token0/token1 explicitly
-        token0 = token_address
-        token1 = ''  # Usually paired with WETH/USDC
-        
-        # Extract chain
-        chain = self._normalize_chain(raw_pair.get('id', {}).get('chain', 'unknown'))
-        dex_id = raw_pair.get('dex', {}).get('name', 'unknown')
+        metrics = raw_pair.get('metrics') or _EMPTY
+        ids = raw_pair.get('id') or _EMPTY
+        liquidity = safe_float(metrics.get('liquidity', 0))
+        volume_24h = safe_float(metrics.get('volume_24h', 0))
+        rank = raw_pair.get('dextools_rank', 9999)
         
         # Calculate confidence
-        rank = raw_pair.get('dextools_rank', 9999)
         confidence = self._calculate_confidence_dextools(
             rank=rank,
             liquidity=liquidity,
             volume_24h=volume_24h
         )
         
-        # Event type
-        event_type = "DEXTOOLS_TOP_GAINER" if rank <= 50 else "SECONDARY_MARKET"
-        
         return {
             # Core identifiers
-            "chain": chain,
-            "dex": dex_id,
-            "pair_address": pair_address,
-            "token0": token0,
-            "token1": token1,
+            "chain": self._normalize_chain(ids.get('chain', 'unknown')),
+            "dex": (raw_pair.get('dex') or _EMPTY).get('name', 'unknown'),
+            "pair_address": ids.get('pair', ''),
+            # DEXTools structure doesn't always have token0/token1 explicitly
+            "token0": ids.get('token', ''),
+            "token1": '',  # Usually paired with WETH/USDC
             
             # Price metrics
-            "price_change_1h": price_change_1h,
+            "price_change_1h": safe_float(metrics.get('price_change_1h', 0)),
             "price_change_6h": None,
-            "price_change_24h": price_change_24h,
-            "current_price": self._safe_float(raw_pair.get('price', 0)),
+            "price_change_24h": safe_float(metrics.get('price_change_24h', 0)),
+            "current_price": safe_float(raw_pair.get('price', 0)),
             
-            # Volume metrics
-            "volume_1h": volume_1h,
+            # Volume metrics (DEXTools doesn't provide h1 volume/tx data reliably)
+            "volume_1h": None,
             "volume_24h": volume_24h,
             
             # Liquidity
             "liquidity": liquidity,
             
             # Transaction counts
-            "tx_1h": tx_1h,
+            "tx_1h": None,
             "tx_24h": None,
             
             # Metadata
             "source": source,
             "confidence": confidence,
-            "event_type": event_type,
+            "event_type": "DEXTOOLS_TOP_GAINER" if rank <= 50 else "SECONDARY_MARKET",
             "age_minutes": None,  # DEXTools doesn't provide creation time
             "dextools_rank": rank,  # Special field for DEXTools
             
@@ -231,30 +251,16 @@ class PairNormalizer:
     
     def _normalize_chain(self, chain_id: str) -> str:
         """Normalize chain identifier."""
-        chain_map = {
-            'base': 'base',
-            'ether': 'ethereum',
-            'ethereum': 'ethereum',
-            'arbitrum': 'arbitrum',
-            'optimism': 'optimism',
-            'polygon': 'polygon',
-            'blast': 'blast',
-        }
-        return chain_map.get(chain_id.lower(), chain_id.lower())
+        chain_id = chain_id.lower()
+        return CHAIN_MAP.get(chain_id, chain_id)
     
     def _safe_float(self, value, default=0.0) -> float:
         """Safely convert to float."""
-        try:
-            return float(value) if value is not None else default
-        except (ValueError, TypeError):
-            return default
+        return safe_float(value, default)
     
     def _safe_int(self, value, default=0) -> int:
         """Safely convert to int."""
-        try:
-            return int(value) if value is not None else default
-        except (ValueError, TypeError):
-            return default
+        return safe_int(value, default)
     
     def _calculate_confidence(self, liquidity: float, volume_24h: float, 
                              tx_count: int, has_price_change: bool) -> float:
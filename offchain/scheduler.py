@@ -5,14 +5,61 @@ CU-saving scheduler that coordinates scanning intervals:
 - DexScreener: every 30-60s
 - DEXTools: every 90-180s
 - No idle polling - event-driven when possible
+- Adaptive mode: per-chain intervals that follow novelty (new pairs per
+  poll) within the source's request budget
 
 Target: < 5k RPC calls/day ($5/month budget)
 """
 
 import asyncio
-from typing import Dict, List, Optional, Callable
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Callable
 from datetime import datetime
 import random
+import time
+
+
+class PollStream:
+    """Novelty and interval state for one (source, chain) poll stream."""
+    
+    __slots__ = (
+        'source', 'chain', 'interval', 'next_due', 'novelty',
+        'requests_per_poll', 'polls', 'new_pairs', 'last_new', '_seen'
+    )
+    
+    max_seen = 2000
+    
+    def __init__(self, source: str, chain: str, interval: float, requests_per_poll: float):
+        self.source = source
+        self.chain = chain
+        self.interval = interval
+        self.next_due = 0.0
+        self.novelty = 0.0  # EWMA of new pairs per poll
+        self.requests_per_poll = requests_per_poll  # EWMA of HTTP requests per poll
+        self.polls = 0
+        self.new_pairs = 0
+        self.last_new = 0
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+    
+    def observe(self, pair_addresses: Iterable[str]) -> int:
+        """Count pair addresses not returned by earlier polls."""
+        new = 0
+        seen = self._seen
+        for address in pair_addresses:
+            if not address:
+                continue
+            if address in seen:
+                seen.move_to_end(address)
+                continue
+            seen[address] = None
+            new += 1
+        while len(seen) > self.max_seen:
+            seen.popitem(last=False)
+        return new
+    
+    @property
+    def novelty_per_minute(self) -> float:
+        return self.novelty * 60 / self.interval if self.interval else 0.0
 
 
 class OffChainScheduler:
@@ -47,6 +94,18 @@ class OffChainScheduler:
         self.adaptive_scaling = self.config.get('adaptive_scaling', True)
         self.activity_threshold = self.config.get('activity_threshold', 5)  # Pairs/scan to consider "active"
         
+        # Adaptive (novelty-driven) polling
+        self.adaptive_min_interval = self.config.get('adaptive_min_interval', 5)
+        self.adaptive_max_interval = self.config.get('adaptive_max_interval', 120)
+        self.request_budget_per_minute = self.config.get('request_budget_per_minute', 30)
+        self.budget_utilization = self.config.get('budget_utilization', 0.8)  # Keep headroom for bursts/pages
+        self.novelty_floor = self.config.get('novelty_floor', 0.2)  # Quiet chains keep a small share
+        self.novelty_alpha = self.config.get('novelty_alpha', 0.3)
+        self.requests_per_poll = self.config.get('requests_per_poll', 2)  # new + trending
+        self._streams: Dict[str, Dict[str, PollStream]] = {}
+        self._budget: Dict[str, float] = {}  # source -> effective requests/min (AIMD)
+        self._request_log: Dict[str, deque] = {}  # source -> (time, requests) of recent polls
+        
         # Emergency backoff
         self.backoff_multiplier = 2.0
         self.backoff_active = False
@@ -171,6 +230,186 @@ class OffChainScheduler:
                 print(f"[SCHEDULER] DEXTools error: {e}")
                 await asyncio.sleep(120)  # Longer error backoff for DEXTools
     
+    def _stream(self, source: str, chain: str) -> PollStream:
+        streams = self._streams.setdefault(source, {})
+        stream = streams.get(chain)
+        if stream is None:
+            stream = streams[chain] = PollStream(source, chain, self.adaptive_min_interval, self.requests_per_poll)
+        return stream
+    
+    def record_poll(self, source: str, chain: str, pair_addresses: Iterable[str]) -> int:
+        """
+        Record the pairs one poll returned for a chain.
+        
+        Args:
+            source: Source name (e.g. 'geckoterminal')
+            chain: Chain polled
+            pair_addresses: Pair addresses the poll returned
+            
+        Returns:
+            Number of genuinely new pairs
+        """
+        stream = self._stream(source, chain)
+        new = stream.observe(pair_addresses)
+        stream.novelty = self.novelty_alpha * new + (1 - self.novelty_alpha) * stream.novelty
+        stream.polls += 1
+        stream.new_pairs += new
+        stream.last_new = new
+        return new
+    
+    async def schedule_adaptive(self, source: str, scan_callback: Callable, chains: List[str] = None,
+                                request_stats: Optional[Callable[[], Dict]] = None):
+        """
+        Novelty-driven polling: each chain gets its own interval.
+        
+        Due chains are scanned together (scan_callback(due_chains), which
+        should call record_poll per chain). After every scan the request
+        budget is redistributed in proportion to each chain's novelty, so
+        a frenzy chain is polled every few seconds and quiet chains back
+        off to adaptive_max_interval.
+        
+        Args:
+            source: Source name (key for streams and stats)
+            scan_callback: Async function to call for scanning
+            chains: List of chains to scan
+            request_stats: Optional callable returning the API client's
+                stats ('total_requests', 'rate_limited') for headroom
+        """
+        chains = chains or ['base']
+        for chain in chains:
+            self._stream(source, chain)
+        self.scans_performed.setdefault(source, 0)
+        self.pairs_found.setdefault(source, 0)
+        self.last_scan_time.setdefault(source, None)
+        self._budget.setdefault(source, float(self.request_budget_per_minute))
+        log = self._request_log.setdefault(source, deque())
+        
+        print(f"[SCHEDULER] {source} adaptive task started (chains: {chains})")
+        
+        last_stats = request_stats() if request_stats else {}
+        
+        while True:
+            try:
+                # Check for backoff
+                if self.backoff_active and self.backoff_until:
+                    now = datetime.now()
+                    if now < self.backoff_until:
+                        wait_time = (self.backoff_until - now).total_seconds()
+                        print(f"[SCHEDULER] {source} in backoff, waiting {wait_time:.0f}s")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        self.backoff_active = False
+                        self.backoff_until = None
+                
+                now = time.monotonic()
+                streams = self._streams[source]
+                due = [chain for chain in chains if streams[chain].next_due <= now]
+                if not due:
+                    await asyncio.sleep(max(0.1, min(streams[c].next_due for c in chains) - now))
+                    continue
+                
+                # Perform scan
+                scan_start = datetime.now()
+                pairs_found = await scan_callback(due)
+                
+                # Update stats
+                self.scans_performed[source] += 1
+                self.last_scan_time[source] = scan_start
+                self.pairs_found[source] += len(pairs_found) if pairs_found else 0
+                
+                # Requests spent and rate-limit feedback
+                done = time.monotonic()
+                if request_stats:
+                    stats = request_stats()
+                    used = stats.get('total_requests', 0) - last_stats.get('total_requests', 0)
+                    limited = stats.get('rate_limited', 0) > last_stats.get('rate_limited', 0)
+                    last_stats = stats
+                    log.append((done, used))
+                    per_poll = used / len(due)
+                    for chain in due:
+                        stream = streams[chain]
+                        stream.requests_per_poll = 0.3 * per_poll + 0.7 * stream.requests_per_poll
+                    self._adjust_budget(source, limited)
+                
+                self._rebalance(source)
+                for chain in due:
+                    stream = streams[chain]
+                    # Jitter to avoid thundering herd
+                    stream.next_due = done + stream.interval * random.uniform(0.9, 1.1)
+                
+                print(f"[SCHEDULER] {source} scan complete ({', '.join(due)}): "
+                      f"{len(pairs_found) if pairs_found else 0} pairs | "
+                      + ", ".join(f"{c} new={streams[c].last_new} next={streams[c].interval:.0f}s" for c in due))
+                
+            except Exception as e:
+                print(f"[SCHEDULER] {source} error: {e}")
+                await asyncio.sleep(60)  # Error backoff
+    
+    def _adjust_budget(self, source: str, rate_limited: bool):
+        """AIMD on the effective request budget: halve on 429, creep back otherwise."""
+        budget = self._budget.get(source, float(self.request_budget_per_minute))
+        if rate_limited:
+            budget = max(self.request_budget_per_minute * 0.1, budget * 0.5)
+        else:
+            budget = min(float(self.request_budget_per_minute), budget + 1.0)
+        self._budget[source] = budget
+    
+    def _rebalance(self, source: str):
+        """Split the request budget across chains in proportion to novelty."""
+        streams = self._streams.get(source)
+        if not streams:
+            return
+        
+        budget_per_second = self._budget.get(source, self.request_budget_per_minute) * self.budget_utilization / 60
+        weights = {chain: max(stream.novelty, self.novelty_floor) for chain, stream in streams.items()}
+        total = sum(weights.values())
+        
+        for chain, stream in streams.items():
+            polls_per_second = budget_per_second * weights[chain] / total / max(stream.requests_per_poll, 1.0)
+            interval = 1 / polls_per_second if polls_per_second > 0 else self.adaptive_max_interval
+            stream.interval = min(self.adaptive_max_interval, max(self.adaptive_min_interval, interval))
+    
+    def _requests_last_minute(self, source: str) -> int:
+        log = self._request_log.get(source)
+        if not log:
+            return 0
+        cutoff = time.monotonic() - 60
+        while log and log[0][0] < cutoff:
+            log.popleft()
+        return sum(used for _, used in log)
+    
+    def get_adaptive_metrics(self) -> Dict:
+        """
+        Chosen interval and observed novelty per source/chain.
+        
+        Returns:
+            {source: {'budget_per_minute', 'requests_last_minute',
+                      'headroom_pct', 'chains': {chain: {...}}}}
+        """
+        metrics = {}
+        for source, streams in self._streams.items():
+            budget = self._budget.get(source, float(self.request_budget_per_minute))
+            used = self._requests_last_minute(source)
+            metrics[source] = {
+                'budget_per_minute': round(budget, 1),
+                'requests_last_minute': used,
+                'headroom_pct': round(max(0.0, 1 - used / self.request_budget_per_minute) * 100, 1)
+                if self.request_budget_per_minute else 0.0,
+                'chains': {
+                    chain: {
+                        'interval_seconds': round(stream.interval, 1),
+                        'novelty_per_poll': round(stream.novelty, 2),
+                        'novelty_per_minute': round(stream.novelty_per_minute, 2),
+                        'requests_per_poll': round(stream.requests_per_poll, 2),
+                        'polls': stream.polls,
+                        'new_pairs': stream.new_pairs,
+                    }
+                    for chain, stream in streams.items()
+                },
+            }
+        return metrics
+    
     def _calculate_interval(self, source: str) -> float:
         """
         Calculate scan interval with jitter.
@@ -238,4 +477,5 @@ class OffChainScheduler:
                 'dexscreener': f"{self.dexscreener_interval_min}-{self.dexscreener_interval_max}s",
                 'dextools': f"{self.dextools_interval_min}-{self.dextools_interval_max}s",
             },
+            'adaptive': self.get_adaptive_metrics(),
         }
@@ -0,0 +1,236 @@
+"""
+OHLCV Store - Local candle store with incremental ATH tracking
+
+Candles are kept per (chain, token, resolution) in SQLite (data/ohlcv.db)
+next to a one-row summary per series that is updated as candles arrive:
+
+- ath / ath_time:      highest high seen
+- low_since_ath:       lowest price after the ATH candle (drawdown floor)
+- last_close:          current price (close of the newest candle)
+- last_time:           newest candle time; the next fetch starts here
+- fetched_at:          when the series was last refreshed
+
+The newest candle is usually still forming, so appends replace candles at
+last_time and add newer ones; anything older is already final and ignored.
+Within a candle the high only rises and the low only falls, so max/min
+updates stay exact without rescanning history.
+
+Usage:
+    store = get_ohlcv_store()
+    store.append('solana', token, '1H', candles)
+    stats = store.get_stats('solana', token, '1H')
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class OHLCVStore:
+    """
+    SQLite candle store (one connection, thread-safe).
+
+    Args:
+        db_path: SQLite file (":memory:" for a throwaway store)
+        idle_days: Series not refreshed for this long are pruned on open
+    """
+
+    def __init__(self, db_path: str = "data/ohlcv.db", idle_days: float = 30):
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS candles (
+                chain TEXT NOT NULL,
+                token TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                time INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                PRIMARY KEY (chain, token, resolution, time)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS series (
+                chain TEXT NOT NULL,
+                token TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                first_time INTEGER,
+                last_time INTEGER,
+                candle_count INTEGER NOT NULL DEFAULT 0,
+                ath REAL NOT NULL DEFAULT 0,
+                ath_time INTEGER NOT NULL DEFAULT 0,
+                low_since_ath REAL,
+                last_close REAL NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (chain, token, resolution)
+            )
+        """)
+        self._conn.commit()
+        if idle_days:
+            self.prune(time.time() - idle_days * 86400)
+
+    # ------------------------------------------------------------------
+    # Series summary
+    # ------------------------------------------------------------------
+
+    _SERIES_FIELDS = ('first_time', 'last_time', 'candle_count', 'ath', 'ath_time',
+                      'low_since_ath', 'last_close', 'fetched_at')
+
+    def series(self, chain: str, token: str, resolution: str) -> Optional[Dict]:
+        """Raw series summary row, or None if nothing is stored."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._SERIES_FIELDS)} FROM series "
+                "WHERE chain = ? AND token = ? AND resolution = ?",
+                (chain, token, resolution),
+            ).fetchone()
+        return dict(zip(self._SERIES_FIELDS, row)) if row else None
+
+    def append(self, chain: str, token: str, resolution: str, candles: List[Dict],
+               fetched_at: float = None) -> int:
+        """
+        Merge fetched candles ({'time','open','high','low','close','volume'})
+        into the store and update the series summary.
+
+        Returns:
+            Number of candles added or revised
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._SERIES_FIELDS)} FROM series "
+                "WHERE chain = ? AND token = ? AND resolution = ?",
+                (chain, token, resolution),
+            ).fetchone()
+            s = dict(zip(self._SERIES_FIELDS, row)) if row else {
+                'first_time': None, 'last_time': None, 'candle_count': 0, 'ath': 0.0,
+                'ath_time': 0, 'low_since_ath': None, 'last_close': 0.0,
+            }
+
+            rows = []
+            for c in sorted(candles, key=lambda c: c.get('time', 0)):
+                t = int(c.get('time', 0))
+                if s['last_time'] is not None and t < s['last_time']:
+                    continue  # final candle already stored
+                high, low, close = float(c.get('high', 0) or 0), float(c.get('low', 0) or 0), float(c.get('close', 0) or 0)
+                if s['last_time'] is None or t > s['last_time']:
+                    s['candle_count'] += 1
+                    s['last_time'] = t
+                if s['first_time'] is None:
+                    s['first_time'] = t
+
+                if high > s['ath']:
+                    s['ath'], s['ath_time'] = high, t
+                    s['low_since_ath'] = close  # lowest known price after the peak
+                elif t > s['ath_time'] and low > 0:
+                    s['low_since_ath'] = low if s['low_since_ath'] is None else min(s['low_since_ath'], low)
+                elif t == s['ath_time'] and close > 0:
+                    s['low_since_ath'] = close if s['low_since_ath'] is None else min(s['low_since_ath'], close)
+                s['last_close'] = close
+
+                rows.append((chain, token, resolution, t, float(c.get('open', 0) or 0), high, low, close,
+                             float(c.get('volume', 0) or 0)))
+
+            s['fetched_at'] = fetched_at
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candles (chain, token, resolution, time, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO series (chain, token, resolution, {', '.join(self._SERIES_FIELDS)}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (chain, token, resolution, *(s[f] for f in self._SERIES_FIELDS)),
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def touch(self, chain: str, token: str, resolution: str, fetched_at: float = None):
+        """Mark a series as refreshed (fetch returned no new candles)."""
+        self.append(chain, token, resolution, [], fetched_at)
+
+    def get_stats(self, chain: str, token: str, resolution: str) -> Optional[Dict]:
+        """
+        ATH / drawdown / rebound stats for a series (None if nothing stored).
+
+        Returns:
+            {
+                'ath', 'ath_time', 'current_price',
+                'drop_percent':         ATH -> current price
+                'low_since_ath',
+                'max_drawdown_percent': ATH -> lowest price since
+                'rebound_percent':      lowest price since ATH -> current price
+                'candles_count', 'last_time', 'fetched_at'
+            }
+        """
+        s = self.series(chain, token, resolution)
+        if s is None:
+            return None
+        ath, current, low = s['ath'], s['last_close'], s['low_since_ath'] or 0
+
+        drop_percent = 0
+        if ath > 0 and current > 0:
+            drop_percent = ((ath - current) / ath) * 100
+        max_drawdown_percent = ((ath - low) / ath) * 100 if ath > 0 and low > 0 else 0
+        rebound_percent = ((current - low) / low) * 100 if low > 0 and current > 0 else 0
+
+        return {
+            'ath': ath,
+            'ath_time': s['ath_time'],
+            'current_price': current,
+            'drop_percent': drop_percent,
+            'low_since_ath': low,
+            'max_drawdown_percent': max_drawdown_percent,
+            'rebound_percent': rebound_percent,
+            'candles_count': s['candle_count'],
+            'last_time': s['last_time'],
+            'fetched_at': s['fetched_at'],
+        }
+
+    # ------------------------------------------------------------------
+    # Candles / maintenance
+    # ------------------------------------------------------------------
+
+    def candles(self, chain: str, token: str, resolution: str, since: int = 0) -> List[Dict]:
+        """Stored candles (oldest first) with time >= since."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT time, open, high, low, close, volume FROM candles "
+                "WHERE chain = ? AND token = ? AND resolution = ? AND time >= ? ORDER BY time",
+                (chain, token, resolution, since),
+            ).fetchall()
+        return [dict(zip(('time', 'open', 'high', 'low', 'close', 'volume'), r)) for r in rows]
+
+    def prune(self, idle_before: float):
+        """Drop series (and their candles) not refreshed since `idle_before`."""
+        with self._lock:
+            self._conn.execute("""
+                DELETE FROM candles WHERE (chain, token, resolution) IN (
+                    SELECT chain, token, resolution FROM series WHERE fetched_at < ?
+                )
+            """, (idle_before,))
+            self._conn.execute("DELETE FROM series WHERE fetched_at < ?", (idle_before,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton
+_ohlcv_store = None
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Get or create the process-wide OHLCVStore."""
+    global _ohlcv_store
+    if _ohlcv_store is None:
+        _ohlcv_store = OHLCVStore()
+    return _ohlcv_store
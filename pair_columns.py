@@ -0,0 +1,94 @@
+"""
+Columnar view of a poll's normalized pairs.
+
+Filters evaluate one pair dict at a time; for batch evaluation the
+numeric fields are pulled once into NumPy columns so level checks and
+scores become vectorized expressions over the whole poll.
+
+Missing and None values read as 0, matching the `pair.get(k, 0) or 0`
+reads in the scalar filter paths.
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Normalized fields read by OffChainFilter / DegenSniperFilter
+FLOAT_COLUMNS = (
+    'liquidity',
+    'volume_1h',
+    'volume_24h',
+    'price_change_5m',
+    'price_change_1h',
+    'price_change_24h',
+    'age_days',
+    'pair_age_hours',
+)
+INT_COLUMNS = (
+    'tx_5m',
+    'tx_1h',
+    'tx_24h',
+    'buys_5m',
+)
+
+
+class PairColumns:
+    """
+    NumPy columns for a list of normalized pairs.
+
+    Numeric fields are exposed as attributes (`cols.liquidity`,
+    `cols.tx_5m`, ...). Flag columns cover the non-numeric checks the
+    filters make (`no_socials`, `is_trending`, core-field presence,
+    `is_solana`). The source dicts stay available as `cols.pairs` for
+    reason formatting and metadata.
+    """
+
+    def __init__(self, pairs: Sequence[Dict]):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch evaluation")
+
+        self.pairs = pairs
+        self.size = len(pairs)
+
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, np.fromiter(
+                (p.get(name, 0) or 0 for p in pairs), dtype=np.float64, count=self.size
+            ))
+        for name in INT_COLUMNS:
+            setattr(self, name, np.fromiter(
+                (p.get(name, 0) or 0 for p in pairs), dtype=np.int64, count=self.size
+            ))
+
+        self.no_socials = self._flags(p.get('has_socials') is False for p in pairs)
+        self.is_trending = self._flags(bool(p.get('is_trending', False)) for p in pairs)
+        self.has_pair_address = self._flags(bool(p.get('pair_address')) for p in pairs)
+        self.has_chain = self._flags(bool(p.get('chain')) for p in pairs)
+        self.has_liquidity = self._flags(bool(p.get('liquidity')) for p in pairs)
+        self.is_solana = self._flags((p.get('chain') or '').lower() == 'solana' for p in pairs)
+
+    def _flags(self, values: Iterable[bool]) -> 'np.ndarray':
+        return np.fromiter(values, dtype=bool, count=self.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def tiered_points(values: 'np.ndarray', cap: float, tiers: List[tuple]) -> 'np.ndarray':
+    """
+    Vectorized `if v >= t0: cap*f0 elif v >= t1: cap*f1 ...` bucket scoring.
+
+    Args:
+        values: column to bucket
+        cap: points cap for the component
+        tiers: [(threshold, fraction), ...] in descending threshold order
+    """
+    return np.select(
+        [values >= threshold for threshold, _ in tiers],
+        [cap * fraction if fraction != 1 else cap for _, fraction in tiers],
+        default=0,
+    )
@@ -8,11 +8,11 @@ Features:
 
 The cooldown file is stored at running/running_cooldown.json by default.
 """
-import json
 import time
 from pathlib import Path
 from typing import Dict, Optional
 from .running_config import get_running_config
+from cooldown_service import get_cooldown_service
 
 
 class RunningCooldown:
@@ -21,6 +21,10 @@ class RunningCooldown:
     
     Enforces 60-minute cooldown between alerts for same token.
     This prevents spam while allowing re-alerting on sustained rallies.
+    
+    Entries live in the shared cooldown store (namespace 'running.alerted')
+    and expire through its timing wheel; the store rewrites the JSON file on
+    every change.
     """
     
     def __init__(self, config: Dict = None):
@@ -28,11 +32,20 @@ class RunningCooldown:
         self.cooldown_minutes = self.config.get("cooldown_minutes", 60)
         self.cooldown_file = Path(self.config.get("cooldown_file", "running/running_cooldown.json"))
         
-        # In-memory cache: {token_address_lower: {timestamp, running_score, chain, ...}}
-        self._alerted_tokens: Dict[str, Dict] = {}
+        existed = self.cooldown_file.exists()
+        
+        # {token_address_lower: {timestamp, running_score, chain, ...}}, loaded from file
+        self._alerted_tokens = get_cooldown_service().table(
+            "running.alerted",
+            cooldown_seconds=self.cooldown_minutes * 60,
+            persist_path=self.cooldown_file,
+            persist_meta={"cooldown_minutes": self.cooldown_minutes}
+        )
         
-        # Load from file on init
-        self._load_from_file()
+        if existed:
+            print(f"[RUNNING] Cooldown: Loaded {len(self._alerted_tokens)} entries from file")
+        else:
+            print("[RUNNING] Cooldown: No existing file, starting fresh")
     
     def is_on_cooldown(self, token_address: str) -> bool:
         """
@@ -45,20 +58,10 @@ class RunningCooldown:
             True if on cooldown (should skip), False if eligible for alert
         """
         token_addr = token_address.lower()
+        remaining = self._alerted_tokens.remaining(token_addr)
         
-        # Clean expired entries first
-        self._clean_expired()
-        
-        if token_addr not in self._alerted_tokens:
-            return False
-        
-        entry = self._alerted_tokens[token_addr]
-        cooldown_seconds = self.cooldown_minutes * 60
-        elapsed = time.time() - entry.get("timestamp", 0)
-        
-        if elapsed < cooldown_seconds:
-            remaining = int((cooldown_seconds - elapsed) / 60)
-            print(f"[RUNNING] Cooldown: Token {token_addr[:10]}... on cooldown ({remaining}m remaining)")
+        if remaining > 0:
+            print(f"[RUNNING] Cooldown: Token {token_addr[:10]}... on cooldown ({int(remaining / 60)}m remaining)")
             return True
         
         return False
@@ -76,22 +79,18 @@ class RunningCooldown:
         """
         token_addr = token_address.lower()
         
-        # Store with metadata
-        self._alerted_tokens[token_addr] = {
+        # Store with metadata (persisted by the cooldown store)
+        self._alerted_tokens.mark(token_addr, {
             "timestamp": time.time(),
             "alerted_at": time.strftime("%Y-%m-%d %H:%M:%S"),
             **(data or {})
-        }
-        
-        # Persist to file
-        self._save_to_file()
+        }, cooldown_seconds=self.cooldown_minutes * 60)
         
         print(f"[RUNNING] Cooldown: Marked {token_addr[:10]}... (cooldown: {self.cooldown_minutes}m)")
         return True
     
     def get_alert_count(self) -> int:
         """Get total count of tokens in cooldown."""
-        self._clean_expired()
         return len(self._alerted_tokens)
     
     def get_token_info(self, token_address: str) -> Optional[Dict]:
@@ -105,19 +104,7 @@ class RunningCooldown:
         Returns:
             Remaining minutes, or 0 if not on cooldown
         """
-        token_addr = token_address.lower()
-        
-        if token_addr not in self._alerted_tokens:
-            return 0
-        
-        entry = self._alerted_tokens[token_addr]
-        cooldown_seconds = self.cooldown_minutes * 60
-        elapsed = time.time() - entry.get("timestamp", 0)
-        
-        if elapsed >= cooldown_seconds:
-            return 0
-        
-        return int((cooldown_seconds - elapsed) / 60)
+        return int(self._alerted_tokens.remaining(token_address.lower()) / 60)
     
     def clear_all(self, confirm: bool = False) -> bool:
         """
@@ -133,70 +120,13 @@ class RunningCooldown:
             print("[RUNNING] Cooldown: clear_all requires confirm=True")
             return False
         
-        self._alerted_tokens = {}
-        self._save_to_file()
+        self._alerted_tokens.clear()
         print("[RUNNING] Cooldown: All entries cleared")
         return True
     
-    def _clean_expired(self) -> int:
-        """Remove expired cooldown entries."""
-        current_time = time.time()
-        cooldown_seconds = self.cooldown_minutes * 60
-        
-        expired = []
-        for token_addr, entry in self._alerted_tokens.items():
-            elapsed = current_time - entry.get("timestamp", 0)
-            if elapsed >= cooldown_seconds:
-                expired.append(token_addr)
-        
-        for token_addr in expired:
-            del self._alerted_tokens[token_addr]
-        
-        if expired:
-            self._save_to_file()
-            
-        return len(expired)
-    
-    def _load_from_file(self) -> None:
-        """Load alerted tokens from persistence file."""
-        try:
-            if self.cooldown_file.exists():
-                with open(self.cooldown_file, "r") as f:
-                    data = json.load(f)
-                    self._alerted_tokens = data.get("tokens", {})
-                    print(f"[RUNNING] Cooldown: Loaded {len(self._alerted_tokens)} entries from file")
-            else:
-                self._alerted_tokens = {}
-                print("[RUNNING] Cooldown: No existing file, starting fresh")
-        except Exception as e:
-            print(f"[RUNNING] Cooldown: Error loading file: {e}")
-            self._alerted_tokens = {}
-    
-    def _save_to_file(self) -> None:
-        """Save alerted tokens to persistence file."""
-        try:
-            # Ensure directory exists
-            self.cooldown_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save with metadata
-            data = {
-                "version": 1,
-                "cooldown_minutes": self.cooldown_minutes,
-                "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_count": len(self._alerted_tokens),
-                "tokens": self._alerted_tokens
-            }
-            
-            with open(self.cooldown_file, "w") as f:
-                json.dump(data, f, indent=2)
-                
-        except Exception as e:
-            print(f"[RUNNING] Cooldown: Error saving to file: {e}")
-    
     def get_stats(self) -> Dict:
         """Get cooldown statistics."""
-        self._clean_expired()
-        tokens = self._alerted_tokens
+        tokens = dict(self._alerted_tokens.items())
         
         if not tokens:
             return {
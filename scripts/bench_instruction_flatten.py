@@ -0,0 +1,245 @@
+"""
+Micro-benchmark for raw_solana_parser instruction flattening.
+
+Flattens 10k transactions (recorded getTransaction results, or synthetic
+Pump.fun/Raydium-shaped ones) and reports time and allocations for:
+- the legacy dict/string representation (one account list per instruction)
+- the compact AccountKeyTable + __slots__ FlatInstruction representation
+
+Usage:
+    python scripts/bench_instruction_flatten.py
+    python scripts/bench_instruction_flatten.py --recorded txs.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules.solana import raw_solana_parser
+from modules.solana.raw_solana_parser import (
+    InstructionFlattener,
+    ProgramFilter,
+    RawTransactionResponse,
+    PROGRAM_IDS,
+)
+
+B58 = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+OTHER_PROGRAMS = [
+    "ComputeBudget111111111111111111111111111111",
+    "11111111111111111111111111111111",
+    "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL",
+]
+
+
+def _pubkey(rng: random.Random) -> str:
+    return ''.join(rng.choice(B58) for _ in range(44))
+
+
+def synth_transaction(rng: random.Random) -> Dict[str, Any]:
+    """Build a jsonParsed-shaped getTransaction result."""
+    programs = list(PROGRAM_IDS.values()) + OTHER_PROGRAMS
+    keys = [{'pubkey': _pubkey(rng), 'signer': i == 0, 'writable': i < 8}
+            for i in range(rng.randint(16, 40))]
+    keys += [{'pubkey': p, 'signer': False, 'writable': False} for p in programs]
+    pubkeys = [k['pubkey'] for k in keys]
+
+    def instr() -> Dict[str, Any]:
+        program = rng.choice(programs)
+        accounts = rng.sample(pubkeys, rng.randint(2, 18))
+        if program == PROGRAM_IDS['spl_token']:
+            return {
+                'programId': program,
+                'parsed': {'type': 'transfer', 'info': {'amount': str(rng.randint(1, 10**9))}},
+            }
+        return {'programId': program, 'accounts': accounts, 'data': _pubkey(rng)}
+
+    return {
+        'slot': rng.randint(250_000_000, 300_000_000),
+        'blockTime': int(time.time()),
+        'transaction': {'message': {
+            'accountKeys': keys,
+            'instructions': [instr() for _ in range(rng.randint(2, 6))],
+        }},
+        'meta': {
+            'err': None,
+            'innerInstructions': [
+                {'index': g, 'instructions': [instr() for _ in range(rng.randint(1, 6))]}
+                for g in range(rng.randint(0, 4))
+            ],
+        },
+    }
+
+
+def load_transactions(path: Optional[str], count: int) -> List[RawTransactionResponse]:
+    """Load recorded results (one JSON object per line) or synthesise them."""
+    results = []
+    if path:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    data = json.loads(line)
+                    results.append(data.get('result', data))
+        while results and len(results) < count:
+            results.extend(results[:count - len(results)])
+    else:
+        rng = random.Random(42)
+        results = [synth_transaction(rng) for _ in range(count)]
+
+    return [
+        RawTransactionResponse(
+            transaction=r.get('transaction', {}),
+            meta=r.get('meta'),
+            slot=r.get('slot', 0),
+            block_time=r.get('blockTime'),
+        )
+        for r in results[:count]
+    ]
+
+
+# -----------------------------------------------------------------------------
+# Legacy representation (previous FlatInstruction dataclass: string program
+# IDs, one resolved account list per instruction, per-instruction DEBUG logs)
+# -----------------------------------------------------------------------------
+
+def _log(message: str, level: str = "INFO"):
+    pass
+
+
+@dataclass
+class LegacyFlatInstruction:
+    program_id: str
+    accounts: List[str]
+    data: Any
+    instruction_type: Optional[str] = None
+    parsed: Optional[Dict] = None
+
+
+def legacy_parse_instruction(instr: Dict, account_keys: List[str]) -> Optional[LegacyFlatInstruction]:
+    _log(f"[SOLANA][RAW] parsing instruction: keys={list(instr.keys())}", "DEBUG")
+    if 'programId' in instr:
+        program_id = instr['programId']
+        _log(f"[SOLANA][RAW] using direct programId: {program_id[:8]}...", "DEBUG")
+    elif 'programIdIndex' in instr:
+        program_id_index = instr.get('programIdIndex')
+        if program_id_index is None or program_id_index >= len(account_keys):
+            return None
+        program_id = account_keys[program_id_index]
+        _log(f"[SOLANA][RAW] resolved programId from index: {program_id[:8]}...", "DEBUG")
+    else:
+        return None
+
+    accounts = []
+    instr_accounts = instr.get('accounts', [])
+    _log(f"[SOLANA][RAW] instruction accounts: {len(instr_accounts)}", "DEBUG")
+    for acc_idx in instr_accounts:
+        if isinstance(acc_idx, int):
+            if acc_idx < len(account_keys):
+                accounts.append(account_keys[acc_idx])
+        elif isinstance(acc_idx, str):
+            accounts.append(acc_idx)
+
+    parsed = instr.get('parsed')
+    instruction_type = None
+    if parsed and isinstance(parsed, dict):
+        instruction_type = parsed.get('type')
+        _log(f"[SOLANA][RAW] instruction type: {instruction_type}", "DEBUG")
+
+    flat = LegacyFlatInstruction(
+        program_id=program_id,
+        accounts=accounts,
+        data=instr.get('data', ''),
+        instruction_type=instruction_type,
+        parsed=parsed
+    )
+    _log(f"[SOLANA][RAW] ✓ parsed instruction: {program_id[:8]}... ({instruction_type})", "DEBUG")
+    return flat
+
+
+def legacy_flatten(tx: RawTransactionResponse) -> List[LegacyFlatInstruction]:
+    instructions = []
+    message = tx.transaction.get('message', {})
+    account_keys = message.get('accountKeys', [])
+    if account_keys and isinstance(account_keys[0], dict):
+        account_keys = [acc.get('pubkey', '') for acc in account_keys]
+
+    for instr in message.get('instructions', []):
+        flat = legacy_parse_instruction(instr, account_keys)
+        if flat:
+            instructions.append(flat)
+
+    if tx.meta:
+        for inner_group in tx.meta.get('innerInstructions', []):
+            for instr in inner_group.get('instructions', []):
+                flat = legacy_parse_instruction(instr, account_keys)
+                if flat:
+                    instructions.append(flat)
+    return instructions
+
+
+def legacy_filter(instructions: List[LegacyFlatInstruction]) -> List[LegacyFlatInstruction]:
+    known_programs = set(PROGRAM_IDS.values())
+    filtered = []
+    for instr in instructions:
+        if instr.program_id in known_programs:
+            filtered.append(instr)
+            _log(f"[SOLANA][RAW] ✓ kept {instr.program_id[:8]}... ({instr.instruction_type})", "DEBUG")
+        else:
+            _log(f"[SOLANA][RAW] ✗ filtered {instr.program_id[:8]}...", "DEBUG")
+    return filtered
+
+
+# -----------------------------------------------------------------------------
+# Runner
+# -----------------------------------------------------------------------------
+
+def run(label: str, txs: List[RawTransactionResponse], flatten, select) -> None:
+    # Timing pass (no tracing overhead)
+    start = time.perf_counter()
+    kept = 0
+    for tx in txs:
+        kept += len(select(flatten(tx)))
+    elapsed = time.perf_counter() - start
+
+    # Allocation pass, retaining every flattened instruction
+    tracemalloc.start()
+    retained = [flatten(tx) for tx in txs]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(len(r) for r in retained)
+    print(
+        f"{label:<8} {len(txs)} txs | {total} instrs ({kept} known) | "
+        f"{elapsed * 1000:8.1f} ms | {len(txs) / elapsed:9.0f} tx/s | "
+        f"retained {current / 1024 / 1024:6.2f} MiB | peak {peak / 1024 / 1024:6.2f} MiB | "
+        f"{current / max(total, 1):6.0f} B/instr"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--recorded', help='JSONL file of recorded getTransaction results')
+    parser.add_argument('--count', type=int, default=10_000)
+    args = parser.parse_args()
+
+    txs = load_transactions(args.recorded, args.count)
+
+    # Keep per-transaction DEBUG logging out of the measurement
+    raw_solana_parser.solana_log = lambda *a, **k: None
+
+    run('legacy', txs, legacy_flatten, legacy_filter)
+    run('compact', txs, InstructionFlattener.flatten_instructions, ProgramFilter.filter_instructions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark for OffChainCache at 100k entries.
+
+Compares the current cache (OrderedDict LRU, monotonic clock, expiry
+heap) with the previous implementation (datetime entries, min() LRU
+scan, full-map expiry scan):
+- set: fill to max_size
+- get: random hits on the full cache
+- set (full): inserts that evict (previous implementation is O(n) per
+  insert, so fewer operations are timed)
+- cleanup_expired on a cache with nothing expired
+
+Usage:
+    python scripts/bench_offchain_cache.py
+    python scripts/bench_offchain_cache.py --entries 20000
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from offchain.cache import OffChainCache
+
+
+class LegacyOffChainCache:
+    """Previous OffChainCache (datetime entries, O(n) LRU eviction)."""
+
+    def __init__(self, config: Dict = None):
+        self.config = config or {}
+        self.ttl_seconds = self.config.get('ttl_seconds', 300)
+        self.max_size = self.config.get('max_size', 1000)
+        self._cache: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key not in self._cache:
+                self.misses += 1
+                return None
+            entry = self._cache[key]
+            if datetime.now() > entry['expires_at']:
+                del self._cache[key]
+                self.misses += 1
+                return None
+            entry['last_accessed'] = datetime.now()
+            self.hits += 1
+            return entry['value']
+
+    def set(self, key: str, value: Dict):
+        with self._lock:
+            if key not in self._cache and len(self._cache) >= self.max_size:
+                lru_key = min(self._cache.keys(), key=lambda k: self._cache[k]['last_accessed'])
+                del self._cache[lru_key]
+                self.evictions += 1
+            now = datetime.now()
+            self._cache[key] = {
+                'value': value,
+                'created_at': now,
+                'last_accessed': now,
+                'expires_at': now + timedelta(seconds=self.ttl_seconds)
+            }
+
+    def cleanup_expired(self):
+        with self._lock:
+            now = datetime.now()
+            expired_keys = [key for key, entry in self._cache.items() if now > entry['expires_at']]
+            for key in expired_keys:
+                del self._cache[key]
+            return len(expired_keys)
+
+
+def timed(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def run(label: str, cache_cls, entries: int, evicting_sets: int) -> None:
+    cache = cache_cls({'ttl_seconds': 3600, 'max_size': entries})
+    keys = [f"0x{i:040x}" for i in range(entries)]
+    value = {'pair_address': keys[0], 'liquidity': 12345.0}
+    rng = random.Random(7)
+    lookups = [rng.choice(keys) for _ in range(entries)]
+    extra = [f"0x{entries + i:040x}" for i in range(evicting_sets)]
+
+    def fill():
+        for key in keys:
+            cache.set(key, value)
+
+    def read():
+        for key in lookups:
+            cache.get(key)
+
+    def evict():
+        for key in extra:
+            cache.set(key, value)
+
+    set_rate = timed(fill, entries)
+    get_rate = timed(read, entries)
+    evict_rate = timed(evict, evicting_sets)
+    start = time.perf_counter()
+    cache.cleanup_expired()
+    cleanup_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{label:<8} set {set_rate:>10,.0f}/s | get {get_rate:>10,.0f}/s | "
+          f"set+evict {evict_rate:>10,.0f}/s ({evicting_sets}) | cleanup {cleanup_ms:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100_000)
+    parser.add_argument('--legacy-evictions', type=int, default=200)
+    args = parser.parse_args()
+
+    run('before', LegacyOffChainCache, args.entries, args.legacy_evictions)
+    run('after', OffChainCache, args.entries, args.entries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark for the Solana TransactionParsePool.
+
+Parses 10k getTransaction response bodies (recorded, or synthetic
+Pump.fun/Raydium-shaped ones) through raw bytes -> compact event tuples
+and reports transactions per second:
+- inline on the event loop thread (workers=0)
+- process pool at 1, 2 and 4 workers (or --workers)
+
+Usage:
+    python scripts/bench_parse_pool.py
+    python scripts/bench_parse_pool.py --recorded txs.jsonl --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules.solana import raw_solana_parser
+from modules.solana.parse_pool import TransactionParsePool
+from scripts.bench_instruction_flatten import synth_transaction, _pubkey
+
+
+def synth_response(rng: random.Random) -> bytes:
+    """Synthetic jsonParsed response with token balances and some create events."""
+    tx = synth_transaction(rng)
+    keys = tx['transaction']['message']['accountKeys']
+    if rng.random() < 0.2:
+        tx['meta']['innerInstructions'].append({'index': 0, 'instructions': [{
+            'programId': raw_solana_parser.PROGRAM_IDS['pumpfun'],
+            'parsed': {'type': 'create', 'info': {'mint': _pubkey(rng), 'creator': keys[0]['pubkey']}},
+        }]})
+    balances = [
+        {'accountIndex': i, 'mint': _pubkey(rng), 'owner': keys[i]['pubkey'],
+         'uiTokenAmount': {'amount': str(rng.randint(0, 10**12)), 'decimals': 6}}
+        for i in range(rng.randint(2, 8))
+    ]
+    tx['meta']['preTokenBalances'] = balances
+    tx['meta']['postTokenBalances'] = [
+        dict(b, uiTokenAmount={'amount': str(rng.randint(0, 10**12)), 'decimals': 6}) for b in balances
+    ]
+    tx['meta']['logMessages'] = ['Program log: Instruction: Create'] * rng.randint(0, 20)
+    return json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': tx}).encode()
+
+
+def load_responses(path, count):
+    if path:
+        raws = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    data = json.loads(line)
+                    if 'result' not in data:
+                        data = {'jsonrpc': '2.0', 'id': 1, 'result': data}
+                    raws.append(json.dumps(data).encode())
+        while raws and len(raws) < count:
+            raws.extend(raws[:count - len(raws)])
+        return raws[:count]
+    rng = random.Random(42)
+    return [synth_response(rng) for _ in range(count)]
+
+
+async def run(label: str, pool: TransactionParsePool, raws) -> None:
+    # Warm up worker processes (imports) outside the measurement
+    await pool.parse_many(raws[:pool.chunk_size * max(1, pool.workers)])
+
+    # Measure event loop responsiveness while parsing
+    lag = [0.0]
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag[0] = max(lag[0], time.perf_counter() - start - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    events = await pool.parse_many(raws)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.02)  # let the ticker observe a blocked loop
+    tick.cancel()
+    pool.shutdown()
+
+    found = sum(1 for e in events if e is not None)
+    print(
+        f"{label:<10} {len(raws)} txs | {elapsed * 1000:8.1f} ms | {len(raws) / elapsed:9.0f} tx/s | "
+        f"{found} events | max loop lag {lag[0] * 1000:7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--recorded', help='JSONL file of recorded getTransaction results')
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=32)
+    args = parser.parse_args()
+
+    raws = load_responses(args.recorded, args.count)
+    print(f"cores: {os.cpu_count()}, payload: {sum(map(len, raws)) / len(raws) / 1024:.1f} KiB/tx avg")
+
+    # Keep DEBUG logging out of the inline measurement (workers drop it themselves)
+    raw_solana_parser.solana_log = lambda *a, **k: None
+
+    await run('inline', TransactionParsePool(workers=0, chunk_size=args.chunk_size), raws)
+    for workers in args.workers:
+        await run(f'{workers} worker' + ('s' if workers > 1 else ''),
+                  TransactionParsePool(workers=workers, chunk_size=args.chunk_size), raws)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
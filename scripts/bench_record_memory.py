@@ -0,0 +1,234 @@
+"""
+Memory benchmark for hot tracked-entity records.
+
+Tracks N tokens (default 100k), each with the records the scanners keep
+per token, and reports bytes per token for:
+- before: the previous dict-backed dataclasses with list-of-tuple series
+- after:  the current slotted records with array-backed series
+
+Per token: PumpfunToken, RaydiumPool (50 liquidity points),
+TokenStateRecord (4 transitions), JupiterTokenData, ActivityCandidate,
+an LPHistory of 12 snapshots, a SnapshotSeries of 3 momentum
+snapshots and one BlockSnapshot.
+JupiterTokenData's VolumeRing is a fixed ~17 KB buffer in both layouts
+and is left out of the count.
+
+Usage:
+    python scripts/bench_record_memory.py
+    python scripts/bench_record_memory.py --tokens 20000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules.solana.pumpfun_scanner import PumpfunToken
+from modules.solana.raydium_scanner import RaydiumPool
+from modules.solana.jupiter_scanner import JupiterTokenData
+from modules.solana.token_state import TokenStateRecord, TokenState
+from modules.global_block_events import BlockSnapshot
+from secondary_activity_scanner import ActivityCandidate
+from momentum_tracker import Snapshot, SnapshotSeries
+from lp_intent_analyzer import LPSnapshot, LPHistory
+
+LIQUIDITY_POINTS = 50
+LP_SNAPSHOTS = 12
+MOMENTUM_SNAPSHOTS = 3
+TRANSITIONS = [
+    (TokenState.DETECTED, TokenState.METADATA_OK),
+    (TokenState.METADATA_OK, TokenState.LP_DETECTED),
+    (TokenState.LP_DETECTED, TokenState.WATCH),
+    (TokenState.WATCH, TokenState.SNIPER_ARMED),
+]
+
+
+# -----------------------------------------------------------------------------
+# Previous layouts (plain dataclasses, list-of-tuple series)
+# -----------------------------------------------------------------------------
+
+@dataclass
+class LegacyPumpfunToken:
+    token_address: str
+    creator_wallet: str
+    creation_timestamp: float
+    name: str = "UNKNOWN"
+    symbol: str = "???"
+    sol_inflow: float = 0.0
+    buy_count: int = 0
+    unique_buyers: int = 0
+    creator_sold: bool = False
+    creator_sell_amount: float = 0.0
+    last_updated: float = field(default_factory=time.time)
+
+
+@dataclass
+class LegacyRaydiumPool:
+    pool_address: str
+    token_mint: str
+    quote_mint: str
+    creation_timestamp: float
+    initial_liquidity_sol: float = 0.0
+    current_liquidity_sol: float = 0.0
+    liquidity_history: List[tuple] = field(default_factory=list)
+    last_updated: float = field(default_factory=time.time)
+    vaults: Optional[Dict] = None
+
+
+@dataclass
+class LegacyJupiterTokenData:
+    token_mint: str
+    first_seen: float
+    total_volume_usd: float = 0.0
+    avg_slippage_bps: float = 0.0
+    routing_count: int = 0
+    last_trade_timestamp: float = 0.0
+    volume_ring: object = None
+
+
+@dataclass
+class LegacyTokenStateRecord:
+    mint: str
+    symbol: str = "???"
+    current_state: TokenState = TokenState.DETECTED
+    state_history: list = field(default_factory=list)
+    metadata_resolved: bool = False
+    lp_detected: bool = False
+    lp_valid: bool = False
+    score: float = 0.0
+    last_score: float = 0.0
+    last_transition: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+    metadata: dict = field(default_factory=dict)
+    lp_info: dict = field(default_factory=dict)
+    reason_skipped: str = ""
+    buy_velocity: float = 0.0
+    smart_wallet_detected: bool = False
+    pending_enrichments: tuple = ()
+
+
+@dataclass
+class LegacyActivityCandidate:
+    pool_address: str
+    chain: str
+    dex: str
+    token_address: str
+    initial_score: float
+    liquidity_usd: float
+    is_smart_wallet: bool = False
+    is_trending: bool = False
+    first_seen_block: int = 0
+    last_scanned_block: int = 0
+    last_activity_block: int = 0
+    swap_count: int = 0
+    volume_usd: float = 0.0
+    unique_traders: Set[str] = field(default_factory=set)
+    activity_score: float = 0.0
+    ttl_blocks: int = 120
+
+
+@dataclass
+class LegacySnapshot:
+    timestamp: float
+    block_number: int
+    liquidity_usd: float
+    price_estimate: float
+    volume_indicator: float
+
+
+@dataclass
+class LegacyLPSnapshot:
+    timestamp: float
+    lp_usd: float
+    volume_usd: float
+    price: float
+    marketcap: float
+
+
+@dataclass(frozen=True)
+class LegacyBlockSnapshot:
+    chain_name: str
+    chain_id: int
+    block_number: int
+    timestamp: int
+    block_hash: str = ""
+    is_strict_mode: bool = False
+
+
+# -----------------------------------------------------------------------------
+# Builders
+# -----------------------------------------------------------------------------
+
+def build_before(i: int, mint: str, now: float) -> tuple:
+    token = LegacyPumpfunToken(mint, f"creator{i}", now, sol_inflow=i * 0.01, buy_count=i % 50)
+    pool = LegacyRaydiumPool(f"pool{i}", mint, "So11111111111111111111111111111111111111112", now)
+    for p in range(LIQUIDITY_POINTS):
+        pool.liquidity_history.append((now + p, 10.0 + p * 0.1))
+    record = LegacyTokenStateRecord(mint)
+    for old, new in TRANSITIONS:
+        record.state_history.append((old.value, new.value, now))
+    jupiter = LegacyJupiterTokenData(mint, now, total_volume_usd=i * 1.5)
+    candidate = LegacyActivityCandidate(f"pool{i}", "base", "uniswap_v2", mint, 75.0, 20000.0 + i)
+    lp = [LegacyLPSnapshot(now + s, 1000.0 + s, 500.0, 0.001, 50000.0) for s in range(LP_SNAPSHOTS)]
+    momentum = [LegacySnapshot(now + s, i + s, 1000.0 + s, 0.001, 1.0) for s in range(MOMENTUM_SNAPSHOTS)]
+    block = LegacyBlockSnapshot("solana", 0, 300_000_000 + i, int(now))
+    return token, pool, record, jupiter, candidate, lp, momentum, block
+
+
+def build_after(i: int, mint: str, now: float) -> tuple:
+    token = PumpfunToken(mint, f"creator{i}", now, sol_inflow=i * 0.01, buy_count=i % 50)
+    pool = RaydiumPool(f"pool{i}", mint, "So11111111111111111111111111111111111111112", now)
+    for p in range(LIQUIDITY_POINTS):
+        pool.liquidity_history.append(now + p, 10.0 + p * 0.1)
+    record = TokenStateRecord(mint)
+    for old, new in TRANSITIONS:
+        record.state_history.append((old.value, new.value, now))
+    jupiter = JupiterTokenData(mint, now, total_volume_usd=i * 1.5, volume_ring=None)
+    candidate = ActivityCandidate(f"pool{i}", "base", "uniswap_v2", mint, 75.0, 20000.0 + i)
+    lp = LPHistory(LPSnapshot(now + s, 1000.0 + s, 500.0, 0.001, 50000.0) for s in range(LP_SNAPSHOTS))
+    momentum = SnapshotSeries(Snapshot(now + s, i + s, 1000.0 + s, 0.001, 1.0) for s in range(MOMENTUM_SNAPSHOTS))
+    block = BlockSnapshot("solana", 0, 300_000_000 + i, int(now))
+    return token, pool, record, jupiter, candidate, lp, momentum, block
+
+
+def measure(builder, mints: List[str]) -> int:
+    """Bytes allocated while holding one record set per mint (mint strings excluded)."""
+    now = time.time()
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracked = {mint: builder(i, mint, now) for i, mint in enumerate(mints)}
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del tracked
+    gc.collect()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tokens', type=int, default=100_000)
+    args = parser.parse_args()
+
+    mints = [f"{i:08d}pump{'x' * 32}" for i in range(args.tokens)]
+
+    before = measure(build_before, mints)
+    after = measure(build_after, mints)
+
+    print(f"{args.tokens} tokens | {LIQUIDITY_POINTS} liquidity points, {LP_SNAPSHOTS} LP snapshots, "
+          f"{MOMENTUM_SNAPSHOTS} momentum snapshots, {len(TRANSITIONS)} transitions per token")
+    print(f"before  {before / args.tokens:8.0f} bytes/token | {before / 2**20:8.1f} MiB")
+    print(f"after   {after / args.tokens:8.0f} bytes/token | {after / 2**20:8.1f} MiB")
+    print(f"saved   {(1 - after / before) * 100:7.1f} %")
+
+
+if __name__ == '__main__':
+    main()
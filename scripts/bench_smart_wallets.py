@@ -0,0 +1,138 @@
+"""
+Benchmark for SmartWalletDetector storage at large wallet counts.
+
+Builds a synthetic wallet database (default 100k wallets) and reports:
+- legacy JSON load + tier cache build time
+- SQLite store first start (legacy JSON import) and warm start time
+- analyze_wallets throughput for batches of early buyers
+- incremental add_wallet / remove_wallet latency
+
+Usage:
+    python scripts/bench_smart_wallets.py
+    python scripts/bench_smart_wallets.py --wallets 250000 --batch 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules_solana.smart_wallet_detector import SmartWalletDetector
+
+B58 = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def _pubkey(rng: random.Random) -> str:
+    return ''.join(rng.choice(B58) for _ in range(44))
+
+
+def build_wallets(count: int, rng: random.Random) -> dict:
+    wallets = {}
+    for _ in range(count):
+        address = _pubkey(rng)
+        total = rng.randint(0, 40)
+        wallets[address.lower()] = {
+            'address': address,
+            'total_trades': total,
+            'wins': rng.randint(0, total),
+            'avg_profit_multiplier': round(rng.uniform(0.2, 6.0), 2),
+            'early_entries': rng.randint(0, 10),
+            'last_updated': int(time.time())
+        }
+    return wallets
+
+
+def legacy_load(json_path: Path, detector: SmartWalletDetector) -> float:
+    """Previous behaviour: json.load everything, then rebuild every tier set."""
+    start = time.perf_counter()
+    with open(json_path) as f:
+        wallets = json.load(f)
+    cache = {1: set(), 2: set(), 3: set()}
+    for address, data in wallets.items():
+        tier = detector._calculate_tier(data)
+        if tier:
+            cache[tier].add(address.lower())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--wallets', type=int, default=100_000)
+    parser.add_argument('--batch', type=int, default=50, help='early buyers per analyze_wallets call')
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--hit-rate', type=float, default=0.02)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    wallets = build_wallets(args.wallets, rng)
+    known = [w['address'] for w in wallets.values()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'smart_wallets.json'
+        db_path = Path(tmp) / 'smart_wallets.db'
+        with open(json_path, 'w') as f:
+            json.dump(wallets, f)
+
+        config = {'db_path': str(db_path), 'legacy_json_path': str(json_path)}
+
+        start = time.perf_counter()
+        SmartWalletDetector(config)
+        import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detector = SmartWalletDetector(config)
+        warm_time = time.perf_counter() - start
+
+        legacy_time = legacy_load(json_path, detector)
+
+        print(f"wallets        {args.wallets}")
+        print(f"legacy load    {legacy_time * 1000:8.1f} ms (json + tier cache rebuild)")
+        print(f"sqlite import  {import_time * 1000:8.1f} ms (first start)")
+        print(f"sqlite load    {warm_time * 1000:8.1f} ms (warm start)")
+        print(f"tier stats     {detector.get_tier_stats()}")
+
+        # analyze_wallets throughput
+        batches = []
+        for _ in range(min(args.calls, 2000)):
+            batch = [
+                rng.choice(known) if rng.random() < args.hit_rate else _pubkey(rng)
+                for _ in range(args.batch)
+            ]
+            batches.append(batch)
+
+        start = time.perf_counter()
+        smart = 0
+        for i in range(args.calls):
+            smart += detector.analyze_wallets(batches[i % len(batches)])['is_smart_money']
+        elapsed = time.perf_counter() - start
+        print(
+            f"analyze        {args.calls} calls x {args.batch} wallets | {elapsed * 1000:8.1f} ms | "
+            f"{args.calls / elapsed:9.0f} calls/s | {args.calls * args.batch / elapsed:10.0f} wallets/s | "
+            f"{smart} smart"
+        )
+
+        # Incremental updates
+        new = {_pubkey(rng): {'total_trades': 12, 'wins': 10} for _ in range(1000)}
+        start = time.perf_counter()
+        for address, performance in new.items():
+            detector.add_wallet(address, performance)
+        add_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for address in new:
+            detector.remove_wallet(address)
+        remove_time = time.perf_counter() - start
+        print(f"add_wallet     {add_time / len(new) * 1e6:8.1f} us/op")
+        print(f"remove_wallet  {remove_time / len(new) * 1e6:8.1f} us/op")
+
+
+if __name__ == '__main__':
+    main()
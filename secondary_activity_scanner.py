@@ -29,7 +29,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivityCandidate:
     """
     In-memory activity candidate (tracked pool)
@@ -8,11 +8,11 @@ Features:
 
 The cooldown file is stored at sniper/sniper_cooldown.json by default.
 """
-import json
 import time
 from pathlib import Path
 from typing import Dict, Optional
 from .sniper_config import get_sniper_config
+from cooldown_service import get_cooldown_service
 
 
 class SniperCooldown:
@@ -21,17 +21,26 @@ class SniperCooldown:
     
     Once a token has been sniped (alert sent), it will NEVER be sniped again.
     This prevents spam and ensures operators only see first opportunities.
+    
+    Entries live in the shared cooldown store (namespace 'sniper.sniped')
+    with no expiry; the store rewrites the JSON file on every change.
     """
     
     def __init__(self, config: Dict = None):
         self.config = config or get_sniper_config()
         self.cooldown_file = Path(self.config.get('cooldown_file', 'sniper/sniper_cooldown.json'))
         
-        # In-memory cache: {token_address_lower: {timestamp, sniper_score, chain, ...}}
-        self._sniped_tokens: Dict[str, Dict] = {}
+        existed = self.cooldown_file.exists()
+        
+        # {token_address_lower: {timestamp, sniper_score, chain, ...}}, loaded from file
+        self._sniped_tokens = get_cooldown_service().table(
+            'sniper.sniped', persist_path=self.cooldown_file
+        )
         
-        # Load from file on init
-        self._load_from_file()
+        if existed:
+            print(f"[SNIPER] Cooldown: Loaded {len(self._sniped_tokens)} sniped tokens from file")
+        else:
+            print("[SNIPER] Cooldown: No existing file, starting fresh")
     
     def is_token_sniped(self, token_address: str) -> bool:
         """
@@ -64,19 +73,15 @@ class SniperCooldown:
         """
         token_addr = token_address.lower()
         
-        if token_addr in self._sniped_tokens:
-            print(f"[SNIPER] Cooldown: Token {token_addr[:10]}... was already marked")
-            return False
-        
-        # Store with metadata
-        self._sniped_tokens[token_addr] = {
+        # Store with metadata (persisted by the cooldown store)
+        payload = {
             'timestamp': time.time(),
             'sniped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
             **(data or {})
         }
-        
-        # Persist to file
-        self._save_to_file()
+        if self._sniped_tokens.check_and_mark(token_addr, payload):
+            print(f"[SNIPER] Cooldown: Token {token_addr[:10]}... was already marked")
+            return False
         
         print(f"[SNIPER] Cooldown: Marked {token_addr[:10]}... as sniped")
         return True
@@ -103,49 +108,13 @@ class SniperCooldown:
             print("[SNIPER] Cooldown: clear_all requires confirm=True")
             return False
         
-        self._sniped_tokens = {}
-        self._save_to_file()
+        self._sniped_tokens.clear()
         print("[SNIPER] Cooldown: All tokens cleared")
         return True
     
-    def _load_from_file(self) -> None:
-        """Load sniped tokens from persistence file."""
-        try:
-            if self.cooldown_file.exists():
-                with open(self.cooldown_file, 'r') as f:
-                    data = json.load(f)
-                    self._sniped_tokens = data.get('tokens', {})
-                    print(f"[SNIPER] Cooldown: Loaded {len(self._sniped_tokens)} sniped tokens from file")
-            else:
-                self._sniped_tokens = {}
-                print("[SNIPER] Cooldown: No existing file, starting fresh")
-        except Exception as e:
-            print(f"[SNIPER] Cooldown: Error loading file: {e}")
-            self._sniped_tokens = {}
-    
-    def _save_to_file(self) -> None:
-        """Save sniped tokens to persistence file."""
-        try:
-            # Ensure directory exists
-            self.cooldown_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save with metadata
-            data = {
-                'version': 1,
-                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'total_count': len(self._sniped_tokens),
-                'tokens': self._sniped_tokens
-            }
-            
-            with open(self.cooldown_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
-        except Exception as e:
-            print(f"[SNIPER] Cooldown: Error saving to file: {e}")
-    
     def get_stats(self) -> Dict:
         """Get cooldown statistics."""
-        tokens = self._sniped_tokens
+        tokens = dict(self._sniped_tokens.items())
         
         if not tokens:
             return {
@@ -17,9 +17,11 @@ from config import (
     REALERT_COOLDOWN_MINUTES,
     REALERT_SCORE_IMPROVEMENT,
     REALERT_LIQUIDITY_IMPROVEMENT,
-    REALERT_MAX_PER_HOUR
+    REALERT_MAX_PER_HOUR,
+    REALERT_HISTORY_HOURS
 )
 from safe_math import safe_div, safe_div_percentage
+from cooldown_service import get_cooldown_service
 
 
 class TelegramNotifier:
@@ -40,7 +42,8 @@ class TelegramNotifier:
         self.enabled = bool(self.bot_token and self.chat_id)
         
         # Enhanced alert tracking: {token_address: {timestamp, score, liquidity, count, renounced}}
-        self.alert_history = {}
+        # Kept in the shared cooldown store, entries expire after REALERT_HISTORY_HOURS
+        self.alert_history = get_cooldown_service().table('telegram.alert_history')
         
         # SAFE QUEUE ARCHITECTURE
         if self.enabled:
@@ -137,10 +140,10 @@ class TelegramNotifier:
         }
         
         # No history = first alert, always eligible
-        if token_addr not in self.alert_history:
+        history = self.alert_history.get(token_addr)
+        if history is None:
             return result
         
-        history = self.alert_history[token_addr]
         last_alert_time = history.get('timestamp', 0)
         last_score = history.get('score', 0)
         last_liquidity = history.get('liquidity', 0)
@@ -198,21 +201,18 @@ class TelegramNotifier:
         token_addr = token_address.lower()
         current_time = time.time()
         
-        if token_addr in self.alert_history:
-            hour_ago = current_time - 3600
-            if self.alert_history[token_addr].get('timestamp', 0) > hour_ago:
-                self.alert_history[token_addr]['count'] += 1
-            else:
-                self.alert_history[token_addr]['count'] = 1
-        else:
-            self.alert_history[token_addr] = {'count': 1}
+        history = self.alert_history.get(token_addr)
+        count = 1
+        if history is not None and history.get('timestamp', 0) > current_time - 3600:
+            count = history.get('count', 0) + 1
         
-        self.alert_history[token_addr].update({
+        self.alert_history.mark(token_addr, {
+            'count': count,
             'timestamp': current_time,
             'score': score_data.get('score', 0),
             'liquidity': token_data.get('liquidity_usd', 0),
             'renounced': token_data.get('renounced', False)
-        })
+        }, cooldown_seconds=REALERT_HISTORY_HOURS * 3600)
     
     def _format_operator_hint(self, operator_hint: dict) -> str:
         """Format operator hint for message."""
@@ -635,13 +635,13 @@ class TelegramNotifier:
     
     def clear_history(self):
         """Clear alert history (for testing or reset)."""
-        self.alert_history = {}
+        self.alert_history.clear()
     
     def get_alert_count(self, token_address: str) -> int:
         """Get current alert count for a token."""
-        token_addr = token_address.lower()
-        if token_addr in self.alert_history:
-            return self.alert_history[token_addr].get('count', 0)
+        history = self.alert_history.get(token_address.lower())
+        if history is not None:
+            return history.get('count', 0)
         return 0
     
     async def send_upgrade_alert_async(self, token_data: dict, original_score_data: dict, 
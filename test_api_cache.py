@@ -0,0 +1,212 @@
+"""
+Tests for the shared ApiCache: TTLs, stale-while-revalidate (async and sync),
+negative caching, stale-if-error, single-flight misses, the SQLite tier and
+per-source hit ratios.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_cache import ApiCache, CacheSourceConfig
+
+
+def make_cache(db_path=None, **config):
+    config.setdefault('ttl', 0.2)
+    return ApiCache(sources={'test': CacheSourceConfig(**config)}, db_path=db_path)
+
+
+class Fetcher:
+    """Async + sync fetcher returning scripted values and counting calls."""
+
+    def __init__(self, *values, delay=0.0):
+        self.values = list(values)
+        self.calls = 0
+        self.delay = delay
+
+    def _next(self):
+        self.calls += 1
+        value = self.values.pop(0) if len(self.values) > 1 else self.values[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    async def __call__(self):
+        await asyncio.sleep(self.delay)
+        return self._next()
+
+    def sync(self):
+        time.sleep(self.delay)
+        return self._next()
+
+
+def test_fresh_and_stale_while_revalidate():
+    """Fresh hits skip the fetcher; stale hits return instantly and refresh in the background."""
+    print("\n✓ Testing stale-while-revalidate...")
+
+    source = make_cache(ttl=0.1, stale_ttl=5).source('test')
+    fetch = Fetcher({'v': 1}, {'v': 2}, delay=0.05)
+
+    async def run():
+        assert await source.get_or_fetch('k', fetch) == {'v': 1}
+        assert await source.get_or_fetch('k', fetch) == {'v': 1}
+        assert fetch.calls == 1
+        await asyncio.sleep(0.15)
+
+        start = time.monotonic()
+        assert await source.get_or_fetch('k', fetch) == {'v': 1}   # stale, served instantly
+        assert time.monotonic() - start < 0.04
+        assert await source.get_or_fetch('k', fetch) == {'v': 1}   # one refresh at a time
+        await asyncio.sleep(0.1)
+        assert fetch.calls == 2
+        assert await source.get_or_fetch('k', fetch) == {'v': 2}   # refreshed
+
+    asyncio.run(run())
+    stats = source.get_stats()
+    assert stats['hits'] == 2 and stats['stale_hits'] == 2 and stats['misses'] == 1
+    assert stats['refreshes'] == 1
+    print(f"  ✓ hits {stats['hits']}, stale {stats['stale_hits']}, misses {stats['misses']}, "
+          f"hit ratio {stats['hit_ratio_pct']:.0f}%")
+    return True
+
+
+def test_negative_and_stale_if_error():
+    """Failures are cached for negative_ttl and never replace a usable value."""
+    print("\n✓ Testing negative caching...")
+
+    source = make_cache(ttl=0.1, stale_ttl=5, negative_ttl=0.15,
+                        is_negative=lambda r: bool(r.get('api_error'))).source('test')
+    fetch = Fetcher({'api_error': 'down'}, {'score': 10}, {'api_error': 'down'}, RuntimeError('boom'))
+
+    async def run():
+        assert (await source.get_or_fetch('k', fetch))['api_error']
+        assert (await source.get_or_fetch('k', fetch))['api_error']
+        assert fetch.calls == 1
+        await asyncio.sleep(0.2)
+        assert await source.get_or_fetch('k', fetch) == {'score': 10}
+
+        # Stale value survives a failed refresh (error payload, then exception)
+        for _ in range(2):
+            await asyncio.sleep(0.12)
+            assert await source.get_or_fetch('k', fetch) == {'score': 10}
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    stats = source.get_stats()
+    assert stats['negative_hits'] == 1 and stats['refresh_errors'] == 1
+    assert fetch.calls == 4
+    print(f"  ✓ negative hits {stats['negative_hits']}, refresh errors {stats['refresh_errors']}")
+    return True
+
+
+def test_single_flight():
+    """Concurrent misses for one key share a single fetch (and its error)."""
+    print("\n✓ Testing single-flight misses...")
+
+    source = make_cache(ttl=10).source('test')
+    fetch = Fetcher({'v': 1}, delay=0.05)
+    failing = Fetcher(ValueError('bad'), delay=0.05)
+
+    async def run():
+        results = await asyncio.gather(*(source.get_or_fetch('k', fetch) for _ in range(10)))
+        assert all(r == {'v': 1} for r in results)
+        errors = await asyncio.gather(*(source.get_or_fetch('e', failing) for _ in range(5)),
+                                      return_exceptions=True)
+        assert all(isinstance(e, ValueError) for e in errors)
+
+    asyncio.run(run())
+    assert fetch.calls == 1 and failing.calls == 1
+    print("  ✓ 10 concurrent callers -> 1 fetch; errors propagate to all waiters")
+    return True
+
+
+def test_sync_path():
+    """get_or_fetch_sync: same policy, stale refresh on a worker thread."""
+    print("\n✓ Testing sync path...")
+
+    cache = make_cache(ttl=0.1, stale_ttl=5)
+    source = cache.source('test')
+    fetch = Fetcher([1], [2], delay=0.05)
+
+    assert source.get_or_fetch_sync('k', fetch.sync) == [1]
+    time.sleep(0.15)
+    start = time.monotonic()
+    assert source.get_or_fetch_sync('k', fetch.sync) == [1]
+    assert time.monotonic() - start < 0.04
+    time.sleep(0.15)
+    assert source.get('k') == [2]
+    assert fetch.calls == 2
+    print("  ✓ Stale value returned while worker refreshed")
+
+    # Concurrent blocking misses for one key share one fetch
+    fetch = Fetcher([3], delay=0.1)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: source.get_or_fetch_sync('miss', fetch.sync), range(6)))
+    assert results == [[3]] * 6 and fetch.calls == 1
+    assert source.get_stats()['coalesced'] == 5 and not source._sync_locks
+    cache.close()
+    print("  ✓ 6 threads missing the same key -> 1 fetch")
+    return True
+
+
+def test_disk_tier():
+    """Persisted sources survive a restart; expired rows are pruned."""
+    print("\n✓ Testing disk tier...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'api_cache.db')
+
+        cache = make_cache(db_path, ttl=60, stale_ttl=60, persist=True)
+        source = cache.source('test')
+        source.set('token_a', {'risk_level': 'SAFE'})
+        source.set('token_b', None)  # negative: memory only
+        cache.close()
+
+        restarted = make_cache(db_path, ttl=60, stale_ttl=60, persist=True)
+        source = restarted.source('test')
+        fetch = Fetcher({'risk_level': 'FAIL'})
+        assert source.get_or_fetch_sync('token_a', fetch.sync) == {'risk_level': 'SAFE'}
+        assert fetch.calls == 0
+        assert source.get('token_b') is None
+        assert source.get_stats()['disk_hits'] == 1
+        restarted.close()
+
+        # Past ttl + stale_ttl: pruned on open
+        expired = make_cache(db_path, ttl=0.01, stale_ttl=0.01, persist=True)
+        time.sleep(0.05)
+        assert expired.source('test').get('token_a') is None
+        expired.close()
+    print("  ✓ Warm after restart; negatives not persisted; expired rows pruned")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("API CACHE TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Stale-while-revalidate", test_fresh_and_stale_while_revalidate),
+        ("Negative + stale-if-error", test_negative_and_stale_if_error),
+        ("Single-flight", test_single_flight),
+        ("Sync path", test_sync_path),
+        ("Disk tier", test_disk_tier),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,152 @@
+"""
+Parity tests: columnar apply_filters_batch vs the scalar apply_filters path
+for OffChainFilter and DegenSniperFilter (results, stats and log output).
+"""
+import copy
+import io
+import random
+from contextlib import redirect_stdout
+
+from cooldown_service import CooldownService
+from degen_sniper_config import DEGEN_SNIPER_CONFIG as DEGEN_CONFIG
+from degen_sniper_filter import DegenSniperFilter
+from offchain.filters import OffChainFilter
+from offchain_config import DEGEN_SNIPER_CONFIG as OFFCHAIN_CONFIG
+
+# Values sit on and around the filter/score thresholds
+MONEY = [0, 500, 999, 1000, 1999.5, 2000, 2999, 3000, 4999, 5000, 9999.99, 10000,
+         19999, 20000, 49999, 50000, 99999, 100000, 250000]
+PCT = [0, 0.0, -0.05, 0.05, 0.1, -4.9, 5, -5, 9.99, 10, 20, -20, 49, 50, 99, 100, -150, 300]
+TX = [0, 1, 2, 4, 5, 9, 10, 19, 20, 49, 50, 120, 900]
+AGE_DAYS = [0, 0.01, 1, 29.99, 30, 30.01, 45, 400]
+AGE_HOURS = [0, 0, 0, 0.5, 1, 1, 23.9, 24, 24.1, 72, 1000]
+
+
+def recorded_pairs(count: int, seed: int = 11):
+    """Normalized-shape pairs (as PairNormalizer emits) with threshold-heavy values."""
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        pair = {
+            'chain': rng.choice(['solana', 'base', 'bsc', 'Solana', '']),
+            'pair_address': rng.choice([f"0x{i:040x}", f"0x{i % 50:040x}", '']),
+            'token_address': f"0x{i:040x}",
+            'liquidity': rng.choice(MONEY),
+            'volume_1h': rng.choice(MONEY[:8] + [None]),
+            'volume_24h': rng.choice(MONEY),
+            'price_change_5m': rng.choice(PCT),
+            'price_change_1h': rng.choice(PCT),
+            'price_change_24h': rng.choice(PCT),
+            'tx_5m': rng.choice(TX),
+            'tx_1h': rng.choice(TX),
+            'tx_24h': rng.choice(TX),
+            'buys_5m': rng.choice(TX),
+            'age_days': rng.choice(AGE_DAYS),
+            'pair_age_hours': rng.choice(AGE_HOURS),
+            'is_trending': rng.random() < 0.3,
+            'has_socials': rng.choice([True, False, None]),
+            'source': 'dexscreener',
+        }
+        for key in ('buys_5m', 'has_socials', 'volume_1h', 'price_change_24h'):
+            if rng.random() < 0.1:
+                del pair[key]
+        pairs.append(pair)
+    return pairs
+
+
+def run_both(make_filter, pairs):
+    """Run the scalar and batch paths on separate copies; return results, stats, logs."""
+    scalar_filter, batch_filter = make_filter(), make_filter()
+    scalar_pairs, batch_pairs = copy.deepcopy(pairs), copy.deepcopy(pairs)
+
+    scalar_log, batch_log = io.StringIO(), io.StringIO()
+    with redirect_stdout(scalar_log):
+        scalar = [scalar_filter.apply_filters(p) for p in scalar_pairs]
+    with redirect_stdout(batch_log):
+        batch = batch_filter.apply_filters_batch(batch_pairs)
+
+    assert len(batch) == len(scalar)
+    for i, (s, b) in enumerate(zip(scalar, batch)):
+        assert s == b, (i, pairs[i], s, b)
+    assert scalar_pairs == batch_pairs
+    assert scalar_filter.stats == batch_filter.stats, (scalar_filter.stats, batch_filter.stats)
+    assert scalar_log.getvalue() == batch_log.getvalue()
+    return scalar, scalar_filter.stats
+
+
+def test_offchain_filter_parity():
+    """OffChainFilter level-0/level-1/score_v3 batch matches scalar."""
+    print("\n✓ Testing OffChainFilter batch parity...")
+
+    pairs = recorded_pairs(3000)
+    strict = copy.deepcopy(OFFCHAIN_CONFIG)
+    strict['global_guardrails']['quality_check'] = {'socials_check': True, 'min_unique_buyers_5m': 5}
+    strict['global_guardrails']['require_h24_volume'] = False
+
+    for label, config in (('default', {}), ('offchain_config', OFFCHAIN_CONFIG), ('quality_check', strict)):
+        results, stats = run_both(lambda: OffChainFilter(config), pairs)
+        passed = sum(1 for ok, _, _ in results if ok)
+        print(f"  ✓ {label}: {passed}/{len(results)} passed, "
+              f"L0 {stats['level0_rejected']}, L1 {stats['level1_rejected']}")
+    return True
+
+
+def test_degen_filter_parity():
+    """DegenSniperFilter guardrails/levels/bonus/score batch matches scalar, incl. dedup + rate limit."""
+    print("\n✓ Testing DegenSniperFilter batch parity...")
+
+    def make_filter(config):
+        def build():
+            filt = DegenSniperFilter(config)
+            filt.seen_pairs = CooldownService().table('test.degen.seen_pairs')
+            return filt
+        return build
+
+    pairs = recorded_pairs(3000, seed=5)
+    for label, config in (('default', {}), ('degen_sniper_config', DEGEN_CONFIG)):
+        results, stats = run_both(make_filter(config), pairs)
+        reasons = {}
+        for ok, reason, _ in results:
+            key = 'PASS' if ok else reason.split(':')[0]
+            reasons[key] = reasons.get(key, 0) + 1
+        print(f"  ✓ {label}: {reasons}")
+    return True
+
+
+def test_empty_batch():
+    """Empty polls are a no-op."""
+    print("\n✓ Testing empty batch...")
+
+    assert OffChainFilter().apply_filters_batch([]) == []
+    assert DegenSniperFilter().apply_filters_batch([]) == []
+    print("  ✓ Empty batch returns []")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("BATCH FILTER PARITY TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("OffChainFilter parity", test_offchain_filter_parity),
+        ("DegenSniperFilter parity", test_degen_filter_parity),
+        ("Empty batch", test_empty_batch),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
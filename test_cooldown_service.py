@@ -0,0 +1,170 @@
+"""
+Test shared CooldownService (timing-wheel expiry, bypass, persistence)
+and the modules that dedup through it.
+"""
+import os
+import random
+import tempfile
+
+from cooldown_service import CooldownService, TimingWheel
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_timing_wheel():
+    """Every key fires on the first advance at/after its deadline, across levels."""
+    print("\n✓ Testing TimingWheel...")
+
+    start = 1_700_000_000.0
+    wheel = TimingWheel(tick_seconds=1.0, slots=8, levels=3, now=start)
+    rng = random.Random(3)
+    deadlines = {i: start + rng.uniform(0.1, 2000) for i in range(2000)}  # past 8**3 -> overflow
+    for key, expires_at in deadlines.items():
+        wheel.schedule(key, expires_at)
+    wheel.cancel(0)
+    del deadlines[0]
+
+    now = start
+    fired = {}
+    while now < start + 2100:
+        now += rng.uniform(0.1, 7.0)
+        for key in wheel.advance(now):
+            fired[key] = now
+
+    assert set(fired) == set(deadlines), len(fired)
+    for key, at in fired.items():
+        assert at >= deadlines[key], (key, at, deadlines[key])
+    assert len(wheel) == 0
+    print(f"  ✓ {len(fired)} keys fired after their deadline, none early")
+    return True
+
+
+def test_cooldown_table():
+    """check_and_mark, bypass predicate, expiry and stats."""
+    print("\n✓ Testing CooldownTable...")
+
+    clock = FakeClock()
+    service = CooldownService(clock=clock)
+    table = service.table('test.pairs')
+
+    grew = lambda last, current: current['volume'] > last['volume']
+    assert table.check_and_mark('a', {'volume': 1}, cooldown_seconds=60, bypass=grew) is False
+    assert table.check_and_mark('a', {'volume': 1}, cooldown_seconds=60, bypass=grew) is True
+    clock.now += 30
+    assert table.check_and_mark('a', {'volume': 5}, cooldown_seconds=60, bypass=grew) is False
+    assert 50 < table.remaining('a') <= 60  # bypass restarted the cooldown
+
+    clock.now += 61
+    assert len(table) == 0 and table.drain_expired() == 1
+    assert table.check_and_mark('a', {'volume': 5}, cooldown_seconds=60) is False
+    assert table.stats['duplicates'] == 1 and table.stats['bypasses'] == 1
+    print(f"  ✓ Duplicate, bypass and expiry: {table.stats}")
+
+    table.get('a')['volume'] = 99  # get() hands out a copy
+    assert table.update('a', {'volume': 7}) == table.get('a')
+    assert table.get('a')['volume'] == 7 and 50 < table.remaining('a') <= 60
+    assert table.update('missing', {'volume': 1}) is None
+    print("  ✓ update() merges into the stored payload and keeps the cooldown")
+    return True
+
+
+def test_persistence():
+    """Persisted tables reload active entries and drop expired ones."""
+    print("\n✓ Testing persistence...")
+
+    clock = FakeClock()
+    path = os.path.join(tempfile.mkdtemp(), 'cooldown.json')
+
+    table = CooldownService(clock=clock).table('test.running', cooldown_seconds=3600, persist_path=path)
+    table.mark('0xaaa', {'score': 80})
+    clock.now += 1800
+    table.mark('0xbbb', {'score': 70})
+    forever = CooldownService(clock=clock).table('test.sniper', persist_path=path + '.sniper')
+    forever.mark('0xccc')
+
+    clock.now += 2000
+    reloaded = CooldownService(clock=clock).table('test.running', cooldown_seconds=3600, persist_path=path)
+    assert '0xaaa' not in reloaded and reloaded.get('0xbbb')['score'] == 70
+    assert 1500 < reloaded.remaining('0xbbb') < 1700
+
+    clock.now += 10 ** 8
+    reloaded = CooldownService(clock=clock).table('test.sniper', persist_path=path + '.sniper')
+    assert reloaded.remaining('0xccc') == float('inf')
+    print("  ✓ Expired entry dropped on reload, active and non-expiring entries kept")
+
+    # Same namespace: same path (or none) returns the table, another path is an error
+    service = reloaded.service
+    assert service.table('test.sniper') is reloaded
+    assert service.table('test.sniper', persist_path=path + '.sniper') is reloaded
+    try:
+        service.table('test.sniper', persist_path=path + '.other')
+        raise AssertionError("conflicting persist_path accepted")
+    except ValueError:
+        pass
+    print("  ✓ Conflicting persist_path for an existing namespace raises")
+    return True
+
+
+def test_deduplicator():
+    """offchain Deduplicator pair/token cooldowns and BC graduation bypass."""
+    print("\n✓ Testing Deduplicator...")
+
+    from offchain.deduplicator import Deduplicator
+
+    clock = FakeClock()
+    dedup = Deduplicator({'pair_cooldown_minutes': 15, 'token_cooldown_minutes': 30},
+                         service=CooldownService(clock=clock))
+
+    assert dedup.is_duplicate('0xpair', 'base') is False
+    assert dedup.is_duplicate('0xpair', 'base') is True
+    assert dedup.is_duplicate('0xpair', 'bsc') is False
+    clock.now += 16 * 60
+    assert dedup.is_duplicate('0xpair', 'base') is False
+
+    assert dedup.is_token_duplicate('0xtok', 'base', {'in_curve': True}) is False
+    # Three graduation bypasses, then the normal token cooldown applies again
+    bypasses = [dedup.is_token_duplicate('0xtok', 'base') for _ in range(5)]
+    assert bypasses == [False, False, False, True, True], bypasses
+
+    # base re-marked after expiry, bsc expired
+    stats = dedup.get_stats()
+    assert stats['bc_bypasses'] == 3 and stats['currently_tracked'] == 2, stats
+    assert dedup.cleanup_expired() == 2
+    print(f"  ✓ Dedup rate {stats['dedup_rate_pct']:.1f}%, tracked {stats['currently_tracked']}")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("COOLDOWN SERVICE TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("TimingWheel", test_timing_wheel),
+        ("CooldownTable", test_cooldown_table),
+        ("Persistence", test_persistence),
+        ("Deduplicator", test_deduplicator),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
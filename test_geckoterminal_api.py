@@ -0,0 +1,183 @@
+"""
+Tests for GeckoTerminalAPI polling: conditional requests (ETag and
+payload hash) skip unchanged pages, and the new_pools backlog is fetched
+only when page 1 is entirely unseen. Uses a fake server, no network.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from http_client import ApiConfig, HttpClient
+from offchain.geckoterminal_api import GeckoTerminalAPI
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeResponse:
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeGecko:
+    """Serves pages per (endpoint, page); honours If-None-Match when `etag` is set."""
+
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.pages = {}
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        endpoint = urlsplit(str(url)).path.rsplit('/', 1)[-1]
+        page = (params or {}).get('page', 1)
+        self.requests.append((endpoint, page, dict(headers or {})))
+        if self.etag and (headers or {}).get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        body = json.dumps({'data': self.pages.get((endpoint, page), [])}).encode()
+        return FakeResponse(200, body, {'ETag': self.etag} if self.etag else {})
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(n, minutes):
+    created = T0 + timedelta(minutes=minutes)
+    return {
+        'id': f'solana_pool{n}',
+        'attributes': {
+            'address': f'pool{n}',
+            'name': f'TK{n} / SOL',
+            'pool_created_at': created.isoformat().replace('+00:00', 'Z'),
+            'reserve_in_usd': '1000',
+        },
+        'relationships': {'base_token': {'data': {'id': f'solana_token{n}'}}},
+    }
+
+
+def make_api(server, **config):
+    api = GeckoTerminalAPI(config)
+    api.http = HttpClient(apis={'geckoterminal': ApiConfig('GeckoTerminal', rate=1000, burst=1000, max_retries=0)},
+                          session_factory=lambda _config: server)
+    return api
+
+
+def test_etag_skip():
+    """A 304 to If-None-Match skips the page without normalizing anything."""
+    print("\n✓ Testing ETag skipping...")
+
+    server = FakeGecko(etag='"v1"')
+    server.pages[('new_pools', 1)] = [make_pool(i, i) for i in range(3)]
+    api = make_api(server)
+
+    async def run():
+        return await api.fetch_new_pools('solana'), await api.fetch_new_pools('solana')
+
+    first, second = asyncio.run(run())
+    assert len(first) == 3 and second == []
+    assert 'If-None-Match' not in server.requests[0][2]
+    assert server.requests[1][2]['If-None-Match'] == '"v1"'
+    assert api.not_modified_count == 1 and api.get_stats()['not_modified'] == 1
+    print("  ✓ Second poll sent If-None-Match and was skipped on 304")
+    return True
+
+
+def test_payload_hash_skip():
+    """Without validators an identical body is skipped; a changed body is not."""
+    print("\n✓ Testing payload-hash skipping...")
+
+    server = FakeGecko()
+    server.pages[('trending_pools', 1)] = [make_pool(i, i) for i in range(2)]
+    api = make_api(server)
+
+    async def run():
+        first = await api.fetch_trending_pools('solana')
+        same = await api.fetch_trending_pools('solana')
+        server.pages[('trending_pools', 1)] = [make_pool(i, i) for i in range(3)]
+        changed = await api.fetch_trending_pools('solana')
+        return first, same, changed
+
+    first, same, changed = asyncio.run(run())
+    assert len(first) == 2 and same == [] and len(changed) == 3
+    assert len(server.requests) == 3 and api.not_modified_count == 1
+    print("  ✓ Unchanged body skipped, changed body returned")
+    return True
+
+
+def test_backlog_pages():
+    """Extra new_pools pages are fetched only when page 1 has no seen pool."""
+    print("\n✓ Testing new_pools backlog...")
+
+    server = FakeGecko()
+    api = make_api(server, max_pages=4)
+
+    async def poll(pools, **extra_pages):
+        server.pages = {('new_pools', 1): pools}
+        for page, page_pools in extra_pages.items():
+            server.pages[('new_pools', int(page[1:]))] = page_pools
+        server.requests.clear()
+        await api.fetch_new_pools('solana', limit=100)
+        return sorted(page for _, page, _ in server.requests)
+
+    async def run():
+        # First poll: nothing seen yet, no backlog guess
+        assert await poll([make_pool(i, 100 - i) for i in range(20)]) == [1]
+
+        # Overlaps the last poll: no extra pages
+        overlap = [make_pool(i, 110 - i) for i in range(10, 30)]
+        assert await poll(overlap) == [1]
+
+        # 20 unseen pools over 19 min, 51 min after the last newest pool:
+        # ~54 more pools missing -> 3 pages (max_pages - 1)
+        fresh = [make_pool(100 + k, 170 - k) for k in range(20)]
+        pages = await poll(fresh, p2=[make_pool(200 + k, 150 - k) for k in range(20)])
+        assert pages == [1, 2, 3, 4], pages
+        assert {'pool100', 'pool200'} <= api._seen_new_pools['solana']
+
+        # Unseen but small gap since the last poll: a single extra page
+        close = [make_pool(300 + k, 190 - k) for k in range(20)]
+        assert await poll(close) == [1, 2]
+
+    asyncio.run(run())
+    print("  ✓ Backlog fetched only after a gap, sized from the creation rate")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("GECKOTERMINAL API TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("ETag skipping", test_etag_skip),
+        ("Payload-hash skipping", test_payload_hash_skip),
+        ("new_pools backlog", test_backlog_pages),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,194 @@
+"""
+Tests for GoPlusBatcher: window/size batching, fan-out of per-address
+results, duplicate coalescing, sync callers from threads and error fan-out.
+Uses a fake HTTP session that answers like GoPlus.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from goplus_batcher import GoPlusBatcher, token_security_url
+from http_client import ApiConfig, HttpClient
+
+
+class FakeResponse:
+    def __init__(self, status, body, delay=0.0):
+        self.status = status
+        self.headers = {}
+        self._body = body
+        self._delay = delay
+
+    async def read(self):
+        await asyncio.sleep(self._delay)
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeGoPlus:
+    """Returns token data for every address except ones starting with 0xdead."""
+
+    def __init__(self, status=200, error=None, delay=0.0):
+        self.status = status
+        self.error = error
+        self.delay = delay
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        addresses = parse_qs(urlsplit(str(url)).query)['contract_addresses'][0].split(',')
+        self.requests.append(addresses)
+        if self.error:
+            raise self.error
+        result = {a: {'is_honeypot': '0', 'holder_count': str(len(a))}
+                  for a in addresses if not a.startswith('0xdead')}
+        body = json.dumps({'code': 1, 'message': 'OK', 'result': result}).encode()
+        return FakeResponse(self.status, body, self.delay)
+
+    async def close(self):
+        self.closed = True
+
+
+def make_batcher(session, **kwargs):
+    http = HttpClient(apis={'goplus': ApiConfig('GoPlus', rate=1000, burst=1000, max_retries=0)},
+                      session_factory=lambda _config: session)
+    return GoPlusBatcher(http=http, **kwargs)
+
+
+ENDPOINT = token_security_url('8453')
+
+
+def addr(i: int) -> str:
+    return f"0x{i:040X}"
+
+
+def test_async_batching():
+    """Concurrent lookups within the window become one request; results fan out."""
+    print("\n✓ Testing async batching...")
+
+    session = FakeGoPlus(delay=0.1)  # full batches still in flight when the repeat arrives
+    batcher = make_batcher(session, window=0.05, max_batch=20)
+
+    async def run():
+        addresses = [addr(i) for i in range(45)] + [addr(3), '0xdead' + '0' * 36]
+        return addresses, await asyncio.gather(*(batcher.lookup(ENDPOINT, a) for a in addresses))
+
+    addresses, results = asyncio.run(run())
+    # 46 unique addresses: 20 + 20 sent when full, 6 after the window
+    # (the repeated address joins its in-flight batch)
+    assert sorted(len(r) for r in session.requests) == [6, 20, 20], session.requests
+    for address, data in zip(addresses, results):
+        key = address.lower()
+        assert data['code'] == 1
+        if key.startswith('0xdead'):
+            assert data['result'] == {}
+        else:
+            assert list(data['result']) == [key]
+            assert data['result'][key]['holder_count'] == str(len(key))
+    stats = batcher.get_stats()
+    assert stats['lookups'] == 47 and stats['coalesced'] == 1 and stats['batches'] == 3
+    print(f"  ✓ 47 lookups -> {stats['batches']} requests (avg {stats['avg_batch_size']:.1f} addresses)")
+    return True
+
+
+def test_window_per_endpoint():
+    """Chains are batched separately; a lone lookup waits at most one window."""
+    print("\n✓ Testing per-chain windows...")
+
+    session = FakeGoPlus()
+    batcher = make_batcher(session, window=0.05, max_batch=20)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(batcher.lookup(token_security_url('8453'), addr(1)),
+                             batcher.lookup(token_security_url('1'), addr(2)),
+                             batcher.lookup(token_security_url('8453'), addr(3)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert sorted(len(r) for r in session.requests) == [1, 2]
+    assert elapsed < 0.5
+    print(f"  ✓ 2 chains -> 2 requests in {elapsed * 1000:.0f}ms")
+    return True
+
+
+def test_sync_callers():
+    """A lone blocking lookup skips the window; concurrent ones still share a batch."""
+    print("\n✓ Testing sync callers...")
+
+    session = FakeGoPlus(delay=0.05)
+    batcher = make_batcher(session, window=0.5, max_batch=20)
+
+    start = time.monotonic()
+    assert addr(100).lower() in batcher.lookup_sync(ENDPOINT, addr(100))['result']
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.4, elapsed
+    assert batcher.get_stats()['eager_flushes'] == 1
+
+    session.requests.clear()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: batcher.lookup_sync(ENDPOINT, addr(i)), range(8)))
+    assert all(addr(i).lower() in r['result'] for i, r in enumerate(results))
+    # The first lookup goes out alone; the rest arrive while it is in flight and batch
+    assert len(session.requests) <= 2 and sum(map(len, session.requests)) == 8, session.requests
+    print(f"  ✓ Lone lookup in {elapsed * 1000:.0f}ms; 8 threads -> {len(session.requests)} requests")
+    return True
+
+
+def test_error_fan_out():
+    """Non-200 gives every caller None; transport errors raise for every caller."""
+    print("\n✓ Testing error fan-out...")
+
+    batcher = make_batcher(FakeGoPlus(status=500), window=0.02)
+
+    async def run_status():
+        return await asyncio.gather(*(batcher.lookup(ENDPOINT, addr(i)) for i in range(3)))
+
+    assert asyncio.run(run_status()) == [None, None, None]
+
+    batcher = make_batcher(FakeGoPlus(error=ConnectionError('down')), window=0.02)
+
+    async def run_error():
+        return await asyncio.gather(*(batcher.lookup(ENDPOINT, addr(i)) for i in range(3)),
+                                    return_exceptions=True)
+
+    assert all(isinstance(e, ConnectionError) for e in asyncio.run(run_error()))
+    assert batcher.get_stats()['failed_batches'] == 1
+    print("  ✓ Errors reach every waiting caller")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("GOPLUS BATCHER TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Async batching", test_async_batching),
+        ("Per-chain windows", test_window_per_endpoint),
+        ("Sync callers", test_sync_callers),
+        ("Error fan-out", test_error_fan_out),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,245 @@
+"""
+Tests for the shared HttpClient: Retry-After handling, token buckets,
+5xx backoff + circuit breaker, metrics and the blocking (sync) path.
+Uses a scripted fake session instead of the network.
+"""
+import asyncio
+import time
+
+from http_client import ApiConfig, CircuitOpenError, HttpClient, RateLimitedError, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status, body=b'{}', headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Replays a script of responses (or exceptions) and records request times."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((time.monotonic(), method, str(url), kwargs))
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+    async def close(self):
+        self.closed = True
+
+
+def make_client(script, **config):
+    session = FakeSession(script)
+    apis = {'test': ApiConfig('Test', **config)}
+    return HttpClient(apis=apis, session_factory=lambda _config: session), session
+
+
+def test_retry_after():
+    """429 with Retry-After is retried after the advertised delay and doesn't trip the breaker."""
+    print("\n✓ Testing Retry-After...")
+
+    assert parse_retry_after('2') == 2.0
+    assert parse_retry_after('garbage') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+    client, session = make_client(
+        [FakeResponse(429, headers={'Retry-After': '0.3'}), FakeResponse(200, b'{"ok": 1}')],
+        rate=100, burst=10, max_retries=2,
+    )
+    resp = client.get_sync('test', 'https://api.example.com/x')
+    assert resp.status == 200 and resp.json() == {'ok': 1}
+    gap = session.calls[1][0] - session.calls[0][0]
+    assert gap >= 0.25, gap
+    assert client.breaker('test').results == [True]
+    stats = client.get_stats()['test']
+    assert stats['rate_limited'] == 1 and stats['retries'] == 1
+    print(f"  ✓ Retried after {gap:.2f}s")
+
+    # Retry-After beyond max_retry_after: give up and return the 429
+    client, session = make_client([FakeResponse(429, headers={'Retry-After': '120'})],
+                                  rate=100, burst=10, max_retries=2, max_retry_after=30)
+    assert client.get_sync('test', 'https://api.example.com/x').status == 429
+    assert len(session.calls) == 1
+    print("  ✓ Long Retry-After returned to caller without retrying")
+    return True
+
+
+def test_token_bucket():
+    """Requests beyond the burst are paced at `rate`, shared by async and sync callers."""
+    print("\n✓ Testing token bucket...")
+
+    client, session = make_client([FakeResponse(200)], rate=20, burst=2)
+
+    async def burst():
+        return await asyncio.gather(*(client.get('test', f'https://api.example.com/{i}') for i in range(6)))
+
+    start = time.monotonic()
+    responses = asyncio.run(burst())
+    client.get_sync('test', 'https://api.example.com/sync')
+    elapsed = time.monotonic() - start
+    assert all(r.status == 200 for r in responses)
+    # 2 burst tokens, then 5 more at 20/s
+    assert elapsed >= 0.2, elapsed
+    assert client.get_stats()['test']['bucket_wait_s'] > 0
+
+    # Separate API keys get separate buckets
+    client, session = make_client([FakeResponse(200)], rate=1, burst=1)
+    start = time.monotonic()
+    for key in ('a', 'b', 'c'):
+        client.get_sync('test', 'https://api.example.com/x', api_key=key)
+    assert time.monotonic() - start < 0.5
+    print(f"  ✓ 7 requests paced over {elapsed:.2f}s; per-key buckets independent")
+    return True
+
+
+def test_bounded_bucket_wait():
+    """A drained bucket fails fast instead of blocking past the timeout / max_retry_after."""
+    print("\n✓ Testing bounded bucket wait...")
+
+    client, session = make_client([FakeResponse(200)], rate=10, burst=1, timeout=0.2, max_retry_after=1)
+    client.get_sync('test', 'https://api.example.com/x')
+    client._bucket('test', None).penalize(5)
+
+    start = time.monotonic()
+    for call in (lambda: client.get_sync('test', 'https://api.example.com/x'),
+                 lambda: asyncio.run(client.get('test', 'https://api.example.com/x'))):
+        try:
+            call()
+            raise AssertionError("expected RateLimitedError")
+        except RateLimitedError as e:
+            assert e.api == 'test'
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.5, elapsed
+    assert len(session.calls) == 1 and client.get_stats()['test']['bucket_rejected'] == 2
+
+    # Retry-After longer than a blocking caller's timeout: the 429 comes back at once
+    client, session = make_client([FakeResponse(429, headers={'Retry-After': '2'}), FakeResponse(200)],
+                                  rate=100, burst=10, max_retries=2, timeout=0.2)
+    start = time.monotonic()
+    assert client.get_sync('test', 'https://api.example.com/x').status == 429
+    assert time.monotonic() - start < 0.5 and len(session.calls) == 1
+    print(f"  ✓ Drained bucket rejected in {elapsed * 1000:.0f}ms (sync and async)")
+    return True
+
+
+def test_backoff_and_breaker():
+    """5xx retries with backoff, then breaker failures open the circuit."""
+    print("\n✓ Testing 5xx backoff and circuit breaker...")
+
+    client, session = make_client([FakeResponse(503)], rate=100, burst=10,
+                                  max_retries=1, backoff=0.05, failure_threshold=0.5)
+    for _ in range(5):
+        assert client.get_sync('test', 'https://api.example.com/x').status == 503
+    assert len(session.calls) == 10  # 1 retry each
+    assert client.breaker('test').state == 'OPEN'
+
+    try:
+        client.get_sync('test', 'https://api.example.com/x')
+        raise AssertionError("expected CircuitOpenError")
+    except CircuitOpenError as e:
+        assert e.api == 'test'
+    assert len(session.calls) == 10
+    assert client.get_stats()['test']['circuit_rejected'] == 1
+    print("  ✓ Circuit OPEN after 5 failed requests; further calls rejected")
+
+    # POST is not retried unless marked idempotent
+    client, session = make_client([FakeResponse(502)], rate=100, burst=10, max_retries=2, backoff=0.01)
+    client.post_sync('test', 'https://api.example.com/x', json={'a': 1})
+    assert len(session.calls) == 1
+    client.post_sync('test', 'https://api.example.com/x', json={'a': 1}, idempotent=True)
+    assert len(session.calls) == 4
+    print("  ✓ Non-idempotent POST sent once")
+    return True
+
+
+def test_transport_errors_and_metrics():
+    """Transport errors are retried then raised; metrics track statuses and latency."""
+    print("\n✓ Testing transport errors and metrics...")
+
+    client, session = make_client([ConnectionError('reset'), FakeResponse(200)],
+                                  rate=100, burst=10, max_retries=1, backoff=0.01)
+    assert client.get_sync('test', 'https://api.example.com/x').status == 200
+
+    client2, _ = make_client([ConnectionError('down')], rate=100, burst=10, max_retries=1, backoff=0.01)
+    try:
+        client2.get_sync('test', 'https://api.example.com/x')
+        raise AssertionError("expected ConnectionError")
+    except ConnectionError:
+        pass
+    assert client2.breaker('test').results == [False]
+
+    stats = client.get_stats()['test']
+    assert stats['requests'] == 1 and stats['attempts'] == 2 and stats['errors'] == 1
+    assert stats['status_counts'] == {200: 1}
+    assert stats['circuit'] == 'CLOSED'
+    assert stats['latency_max_ms'] >= stats['latency_p50_ms'] >= 0
+    print(f"  ✓ Stats: {stats['attempts']} attempts, {stats['errors']} error, circuit {stats['circuit']}")
+    return True
+
+
+def test_sessions_per_host():
+    """One pooled session per host; close() drops them."""
+    print("\n✓ Testing session pooling...")
+
+    created = []
+
+    def factory(_config):
+        created.append(FakeSession([FakeResponse(200)]))
+        return created[-1]
+
+    client = HttpClient(apis={'test': ApiConfig('Test', rate=100, burst=10)}, session_factory=factory)
+    for url in ('https://a.example.com/1', 'https://a.example.com/2', 'https://b.example.com/1'):
+        client.get_sync('test', url)
+    assert len(created) == 2
+    asyncio.run(client.close())
+    assert all(s.closed for s in created)
+    print("  ✓ 2 hosts -> 2 sessions, closed on close()")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("HTTP CLIENT TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Retry-After", test_retry_after),
+        ("Token bucket", test_token_bucket),
+        ("Bounded bucket wait", test_bounded_bucket_wait),
+        ("Backoff + circuit breaker", test_backoff_and_breaker),
+        ("Transport errors + metrics", test_transport_errors_and_metrics),
+        ("Sessions per host", test_sessions_per_host),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -3,7 +3,7 @@ Test script for LP Intent Analyzer
 """
 
 import asyncio
-from lp_intent_analyzer import LPIntentAnalyzer
+from lp_intent_analyzer import LPIntentAnalyzer, LPSnapshot, HISTORY_MAX_AGE, HISTORY_MAX_SNAPSHOTS
 from colorama import init, Fore
 import time
 
@@ -193,6 +193,37 @@ def test_risk_levels():
     print(f"\n{Fore.GREEN}✅ TEST 4 PASSED\n")
 
 
+def test_history_series():
+    """Test the array-backed LP history: reads, slices and trimming."""
+    
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"{Fore.CYAN}TEST 5: LP History Series")
+    print(f"{Fore.CYAN}{'='*60}\n")
+    
+    analyzer = LPIntentAnalyzer('solana')
+    token_address = 'TestToken999'
+    now = time.time()
+    
+    for i in range(10):
+        analyzer._append_snapshot(token_address, LPSnapshot(now - 7200 + i * 600, 1000.0 + i, 50.0 * i, 0.001, 1e6))
+    
+    history = analyzer.lp_history[token_address]
+    # Snapshots older than HISTORY_MAX_AGE before the latest are dropped
+    assert len(history) == HISTORY_MAX_AGE // 600 + 1, len(history)
+    assert history[0] == LPSnapshot(now - 7200 + 3 * 600, 1003.0, 150.0, 0.001, 1e6)
+    assert history[-1].lp_usd == 1009.0 and [s.lp_usd for s in history[-2:]] == [1008.0, 1009.0]
+    assert list(history) == history[:]
+    print(f"  ✅ {len(history)} snapshots kept within {HISTORY_MAX_AGE}s")
+    
+    for i in range(HISTORY_MAX_SNAPSHOTS + 5):
+        analyzer._append_snapshot(token_address, LPSnapshot(now + i * 0.01, 500.0, 0.0, 0.0, 0.0))
+    assert len(history) == HISTORY_MAX_SNAPSHOTS
+    assert history.times[0] == now + 5 * 0.01
+    print(f"  ✅ Capped at {HISTORY_MAX_SNAPSHOTS} snapshots")
+    
+    print(f"\n{Fore.GREEN}✅ TEST 5 PASSED\n")
+
+
 async def run_all_tests():
     """Run all test cases."""
     
@@ -205,6 +236,7 @@ async def run_all_tests():
         test_lp_drop_detection()
         test_divergence_detection()
         test_risk_levels()
+        test_history_series()
         
         print(f"\n{Fore.GREEN}{'='*60}")
         print(f"{Fore.GREEN}ALL TESTS PASSED ✅")
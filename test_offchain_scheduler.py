@@ -0,0 +1,154 @@
+"""
+Tests for the adaptive OffChainScheduler: novelty tracking per chain,
+budget split across chains, and AIMD on the request budget after 429s.
+"""
+import asyncio
+
+from offchain.scheduler import OffChainScheduler
+
+
+def make_scheduler(**config):
+    return OffChainScheduler({'request_budget_per_minute': 30, 'budget_utilization': 0.8,
+                              'novelty_alpha': 1.0, **config})
+
+
+def test_novelty():
+    """Only pairs not seen in earlier polls count as new."""
+    print("\n✓ Testing novelty tracking...")
+
+    scheduler = make_scheduler(novelty_alpha=0.5)
+    assert scheduler.record_poll('gecko', 'solana', ['a', 'b', 'c', '']) == 3
+    assert scheduler.record_poll('gecko', 'solana', ['b', 'c', 'd']) == 1
+    assert scheduler.record_poll('gecko', 'base', ['a']) == 1  # streams are per chain
+
+    stream = scheduler._streams['gecko']['solana']
+    assert stream.polls == 2 and stream.new_pairs == 4 and stream.last_new == 1
+    assert stream.novelty == 0.5 * 1 + 0.5 * (0.5 * 3)
+    print(f"  ✓ 4 new pairs over 2 polls, novelty EWMA {stream.novelty}")
+    return True
+
+
+def test_rebalance():
+    """The busy chain gets most of the budget; total rate stays inside it."""
+    print("\n✓ Testing budget rebalance...")
+
+    scheduler = make_scheduler()
+    scheduler.record_poll('gecko', 'solana', [f'p{i}' for i in range(10)])
+    scheduler.record_poll('gecko', 'base', [])
+    scheduler.record_poll('gecko', 'base', [])
+    scheduler._rebalance('gecko')
+
+    streams = scheduler._streams['gecko']
+    solana, base = streams['solana'].interval, streams['base'].interval
+    assert scheduler.adaptive_min_interval <= solana < 10, solana
+    assert base == scheduler.adaptive_max_interval, base
+
+    # Quiet chains are clamped to adaptive_max_interval, which may dip into
+    # the utilization headroom but never past the budget itself
+    used = sum(s.requests_per_poll / s.interval for s in streams.values())
+    assert used <= 30 / 60, used
+
+    # Activity moves to base: the split follows it
+    scheduler.record_poll('gecko', 'solana', [f'p{i}' for i in range(10)])
+    scheduler.record_poll('gecko', 'base', [f'b{i}' for i in range(10)])
+    scheduler._rebalance('gecko')
+    assert streams['base'].interval < base and streams['solana'].interval > solana
+    print(f"  ✓ solana every {solana:.1f}s, quiet base every {base:.0f}s; split follows novelty")
+    return True
+
+
+def test_aimd():
+    """429 halves the budget (floored at 10%); clean polls add 1/min up to the cap."""
+    print("\n✓ Testing AIMD budget...")
+
+    scheduler = make_scheduler()
+    scheduler.record_poll('gecko', 'solana', [f'p{i}' for i in range(10)])
+    scheduler._rebalance('gecko')
+    before = scheduler._streams['gecko']['solana'].interval
+
+    scheduler._adjust_budget('gecko', rate_limited=True)
+    assert scheduler._budget['gecko'] == 15.0
+    scheduler._rebalance('gecko')
+    after = scheduler._streams['gecko']['solana'].interval
+    assert abs(after - 2 * before) < 1e-6, (before, after)
+
+    for _ in range(10):
+        scheduler._adjust_budget('gecko', rate_limited=True)
+    assert scheduler._budget['gecko'] == 3.0
+
+    for _ in range(40):
+        scheduler._adjust_budget('gecko', rate_limited=False)
+    assert scheduler._budget['gecko'] == 30.0
+    print(f"  ✓ Interval {before:.1f}s -> {after:.1f}s after 429; floor 3/min, recovers to 30/min")
+    return True
+
+
+def test_schedule_adaptive():
+    """The loop feeds request stats into AIMD and reschedules chains by novelty."""
+    print("\n✓ Testing adaptive loop...")
+
+    scheduler = make_scheduler(adaptive_min_interval=0.01, adaptive_max_interval=0.5,
+                               request_budget_per_minute=6000)
+    stats = {'total_requests': 0, 'rate_limited': 0}
+    scans = []
+
+    async def scan(chains):
+        scans.append(list(chains))
+        for chain in chains:
+            stats['total_requests'] += 2
+            new = [f'{chain}{len(scans)}-{i}' for i in range(5)] if chain == 'solana' else []
+            scheduler.record_poll('gecko', chain, new)
+        if len(scans) == 3:
+            stats['rate_limited'] += 1
+        return []
+
+    async def run():
+        task = asyncio.create_task(scheduler.schedule_adaptive(
+            'gecko', scan, ['solana', 'base'], request_stats=lambda: dict(stats)))
+        await asyncio.sleep(0.6)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    metrics = scheduler.get_adaptive_metrics()['gecko']
+    chains = metrics['chains']
+    assert chains['solana']['polls'] > chains['base']['polls'] >= 1, chains
+    assert chains['base']['interval_seconds'] == 0.5
+    assert metrics['budget_per_minute'] < 6000
+    assert abs(chains['solana']['requests_per_poll'] - 2) < 1e-6
+    print(f"  ✓ solana polled {chains['solana']['polls']}x, base {chains['base']['polls']}x; "
+          f"budget {metrics['budget_per_minute']}/min after one 429")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("OFF-CHAIN SCHEDULER TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Novelty tracking", test_novelty),
+        ("Budget rebalance", test_rebalance),
+        ("AIMD budget", test_aimd),
+        ("Adaptive loop", test_schedule_adaptive),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,167 @@
+"""
+Tests for OHLCVStore (incremental ATH / drawdown vs full recompute) and
+BirdeyeClient.calculate_ath incremental fetching.
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from birdeye_client import BirdeyeClient
+from ohlcv_store import OHLCVStore
+
+HOUR = 3600
+
+
+def random_candles(count: int, start: int = 1_700_000_000, seed: int = 3):
+    rng = random.Random(seed)
+    price, candles = 1.0, []
+    for i in range(count):
+        open_ = price
+        close = max(1e-6, open_ * rng.uniform(0.7, 1.4))
+        high = max(open_, close) * rng.uniform(1.0, 1.2)
+        low = min(open_, close) * rng.uniform(0.8, 1.0)
+        candles.append({'time': start + i * HOUR, 'open': open_, 'high': high, 'low': low,
+                        'close': close, 'volume': rng.uniform(0, 1e5)})
+        price = close
+    return candles
+
+
+def forming(candle, rng):
+    """Earlier snapshot of a candle: high not yet reached, low not yet hit."""
+    high = rng.uniform(candle['open'], candle['high'])
+    low = rng.uniform(candle['low'], candle['open'])
+    return {**candle, 'high': high, 'low': low, 'close': rng.uniform(low, high)}
+
+
+def recompute(candles):
+    ath_candle = max(candles, key=lambda c: c['high'])
+    after = [c['low'] for c in candles if c['time'] > ath_candle['time']]
+    return {
+        'ath': ath_candle['high'],
+        'ath_time': ath_candle['time'],
+        'current_price': candles[-1]['close'],
+        'candles_count': len(candles),
+        'min_low_after': min(after) if after else None,
+        'ath_close': ath_candle['close'],
+    }
+
+
+def test_incremental_parity():
+    """Chunked appends (with forming-candle revisions) match a full recompute."""
+    print("\n✓ Testing incremental ATH parity...")
+
+    rng = random.Random(7)
+    for seed in range(20):
+        candles = random_candles(300, seed=seed)
+        store = OHLCVStore(":memory:", idle_days=0)
+
+        i = 0
+        while i < len(candles):
+            j = min(len(candles), i + rng.randint(1, 40))
+            chunk = candles[i:j]
+            if j < len(candles):
+                chunk = chunk + [forming(candles[j], rng)]  # newest candle still forming
+            store.append('solana', 'tok', '1H', chunk)
+            i = j
+
+        stats = store.get_stats('solana', 'tok', '1H')
+        expected = recompute(candles)
+        for key in ('ath', 'ath_time', 'current_price', 'candles_count'):
+            assert stats[key] == expected[key], (seed, key, stats[key], expected[key])
+        # Floor: never above the ATH candle's close or the lowest low after it
+        assert stats['low_since_ath'] <= expected['ath_close'] + 1e-12
+        if expected['min_low_after'] is not None:
+            assert stats['low_since_ath'] <= expected['min_low_after'] + 1e-12
+        assert store.candles('solana', 'tok', '1H') == candles
+        store.close()
+    print("  ✓ 20 series: ATH, ATH time, current price, count and stored candles match")
+    return True
+
+
+def test_persistence():
+    """Series survive reopening; idle series are pruned."""
+    print("\n✓ Testing persistence...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ohlcv.db')
+        store = OHLCVStore(db_path)
+        store.append('solana', 'tok', '1H', random_candles(10))
+        store.append('solana', 'old', '1H', random_candles(5), fetched_at=time.time() - 40 * 86400)
+        before = store.get_stats('solana', 'tok', '1H')
+        store.close()
+
+        store = OHLCVStore(db_path, idle_days=30)
+        assert store.get_stats('solana', 'tok', '1H') == before
+        assert store.get_stats('solana', 'old', '1H') is None
+        assert store.candles('solana', 'old', '1H') == []
+        store.close()
+    print("  ✓ Reopened store keeps stats; idle series pruned")
+    return True
+
+
+def test_calculate_ath_incremental():
+    """First check loads history; repeats cost zero calls, then one small call."""
+    print("\n✓ Testing calculate_ath fetch pattern...")
+
+    history = random_candles(200, start=int(time.time()) - 200 * HOUR)
+    calls = []
+
+    client = BirdeyeClient(api_key='test', store=OHLCVStore(":memory:", idle_days=0), refresh_interval=0.1)
+
+    async def fake_request(token_address, chain, timeframe, time_from):
+        calls.append(time_from)
+        return [c for c in history if c['time'] >= time_from]
+
+    client._request_ohlcv = fake_request
+
+    async def run():
+        first = await client.calculate_ath('tok', 'solana')
+        for _ in range(5):
+            assert await client.calculate_ath('tok', 'solana') == first
+        assert len(calls) == 1
+
+        # New candle appears; next check after refresh_interval fetches from the last stored one
+        history.append({**history[-1], 'time': history[-1]['time'] + HOUR,
+                        'high': first['ath'] * 2, 'close': first['ath'] * 1.5})
+        await asyncio.sleep(0.15)
+        updated = await client.calculate_ath('tok', 'solana')
+        assert len(calls) == 2 and calls[1] == history[-2]['time']
+        assert updated['ath'] == first['ath'] * 2 and updated['candles_count'] == 201
+        return first
+
+    first = asyncio.run(run())
+    expected = recompute(history[:-1])
+    assert first['ath'] == expected['ath'] and first['candles_count'] == 200
+    print(f"  ✓ 7 checks -> {len(calls)} API calls (incremental from last candle)")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("OHLCV STORE TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Incremental parity", test_incremental_parity),
+        ("Persistence", test_persistence),
+        ("calculate_ath incremental", test_calculate_ath_incremental),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
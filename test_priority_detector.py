@@ -0,0 +1,134 @@
+"""
+Tests for SolanaPriorityDetector batch mode: the NumPy and pure-Python
+column paths must produce the same scores, fee percentiles and bundles.
+"""
+import math
+import random
+
+import modules_solana.priority_detector as priority_detector
+from modules_solana.priority_detector import JITO_TIP_ACCOUNTS, SOLANA_BASE_FEE, SolanaPriorityDetector
+
+
+def make_tx(i, slot, fee, tip_account=None, tip=0, compute_units=0):
+    instructions = []
+    if tip_account is not None:
+        instructions.append({
+            'programId': priority_detector.SYSTEM_PROGRAM_ID,
+            'parsed': {'type': 'transfer', 'info': {'destination': tip_account, 'lamports': tip}},
+        })
+    return {
+        'signature': f'sig{i}',
+        'slot': slot,
+        'meta': {'fee': fee, 'computeUnitsConsumed': compute_units},
+        'transaction': {'message': {'accountKeys': [], 'instructions': instructions}},
+    }
+
+
+def make_batch(count=200, seed=7):
+    rng = random.Random(seed)
+    txs = []
+    for i in range(count):
+        tipped = rng.random() < 0.4
+        txs.append(make_tx(
+            i,
+            slot=1000 + rng.randrange(5),
+            fee=SOLANA_BASE_FEE + rng.randrange(0, 2_000_000),
+            tip_account=rng.choice(JITO_TIP_ACCOUNTS[:2]) if tipped else None,
+            tip=rng.randrange(1_000, 5_000_000) if tipped else 0,
+            compute_units=rng.randrange(0, 400_000),
+        ))
+    # A tight bundle: 4 txs, same slot and tip account, near-equal fees
+    for j in range(4):
+        txs.append(make_tx(count + j, slot=2000, fee=SOLANA_BASE_FEE + 100_000 + j * 1_000,
+                           tip_account=JITO_TIP_ACCOUNTS[3], tip=50_000))
+    return txs
+
+
+def run_batch(txs, use_numpy):
+    saved = priority_detector.NUMPY_AVAILABLE
+    priority_detector.NUMPY_AVAILABLE = use_numpy
+    try:
+        return SolanaPriorityDetector().analyze_batch(txs)
+    finally:
+        priority_detector.NUMPY_AVAILABLE = saved
+
+
+def assert_percentiles_close(a, b):
+    assert a.keys() == b.keys(), (a, b)
+    for key in a:
+        if isinstance(a[key], dict):
+            assert_percentiles_close(a[key], b[key])
+        else:
+            assert math.isclose(a[key], b[key], rel_tol=1e-9, abs_tol=1e-6), (key, a[key], b[key])
+
+
+def test_percentiles_match():
+    """Fallback percentiles interpolate linearly, matching np.percentile."""
+    print("\n✓ Testing percentile paths...")
+    if not priority_detector.NUMPY_AVAILABLE:
+        print("  - NumPy not installed, skipped")
+        return True
+
+    rng = random.Random(1)
+    for size in (1, 2, 3, 7, 10, 101, 1000):
+        values = [rng.randrange(0, 10_000_000) for _ in range(size)]
+        with_numpy = SolanaPriorityDetector._percentiles(values)
+        priority_detector.NUMPY_AVAILABLE = False
+        try:
+            fallback = SolanaPriorityDetector._percentiles(values)
+        finally:
+            priority_detector.NUMPY_AVAILABLE = True
+        assert_percentiles_close(with_numpy, fallback)
+    assert SolanaPriorityDetector._percentiles([10, 20]) == {'p50': 15.0, 'p75': 17.5, 'p90': 19.0, 'p99': 19.9}
+    print("  ✓ p50/p75/p90/p99 equal for sizes 1..1000")
+    return True
+
+
+def test_batch_paths_match():
+    """analyze_batch gives the same results, percentiles and bundles either way."""
+    print("\n✓ Testing analyze_batch paths...")
+    if not priority_detector.NUMPY_AVAILABLE:
+        print("  - NumPy not installed, skipped")
+        return True
+
+    txs = make_batch()
+    with_numpy = run_batch(txs, True)
+    fallback = run_batch(txs, False)
+
+    assert with_numpy['results'] == fallback['results']
+    assert_percentiles_close(with_numpy['fee_percentiles'], fallback['fee_percentiles'])
+    assert with_numpy['fee_percentiles']['jito_tip_count'] == fallback['fee_percentiles']['jito_tip_count']
+
+    key = lambda c: (c['slot'], c['jito_tip_account'])
+    assert sorted(with_numpy['bundle_clusters'], key=key) == sorted(fallback['bundle_clusters'], key=key)
+    assert any(c['slot'] == 2000 and c['size'] == 4 for c in fallback['bundle_clusters'])
+    print(f"  ✓ {len(txs)} txs, {len(fallback['bundle_clusters'])} bundle(s), identical output")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("PRIORITY DETECTOR TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Percentile paths", test_percentiles_match),
+        ("Batch paths", test_batch_paths_match),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -17,7 +17,9 @@ print("\n2. Testing Smart Wallet Detector...")
 try:
     from solana.smart_wallet_detector import SmartWalletDetector
     detector = SmartWalletDetector()
-    print(f"✅ Smart Wallet Detector loaded {len(detector.wallets)} wallets")
+    stats = detector.get_tier_stats()
+    print(f"✅ Smart Wallet Detector loaded {stats['total']} wallets "
+          f"(tier1={stats['tier1']}, tier2={stats['tier2']}, tier3={stats['tier3']})")
 except Exception as e:
     print(f"❌ Smart Wallet Detector failed: {e}")
 
@@ -0,0 +1,145 @@
+"""
+Tests for the SQLite-backed SmartWalletDetector: upserts, lookups,
+tier scoring, removal and the one-time legacy JSON import.
+Uses a temporary database, never data/smart_wallets.db.
+"""
+import json
+import tempfile
+from pathlib import Path
+
+from modules_solana.smart_wallet_detector import SmartWalletDetector
+
+ELITE = {'total_trades': 20, 'wins': 16, 'avg_profit_multiplier': 4.5, 'early_entries': 7}
+GOOD = {'total_trades': 8, 'wins': 5, 'avg_profit_multiplier': 2.0}
+AVERAGE = {'total_trades': 4, 'wins': 1}
+UNQUALIFIED = {'total_trades': 2, 'wins': 0}
+
+
+def make_detector(tmp, **config):
+    return SmartWalletDetector({'db_path': str(Path(tmp) / 'wallets.db'),
+                                'legacy_json_path': str(Path(tmp) / 'missing.json'), **config})
+
+
+def test_upsert():
+    """add_wallet(s) insert or replace rows and keep counts/tiers in step."""
+    print("\n✓ Testing upserts...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = make_detector(tmp)
+        assert detector.add_wallets({'WalletA': ELITE, 'WalletB': GOOD, 'WalletC': UNQUALIFIED}) == 3
+        assert detector.get_tier_stats() == {'tier1': 1, 'tier2': 1, 'tier3': 0, 'total': 3}
+
+        # Same address (any case) replaces the row and moves the tier
+        assert detector.add_wallet('walletb', AVERAGE)
+        assert detector.add_wallet('WALLETC', GOOD)
+        assert detector.get_tier_stats() == {'tier1': 1, 'tier2': 1, 'tier3': 1, 'total': 3}
+        assert detector.tier_index == {'walleta': 1, 'walletb': 3, 'walletc': 2}
+
+        # Rows and index survive a reopen
+        reopened = make_detector(tmp)
+        assert reopened.get_tier_stats() == detector.get_tier_stats()
+        assert reopened.tier_index == detector.tier_index
+        detector._conn.close()
+        reopened._conn.close()
+    print("  ✓ Insert, replace and reopen keep tier counts consistent")
+    return True
+
+
+def test_lookup():
+    """get_wallet_info is case-insensitive and returns the stored row with its tier."""
+    print("\n✓ Testing lookups...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = make_detector(tmp)
+        detector.add_wallet('WalletA', ELITE)
+
+        info = detector.get_wallet_info('WALLETA')
+        assert info['address'] == 'WalletA' and info['tier'] == 1
+        assert info['total_trades'] == 20 and info['wins'] == 16
+        assert info['avg_profit_multiplier'] == 4.5 and info['early_entries'] == 7
+        assert detector.get_wallet_info('nobody') is None
+
+        assert detector.remove_wallet('walleta') and not detector.remove_wallet('walleta')
+        assert detector.get_wallet_info('WalletA') is None
+        assert detector.get_tier_stats() == {'tier1': 0, 'tier2': 0, 'tier3': 0, 'total': 0}
+        detector._conn.close()
+    print("  ✓ Case-insensitive lookup; removal updates index and counts")
+    return True
+
+
+def test_scoring():
+    """The highest matched tier sets the score; unknown and unqualified wallets score 0."""
+    print("\n✓ Testing scoring...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = make_detector(tmp)
+        detector.add_wallets({'Elite1': ELITE, 'Good1': GOOD, 'Good2': GOOD, 'Avg1': AVERAGE, 'Nope': UNQUALIFIED})
+
+        result = detector.analyze_wallets(['good1', 'ELITE1', 'Avg1', 'stranger'])
+        assert result['smart_wallet_score'] == 40 and result['highest_tier'] == 1
+        assert result['is_smart_money']
+        assert [w['address'] for w in result['detected_wallets']] == ['elite1']
+        assert result['detected_wallets'][0]['success_rate'] == 80.0
+
+        result = detector.analyze_wallets(['Good1', 'Good2', 'Avg1'])
+        assert result['smart_wallet_score'] == 25 and len(result['detected_wallets']) == 2
+
+        assert detector.analyze_wallets(['Avg1'])['smart_wallet_score'] == 15
+        empty = detector.analyze_wallets(['Nope', 'stranger'])
+        assert empty['smart_wallet_score'] == 0 and not empty['is_smart_money'] and empty['highest_tier'] is None
+        assert detector.analyze_wallets([])['detected_wallets'] == []
+        detector._conn.close()
+    print("  ✓ Tier 1/2/3 -> 40/25/15 points, highest tier wins")
+    return True
+
+
+def test_legacy_import():
+    """A legacy smart_wallets.json is imported once when the database is created."""
+    print("\n✓ Testing legacy JSON import...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / 'smart_wallets.json'
+        legacy.write_text(json.dumps({'LegacyA': {'address': 'LegacyA', **ELITE}, 'LegacyB': GOOD}))
+
+        detector = SmartWalletDetector({'db_path': str(legacy)})  # .json path -> sibling .db
+        assert detector.db_path == legacy.with_suffix('.db')
+        assert detector.get_tier_stats() == {'tier1': 1, 'tier2': 1, 'tier3': 0, 'total': 2}
+        detector.remove_wallet('LegacyB')
+        detector._conn.close()
+
+        # Existing database: JSON is not re-imported
+        detector = SmartWalletDetector({'db_path': str(legacy)})
+        assert detector.get_tier_stats()['total'] == 1
+        detector._conn.close()
+    print("  ✓ Imported 2 wallets once; later starts use the database")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("SMART WALLET DETECTOR TEST")
+    print("=" * 60)
+
+    results = []
+    for name, test in [
+        ("Upserts", test_upsert),
+        ("Lookups", test_lookup),
+        ("Scoring", test_scoring),
+        ("Legacy JSON import", test_legacy_import),
+    ]:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 60)
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+    passed = sum(1 for _, ok in results if ok)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
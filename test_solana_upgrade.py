@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from modules.solana.metadata_resolver import MetadataResolver, TokenMetadata
 from modules.solana.raydium_lp_detector import RaydiumLPDetector, RaydiumLPInfo
+from modules.solana.pumpfun_curve import BondingCurveReader, decode_bonding_curve
 from modules.solana.token_state import TokenStateMachine, TokenState
 from modules.solana.solana_scanner import SolanaScanner
 
@@ -68,6 +69,396 @@ def test_metadata_resolver():
         return False
 
 
+def test_metadata_batching():
+    """Test batched metadata resolution via getMultipleAccounts."""
+    print("\n✓ Testing MetadataResolver batching...")
+    
+    import struct
+    import tempfile
+    from modules.solana.metadata_resolver import derive_metadata_pda
+    
+    # Known mint: USDC metadata account
+    usdc = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+    assert derive_metadata_pda(usdc) == "FLRCMW1tzhWmBxuBettzNep73ycMCWiobkwCsqURTh9i", derive_metadata_pda(usdc)
+    print("  ✓ Metadata PDA derived for USDC")
+    
+    class _Account:
+        def __init__(self, data):
+            self.data = data
+    
+    class _Response:
+        def __init__(self, value):
+            self.value = value
+    
+    class _BatchClient:
+        """Fake RPC client: even keys are mints, odd keys metadata PDAs."""
+        calls = 0
+        
+        def get_multiple_accounts(self, pubkeys):
+            _BatchClient.calls += 1
+            mint_data = bytes(44) + bytes([6]) + bytes(3) + struct.pack('<Q', 10**9) + bytes(26)
+            meta_data = bytes(65)
+            for field_value in (b"Batch", b"BTCH", b"ipfs://cid"):
+                meta_data += struct.pack('<I', len(field_value)) + field_value
+            return _Response([
+                _Account(mint_data if i % 2 == 0 else meta_data)
+                for i in range(len(pubkeys))
+            ])
+    
+    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    mints = [f"Batch{'1' * 37}{a}{b}" for a in alphabet[:3] for b in alphabet[:20]]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = str(Path(tmp) / "meta.json")
+        resolver = MetadataResolver(client=_BatchClient(), cache_file=cache_file)
+        
+        async def resolve_all():
+            return await asyncio.gather(*(resolver.resolve(m) for m in mints))
+        
+        results = asyncio.run(resolve_all())
+        assert all(r and r.symbol == "BTCH" and r.decimals == 6 for r in results)
+        # 60 mints -> 120 accounts -> 2 chunked getMultipleAccounts calls
+        assert _BatchClient.calls == 2, _BatchClient.calls
+        print(f"  ✓ Resolved {len(results)} mints in {_BatchClient.calls} RPC calls")
+        
+        resolver.save_cache()
+        reloaded = MetadataResolver(client=None, cache_file=cache_file)
+        assert reloaded.get_cache_stats()["persisted_tokens"] == len(mints)
+        cached = asyncio.run(reloaded.resolve(mints[0]))
+        assert cached and cached.name == "Batch"
+        print(f"  ✓ Persistent cache reloaded {len(mints)} mints without RPC")
+
+
+def test_uri_fetcher():
+    """Test gateway racing, CID cache and negative caching of metadata URIs."""
+    print("\n✓ Testing UriMetadataFetcher...")
+    
+    import tempfile
+    import time
+    from modules.solana.uri_fetcher import UriMetadataFetcher, content_key
+    
+    cid = "Qm" + "a" * 44
+    key, urls = content_key(f"ipfs://{cid}")
+    assert key == f"ipfs:{cid}" and len(urls) > 1
+    assert content_key(f"https://ipfs.io/ipfs/{cid}")[0] == key
+    assert content_key(f"https://gateway.pinata.cloud/ipfs/{cid}?x=1")[0] == key
+    print("  ✓ Gateway URLs map to one content-addressed key")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = str(Path(tmp) / "uri.json")
+        fetcher = UriMetadataFetcher(hedge_delay=0.05, timeout=1.0, cache_file=cache_file)
+        requested = []
+        
+        async def fake_fetch_url(url):
+            requested.append(url)
+            if "dead" in url:
+                return None
+            if url.startswith("https://ipfs.io/"):
+                await asyncio.sleep(5)  # Slow primary gateway
+            return {"name": "Raced", "image": "ipfs://img"}
+        
+        fetcher._fetch_url = fake_fetch_url
+        
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                fetcher.fetch(f"ipfs://{cid}"),
+                fetcher.fetch(f"https://ipfs.io/ipfs/{cid}"),
+            )
+            elapsed = time.perf_counter() - start
+            dead = await fetcher.fetch("https://dead.example/meta.json")
+            dead_again = await fetcher.fetch("https://dead.example/meta.json")
+            return results, elapsed, dead, dead_again
+        
+        results, elapsed, dead, dead_again = asyncio.run(run())
+        assert all(r and r["name"] == "Raced" for r in results)
+        assert elapsed < 0.5, elapsed
+        assert fetcher.fetches == 2, fetcher.fetches  # CID once + dead URI once
+        print(f"  ✓ Slow gateway raced out in {elapsed * 1000:.0f} ms, duplicate fetch shared")
+        
+        assert dead is None and dead_again is None
+        assert fetcher.negative_hits == 1 and requested.count("https://dead.example/meta.json") == 1
+        print("  ✓ Dead URI negatively cached")
+        
+        fetcher.save_cache()
+        reloaded = UriMetadataFetcher(cache_file=cache_file)
+        assert reloaded.get_cached(f"https://cf-ipfs.com/ipfs/{cid}")["name"] == "Raced"
+        print("  ✓ Persistent CID cache reloaded")
+        
+        bounded = UriMetadataFetcher(cache_file=None, max_entries=3, negative_ttl=60)
+        for i in range(5):
+            bounded._store(f"ar:{i}", {"i": i}, time.time())
+            bounded._remember_failure(f"https://dead.example/{i}")
+        bounded.get_cached("ar:2")
+        assert list(bounded._cache) == ["ar:2", "ar:3", "ar:4"]
+        assert len(bounded._failed) == 3
+        bounded._failed["https://dead.example/2"] = time.time() - 120  # expired
+        bounded._failed["https://dead.example/3"] = time.time() - 120
+        bounded._remember_failure("https://dead.example/5")
+        assert list(bounded._failed) == ["https://dead.example/4", "https://dead.example/5"]
+        print("  ✓ Document and failure caches bounded")
+    
+    from modules.solana.metadata_resolver import offchain_fields
+    
+    fields = offchain_fields({"image": "ipfs://img", "twitter": "https://x.com/t",
+                              "extensions": {"website": "https://t.io"}})
+    assert fields["image"] == "ipfs://img" and fields["website"] == "https://t.io"
+    assert fields["has_socials"] and not offchain_fields(None)["has_socials"]
+    print("  ✓ Image / socials extracted from URI JSON")
+
+
+def test_bonding_curve():
+    """Test on-chain pump.fun bonding curve decoding and batched reads."""
+    print("\n✓ Testing BondingCurveReader...")
+    
+    import struct
+    import time
+    
+    def curve_data(real_tokens, complete):
+        return (
+            bytes(8) + struct.pack('<QQQQQ', 1_073_000_000 * 10**6, 30 * 10**9,
+                                   real_tokens, 42 * 10**9, 10**15)
+            + bytes([1 if complete else 0])
+        )
+    
+    half = decode_bonding_curve("mint", curve_data(793_100_000 * 10**6 // 2, False))
+    assert abs(half.progress - 50.0) < 0.01 and not half.is_graduated
+    assert half.real_sol == 42.0 and half.price_sol > 0
+    done = decode_bonding_curve("mint", curve_data(0, True))
+    assert done.progress == 100.0 and done.is_graduated
+    assert decode_bonding_curve("mint", bytes(20)) is None
+    print("  ✓ Decoded reserves, progress and complete flag")
+    
+    class _Account:
+        def __init__(self, data):
+            self.data = data
+    
+    class _Response:
+        def __init__(self, value):
+            self.value = value
+    
+    class _CurveClient:
+        calls = 0
+        
+        def get_multiple_accounts(self, pubkeys):
+            _CurveClient.calls += 1
+            return _Response([_Account(curve_data(0, True)) for _ in pubkeys])
+    
+    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    mints = [f"Curve{'1' * 37}{a}{b}" for a in alphabet[:4] for b in alphabet[:25]]
+    reader = BondingCurveReader(client=_CurveClient())
+    
+    async def read_all():
+        return await asyncio.gather(*(reader.get_state(m) for m in mints))
+    
+    states = asyncio.run(read_all())
+    assert all(s and s.is_graduated for s in states)
+    # 96 mints in one batch window -> 1 getMultipleAccounts call
+    assert _CurveClient.calls == 1, _CurveClient.calls
+    asyncio.run(read_all())
+    assert _CurveClient.calls == 1  # graduated curves stay cached
+    print(f"  ✓ Read {len(mints)} curves in {_CurveClient.calls} RPC call")
+
+    class _EmptyClient:
+        def get_multiple_accounts(self, pubkeys):
+            return _Response([None for _ in pubkeys])
+
+    bounded = BondingCurveReader(client=_CurveClient(), max_entries=40)
+    bounded.fetch_states(mints)
+    assert len(bounded._cache) == 40 and mints[-1] in bounded._cache and mints[0] not in bounded._cache
+    bounded.set_client(_EmptyClient())
+    bounded.cache_ttl = 0.05
+    bounded.fetch_states(mints[:60])
+    assert len(bounded._missing) == 40
+    time.sleep(0.06)
+    bounded.fetch_states(mints[:1])
+    assert list(bounded._missing) == [mints[0]]  # expired entries dropped
+    print("  ✓ Curve cache and missing list bounded (LRU + TTL)")
+
+
+def test_holder_concentration():
+    """Test local holder concentration (top-10 share, Gini, exclusions, batching)."""
+    print("\n✓ Testing HolderConcentrationReader...")
+    
+    import struct
+    from solders.pubkey import Pubkey
+    from modules.solana.holder_concentration import (
+        HolderConcentrationReader, gini_coefficient, RAYDIUM_AMM_AUTHORITY
+    )
+    from modules.solana.pumpfun_curve import derive_bonding_curve_pda
+    
+    assert gini_coefficient([5, 5, 5, 5]) == 0.0
+    assert gini_coefficient([0, 0, 0, 100]) == 0.0  # Single holder sample
+    assert 0.7 < gini_coefficient([1, 1, 1, 97]) < 0.75
+    
+    class _Account:
+        def __init__(self, data):
+            self.data = data
+    
+    class _Entry:
+        def __init__(self, address):
+            self.address = address
+    
+    class _Response:
+        def __init__(self, value):
+            self.value = value
+    
+    def owner_key(n):
+        return str(Pubkey(bytes([n]) * 32))
+    
+    mints = [str(Pubkey(bytes([200 + i]) + bytes(31))) for i in range(12)]
+    supply = 1_000_000_000
+    # Per mint: curve holds 50%, Raydium vault 10%, 10 holders 3% each, 10 holders 1% each
+    token_accounts = {}
+    for m, mint in enumerate(mints):
+        owners = [derive_bonding_curve_pda(mint), RAYDIUM_AMM_AUTHORITY] + [owner_key(n) for n in range(1, 21)]
+        amounts = [supply // 2, supply // 10] + [supply * 3 // 100] * 10 + [supply // 100] * 10
+        for i in range(22):
+            token_accounts[str(Pubkey(bytes([m + 1, i + 1]) + bytes(30)))] = (mint, owners[i], amounts[i])
+    
+    class _HolderClient:
+        largest_calls = 0
+        multi_calls = 0
+        
+        def get_token_largest_accounts(self, mint_pubkey):
+            _HolderClient.largest_calls += 1
+            mint = str(mint_pubkey)
+            return _Response([_Entry(a) for a, entry in token_accounts.items() if entry[0] == mint])
+        
+        def get_multiple_accounts(self, pubkeys):
+            _HolderClient.multi_calls += 1
+            values = []
+            for pubkey in pubkeys:
+                key = str(pubkey)
+                if key in token_accounts:
+                    _, owner, amount = token_accounts[key]
+                    values.append(_Account(
+                        bytes(32) + bytes(Pubkey.from_string(owner)) + struct.pack('<Q', amount) + bytes(93)
+                    ))
+                else:
+                    values.append(_Account(bytes(36) + struct.pack('<Q', supply) + bytes([6]) + bytes(37)))
+            return _Response(values)
+    
+    reader = HolderConcentrationReader(client=_HolderClient(), cache_ttl=30)
+    
+    async def run():
+        return await asyncio.gather(*(reader.get_concentration(m) for m in mints))
+    
+    results = asyncio.run(run())
+    first = results[0]
+    assert all(r is not None for r in results)
+    # Circulating = 40% of supply; top 10 hold 30% -> 75%
+    assert abs(first.top10_pct - 75.0) < 0.01, first.top10_pct
+    assert 0.2 < first.gini < 0.3, first.gini
+    assert _HolderClient.multi_calls == 3, _HolderClient.multi_calls  # 12 mints + 264 accounts
+    print(f"  ✓ {len(mints)} mints: top10 {first.top10_pct:.1f}%, gini {first.gini:.3f}, "
+          f"{_HolderClient.multi_calls} getMultipleAccounts calls")
+    
+    # Incremental refresh: expired tracked mints re-read known accounts only
+    for concentration in reader._cache.values():
+        concentration.timestamp -= 60
+    reader.set_tracked(mints[:4])
+    refreshed = asyncio.run(reader.refresh_tracked())
+    assert refreshed == 4 and _HolderClient.largest_calls == len(mints)
+    print("  ✓ Tracked refresh skipped getTokenLargestAccounts")
+
+    import time
+    bounded = HolderConcentrationReader(client=_HolderClient(), max_entries=5)
+    bounded.fetch_concentrations(mints)
+    assert len(bounded._cache) == 5 and mints[-1] in bounded._cache and mints[0] not in bounded._cache
+    unknown = [str(Pubkey(bytes([100 + i]) + bytes(31))) for i in range(8)]
+    bounded.cache_ttl = 0.05
+    bounded.fetch_concentrations(unknown)
+    assert len(bounded._missing) == 5
+    time.sleep(0.06)
+    bounded.fetch_concentrations(unknown[:1])
+    assert list(bounded._missing) == [unknown[0]]  # expired entries dropped
+    print("  ✓ Holder cache and missing list bounded (LRU + TTL)")
+
+
+def test_position_watcher():
+    """Test accountSubscribe liquidity decoding for open positions."""
+    print("\n✓ Testing SolanaPositionWatcher...")
+    
+    import base64
+    import struct
+    from solders.pubkey import Pubkey
+    from modules.solana.position_watcher import SolanaPositionWatcher
+    from modules.solana.pumpfun_curve import derive_bonding_curve_pda
+    from modules.solana.solana_utils import WRAPPED_SOL_MINT
+    from lp_intent_analyzer import LPIntentAnalyzer
+    
+    mint = str(Pubkey(bytes([77]) * 32))
+    pool = str(Pubkey(bytes([78]) * 32))
+    vault = str(Pubkey(bytes([79]) * 32))
+    curve = derive_bonding_curve_pda(mint)
+    
+    def curve_data(real_sol, complete=False):
+        return bytes(8) + struct.pack('<5Q', 1, 1, 1, real_sol, 1) + bytes([complete])
+    
+    def vault_data(lamports):
+        return bytes(64) + struct.pack('<Q', lamports) + bytes(93)
+    
+    pool_data = bytearray(752)
+    struct.pack_into('<Q', pool_data, 40, 9)  # quote decimals
+    pool_data[368:400] = bytes(Pubkey.from_string(vault))
+    pool_data[400:432] = bytes(Pubkey.from_string(mint))
+    pool_data[432:464] = bytes(Pubkey.from_string(WRAPPED_SOL_MINT))
+    
+    class _Account:
+        def __init__(self, data):
+            self.data = data
+    
+    class _Response:
+        def __init__(self, value):
+            self.value = value
+    
+    accounts = {curve: curve_data(30 * 10**9), pool: bytes(pool_data), vault: vault_data(50 * 10**9)}
+    
+    class _Client:
+        def get_multiple_accounts(self, pubkeys):
+            return _Response([_Account(accounts[str(k)]) if str(k) in accounts else None for k in pubkeys])
+    
+    changes = []
+    watcher = SolanaPositionWatcher(rpc_url="http://localhost", client=_Client(),
+                                    on_change=lambda *args: changes.append(args))
+    assert asyncio.run(watcher.watch_position("1", mint, pool))
+    # Curve 30 SOL + pool 2 x 50 SOL
+    assert watcher.get_liquidity("1") == 130.0, watcher.get_liquidity("1")
+    
+    def notify(subscription, data, slot):
+        watcher.handle_message({"jsonrpc": "2.0", "method": "accountNotification", "params": {
+            "subscription": subscription,
+            "result": {"context": {"slot": slot}, "value": {"data": [base64.b64encode(data).decode(), "base64"]}}
+        }})
+    
+    # Subscription acks map request ids to accounts
+    watcher._requests = {1: curve, 2: vault}
+    watcher.handle_message({"jsonrpc": "2.0", "id": 1, "result": 101})
+    watcher.handle_message({"jsonrpc": "2.0", "id": 2, "result": 102})
+    
+    notify(102, vault_data(10 * 10**9), 500)
+    assert changes[-1] == ("1", mint, 50.0, 130.0, 500), changes[-1]
+    notify(102, vault_data(10 * 10**9), 501)  # Unchanged balance: no callback
+    assert len(changes) == 1
+    
+    # Curve completion is a migration, not a pull
+    notify(101, curve_data(0, complete=True), 502)
+    assert len(changes) == 1 and curve not in watcher._owners
+    print(f"  ✓ Vault pull decoded in slot 500: 130 → 50 SOL; curve migration ignored")
+    
+    analyzer = LPIntentAnalyzer('solana')
+    assert analyzer.ingest_reserves(mint, 13000.0) is None
+    analyzer.ingest_reserves(mint, 12000.0)
+    delta = analyzer.ingest_reserves(mint, 5000.0)
+    assert round(delta, 1) == -58.3, delta
+    assert round(analyzer.get_lp_drawdown(mint, seconds=60), 1) == 61.5
+    print(f"  ✓ Analyzer drawdown from streamed reserves: {analyzer.get_lp_drawdown(mint):.1f}%")
+    
+    watcher.unwatch_position("1")
+    assert not watcher._owners and watcher.get_liquidity("1") is None
+
+
 def test_lp_detector():
     """Test LP detector initialization."""
     print("\n✓ Testing RaydiumLPDetector...")
@@ -98,6 +489,227 @@ def test_lp_detector():
         return False
 
 
+def test_raydium_pool_tracking():
+    """Test pools from LP detection join the tiered Raydium liquidity refresh."""
+    print("\n✓ Testing Raydium pool tracking...")
+    
+    import struct
+    from solders.pubkey import Pubkey
+    from modules.solana.raydium_lp_detector import (
+        RAYDIUM_V4_BASE_VAULT_OFFSET, RAYDIUM_V4_QUOTE_VAULT_OFFSET,
+        RAYDIUM_V4_BASE_MINT_OFFSET, RAYDIUM_V4_QUOTE_MINT_OFFSET,
+        RAYDIUM_V4_BASE_DECIMAL_OFFSET, RAYDIUM_V4_QUOTE_DECIMAL_OFFSET, RAYDIUM_V4_POOL_SIZE
+    )
+    from modules.solana.solana_utils import WRAPPED_SOL_MINT
+    
+    mint, pool, base_vault, quote_vault = (str(Pubkey(bytes([n]) * 32)) for n in (91, 92, 93, 94))
+    
+    pool_data = bytearray(RAYDIUM_V4_POOL_SIZE)
+    struct.pack_into('<Q', pool_data, RAYDIUM_V4_BASE_DECIMAL_OFFSET, 6)
+    struct.pack_into('<Q', pool_data, RAYDIUM_V4_QUOTE_DECIMAL_OFFSET, 9)
+    for offset, address in ((RAYDIUM_V4_BASE_VAULT_OFFSET, base_vault), (RAYDIUM_V4_QUOTE_VAULT_OFFSET, quote_vault),
+                            (RAYDIUM_V4_BASE_MINT_OFFSET, mint), (RAYDIUM_V4_QUOTE_MINT_OFFSET, WRAPPED_SOL_MINT)):
+        pool_data[offset:offset + 32] = bytes(Pubkey.from_string(address))
+    
+    def vault_data(amount):
+        return bytes(64) + struct.pack('<Q', amount) + bytes(93)
+    
+    accounts = {pool: bytes(pool_data), base_vault: vault_data(10**15), quote_vault: vault_data(55 * 10**9)}
+    
+    class _Account:
+        def __init__(self, data):
+            self.data = data
+    
+    class _Response:
+        def __init__(self, value):
+            self.value = value
+    
+    class _Client:
+        calls = 0
+        
+        def get_multiple_accounts(self, pubkeys):
+            _Client.calls += 1
+            return _Response([_Account(accounts[str(k)]) if str(k) in accounts else None for k in pubkeys])
+    
+    scanner = SolanaScanner({'rpc_url': 'https://api.mainnet-beta.solana.com', 'state_snapshot_file': None})
+    scanner.raydium.connect(_Client())
+    
+    async def fake_detect(txid, token_mint=None):
+        return RaydiumLPInfo(pool_address=pool, base_mint=mint, quote_mint=WRAPPED_SOL_MINT, lp_mint="",
+                             base_liquidity=10**9, quote_liquidity=40.0, quote_liquidity_usd=6000.0)
+    
+    scanner.lp_detector.detect_from_transaction = fake_detect
+    asyncio.run(scanner.detect_token_lp(mint, "sig"))
+    assert scanner.raydium.has_pool(mint)
+    assert scanner.raydium.get_liquidity_data(mint)["liquidity_sol"] == 40.0
+    
+    asyncio.run(scanner.refresh_raydium_liquidity())
+    assert _Client.calls == 0  # Not due yet (hot tier: 5s)
+    
+    scanner.raydium._pools[pool].last_updated -= 10
+    asyncio.run(scanner.refresh_raydium_liquidity())
+    # Pool account (vaults) + both vault balances
+    assert _Client.calls == 2, _Client.calls
+    assert scanner.raydium.get_liquidity_data(mint)["liquidity_sol"] == 55.0
+    print(f"  ✓ Detected pool refreshed from vaults: 40 → 55 SOL in {_Client.calls} RPC calls")
+    
+    # Pools tracked on the loop while the RPC reads are in flight
+    import time
+    
+    class _SlowClient(_Client):
+        def get_multiple_accounts(self, pubkeys):
+            time.sleep(0.1)
+            return super().get_multiple_accounts(pubkeys)
+    
+    scanner.raydium.connect(_SlowClient())
+    scanner.raydium._pools[pool].last_updated -= 10
+    accounts[quote_vault] = vault_data(60 * 10**9)
+    
+    async def refresh_while_tracking():
+        refresh = asyncio.create_task(scanner.refresh_raydium_liquidity())
+        await asyncio.sleep(0.02)
+        for n in range(100, 150):
+            scanner.raydium.track_pool(str(Pubkey(bytes([n]) * 32)), str(Pubkey(bytes([n, 1]) * 16)))
+        await refresh
+    
+    asyncio.run(refresh_while_tracking())
+    assert scanner.raydium.get_liquidity_data(mint)["liquidity_sol"] == 60.0
+    assert len(scanner.raydium._pools) == 51
+    print("  ✓ Pools tracked during an in-flight refresh; dict updated on the loop")
+
+    # Non-v4 pools are resolved once; the SOL / USDC side is picked by mint
+    from modules.solana.solana_utils import USDC_MINT, usd_to_sol
+    other_pool, usdc_pool, usdc_token, usdc_vault, token_vault = (str(Pubkey(bytes([n]) * 32)) for n in range(95, 100))
+    usdc_data = bytearray(pool_data)
+    struct.pack_into('<Q', usdc_data, RAYDIUM_V4_QUOTE_DECIMAL_OFFSET, 6)
+    for offset, address in ((RAYDIUM_V4_BASE_VAULT_OFFSET, usdc_vault), (RAYDIUM_V4_QUOTE_VAULT_OFFSET, token_vault),
+                            (RAYDIUM_V4_BASE_MINT_OFFSET, USDC_MINT), (RAYDIUM_V4_QUOTE_MINT_OFFSET, usdc_token)):
+        usdc_data[offset:offset + 32] = bytes(Pubkey.from_string(address))
+    accounts.update({other_pool: bytes(200), usdc_pool: bytes(usdc_data),
+                     usdc_vault: vault_data(3000 * 10**6), token_vault: vault_data(10**12)})
+
+    raydium = SolanaScanner({'rpc_url': 'https://api.mainnet-beta.solana.com', 'state_snapshot_file': None}).raydium
+    raydium.connect(_Client())
+    raydium.track_pool(other_pool, mint)
+    raydium.track_pool(usdc_pool, usdc_token, quote_mint=USDC_MINT)
+    for _ in range(2):
+        for tracked in raydium._pools.values():
+            tracked.last_updated -= 10
+        _Client.calls = 0
+        asyncio.run(raydium.refresh_liquidity())
+    assert _Client.calls == 1, _Client.calls  # Vault balances only, non-v4 pool not re-read
+    assert raydium._pools[other_pool].vaults == {}
+    assert abs(raydium._pools[usdc_pool].current_liquidity_sol - usd_to_sol(3000)) < 1e-9
+    print("  ✓ Non-v4 pool cached as unsupported; USDC-base pool valued from the USDC side")
+
+
+def test_jupiter_volume_ring():
+    """Test VolumeRing window sums and spike detection against trade-list sums."""
+    print("\n✓ Testing Jupiter VolumeRing...")
+
+    import random
+    import types
+    from modules.solana import jupiter_scanner
+    from modules.solana.jupiter_scanner import JupiterScanner, JupiterTokenData, VolumeRing
+
+    def list_sums(history, now):
+        """Sums as the old list-based JupiterTokenData computed them."""
+        day = [(t, v) for t, v in history if t > now - 86400]
+        return (sum(v for _, v in day), len(day),
+                sum(v for t, v in history if t > now - 3600),
+                sum(v for t, v in history if now - 7200 < t <= now - 3600))
+
+    def list_spike(history, now, multiplier=2.0):
+        """Hourly-average spike check over a plain trade list."""
+        day = [(t, v) for t, v in history if t > now - 86400]
+        if len(day) < 10:
+            return False
+        covered = min(int(now // 60) - int(min(t for t, _ in history) // 60) + 1, 1440)
+        older_hours = (covered - 60) / 60
+        if older_hours <= 0:
+            return False
+        recent = sum(v for t, v in day if t > now - 3600)
+        avg = (sum(v for _, v in day) - recent) / older_hours
+        return recent > avg * multiplier if avg > 0 else False
+
+    # Trades land 10s into a minute and checks run 30s in, so the minute
+    # buckets and the old "t > now - window" cut-offs select the same trades
+    rng = random.Random(29)
+    start = 1_700_000_000 // 60 * 60
+    ring, history = VolumeRing(), []
+    checks = 0
+    for minute in range(0, 30 * 60, 7):  # 30h: the ring wraps past 24h
+        t = start + minute * 60 + 10
+        volume = round(rng.uniform(1, 500), 2)
+        ring.add(t, volume)
+        history.append((t, volume))
+        if minute % 91 == 0:
+            late = t - rng.randrange(1, 120) * 60  # out-of-order trade inside the window
+            ring.add(late, 5.0)
+            history.append((late, 5.0))
+        now = t + 20
+        ring.advance(now)
+        volume_24h, count_24h, volume_1h, volume_prev_1h = list_sums(history, now)
+        assert abs(ring.volume_24h - volume_24h) < 1e-6 and ring.count_24h == count_24h
+        assert abs(ring.volume_1h - volume_1h) < 1e-6 and abs(ring.volume_prev_1h - volume_prev_1h) < 1e-6
+        checks += 1
+    assert ring.covered_minutes() == 1440
+    print(f"  ✓ 24h / 1h / previous-hour sums match the trade list at {checks} points across wraparound")
+
+    gap = history[-1][0] + 25 * 3600
+    ring.advance(gap)
+    assert ring.volume_24h == 0 and ring.count_24h == 0 and ring.volume_1h == ring.volume_prev_1h == 0
+    print("  ✓ Gap longer than the window clears every bucket")
+
+    real_time = jupiter_scanner.time
+    try:
+        for burst in (0, 1, 5):
+            now = start + 6 * 3600 + 30
+            jupiter_scanner.time = types.SimpleNamespace(time=lambda: now)
+            token = JupiterTokenData(token_mint="spike", first_seen=start)
+            history = []
+            for minute in range(0, 6 * 60, 6):  # 10 trades/hour, bigger in the last hour
+                t = start + minute * 60 + 10
+                volume = 100.0 * (burst if minute >= 5 * 60 else 1) or 1.0
+                token.record_trade(t, volume)
+                history.append((t, volume))
+            scanner = JupiterScanner()
+            scanner._tokens["spike"] = token
+            assert scanner.check_volume_spike("spike") == list_spike(history, now) == (burst == 5)
+    finally:
+        jupiter_scanner.time = real_time
+    print("  ✓ Spike detection matches the trade-list reference (flat, dip and 5x burst)")
+
+
+def test_raw_account_resolution():
+    """Test account resolution when instructions mix indices and pubkeys."""
+    print("\n✓ Testing raw parser account resolution...")
+    
+    from modules.solana.raw_solana_parser import RawTransactionResponse, InstructionFlattener
+    
+    message = {
+        # Object and plain-string key entries in one list
+        "accountKeys": [{"pubkey": "Program1"}, "KeyA", {"pubkey": "KeyB"}],
+        "instructions": [
+            {"programIdIndex": 0, "accounts": [1, "KeyB", 2], "data": ""},
+            {"programIdIndex": 0, "accounts": ["KeyA", 2, "LookupKey"], "data": ""},
+            {"programIdIndex": 0, "accounts": [2, 1], "data": ""},
+            {"programIdIndex": 0, "accounts": [1, 7, -1, None], "data": ""},
+        ],
+    }
+    tx = RawTransactionResponse(transaction={"message": message}, meta=None, slot=1, block_time=None)
+    flat = InstructionFlattener.flatten_instructions(tx)
+    
+    assert len(flat) == 4, flat
+    assert flat[0].program_id == "Program1"
+    assert flat[0].accounts == ["KeyA", "KeyB", "KeyB"]
+    assert flat[1].accounts == ["KeyA", "KeyB", "LookupKey"]
+    assert flat[2].accounts == ["KeyB", "KeyA"]
+    # Out-of-range, negative and unknown entries are dropped, not fatal
+    assert flat[3].accounts == ["KeyA"]
+    print("  ✓ Mixed int/str accounts and key entries resolved per entry")
+
+
 def test_state_machine():
     """Test token state machine."""
     print("\n✓ Testing TokenStateMachine...")
@@ -212,6 +824,62 @@ def test_state_transitions():
         return False
 
 
+def test_state_storage():
+    """Test state indexes, O(expired) cleanup and snapshot restore."""
+    print("\n✓ Testing TokenStateMachine storage...")
+    
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = str(Path(tmp) / "state.json")
+        sm = TokenStateMachine(min_lp_sol=10.0, sniper_score_threshold=70,
+                               snapshot_file=snapshot_file)
+        
+        for i in range(1000):
+            sm.create_token(f"Mint{i}", f"T{i}")
+        armed = "Mint7"
+        sm.set_metadata(armed, "Armed", "ARM", 9, 10**9)
+        sm.set_lp_detected(armed, "Pool", 10**8, 18.7, 3740)
+        sm.update_score(armed, 80.0)
+        
+        assert [r.mint for r in sm.get_armed_tokens()] == [armed]
+        assert sm.count_by_state(TokenState.DETECTED) == 999
+        assert sm.get_stats()["by_state"]["SNIPER_ARMED"] == 1
+        print("  ✓ Per-state indexes follow transitions")
+        
+        sm.save_snapshot()
+        restored = TokenStateMachine(snapshot_file=snapshot_file)
+        record = restored.get_token(armed)
+        assert record and record.current_state == TokenState.SNIPER_ARMED
+        assert record.lp_info.get("pool") == "Pool"
+        assert len(restored.get_armed_tokens()) == 1
+        print("  ✓ Armed state restored from snapshot")
+        
+        scanner_file = str(Path(tmp) / "scanner_state.json")
+        scanner = SolanaScanner({'rpc_url': 'https://api.mainnet-beta.solana.com',
+                                 'state_snapshot_file': scanner_file, 'parse_workers': 1})
+        scanner.metadata_resolver.cache_file = None
+        scanner.state_machine.set_metadata(armed, "Armed", "ARM", 9, 10**9)
+        scanner.state_machine.set_lp_detected(armed, "Pool", 10**8, 18.7, 3740)
+        scanner.parse_pool._get_executor()
+        asyncio.run(scanner.close())
+        record = TokenStateMachine(snapshot_file=scanner_file).get_token(armed)
+        assert record and record.current_state == TokenState.LP_DETECTED
+        assert scanner.parse_pool._executor is None
+        print("  ✓ Scanner close() writes the state snapshot and stops parse workers")
+        
+        # Age every record past the cutoff, then expire them
+        for record in sm._states.values():
+            record.created_at -= 48 * 3600
+        sm._expiry = type(sm._expiry)(
+            (created_at - 48 * 3600, mint) for created_at, mint in sm._expiry
+        )
+        sm.cleanup(max_age_hours=24)
+        assert sm.get_stats()["total_tokens"] == 0
+        assert not sm.get_armed_tokens()
+        print("  ✓ Cleanup expired all aged records")
+
+
 def test_safe_mode():
     """Test safe mode enforcement."""
     print("\n✓ Testing Safe Mode...")
@@ -333,6 +1001,118 @@ def test_scanner_integration():
         return False
 
 
+def test_concurrent_enrichment():
+    """Test unified events are emitted early with partial data, then updated."""
+    print("\n✓ Testing concurrent enrichment...")
+    
+    import time
+    
+    scanner = SolanaScanner({
+        'rpc_url': 'https://api.mainnet-beta.solana.com',
+        'state_snapshot_file': None,
+        'enrichment_first_deadline': 0.25,
+        'enrichment_deadlines': {'curve': 0.3}
+    })
+    mint = "Enrich" + "1" * 38
+    
+    async def fast_metadata():
+        await asyncio.sleep(0.05)
+        scanner.state_machine.set_metadata(mint, "Fast", "FAST", 6, 10**9)
+        return {"name": "Fast", "symbol": "FAST", "decimals": 6}
+    
+    async def slow_lp():
+        await asyncio.sleep(0.6)
+        return {"pool_address": "Pool", "quote_liquidity": 42.0, "quote_liquidity_usd": 7000}
+    
+    async def stuck_curve():
+        await asyncio.sleep(10)
+    
+    scanner._enrichment_sources = lambda address, tx_signature, tasks: iter([
+        ("metadata", fast_metadata()), ("lp", slow_lp()), ("curve", stuck_curve())
+    ])
+    
+    updates = []
+    
+    async def on_update(event):
+        updates.append(event)
+    
+    scanner.on_event_update = on_update
+    
+    async def run():
+        start = time.perf_counter()
+        event = await scanner._create_unified_event_async({'token_address': mint, 'tx_signature': 'sig'})
+        first_ms = (time.perf_counter() - start) * 1000
+        record = scanner.state_machine.get_token(mint)
+        pending = set(record.pending_enrichments)
+        await asyncio.wait(list(scanner._enrichment_tasks))
+        return event, first_ms, pending
+    
+    event, first_ms, pending = asyncio.run(run())
+    assert first_ms < 300, first_ms
+    assert event['partial'] and event['name'] == "Fast" and event['metadata_status'] == 'resolved'
+    assert set(event['pending_enrichments']) == {"lp", "curve"} == pending
+    print(f"  ✓ First event after {first_ms:.0f} ms with metadata; pending {sorted(pending)}")
+    
+    assert len(updates) == 1
+    update = updates[0]
+    assert update['is_update'] and not update['partial']
+    assert update['liquidity_sol'] == 42.0 and update['bonding_curve_progress'] is None
+    assert scanner.state_machine.get_token(mint).pending_enrichments == ()
+    assert scanner.get_stats()['enrichment']['timeouts'] == {'curve': 1}
+    print(f"  ✓ Update delivered after {update['enrichment_ms']:.0f} ms (curve deadline hit)")
+
+
+def test_lp_before_metadata():
+    """Test an LP found before metadata still reaches LP_DETECTED in safe mode."""
+    print("\n✓ Testing LP detected before metadata...")
+    
+    from modules.solana.metadata_resolver import TokenMetadata
+    from modules.solana.raydium_lp_detector import RaydiumLPInfo
+    
+    scanner = SolanaScanner({
+        'rpc_url': 'https://api.mainnet-beta.solana.com',
+        'state_snapshot_file': None,
+        'safe_mode': True,
+        'enrichment_first_deadline': 0.05
+    })
+    mint = "FastLP" + "1" * 38
+    assert scanner.state_machine.safe_mode
+    
+    async def slow_resolve(token_mint):
+        await asyncio.sleep(0.2)
+        return TokenMetadata(mint=token_mint, name="Late", symbol="LATE", decimals=6, supply=10**9)
+    
+    async def fast_lp(txid, token_mint):
+        return RaydiumLPInfo(
+            pool_address="Pool" + "1" * 40, base_mint=token_mint, quote_mint="So11111111111111111111111111111111111111112",
+            lp_mint="", base_liquidity=1.0, quote_liquidity=50.0, quote_liquidity_usd=7500.0
+        )
+    
+    async def no_curve(token_mint):
+        return None
+    
+    scanner.metadata_resolver.resolve = slow_resolve
+    scanner.lp_detector.detect_from_transaction = fast_lp
+    
+    async def run():
+        from modules.solana import solana_scanner as scanner_module
+        reader = scanner_module.get_bonding_curve_reader()
+        original, reader.get_state = reader.get_state, no_curve
+        try:
+            event = await scanner._create_unified_event_async({'token_address': mint, 'tx_signature': 'sig'})
+            await asyncio.wait(list(scanner._enrichment_tasks))
+        finally:
+            reader.get_state = original
+        return event
+    
+    event = asyncio.run(run())
+    assert event['partial'] and event['metadata_status'] == 'pending'
+    record = scanner.state_machine.get_token(mint)
+    assert record.metadata_resolved and record.lp_detected and record.lp_valid, record.to_dict()
+    assert record.current_state == TokenState.LP_DETECTED, record.current_state
+    print("  ✓ LP held until metadata resolved; token reached LP_DETECTED")
+
+
 def test_configuration():
     """Test configuration has new settings."""
     print("\n✓ Testing Configuration...")
@@ -363,23 +1143,45 @@ def test_configuration():
         return False
 
 
+def run_test(test) -> bool:
+    """Run one test; assert-style tests pass by returning without raising."""
+    try:
+        return test() is not False
+    except Exception as e:
+        print(f"  ✗ {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
     print("SOLANA MODULE UPGRADE — VALIDATION TEST SUITE")
     print("=" * 60)
     
-    results = []
-    
-    # Run tests
-    results.append(("Imports", test_imports()))
-    results.append(("MetadataResolver", test_metadata_resolver()))
-    results.append(("RaydiumLPDetector", test_lp_detector()))
-    results.append(("TokenStateMachine", test_state_machine()))
-    results.append(("State Transitions", test_state_transitions()))
-    results.append(("Safe Mode", test_safe_mode()))
-    results.append(("Scanner Integration", test_scanner_integration()))
-    results.append(("Configuration", test_configuration()))
+    tests = [
+        ("Imports", test_imports),
+        ("MetadataResolver", test_metadata_resolver),
+        ("MetadataResolver Batching", test_metadata_batching),
+        ("UriMetadataFetcher", test_uri_fetcher),
+        ("BondingCurveReader", test_bonding_curve),
+        ("HolderConcentrationReader", test_holder_concentration),
+        ("SolanaPositionWatcher", test_position_watcher),
+        ("RaydiumLPDetector", test_lp_detector),
+        ("Raydium Pool Tracking", test_raydium_pool_tracking),
+        ("Jupiter VolumeRing", test_jupiter_volume_ring),
+        ("Raw Account Resolution", test_raw_account_resolution),
+        ("TokenStateMachine", test_state_machine),
+        ("State Transitions", test_state_transitions),
+        ("State Storage", test_state_storage),
+        ("Safe Mode", test_safe_mode),
+        ("Scanner Integration", test_scanner_integration),
+        ("Concurrent Enrichment", test_concurrent_enrichment),
+        ("LP Before Metadata", test_lp_before_metadata),
+        ("Configuration", test_configuration),
+    ]
+    results = [(name, run_test(test)) for name, test in tests]
     
     # Summary
     print("\n" + "=" * 60)
@@ -5,8 +5,10 @@ Enhanced with RugCheck.xyz (Solana) and GoPlus (EVM)
 
 from web3 import Web3
 from typing import Dict, Optional, List
-import requests
-import time
+
+from api_cache import get_api_cache
+from goplus_batcher import get_goplus_batcher, token_security_url
+from http_client import get_http_client
 
 class TokenSnifferAnalyzer:
     """
@@ -36,6 +38,19 @@ class TokenSnifferAnalyzer:
     def _get_goplus_id(self):
         return self.goplus_chain_map.get(self.chain_name, '1')
 
+    def _cached_report(self, source: str, api: str, label: str, key: str, url: str, **kwargs) -> Optional[Dict]:
+        """
+        Raw JSON report through the shared API cache (stale-while-revalidate).
+        Returns None on a non-200 response; transport errors raise on a miss.
+        """
+        def fetch():
+            resp = get_http_client().get_sync(api, url, **kwargs)
+            if resp.status != 200:
+                print(f"   ⚠️ {label} API Error {resp.status}: {resp.text[:100]}")
+                return None
+            return resp.json()
+        return get_api_cache().source(source).get_or_fetch_sync(key, fetch)
+
     def analyze_comprehensive(self, token_address: str, pair_address: str = None, external_liquidity_usd: float = 0) -> Dict:
         result = {
             'swap_analysis': {},
@@ -194,17 +209,24 @@ class TokenSnifferAnalyzer:
                  print(f"   ⚠️ Invalid Solana Address length: {token_address}")
                  raise ValueError("Invalid address length")
             
+            # On-chain holder concentration first; RugCheck topHolders only fill in without RPC
+            concentration = self._onchain_holder_concentration(token_address)
+            if concentration is not None:
+                result['holder_analysis'] = {
+                    'top10_holders_percent': concentration.top10_pct,
+                    'holder_gini': round(concentration.gini, 4),
+                    'creator_wallet_percent': 0,
+                    'details': []
+                }
+            
             url = f"https://api.rugcheck.xyz/v1/tokens/{token_address}/report"
-            resp = requests.get(url, timeout=15)
+            data = self._cached_report('rugcheck.report', 'rugcheck', 'RugCheck', token_address, url, timeout=15)
             
-            if resp.status_code != 200:
-                print(f"   ⚠️ RugCheck API Error {resp.status_code}: {resp.text[:100]}")
-                result['contract_analysis']['details'] = [f"⚠️ RugCheck API Failed: {resp.status_code}"]
+            if data is None:
+                result['contract_analysis']['details'] = ["⚠️ RugCheck API Failed"]
                 result['risk_score'] = 50  # Moderate risk if can't verify
                 result['risk_level'] = 'WARN'
                 return
-
-            data = resp.json()
             
             # START SCORE-BASED CALCULATION
             # Base score from RugCheck (0-100, lower = better)
@@ -281,8 +303,13 @@ class TokenSnifferAnalyzer:
                     
                 filtered_holders.append(h)
             
-            # Calculate Top 10 from REAL holders only
-            top10_pct = sum(float(h.get('pct', 0)) for h in filtered_holders[:10])
+            # Calculate Top 10 from REAL holders only (unless read on-chain above)
+            if concentration is not None:
+                top10_pct = concentration.top10_pct
+                holder_gini = round(concentration.gini, 4)
+            else:
+                top10_pct = sum(float(h.get('pct', 0)) for h in filtered_holders[:10])
+                holder_gini = None
             
             if top10_pct > 90:
                 score += 25
@@ -397,6 +424,7 @@ class TokenSnifferAnalyzer:
             }
             result['holder_analysis'] = {
                 'top10_holders_percent': top10_pct,
+                'holder_gini': holder_gini,
                 'creator_wallet_percent': 0,
                 'details': []
             }
@@ -419,54 +447,53 @@ class TokenSnifferAnalyzer:
             result['risk_score'] = 50
             result['risk_level'] = 'WARN'
 
+    def _onchain_holder_concentration(self, token_address: str):
+        """Holder concentration from chain data (None without an RPC client)."""
+        try:
+            from modules.solana.holder_concentration import get_holder_concentration_reader
+            holder_reader = get_holder_concentration_reader()
+            if holder_reader.available:
+                return holder_reader.fetch_concentrations([token_address]).get(token_address)
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"   ⚠️ On-chain holder read failed: {e}")
+        return None
+
     def _analyze_evm_goplus(self, token_address, pair_address, result):
         """Deep analysis for EVM using GoPlus with SCORE-BASED detection."""
         chain_id = self._get_goplus_id()
         
-        # RETRY LOGIC FOR TIMEOUTS
-        max_retries = 3
-        retry_delay = 1  # Start with 1 second
+        # Timeouts/5xx are retried with exponential backoff by the shared HTTP client
+        max_retries = get_http_client().api_config('goplus').max_retries + 1
         
         goplus_success = False
         last_error = None
         
-        for attempt in range(max_retries):
-            try:
-                url = f"https://api.gopluslabs.io/api/v1/token_security/{chain_id}?contract_addresses={token_address}"
-                timeout = 10 + (attempt * 2)  # Increase timeout on retries
-                
-                print(f"   [GoPlus] Attempt {attempt + 1}/{max_retries} (timeout: {timeout}s)")
-                resp = requests.get(url, timeout=timeout)
-                data = resp.json()
-                
-                if data['code'] != 1:
-                    result['contract_analysis']['details'] = [f"⚠️ GoPlus API Error: {data.get('message')}"]
-                    result['risk_score'] = 50
-                    result['risk_level'] = 'WARN'
-                    return
-                
-                # SUCCESS - break retry loop
+        try:
+            # Batched with concurrent lookups for the same chain
+            data = get_api_cache().source('goplus.report').get_or_fetch_sync(
+                f"{chain_id}_{token_address}",
+                lambda: get_goplus_batcher().lookup_sync(token_security_url(chain_id), token_address)
+            )
+            
+            if data is None:
+                last_error = "HTTP error"
+            elif data['code'] != 1:
+                result['contract_analysis']['details'] = [f"⚠️ GoPlus API Error: {data.get('message')}"]
+                result['risk_score'] = 50
+                result['risk_level'] = 'WARN'
+                return
+            else:
                 goplus_success = True
-                break
-                
-            except requests.Timeout as e:
-                last_error = f"Timeout after {timeout}s"
-                print(f"   ⚠️ GoPlus timeout on attempt {attempt + 1}/{max_retries}")
-                
-                if attempt < max_retries - 1:
-                    print(f"   ⏳ Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                continue
-                
-            except Exception as e:
-                last_error = str(e)
-                print(f"   ⚠️ GoPlus error on attempt {attempt + 1}/{max_retries}: {e}")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                continue
+            
+        except TimeoutError:
+            last_error = "Timeout"
+            print(f"   ⚠️ GoPlus timeout")
+            
+        except Exception as e:
+            last_error = str(e)
+            print(f"   ⚠️ GoPlus error: {e}")
         
         # IF GOPLUS FAILED AFTER RETRIES, TRY SECONDARY API
         if not goplus_success:
@@ -658,14 +685,12 @@ class TokenSnifferAnalyzer:
         try:
             # TokenSniffer API endpoint (free tier)
             url = f"https://tokensniffer.com/api/v2/tokens/{self.chain_name}/{token_address}"
-            resp = requests.get(url, timeout=8)
+            data = self._cached_report('tokensniffer', 'tokensniffer', 'TokenSniffer',
+                                       f"{self.chain_name}_{token_address}", url)
             
-            if resp.status_code != 200:
-                print(f"   ⚠️ TokenSniffer returned status {resp.status_code}")
+            if data is None:
                 return False
             
-            data = resp.json()
-            
             # Extract relevant data
             score = 0
             details = []
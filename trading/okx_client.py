@@ -3,12 +3,12 @@ OKX DEX API Client
 Handles quote fetching and swap execution
 """
 
-import aiohttp
-import asyncio
 from typing import Dict, Optional, List
 import json
 import logging
 
+from http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class OKXDexClient:
@@ -28,16 +28,13 @@ class OKXDexClient:
     SOL_MINT = "So11111111111111111111111111111111111111112"
 
     def __init__(self):
-        self.session = None
+        self.http = get_http_client()
         self.api_key = None
         self.secret_key = None
         self.passphrase = None
         
-        # Rate limiting: Max 60 requests per minute
-        from collections import deque
-        self._request_times = deque(maxlen=60)
-        self._rate_limit_lock = asyncio.Lock()
-        self._min_request_interval = 2.0  # Increased to 2s to be safe
+        # Rate limiting (one request per 2s, well under 60/min) is the shared
+        # HTTP client's 'okx' bucket
         
         self._load_credentials()
 
@@ -62,33 +59,6 @@ class OKXDexClient:
         else:
             logger.warning("OKX Web3 API Key NOT FOUND - DEX trading will fail")
 
-    async def _rate_limit(self):
-        """Enforce rate limiting to prevent 429 errors"""
-        async with self._rate_limit_lock:
-            from time import time
-            
-            current_time = time()
-            
-            # Remove requests older than 60 seconds
-            while self._request_times and current_time - self._request_times[0] > 60:
-                self._request_times.popleft()
-            
-            # If we've made 60 requests in the last minute, wait
-            if len(self._request_times) >= 60:
-                sleep_time = 60 - (current_time - self._request_times[0]) + 1
-                if sleep_time > 0:
-                    logger.warning(f"Rate limit reached, waiting {sleep_time:.1f}s")
-                    await asyncio.sleep(sleep_time)
-            
-            # Enforce minimum interval between requests
-            if self._request_times:
-                time_since_last = current_time - self._request_times[-1]
-                if time_since_last < self._min_request_interval:
-                    await asyncio.sleep(self._min_request_interval - time_since_last)
-            
-            # Record this request
-            self._request_times.append(time())
-
     def _get_timestamp(self):
         from datetime import datetime, timezone
         now = datetime.now(timezone.utc)
@@ -128,23 +98,11 @@ class OKXDexClient:
             'Content-Type': 'application/json'
         }
 
-    async def _get_session(self):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
-    
-    async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
-
     async def get_quote(self, chain: str, from_token: str, to_token: str, amount: str, slippage: float = 0.01) -> Optional[Dict]:
-        await self._rate_limit()
         # Force OKX for all chains
         return await self._get_okx_quote(chain, from_token, to_token, amount, slippage)
 
     async def _get_okx_quote(self, chain, from_token, to_token, amount, slippage):
-        import requests # Use requests for consistent URL encoding vs Signature
-        
         chain_id = self.CHAIN_IDS.get(chain.lower())
         if not chain_id:
             logger.error(f"Unsupported chain: {chain}")
@@ -174,10 +132,10 @@ class OKXDexClient:
         url = f"https://www.okx.com{request_path}"
         
         try:
-            # Blocking call is acceptable here for ensuring Auth works
-            response = requests.get(url, headers=headers)
+            # Sent pre-encoded so the query matches the signed request_path
+            response = await self.http.get('okx', url, headers=headers, encoded=True)
             
-            if response.status_code == 200:
+            if response.status == 200:
                 data = response.json()
                 if data.get('code') == '0':
                         return data.get('data', [{}])[0]
@@ -185,7 +143,7 @@ class OKXDexClient:
                         logger.error(f"[OKX] API Error: {data.get('msg')}")
                         return None
             else:
-                logger.error(f"[OKX] HTTP Error: {response.status_code}")
+                logger.error(f"[OKX] HTTP Error: {response.status}")
                 logger.error(f"[OKX] Response: {response.text}")
                 return None
         except Exception as e:
@@ -194,13 +152,12 @@ class OKXDexClient:
             raise e
 
     async def get_swap_data(self, chain: str, from_token: str, to_token: str, amount: str, slippage: float, user_wallet: str) -> Optional[Dict]:
-        await self._rate_limit()
         if chain.lower() == 'solana':
             return await self._get_jupiter_swap(from_token, to_token, amount, slippage, user_wallet)
         return await self._get_okx_swap(chain, from_token, to_token, amount, slippage, user_wallet)
 
     async def _get_jupiter_swap(self, from_token, to_token, amount, slippage, user_wallet):
-        """Get swap instructions from Jupiter API (Solana) - Sync version fallback."""
+        """Get swap instructions from Jupiter API (Solana)."""
         
         # List of endpoints to try (Main vs Backup)
         # Note: public.jupiterapi.com typically exposes /quote directly without /v6 prefix, 
@@ -211,7 +168,6 @@ class OKXDexClient:
             # "https://jupiter-api.raydium.io/v6", # Raydium (DISABLED: DNS Resolution Issues)
         ]
 
-        import requests
         slippage_bps = int(slippage * 100)
         
         headers = {
@@ -235,9 +191,9 @@ class OKXDexClient:
                 logger.info(f"[Jupiter] Trying endpoint: {base_url}...")
                 
                 # 1. Get Quote
-                response = requests.get(quote_url, headers=headers, timeout=5)
-                if response.status_code != 200:
-                    last_error = f"Quote failed {response.status_code}: {response.text}"
+                response = await self.http.get('jupiter', quote_url, headers=headers)
+                if response.status != 200:
+                    last_error = f"Quote failed {response.status}: {response.text}"
                     continue # Try next
                 
                 quote_data = response.json()
@@ -253,9 +209,9 @@ class OKXDexClient:
                     "skipUserAccountsRpcCalls": False  # Ensure account checks
                 }
                 
-                response = requests.post(swap_url, json=payload, headers=headers, timeout=5)
-                if response.status_code != 200:
-                    last_error = f"Swap failed {response.status_code}: {response.text}"
+                response = await self.http.post('jupiter', swap_url, json=payload, headers=headers)
+                if response.status != 200:
+                    last_error = f"Swap failed {response.status}: {response.text}"
                     continue # Try next
                     
                 swap_resp = response.json()
@@ -307,10 +263,9 @@ class OKXDexClient:
         logger.info(f"DEBUG FINAL SWAP URL: {url}")
         
         try:
-            import requests
-            response = requests.get(url, headers=headers)
+            response = await self.http.get('okx', url, headers=headers, encoded=True)
             
-            if response.status_code == 200:
+            if response.status == 200:
                 data = response.json()
                 if data.get('code') == '0':
                         return data.get('data', [{}])[0]
@@ -318,7 +273,7 @@ class OKXDexClient:
                         logger.error(f"[OKX] API Error in swap: {data.get('msg')}")
                         return None
             else:
-                logger.error(f"[OKX] Swap data HTTP error: {response.status_code}")
+                logger.error(f"[OKX] Swap data HTTP error: {response.status}")
                 logger.error(f"[OKX] Response: {response.text}")
                 return None
         except Exception as e:
@@ -326,6 +281,4 @@ class OKXDexClient:
             return None
 
     async def close(self):
-        """Close client session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """No-op: connections are pooled by the shared HTTP client."""